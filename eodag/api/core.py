@@ -15,6 +15,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import itertools
 import logging
 import os
 import re
@@ -45,6 +46,7 @@ from eodag.config import (
 )
 from eodag.plugins.download.base import DEFAULT_DOWNLOAD_TIMEOUT, DEFAULT_DOWNLOAD_WAIT
 from eodag.plugins.manager import PluginManager
+from eodag.plugins.search.base import SearchContext
 from eodag.utils import (
     GENERIC_PRODUCT_TYPE,
     MockResponse,
@@ -54,6 +56,7 @@ from eodag.utils import (
     obj_md5sum,
     uri_to_path,
 )
+from eodag.utils.concurrency import iter_ordered
 from eodag.utils.exceptions import (
     AuthenticationError,
     MisconfiguredError,
@@ -61,7 +64,15 @@ from eodag.utils.exceptions import (
     PluginImplementationError,
     UnsupportedProvider,
 )
+from eodag.utils.sharding import (
+    DEFAULT_SHARD_MAX_DEPTH,
+    DEFAULT_SHARD_MAX_RESULTS,
+    DEFAULT_SHARD_MIN_DURATION,
+    DEFAULT_SHARDS_MAX_WORKERS,
+    SearchShard,
+)
 from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT, fetch_stac_items
+from eodag.utils.throttling import DEFAULT_BURST, set_global_rate_limit
 
 logger = logging.getLogger("eodag.core")
 
@@ -314,6 +325,42 @@ class EODataAccessGateway(object):
         preferred, priority = max(providers_with_priority, key=itemgetter(1))
         return preferred, priority
 
+    def set_rate_limit(
+        self,
+        bytes_per_second=None,
+        requests_per_second=None,
+        provider=None,
+        burst=DEFAULT_BURST,
+    ):
+        """Limit the bandwidth and the requests rate of a provider, or of all the
+        providers together if no provider is given. A limit not set is removed.
+
+        Limits of a provider can also be set in the ``rate_limit`` section of its
+        configuration, and global limits with the ``EODAG_MAX_BYTES_PER_SECOND`` and
+        ``EODAG_MAX_REQUESTS_PER_SECOND`` environment variables (see
+        :class:`~eodag.utils.throttling.RateLimiter`).
+
+        :param bytes_per_second: (optional) Maximum bandwidth
+        :type bytes_per_second: float
+        :param requests_per_second: (optional) Maximum requests rate
+        :type requests_per_second: float
+        :param provider: (optional) The provider to limit, all of them if not set
+        :type provider: str
+        :param burst: (optional) Duration of the traffic allowed in a burst, in seconds
+        :type burst: float
+        :raises: :class:`~eodag.utils.exceptions.UnsupportedProvider`
+        """
+        if provider is None:
+            set_global_rate_limit(bytes_per_second, requests_per_second, burst)
+            return
+        if provider not in self.available_providers():
+            raise UnsupportedProvider(
+                f"This provider is not recognised by eodag: {provider}"
+            )
+        self._plugins_manager.get_rate_limiter(provider).set_limits(
+            bytes_per_second, requests_per_second, burst
+        )
+
     def update_providers_config(self, yaml_conf):
         """Update providers configuration with given input.
         Can be used to add a provider to existing configuration or update
@@ -833,6 +880,7 @@ class EODataAccessGateway(object):
         end=None,
         geom=None,
         locations=None,
+        count=True,
         **kwargs,
     ):
         """Look for products matching criteria on known providers.
@@ -874,11 +922,17 @@ class EODataAccessGateway(object):
                           'PA' such as Panama and Pakistan in the shapefile configured with
                           name=country and attr=ISO3
         :type locations: dict
+        :param count: (optional) How the total number of results is counted: ``True``
+                      to send count requests (skipped for the providers giving it in
+                      their search responses), ``"estimate"`` to reuse the counts of
+                      identical searches run during the last minutes, or ``False`` not
+                      to count them
+        :type count: Union[bool, str]
         :param kwargs: Some other criteria that will be used to do the search,
                        using paramaters compatibles with the provider
         :type kwargs: Union[int, str, bool, dict]
         :returns: A collection of EO products matching the criteria and the total
-                  number of results found
+                  number of results found, ``None`` if ``count`` is ``False``
         :rtype: tuple(:class:`~eodag.api.search_result.SearchResult`, int)
 
         .. note::
@@ -898,9 +952,8 @@ class EODataAccessGateway(object):
             page=page,
             items_per_page=items_per_page,
         )
-        search_plugin.clear()
         return self._do_search(
-            search_plugin, count=True, raise_errors=raise_errors, **search_kwargs
+            search_plugin, count=count, raise_errors=raise_errors, **search_kwargs
         )
 
     def search_iter_page(
@@ -910,6 +963,7 @@ class EODataAccessGateway(object):
         end=None,
         geom=None,
         locations=None,
+        prefetch=None,
         **kwargs,
     ):
         """Iterate over the pages of a products search.
@@ -940,6 +994,14 @@ class EODataAccessGateway(object):
                           'PA' such as Panama and Pakistan in the shapefile configured with
                           name=country and attr=ISO3
         :type locations: dict
+        :param prefetch: (optional) The number of pages searched ahead of the consumed
+                         one, concurrently, once the total number of results is
+                         known. The number of concurrent requests is limited by the
+                         ``max_workers`` search configuration of the provider, if set.
+                         Only used for providers paginating by page number or by
+                         number of skipped items: the pages are searched one after
+                         another for the other ones, or if not set
+        :type prefetch: int
         :param kwargs: Some other criteria that will be used to do the search,
                        using paramaters compatibles with the provider
         :type kwargs: Union[int, str, bool, dict]
@@ -952,12 +1014,32 @@ class EODataAccessGateway(object):
         )
         search_plugin = search_kwargs.pop("search_plugin")
         iteration = 1
-        # Store the search plugin config pagination.next_page_url_tpl to reset it later
-        # since it might be modified if the next_page_url mechanism is used by the
-        # plugin. (same thing for next_page_query_obj, next_page_query_obj with POST reqs)
-        pagination_config = getattr(search_plugin.config, "pagination", {})
-        prev_next_page_url_tpl = pagination_config.get("next_page_url_tpl", None)
-        prev_next_page_query_obj = pagination_config.get("next_page_query_obj", None)
+        # The pages are searched using the same search context, which keeps the
+        # next_page_url and next_page_query_obj collected by the plugin (with POST
+        # reqs) and overrides the pagination configuration with them, even if other
+        # searches are run in between using the same plugin.
+        search_context = getattr(search_plugin, "context", None)
+        if prefetch:
+            # pages obtained from the previous one cannot be searched in advance
+            cursor_pagination = any(
+                key in search_plugin.config.pagination
+                for key in (
+                    "next_page_url_key_path",
+                    "next_page_query_obj_key_path",
+                    "next_page_merge_key_path",
+                )
+            )
+            if search_context is not None and not cursor_pagination:
+                for products in self._search_iter_prefetched_pages(
+                    search_plugin, prefetch, items_per_page, **search_kwargs
+                ):
+                    yield products
+                return
+            logger.debug(
+                "Pages of provider %s cannot be prefetched, they are searched one "
+                "after another",
+                search_plugin.provider,
+            )
         # Page has to be set to a value even if use_next is True, this is required
         # internally by the search plugin (see collect_search_urls)
         search_kwargs.update(
@@ -968,43 +1050,39 @@ class EODataAccessGateway(object):
         next_page_url = None
         next_page_query_obj = None
         while True:
-            if iteration > 1 and next_page_url:
-                pagination_config["next_page_url_tpl"] = next_page_url
-            if iteration > 1 and next_page_query_obj:
-                pagination_config["next_page_query_obj"] = next_page_query_obj
             logger.info("Iterate search over multiple pages: page #%s", iteration)
-            try:
+            if search_context is None:
                 products, _ = self._do_search(
                     search_plugin, count=False, raise_errors=True, **search_kwargs
                 )
-            finally:
-                # we don't want that next(search_iter_page(...)) modifies the plugin
-                # indefinitely. So we reset after each request, but before the generator
-                # yields, the attr next_page_url (to None) and
-                # config.pagination["next_page_url_tpl"] (to its original value).
-                next_page_url = getattr(search_plugin, "next_page_url", None)
-                next_page_query_obj = getattr(search_plugin, "next_page_query_obj", {})
-                next_page_merge = getattr(search_plugin, "next_page_merge", None)
-
-                if next_page_url:
-                    search_plugin.next_page_url = None
-                    if prev_next_page_url_tpl:
-                        search_plugin.config.pagination[
-                            "next_page_url_tpl"
-                        ] = prev_next_page_url_tpl
-                if next_page_query_obj:
-                    if prev_next_page_query_obj:
-                        search_plugin.config.pagination[
-                            "next_page_query_obj"
-                        ] = prev_next_page_query_obj
+            else:
+                search_context.pagination = {}
+                if iteration > 1 and next_page_url:
+                    search_context.pagination["next_page_url_tpl"] = next_page_url
+                if iteration > 1 and next_page_query_obj:
+                    search_context.pagination[
+                        "next_page_query_obj"
+                    ] = next_page_query_obj
+                try:
+                    with search_plugin.use_context(search_context):
+                        products, _ = self._do_search(
+                            search_plugin,
+                            count=False,
+                            raise_errors=True,
+                            **search_kwargs,
+                        )
+                finally:
+                    # The next page url is reset, as the next page is searched using
+                    # the pagination configuration overridden with it
+                    next_page_url = search_context.next_page_url
+                    next_page_query_obj = search_context.next_page_query_obj
+                    search_context.next_page_url = None
                     # Update next_page_query_obj for next page req
-                    if next_page_merge:
-                        search_plugin.next_page_query_obj = dict(
-                            getattr(search_plugin, "query_params", {}),
+                    if next_page_query_obj and search_context.next_page_merge:
+                        search_context.next_page_query_obj = dict(
+                            search_context.query_params,
                             **next_page_query_obj,
                         )
-                    else:
-                        search_plugin.next_page_query_obj = next_page_query_obj
 
             if len(products) > 0:
                 # The first products between two iterations are compared. If they
@@ -1041,6 +1119,82 @@ class EODataAccessGateway(object):
             last_page_with_products,
         )
 
+    def _search_iter_prefetched_pages(
+        self, search_plugin, prefetch, items_per_page, **search_kwargs
+    ):
+        """Iterate over the pages of a search, searching the next ``prefetch`` pages
+        concurrently, each one in its own search context.
+
+        The number of pages is computed from the total number of results given with
+        the first page. If the last one is full, as some providers give an
+        approximate total, or if no total is given, the following pages are searched
+        one after another.
+        """
+        product_type_config = search_plugin.context.product_type_config
+        max_workers = min(
+            prefetch, int(getattr(search_plugin.config, "max_workers", prefetch))
+        )
+
+        def search_page(page, count=False):
+            logger.info("Iterate search over multiple pages: page #%s", page)
+            with search_plugin.use_context(SearchContext(product_type_config)):
+                return self._do_search(
+                    search_plugin,
+                    count=count,
+                    raise_errors=True,
+                    page=page,
+                    items_per_page=items_per_page,
+                    **search_kwargs,
+                )
+
+        def search_pages():
+            products, total = search_page(1, count=True)
+            yield products
+            # without total, the last page is unknown and pages are not prefetched
+            last_page = -(-total // items_per_page) if total else 1
+            yield from iter_ordered(
+                lambda page: search_page(page)[0],
+                range(2, last_page + 1),
+                max_workers=max_workers,
+                prefetch=prefetch,
+            )
+            for page in itertools.count(last_page + 1):
+                yield search_page(page)[0]
+
+        prev_product = None
+        last_page_with_products = 0
+        pages = search_pages()
+        try:
+            for iteration, products in enumerate(pages, start=1):
+                if len(products) == 0:
+                    break
+                # Same workaround as in search_iter_page for providers not handling
+                # pagination
+                product = products[0]
+                if (
+                    prev_product
+                    and product.properties["id"] == prev_product.properties["id"]
+                    and product.provider == prev_product.provider
+                ):
+                    logger.warning(
+                        "Iterate over pages: stop iterating since the next page "
+                        "appears to have the same products as in the previous one. "
+                        "This provider may not implement pagination.",
+                    )
+                    break
+                yield products
+                last_page_with_products = iteration
+                prev_product = product
+                if len(products) < items_per_page:
+                    break
+        finally:
+            # cancel the searches of the pages not consumed
+            pages.close()
+        logger.debug(
+            "Iterate over pages: last products found on page %s",
+            last_page_with_products,
+        )
+
     def search_all(
         self,
         items_per_page=None,
@@ -1048,6 +1202,7 @@ class EODataAccessGateway(object):
         end=None,
         geom=None,
         locations=None,
+        prefetch=None,
         **kwargs,
     ):
         """Search and return all the products matching the search criteria.
@@ -1090,6 +1245,14 @@ class EODataAccessGateway(object):
                           'PA' such as Panama and Pakistan in the shapefile configured with
                           name=country and attr=ISO3
         :type locations: dict
+        :param prefetch: (optional) The number of pages searched ahead of the consumed
+                         one, concurrently, once the total number of results is
+                         known. The number of concurrent requests is limited by the
+                         ``max_workers`` search configuration of the provider, if set.
+                         Only used for providers paginating by page number or by
+                         number of skipped items: the pages are searched one after
+                         another for the other ones, or if not set
+        :type prefetch: int
         :param kwargs: Some other criteria that will be used to do the search,
                        using paramaters compatibles with the provider
         :type kwargs: Union[int, str, bool, dict]
@@ -1137,6 +1300,7 @@ class EODataAccessGateway(object):
             end=end,
             geom=geom,
             locations=locations,
+            prefetch=prefetch,
             **kwargs,
         ):
             all_results.data.extend(page_results.data)
@@ -1147,6 +1311,183 @@ class EODataAccessGateway(object):
         )
         return all_results
 
+    def search_iter_shards(
+        self,
+        start=None,
+        end=None,
+        geom=None,
+        locations=None,
+        split="time",
+        max_results=DEFAULT_SHARD_MAX_RESULTS,
+        min_duration=DEFAULT_SHARD_MIN_DURATION,
+        max_depth=DEFAULT_SHARD_MAX_DEPTH,
+        max_workers=DEFAULT_SHARDS_MAX_WORKERS,
+        items_per_page=None,
+        prefetch=None,
+        **kwargs,
+    ):
+        """Search all the products matching the criteria, splitting the search into
+        shards covering shorter time ranges or smaller areas.
+
+        The search is split in two halves as long as it matches more than
+        ``max_results`` products, as counted by the provider, so that each shard can
+        be paginated through (see :meth:`search_all`) even if the provider limits the
+        number of results of a search. The shards are then searched concurrently, and
+        their products are yielded in the order of the shards, without those already
+        found in a previous one (e.g. products at the boundary of two shards).
+
+        :param start: (optional) Start sensing time in ISO 8601 format (e.g. "1990-11-26",
+                      "1990-11-26T14:30:10.153Z", "1990-11-26T14:30:10+02:00", ...).
+                      If no time offset is given, the time is assumed to be given in UTC.
+        :type start: str
+        :param end: (optional) End sensing time in ISO 8601 format (e.g. "1990-11-26",
+                    "1990-11-26T14:30:10.153Z", "1990-11-26T14:30:10+02:00", ...).
+                    If no time offset is given, the time is assumed to be given in UTC.
+        :type end: str
+        :param geom: (optional) Search area that can be defined in the different ways
+                     supported by :meth:`search`
+        :type geom: Union[str, dict, shapely.geometry.base.BaseGeometry]
+        :param locations: (optional) Location filtering by name using locations
+                          configuration (see :meth:`search`)
+        :type locations: dict
+        :param split: (optional) How the shards are split: ``"time"`` to split the
+                      time range, ``"space"`` to split the area, or ``"both"`` to split
+                      the time range until ``min_duration``, then the area
+        :type split: str
+        :param max_results: (optional) The number of products above which a shard is
+                            split
+        :type max_results: int
+        :param min_duration: (optional) The minimum duration of a time range split
+        :type min_duration: :class:`datetime.timedelta`
+        :param max_depth: (optional) The maximum number of splits of a shard
+        :type max_depth: int
+        :param max_workers: (optional) The number of shards counted or searched
+                            concurrently
+        :type max_workers: int
+        :param items_per_page: (optional) The number of results requested per page
+                               (see :meth:`search_all`)
+        :type items_per_page: int
+        :param prefetch: (optional) The number of pages of a shard searched ahead
+                         (see :meth:`search_iter_page`)
+        :type prefetch: int
+        :param kwargs: Some other criteria that will be used to do the search,
+                       using paramaters compatibles with the provider
+        :type kwargs: Union[int, str, bool, dict]
+        :returns: An iterator that yields shard per shard a collection of EO products
+                  matching the criteria
+        :rtype: Iterator[:class:`~eodag.api.search_result.SearchResult`]
+        """
+        box = kwargs.pop("box", None)
+        box = kwargs.pop("bbox", box)
+        geometry = get_geometry_from_various(
+            self.locations_config,
+            geometry=geom if geom is not None else box,
+            locations=locations,
+        )
+        shards = self._plan_search_shards(
+            SearchShard(start, end, geometry),
+            split=split,
+            max_results=max_results,
+            min_duration=min_duration,
+            max_depth=max_depth,
+            max_workers=max_workers,
+            **kwargs,
+        )
+        logger.info("Searching %s shard(s)", len(shards))
+        shards_results = iter_ordered(
+            lambda shard: self.search_all(
+                items_per_page=items_per_page,
+                prefetch=prefetch,
+                **shard.search_kwargs,
+                **kwargs,
+            ),
+            shards,
+            max_workers=max_workers,
+        )
+        found_ids = set()
+        try:
+            for shard_results in shards_results:
+                products = SearchResult([])
+                for product in shard_results:
+                    if product.properties["id"] not in found_ids:
+                        found_ids.add(product.properties["id"])
+                        products.append(product)
+                if products:
+                    yield products
+        finally:
+            # cancel the searches of the shards not consumed
+            shards_results.close()
+
+    def _plan_search_shards(
+        self,
+        shard,
+        split="time",
+        max_results=DEFAULT_SHARD_MAX_RESULTS,
+        min_duration=DEFAULT_SHARD_MIN_DURATION,
+        max_depth=DEFAULT_SHARD_MAX_DEPTH,
+        max_workers=DEFAULT_SHARDS_MAX_WORKERS,
+        **kwargs,
+    ):
+        """Split a search shard until each shard matches at most ``max_results``
+        products, the shards of a same depth being counted concurrently. The shards
+        matching no product are dropped, and the others are kept in the order of
+        their time ranges and areas.
+
+        :returns: The shards to search
+        :rtype: list[:class:`~eodag.utils.sharding.SearchShard`]
+        """
+
+        def count_shard(shard):
+            _, total = self.search(
+                page=1,
+                items_per_page=1,
+                raise_errors=True,
+                count="estimate",
+                **shard.search_kwargs,
+                **kwargs,
+            )
+            return total
+
+        # shards with whether they are planned or need to be counted
+        shards = [(shard, False)]
+        while not all(planned for _, planned in shards):
+            pending = [shard for shard, planned in shards if not planned]
+            totals = dict(
+                zip(
+                    map(id, pending),
+                    iter_ordered(count_shard, pending, max_workers=max_workers),
+                )
+            )
+            next_shards = []
+            for shard, planned in shards:
+                if planned:
+                    next_shards.append((shard, planned))
+                    continue
+                total = totals[id(shard)]
+                if total == 0:
+                    continue
+                if total is not None and total > max_results:
+                    halves = (
+                        shard.split(split, min_duration)
+                        if shard.depth < max_depth
+                        else []
+                    )
+                    if halves:
+                        logger.debug(
+                            "%s matches %s products, it is split", shard, total
+                        )
+                        next_shards.extend((half, False) for half in halves)
+                        continue
+                    logger.warning(
+                        "%s matches %s products and cannot be split further, its "
+                        "results may be truncated by the provider",
+                        shard,
+                        total,
+                    )
+                next_shards.append((shard, True))
+            shards = next_shards
+        return [shard for shard, _ in shards]
+
     def _search_by_id(self, uid, provider=None, **kwargs):
         """Internal method that enables searching a product by its id.
 
@@ -1182,6 +1523,7 @@ class EODataAccessGateway(object):
             )
             logger.debug("Using plugin class for search: %s", plugin.__class__.__name__)
             auth = self._plugins_manager.get_auth_plugin(plugin.provider)
+            plugin.clear()
             results, _ = self._do_search(plugin, auth=auth, id=uid, **kwargs)
             if len(results) == 1:
                 if not results[0].product_type:
@@ -1316,10 +1658,11 @@ class EODataAccessGateway(object):
                 product_type,
                 search_plugin.provider,
             )
-        # Add product_types_config to plugin config. This dict contains product
-        # type metadata that will also be stored in each product's properties.
+        # Add product_types_config to the search context of the plugin. This dict
+        # contains product type metadata that will also be stored in each product's
+        # properties.
         try:
-            search_plugin.config.product_type_config = dict(
+            product_type_config = dict(
                 [
                     p
                     for p in self.list_product_types(
@@ -1332,13 +1675,20 @@ class EODataAccessGateway(object):
         # If the product isn't in the catalog, it's a generic product type.
         except IndexError:
             # Construct the GENERIC_PRODUCT_TYPE metadata
-            search_plugin.config.product_type_config = dict(
+            product_type_config = dict(
                 ID=GENERIC_PRODUCT_TYPE,
                 **self.product_types_config[GENERIC_PRODUCT_TYPE],
                 productType=product_type,
             )
         # Remove the ID since this is equal to productType.
-        search_plugin.config.product_type_config.pop("ID", None)
+        product_type_config.pop("ID", None)
+        # Start a new search context in the current thread or task
+        search_plugin.clear()
+        if hasattr(search_plugin, "context"):
+            search_plugin.context.product_type_config = product_type_config
+        # deprecated, kept for the plugins not using the search context: it is shared
+        # by the concurrent searches of the provider
+        search_plugin.config.product_type_config = product_type_config
 
         logger.debug(
             "Using plugin class for search: %s", search_plugin.__class__.__name__
@@ -1358,8 +1708,9 @@ class EODataAccessGateway(object):
 
         :param search_plugin: A search plugin
         :type search_plugin: eodag.plugins.base.Search
-        :param count: (optional) Whether to run a query with a count request or not
-        :type count: bool
+        :param count: (optional) Whether to run a query with a count request or not,
+                      or ``"estimate"`` to reuse cached counts
+        :type count: Union[bool, str]
         :param raise_errors: (optional) When an error occurs when searching, if this is set to
                              True, the error is raised
         :type raise_errors: bool
@@ -1562,6 +1913,8 @@ class EODataAccessGateway(object):
         progress_callback=None,
         wait=DEFAULT_DOWNLOAD_WAIT,
         timeout=DEFAULT_DOWNLOAD_TIMEOUT,
+        max_workers=None,
+        max_workers_per_provider=None,
         **kwargs,
     ):
         """Download all products resulting from a search.
@@ -1587,11 +1940,21 @@ class EODataAccessGateway(object):
         :param timeout: (optional) If download fails, maximum time in minutes
                         before stop retrying to download
         :type timeout: int
+        :param max_workers: (optional) Maximum number of products downloaded
+                            concurrently. Products are downloaded sequentially
+                            by default
+        :type max_workers: int
+        :param max_workers_per_provider: (optional) Maximum number of products
+                                         downloaded concurrently from the same
+                                         provider, defaults to ``max_workers``
+        :type max_workers_per_provider: int
         :param kwargs: `outputs_prefix` (str), `extract` (bool), `delete_archive` (bool)
                         and `dl_url_params` (dict) can be provided as additional kwargs
                         and will override any other values defined in a configuration
-                        file or with environment variables.
-        :type kwargs: Union[str, bool, dict]
+                        file or with environment variables. `asset_filter` (str or list)
+                        selects the assets to download (see
+                        :class:`~eodag.utils.assets.AssetFilter`).
+        :type kwargs: Union[str, bool, dict, list]
         :returns: A collection of the absolute paths to the downloaded products
         :rtype: list
         """
@@ -1609,6 +1972,8 @@ class EODataAccessGateway(object):
                 progress_callback=progress_callback,
                 wait=wait,
                 timeout=timeout,
+                max_workers=max_workers,
+                max_workers_per_provider=max_workers_per_provider,
                 **kwargs,
             )
         else:
@@ -1785,8 +2150,10 @@ class EODataAccessGateway(object):
         :param kwargs: `outputs_prefix` (str), `extract` (bool), `delete_archive` (bool)
                         and `dl_url_params` (dict) can be provided as additional kwargs
                         and will override any other values defined in a configuration
-                        file or with environment variables.
-        :type kwargs: Union[str, bool, dict]
+                        file or with environment variables. `asset_filter` (str or list)
+                        selects the assets to download (see
+                        :class:`~eodag.utils.assets.AssetFilter`).
+        :type kwargs: Union[str, bool, dict, list]
         :returns: The absolute path to the downloaded product in the local filesystem
         :rtype: str
         :raises: :class:`~eodag.utils.exceptions.PluginImplementationError`
@@ -20,10 +20,10 @@ import logging
 import os
 import re
 
-import requests
 from requests import RequestException
 from shapely import geometry, geos, wkb, wkt
 
+from eodag.api.product._reader import AssetReader
 from eodag.api.product.drivers import DRIVERS, NoDriver
 from eodag.api.product.metadata_mapping import NOT_AVAILABLE, NOT_MAPPED
 from eodag.plugins.download.base import (
@@ -32,7 +32,8 @@ from eodag.plugins.download.base import (
     DEFAULT_STREAM_REQUESTS_TIMEOUT,
 )
 from eodag.utils import ProgressCallback, get_geometry_from_various
-from eodag.utils.exceptions import DownloadError, MisconfiguredError
+from eodag.utils.exceptions import AddressNotFound, DownloadError, MisconfiguredError
+from eodag.utils.http import get_default_http_session
 
 try:
     from shapely.errors import GEOSException
@@ -275,8 +276,10 @@ class EOProduct(object):
         :param kwargs: `outputs_prefix` (str), `extract` (bool), `delete_archive` (bool)
                         and `dl_url_params` (dict) can be provided as additional kwargs
                         and will override any other values defined in a configuration
-                        file or with environment variables.
-        :type kwargs: Union[str, bool, dict]
+                        file or with environment variables. `asset_filter` (str or list)
+                        selects the assets to download (see
+                        :class:`~eodag.utils.assets.AssetFilter`).
+        :type kwargs: Union[str, bool, dict, list]
         :returns: The absolute path to the downloaded product on the local filesystem
         :rtype: str
         :raises: :class:`~eodag.utils.exceptions.PluginImplementationError`
@@ -423,7 +426,7 @@ class EOProduct(object):
                 if self.downloader_auth is not None
                 else None
             )
-            with requests.get(
+            with get_default_http_session().get(
                 self.properties["quicklook"],
                 stream=True,
                 auth=auth,
@@ -452,6 +455,37 @@ class EOProduct(object):
 
         return quicklook_file
 
+    def open_asset(self, key, **kwargs):
+        """Open an asset or a band of the product, to read it without downloading the
+        whole product.
+
+        Nothing is requested until data is read from the returned
+        :class:`~eodag.api.product._reader.AssetReader`. Its data is then fetched with
+        range requests, by blocks kept in a cache, and raster windows of cloud optimized
+        GeoTIFF files can be read (``rasterio`` needed), fetching concurrently only the
+        tiles they intersect::
+
+            >>> with product.open_asset("B04") as asset:  # doctest: +SKIP
+            ...     data = asset.read(1, window=((0, 512), (0, 512)))
+
+        :param key: The asset key, or a band resolved by the driver of the product
+        :type key: str
+        :param kwargs: ``block_size`` (int), ``cache_size`` (int) and ``max_workers``
+                       (int) of the :class:`~eodag.api.product._reader.AssetReader`
+        :type kwargs: int
+        :returns: The lazy asset reader
+        :rtype: :class:`~eodag.api.product._reader.AssetReader`
+        :raises: :class:`~eodag.utils.exceptions.AddressNotFound`
+        """
+        asset = (getattr(self, "assets", None) or {}).get(key, {})
+        href = asset.get("href", None)
+        if href is None:
+            try:
+                href = self.driver.get_data_address(self, key)
+            except NotImplementedError:
+                raise AddressNotFound(f"No asset {key} found in {self}")
+        return AssetReader(self, href, **kwargs)
+
     def get_driver(self):
         """Get the most appropriate driver"""
         try:
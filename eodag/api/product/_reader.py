@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import math
+from urllib.parse import urlparse
+
+from eodag.utils import uri_to_path
+from eodag.utils.ranges import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_RANGES_MAX_WORKERS,
+    HttpRangeFetcher,
+    RangeReader,
+)
+
+logger = logging.getLogger("eodag.api.product._reader")
+
+
+def _import_rasterio():
+    """Import rasterio, needed for windowed reads"""
+    try:
+        import rasterio
+    except ImportError:
+        raise NotImplementedError(
+            "rasterio needed for this functionnality, install using `pip install eodag-cube`"
+        )
+    return rasterio
+
+
+class AssetReader:
+    """Lazy handle on a remote file of a product, typically a cloud optimized GeoTIFF,
+    reading it with range requests instead of downloading it.
+
+    Nothing is requested until data is read. The file is then read by aligned blocks,
+    kept in a cache (see :class:`~eodag.utils.ranges.RangeReader`), using the range
+    fetcher of the download plugin of the product: HTTP range requests, or S3
+    ``GetObject`` range requests for :class:`~eodag.plugins.download.aws.AwsDownload`.
+
+    Raster windows are read using `rasterio <https://rasterio.readthedocs.io>`_ (>=1.3,
+    installed with ``eodag-cube``), the tiles intersecting a window being fetched
+    concurrently before it is decoded.
+
+    :param product: The product of the file
+    :type product: :class:`~eodag.api.product._product.EOProduct`
+    :param href: The file URL
+    :type href: str
+    :param block_size: (optional) Size of the fetched and cached blocks
+    :type block_size: int
+    :param cache_size: (optional) Maximum size of the cached blocks
+    :type cache_size: int
+    :param max_workers: (optional) Maximum number of ranges fetched concurrently
+    :type max_workers: int
+    """
+
+    def __init__(
+        self,
+        product,
+        href,
+        block_size=DEFAULT_BLOCK_SIZE,
+        cache_size=DEFAULT_CACHE_SIZE,
+        max_workers=DEFAULT_RANGES_MAX_WORKERS,
+    ):
+        self.product = product
+        self.href = href
+        self.block_size = block_size
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+        self._file = None
+        self._dataset = None
+
+    def __repr__(self):
+        return f"AssetReader({self.href!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def file(self):
+        """Seekable file object on the remote file, or on the local file if the
+        product is downloaded"""
+        if self._file is None:
+            if urlparse(self.href).scheme in ("", "file"):
+                self._file = open(uri_to_path(self.href), "rb")
+            else:
+                self._file = RangeReader(
+                    self._get_range_fetcher(),
+                    block_size=self.block_size,
+                    cache_size=self.cache_size,
+                    max_workers=self.max_workers,
+                )
+        return self._file
+
+    def _get_range_fetcher(self):
+        """Range fetcher of the download plugin of the product, or an HTTP one using
+        the default session for plugins which do not provide any"""
+        downloader = getattr(self.product, "downloader", None)
+        if downloader is None or not hasattr(downloader, "get_range_fetcher"):
+            return HttpRangeFetcher(self.href)
+        downloader_auth = getattr(self.product, "downloader_auth", None)
+        auth = downloader_auth.authenticate() if downloader_auth is not None else None
+        return downloader.get_range_fetcher(self.product, self.href, auth=auth)
+
+    def read_bytes(self, start, end):
+        """Read a byte range of the file
+
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset following the last byte
+        :type end: int
+        :returns: The bytes
+        :rtype: bytes
+        """
+        if isinstance(self.file, RangeReader):
+            return self.file.read_range(start, end)
+        self.file.seek(start)
+        return self.file.read(end - start)
+
+    @property
+    def dataset(self):
+        """The rasterio dataset of the file, opened on the first access"""
+        if self._dataset is None:
+            rasterio = _import_rasterio()
+            self._dataset = rasterio.open(self.file)
+        return self._dataset
+
+    def get_tiles_ranges(self, window, indexes=None):
+        """Byte ranges of the tiles of the TIFF file intersecting a window
+
+        :param window: The window, in pixels
+        :type window: :class:`rasterio.windows.Window`
+        :param indexes: (optional) The bands indexes, all the bands if not set
+        :type indexes: Union[int, list[int]]
+        :returns: The ``(start, end)`` byte ranges
+        :rtype: list[tuple]
+        """
+        dataset = self.dataset
+        if indexes is None:
+            indexes = dataset.indexes
+        elif isinstance(indexes, int):
+            indexes = [indexes]
+        block_height, block_width = dataset.block_shapes[0]
+        row_start = max(0, math.floor(window.row_off))
+        row_stop = min(dataset.height, math.ceil(window.row_off + window.height))
+        col_start = max(0, math.floor(window.col_off))
+        col_stop = min(dataset.width, math.ceil(window.col_off + window.width))
+
+        ranges = set()
+        for bidx in indexes:
+            for row in range(row_start // block_height, -(-row_stop // block_height)):
+                for col in range(col_start // block_width, -(-col_stop // block_width)):
+                    offset = dataset.get_tag_item(
+                        f"BLOCK_OFFSET_{col}_{row}", "TIFF", bidx=bidx
+                    )
+                    size = dataset.get_tag_item(
+                        f"BLOCK_SIZE_{col}_{row}", "TIFF", bidx=bidx
+                    )
+                    # sparse files have no data for empty tiles
+                    if offset and size:
+                        ranges.add((int(offset), int(offset) + int(size)))
+        return sorted(ranges)
+
+    def read(self, indexes=None, window=None, bounds=None, **kwargs):
+        """Read raster data, only fetching the tiles needed by the window
+
+        :param indexes: (optional) The bands indexes, all the bands if not set
+        :type indexes: Union[int, list[int]]
+        :param window: (optional) The window to read, in pixels
+        :type window: :class:`rasterio.windows.Window`
+        :param bounds: (optional) The ``(left, bottom, right, top)`` bounds to read,
+                       in the coordinates reference system of the file, instead of
+                       ``window``
+        :type bounds: tuple
+        :param kwargs: Other arguments of :meth:`rasterio.io.DatasetReader.read`
+        :type kwargs: Any
+        :returns: The data
+        :rtype: :class:`numpy.ndarray`
+        """
+        _import_rasterio()
+        from rasterio.windows import Window, from_bounds
+
+        dataset = self.dataset
+        if bounds is not None:
+            window = from_bounds(*bounds, transform=dataset.transform)
+        elif window is not None and not isinstance(window, Window):
+            window = Window.from_slices(*window)
+        if isinstance(self.file, RangeReader):
+            self.file.prefetch(
+                self.get_tiles_ranges(
+                    window or Window(0, 0, dataset.width, dataset.height), indexes
+                )
+            )
+        return dataset.read(indexes, window=window, **kwargs)
+
+    def close(self):
+        """Close the dataset and the file, forgetting the cached blocks"""
+        if self._dataset is not None:
+            self._dataset.close()
+            self._dataset = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -518,6 +518,12 @@ def discover_pt(ctx, **kwargs):
     show_default=False,
     help="Download only quicklooks of products instead full set of files",
 )
+@click.option(
+    "--asset",
+    multiple=True,
+    help="Download only the assets whose key matches this glob pattern, or regular "
+    "expression prefixed with 're:'. Can be repeated",
+)
 @click.pass_context
 def download(ctx, **kwargs):
     """Download a bunch of products from a serialized search result"""
@@ -570,7 +576,9 @@ def download(ctx, **kwargs):
                     satim_api._plugins_manager.get_download_plugin(product), auth
                 )
 
-        downloaded_files = satim_api.download_all(search_results)
+        downloaded_files = satim_api.download_all(
+            search_results, asset_filter=list(kwargs.pop("asset")) or None
+        )
         if downloaded_files and len(downloaded_files) > 0:
             for downloaded_file in downloaded_files:
                 if downloaded_file is None:
@@ -666,7 +674,8 @@ def serve_rpc(ctx, host, port, conf):
 @click.pass_context
 def serve_rest(ctx, daemon, world, port, config, locs, debug):
     """Serve EODAG functionalities through a WEB interface"""
-    setup_logging(verbose=ctx.obj["verbosity"])
+    # progress is only counted by the progress metrics on a server
+    setup_logging(verbose=ctx.obj["verbosity"], no_progress_bar=True)
     # Set the settings of the app
     # IMPORTANT: the order of imports counts here (first we override the settings,
     # then we import the app so that the updated settings is taken into account in
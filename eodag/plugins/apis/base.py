@@ -44,14 +44,14 @@ class Api(PluginTopic):
       eventually after it's extracted) to the product's location given as a file URI
       (e.g. 'file:///tmp/product_folder' on Linux or
       'file:///C:/Users/username/AppData/LOcal/Temp' on Windows)
-    - save a *record* file in the directory ``outputs_prefix/.downloaded`` whose name
-      is built on the MD5 hash of the product's ``remote_location`` attribute
-      (``hashlib.md5(remote_location.encode("utf-8")).hexdigest()``) and whose content is
-      the product's ``remote_location`` attribute itself.
+    - save a *record* of the download in the directory ``outputs_prefix/.downloaded``,
+      identified by the MD5 hash of the product's ``remote_location`` attribute
+      (``hashlib.md5(remote_location.encode("utf-8")).hexdigest()``), using the
+      :class:`~eodag.utils.records.DownloadRecord` returned by ``_prepare_download``.
     - not try to download a product whose ``location`` attribute already points to an
       existing file/directory
-    - not try to download a product if its *record* file exists as long as the expected
-      product's file/directory. If the *record* file only is found, it must be deleted
+    - not try to download a product if its *record* exists as long as the expected
+      product's file/directory. If the *record* only is found, it must be deleted
       (it certainly indicates that the download didn't complete)
     """
 
@@ -142,7 +142,7 @@ class CdsApi(Download, Api, QueryStringSearch):
         )
         # use product_type_config as default properties
         product.properties = dict(
-            getattr(self.config, "product_type_config", {}), **product.properties
+            self.context.product_type_config, **product.properties
         )
 
         results_count = 1
@@ -214,14 +214,14 @@ class CdsApi(Download, Api, QueryStringSearch):
         product_extension = CDS_KNOWN_FORMATS[product.properties.get("format", "grib")]
 
         # Prepare download
-        fs_path, record_filename = self._prepare_download(
+        fs_path, record = self._prepare_download(
             product,
             progress_callback=progress_callback,
             outputs_extension=f".{product_extension}",
             **kwargs,
         )
 
-        if not fs_path or not record_filename:
+        if not fs_path or not record:
             if fs_path:
                 product.location = path_to_uri(fs_path)
             return fs_path
@@ -257,9 +257,7 @@ class CdsApi(Download, Api, QueryStringSearch):
             logger.error(e)
             raise DownloadError(e)
 
-        with open(record_filename, "w") as fh:
-            fh.write(product.properties["downloadLink"])
-        logger.debug("Download recorded in %s", record_filename)
+        record.save(fs_path)
 
         # do not try to extract or delete grib/netcdf
         kwargs["extract"] = False
@@ -141,7 +141,7 @@ class EcmwfApi(Download, Api, QueryStringSearch):
         )
         # use product_type_config as default properties
         product.properties = dict(
-            getattr(self.config, "product_type_config", {}), **product.properties
+            self.context.product_type_config, **product.properties
         )
 
         results_count = 1
@@ -186,14 +186,14 @@ class EcmwfApi(Download, Api, QueryStringSearch):
         ]
 
         # Prepare download
-        fs_path, record_filename = self._prepare_download(
+        fs_path, record = self._prepare_download(
             product,
             progress_callback=progress_callback,
             outputs_extension=f".{product_extension}",
             **kwargs,
         )
 
-        if not fs_path or not record_filename:
+        if not fs_path or not record:
             if fs_path:
                 product.location = path_to_uri(fs_path)
             return fs_path
@@ -233,9 +233,7 @@ class EcmwfApi(Download, Api, QueryStringSearch):
             logger.error(e)
             raise DownloadError(e)
 
-        with open(record_filename, "w") as fh:
-            fh.write(product.properties["downloadLink"])
-        logger.debug("Download recorded in %s", record_filename)
+        record.save(fs_path)
 
         # do not try to extract or delete grib/netcdf
         kwargs["extract"] = False
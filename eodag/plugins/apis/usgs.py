@@ -45,6 +45,7 @@ from eodag.utils import (
     path_to_uri,
 )
 from eodag.utils.exceptions import AuthenticationError, NotAvailableError
+from eodag.utils.streaming import write_stream
 
 logger = logging.getLogger("eodag.plugins.apis.usgs")
 
@@ -209,13 +210,13 @@ class UsgsApi(Download, Api):
             product.product_type, self.config.products[GENERIC_PRODUCT_TYPE]
         ).get("outputs_extension", ".tar.gz")
 
-        fs_path, record_filename = self._prepare_download(
+        fs_path, record = self._prepare_download(
             product,
             progress_callback=progress_callback,
             outputs_extension=outputs_extension,
             **kwargs,
         )
-        if not fs_path or not record_filename:
+        if not fs_path or not record:
             if fs_path:
                 product.location = path_to_uri(fs_path)
             return fs_path
@@ -264,7 +265,7 @@ class UsgsApi(Download, Api):
         @self._download_retry(product, wait, timeout)
         def download_request(product, fs_path, progress_callback, **kwargs):
             try:
-                with requests.get(
+                with self.http_session.get(
                     req_url,
                     stream=True,
                     timeout=wait * 60,
@@ -281,18 +282,13 @@ class UsgsApi(Download, Api):
                         stream_size = int(stream.headers.get("content-length", 0))
                         progress_callback.reset(total=stream_size)
                         with open(fs_path, "wb") as fhandle:
-                            for chunk in stream.iter_content(chunk_size=64 * 1024):
-                                if chunk:
-                                    fhandle.write(chunk)
-                                    progress_callback(len(chunk))
+                            write_stream(stream, fhandle, progress_callback)
             except requests.exceptions.Timeout as e:
                 raise NotAvailableError(str(e))
 
         download_request(product, fs_path, progress_callback, **kwargs)
 
-        with open(record_filename, "w") as fh:
-            fh.write(product.properties["downloadLink"])
-        logger.debug(f"Download recorded in {record_filename}")
+        record.save(fs_path)
 
         api.logout()
 
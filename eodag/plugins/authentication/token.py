@@ -16,13 +16,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
 from requests import RequestException
 
 from eodag.plugins.authentication.base import Authentication
 from eodag.utils import RequestsTokenAuth
 from eodag.utils.exceptions import AuthenticationError, MisconfiguredError
-from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT
 
 
 class TokenAuth(Authentication):
@@ -51,10 +49,10 @@ class TokenAuth(Authentication):
         )
         try:
             # First get the token
-            response = requests.post(
+            response = self.http_session.post(
                 self.config.auth_uri,
                 data=self.config.credentials,
-                timeout=HTTP_REQ_TIMEOUT,
+                timeout=self.http_session.timeout,
                 **req_kwargs,
             )
             response.raise_for_status()
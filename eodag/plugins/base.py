@@ -16,6 +16,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from eodag.utils.exceptions import PluginNotFoundError
+from eodag.utils.http import HttpSession
+from eodag.utils.throttling import RateLimiter, get_global_rate_limiter
 
 
 class EODAGPluginMount(type):
@@ -54,6 +56,46 @@ class PluginTopic(metaclass=EODAGPluginMount):
     def __init__(self, provider, config):
         self.config = config
         self.provider = provider
+        self._http_session = None
+        self._rate_limiter = None
+
+    @property
+    def http_session(self):
+        """HTTP session used by the plugin for all its requests.
+
+        It is set by the :class:`~eodag.plugins.manager.PluginManager` to the session
+        shared by all the plugins of the provider, or built on first access from the
+        plugin ``http`` configuration if the plugin was instantiated on its own.
+        """
+        if getattr(self, "_http_session", None) is None:
+            self._http_session = HttpSession.from_config(
+                getattr(self.config, "http", None)
+            )
+            self._http_session.rate_limiter = self.rate_limiter
+        return self._http_session
+
+    @http_session.setter
+    def http_session(self, session):
+        self._http_session = session
+
+    @property
+    def rate_limiter(self):
+        """Bandwidth and requests rate limiter of the plugin.
+
+        It is set by the :class:`~eodag.plugins.manager.PluginManager` to the limiter
+        shared by all the plugins of the provider, or built on first access from the
+        plugin ``rate_limit`` configuration if the plugin was instantiated on its own.
+        """
+        if getattr(self, "_rate_limiter", None) is None:
+            self._rate_limiter = RateLimiter.from_config(
+                getattr(self.config, "rate_limit", None),
+                parent=get_global_rate_limiter(),
+            )
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter):
+        self._rate_limiter = rate_limiter
 
     def __repr__(self):
         return "{}(provider={}, priority={}, topic={})".format(
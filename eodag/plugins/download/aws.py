@@ -16,15 +16,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
 import logging
 import os
 import re
+import string
+import threading
+from functools import lru_cache
 from pathlib import Path
 
 import boto3
-import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, ProfileNotFound
 from botocore.handlers import disable_signing
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from lxml import etree
 
 from eodag.api.product.metadata_mapping import (
@@ -37,14 +43,37 @@ from eodag.utils import (
     ProgressCallback,
     flatten_top_directories,
     get_bucket_name_and_prefix,
+    get_thread_safe_callback,
+    obj_md5sum,
     path_to_uri,
     rename_subfolder,
 )
-from eodag.utils.exceptions import AuthenticationError, DownloadError
-from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT
+from eodag.utils.checksum import ChecksumWriter
+from eodag.utils.exceptions import AuthenticationError, ChecksumError, DownloadError
+from eodag.utils.http import DEFAULT_MAX_RETRIES
+from eodag.utils.ranges import S3RangeFetcher
 
 logger = logging.getLogger("eodag.plugins.download.aws")
 
+# default number of objects of a product downloaded concurrently
+DEFAULT_OBJECTS_MAX_WORKERS = 8
+# default size of the connection pool of botocore clients
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+# error codes of requests rejected because of their credentials
+AUTH_ERROR_CODES = [
+    "AccessDenied",
+    "InvalidAccessKeyId",
+    "SignatureDoesNotMatch",
+    "ExpiredToken",
+]
+# identifier of the hook throttling the requests of botocore clients
+RATE_LIMITER_HOOK_ID = "eodag-rate-limiter"
+
+# authenticated objects of the buckets and their auth strategy, shared by all the
+# plugins of the process, by provider, endpoint, bucket and credentials
+_authenticated_objects_cache = {}
+_authenticated_objects_cache_lock = threading.Lock()
+
 # AWS chunk path identify patterns
 
 # S2 L2A Tile files -----------------------------------------------------------
@@ -163,6 +192,280 @@ S1_IMG_NB_PER_POLAR = {
 }
 
 
+# SAFE paths of chunks, by order of precedence: ``path`` is built using the named
+# groups of the first matching ``pattern`` and the SAFE fields of the product
+# (title, platform, title_date1, title_part3, ds_dir, s2_processing_level,
+# s1_title_suffix, s1_img_nb)
+DEFAULT_SAFE_PATH_RULES = [
+    # S2 L2A Tile files
+    {
+        "pattern": S2L2A_TILE_IMG_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/IMG_DATA/R{res}/"
+        "T{tile1}{tile2}{tile3}_{title_date1}_{file}_{res}.jp2",
+    },
+    {
+        "pattern": S2L2A_TILE_AUX_DIR_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/AUX_DATA/{file}",
+    },
+    # S2 L2A QI Masks
+    {
+        "pattern": S2_TILE_QI_MSK_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/QI_DATA/MSK_{file_base}PRB_{file_suffix}",
+    },
+    # S2 L2A QI PVI
+    {
+        "pattern": S2_TILE_QI_PVI_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/QI_DATA/{title_part3}_{title_date1}_PVI.jp2",
+    },
+    # S2 Tile files
+    {
+        "pattern": S2_TILE_PREVIEW_DIR_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/preview/{file}",
+    },
+    {
+        "pattern": S2_TILE_IMG_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/IMG_DATA/"
+        "T{tile1}{tile2}{tile3}_{title_date1}_{file}",
+    },
+    {
+        "pattern": S2_TILE_THUMBNAIL_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/{file}",
+    },
+    {
+        "pattern": S2_TILE_MTD_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/MTD_TL.xml",
+    },
+    {
+        "pattern": S2_TILE_AUX_DIR_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/AUX_DATA/AUX_{file}",
+    },
+    {
+        "pattern": S2_TILE_QI_DIR_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/QI_DATA/{file}",
+    },
+    # S2 Tiles generic
+    {
+        "pattern": S2_TILE_REGEX.pattern,
+        "path": "{title}.SAFE/GRANULE/{num}/{file}",
+    },
+    # S2 Product files
+    {
+        "pattern": S2_PROD_DS_MTD_REGEX.pattern,
+        "path": "{title}.SAFE/DATASTRIP/{ds_dir}/MTD_DS.xml",
+    },
+    {
+        "pattern": S2_PROD_DS_QI_REPORT_REGEX.pattern,
+        "path": "{title}.SAFE/DATASTRIP/{ds_dir}/QI_DATA/{filename}.xml",
+    },
+    {
+        "pattern": S2_PROD_DS_QI_REGEX.pattern,
+        "path": "{title}.SAFE/DATASTRIP/{ds_dir}/QI_DATA/{file}",
+    },
+    {
+        "pattern": S2_PROD_INSPIRE_REGEX.pattern,
+        "path": "{title}.SAFE/INSPIRE.xml",
+    },
+    {
+        "pattern": S2_PROD_MTD_REGEX.pattern,
+        "path": "{title}.SAFE/MTD_MSI{s2_processing_level}.xml",
+    },
+    # S2 Product generic
+    {
+        "pattern": S2_PROD_REGEX.pattern,
+        "path": "{title}.SAFE/{file}",
+    },
+    # S1
+    {
+        "pattern": S1_CALIB_REGEX.pattern,
+        "path": "{title}.SAFE/annotation/calibration/{file_prefix}-{platform}-"
+        "{file_beam}-grd-{file_pol}-{s1_title_suffix}-{s1_img_nb:03d}.xml",
+    },
+    {
+        "pattern": S1_ANNOT_REGEX.pattern,
+        "path": "{title}.SAFE/annotation/{platform}-{file_beam}-grd-{file_pol}-"
+        "{s1_title_suffix}-{s1_img_nb:03d}.xml",
+    },
+    {
+        "pattern": S1_MEAS_REGEX.pattern,
+        "path": "{title}.SAFE/measurement/{platform}-{file_beam}-grd-{file_pol}-"
+        "{s1_title_suffix}-{s1_img_nb:03d}.{file_ext}",
+    },
+    {
+        "pattern": S1_REPORT_REGEX.pattern,
+        "path": "{title}.SAFE/{title}.SAFE-{file}",
+    },
+    # S1 generic
+    {
+        "pattern": S1_REGEX.pattern,
+        "path": "{title}.SAFE/{file}",
+    },
+]
+
+NAMED_GROUP_REGEX = re.compile(r"\(\?P<(\w+)>")
+
+
+class SafePathMapper:
+    """SAFE path rules compiled into a single regular expression, each rule being a
+    named alternative, so that a key is matched once whatever the number of rules
+
+    >>> mapper = SafePathMapper([
+    ...     {"pattern": r"^a/(?P<file>.+)$", "path": "{title}.SAFE/A/{file}"},
+    ...     {"pattern": r"^(?P<file>.+)$", "path": "{title}.SAFE/{file}"},
+    ... ])
+    >>> mapper.get_path("a/foo.xml", {"title": "T"})
+    'T.SAFE/A/foo.xml'
+    >>> mapper.get_path("b/foo.xml", {"title": "T"})
+    'T.SAFE/b/foo.xml'
+
+    :param rules: The rules, by order of precedence, having a ``pattern`` regular
+                  expression and a ``path`` format string using its named groups
+    :type rules: list[dict]
+    """
+
+    def __init__(self, rules):
+        alternatives = []
+        # path, captured groups and product fields of each rule, by rule name
+        self._rules = {}
+        formatter = string.Formatter()
+        for i, rule in enumerate(rules):
+            rule_name = f"rule{i}"
+            path_fields = {
+                field_name
+                for _, field_name, _, _ in formatter.parse(rule["path"])
+                if field_name
+            }
+            groups = []
+
+            def rename_group(match):
+                # only the groups used in the path are captured
+                if match.group(1) not in path_fields:
+                    return "(?:"
+                groups.append((f"{rule_name}_{match.group(1)}", match.group(1)))
+                return f"(?P<{rule_name}_{match.group(1)}>"
+
+            pattern = NAMED_GROUP_REGEX.sub(rename_group, rule["pattern"])
+            alternatives.append(f"(?P<{rule_name}>{pattern})")
+            self._rules[rule_name] = (rule["path"], groups, path_fields)
+        self._regex = re.compile("|".join(alternatives))
+
+    def get_path(self, key, safe_fields):
+        """Get the SAFE path of a chunk
+
+        :param key: The chunk key
+        :type key: str
+        :param safe_fields: The SAFE fields of the product, overriding the groups of
+                            the rules. Callable fields are called with the
+                            other fields of the path.
+        :type safe_fields: dict
+        :returns: The destination path, relative to the product directory, or
+                  ``None`` if no rule matches the key
+        :rtype: str
+        """
+        return self.get_paths([key], safe_fields)[0]
+
+    def get_paths(self, keys, safe_fields):
+        """Get the SAFE paths of many chunks of a product, the product fields used by
+        each rule being resolved once
+
+        :param keys: The chunks keys
+        :type keys: list[str]
+        :param safe_fields: The SAFE fields of the product (see
+                            :meth:`~eodag.plugins.download.aws.SafePathMapper.get_path`)
+        :type safe_fields: dict
+        :returns: The destination paths, ``None`` for keys matching no rule
+        :rtype: list
+        """
+        # path, groups, fixed fields and callable fields, by matched rule
+        resolved_rules = {}
+        paths = []
+        for key in keys:
+            match = self._regex.match(key)
+            if match is None:
+                paths.append(None)
+                continue
+            resolved_rule = resolved_rules.get(match.lastgroup, None)
+            if resolved_rule is None:
+                path, groups, path_fields = self._rules[match.lastgroup]
+                fixed_fields = {
+                    name: safe_fields[name]
+                    for name in path_fields
+                    if name in safe_fields and not callable(safe_fields[name])
+                }
+                callable_fields = {
+                    name: safe_fields[name]
+                    for name in path_fields
+                    if callable(safe_fields.get(name, None))
+                }
+                groups = [
+                    (group, name)
+                    for group, name in groups
+                    if name not in fixed_fields and name not in callable_fields
+                ]
+                fixed_fields.update(
+                    (name, None)
+                    for name in path_fields
+                    if name not in safe_fields
+                    and name not in {name for _, name in groups}
+                )
+                resolved_rule = resolved_rules[match.lastgroup] = (
+                    path,
+                    groups,
+                    fixed_fields,
+                    callable_fields,
+                )
+            path, groups, fixed_fields, callable_fields = resolved_rule
+            fields = dict(fixed_fields)
+            for group, name in groups:
+                fields[name] = match.group(group)
+            for name, func in callable_fields.items():
+                fields[name] = func(fields)
+            paths.append(path.format_map(fields))
+        return paths
+
+
+@lru_cache(maxsize=32)
+def _get_safe_path_mapper(rules):
+    return SafePathMapper([{"pattern": p, "path": f} for p, f in rules])
+
+
+def get_safe_path_mapper(rules):
+    """Get the compiled rules, compiled once per process
+
+    :param rules: The rules (see :class:`~eodag.plugins.download.aws.SafePathMapper`)
+    :type rules: list[dict]
+    :returns: The compiled rules
+    :rtype: :class:`~eodag.plugins.download.aws.SafePathMapper`
+    """
+    return _get_safe_path_mapper(
+        tuple((rule["pattern"], rule["path"]) for rule in rules)
+    )
+
+
+class S3Object:
+    """Object of a bucket listing, with the client used to download it
+
+    :param bucket_name: The bucket of the object
+    :type bucket_name: str
+    :param key: The object key
+    :type key: str
+    :param size: The object size in bytes
+    :type size: int
+    :param client: The authenticated boto3 client of the bucket
+    :type client: :class:`botocore.client.S3`
+    """
+
+    __slots__ = ("bucket_name", "key", "size", "client")
+
+    def __init__(self, bucket_name, key, size, client):
+        self.bucket_name = bucket_name
+        self.key = key
+        self.size = size
+        self.client = client
+
+    def __repr__(self):
+        return f"S3Object(s3://{self.bucket_name}/{self.key})"
+
+
 class AwsDownload(Download):
     """Download on AWS using S3 protocol.
 
@@ -178,6 +481,25 @@ class AwsDownload(Download):
                        a requester-pays bucket or not
                      * ``config.flatten_top_dirs`` (bool) - flatten directory structure
                      * ``config.products`` (dict) - product_type specific configuration
+                     * ``config.safe_path_rules`` (list) - rules mapping the objects
+                       keys to SAFE paths when ``build_safe`` is set, overridable in
+                       the product type configuration. Each rule has a ``pattern``
+                       regular expression and a ``path`` format string using its named
+                       groups and the product SAFE fields (default:
+                       ``DEFAULT_SAFE_PATH_RULES``)
+                     * ``config.max_workers`` (int) - number of objects of a product
+                       downloaded concurrently (default: 8)
+                     * ``config.transfer_config`` (dict) - parameters of the boto3
+                       ``TransferConfig`` used for each object, like
+                       ``max_concurrency``, ``multipart_threshold`` or
+                       ``multipart_chunksize``
+                     * ``config.ignore_assets`` (bool) - list the objects of the
+                       product location instead of using its assets. An
+                       ``asset_filter`` given to ``download`` is then matched against
+                       the objects keys, file names, or file names without extension
+                     * ``config.verify_checksum`` (bool) - verify downloaded objects
+                       against the checksum of their asset (``file:checksum``), or of
+                       the product for single-object products (default: True)
     :type config: :class:`~eodag.config.PluginConfig`
     """
 
@@ -208,8 +530,10 @@ class AwsDownload(Download):
         :param kwargs: `outputs_prefix` (str), `extract` (bool), `delete_archive` (bool)
                         and `dl_url_params` (dict) can be provided as additional kwargs
                         and will override any other values defined in a configuration
-                        file or with environment variables.
-        :type kwargs: Union[str, bool, dict]
+                        file or with environment variables. `asset_filter` (str or list)
+                        selects the assets to download (see
+                        :class:`~eodag.utils.assets.AssetFilter`).
+        :type kwargs: Union[str, bool, dict, list]
         :returns: The absolute path to the downloaded product in the local filesystem
         :rtype: str
         """
@@ -220,10 +544,10 @@ class AwsDownload(Download):
             progress_callback = ProgressCallback(disable=True)
 
         # prepare download & create dirs (before updating metadata)
-        product_local_path, record_filename = self._prepare_download(
+        product_local_path, record = self._prepare_download(
             product, progress_callback=progress_callback, **kwargs
         )
-        if not product_local_path or not record_filename:
+        if not product_local_path or not record:
             if product_local_path:
                 product.location = path_to_uri(product_local_path)
             return product_local_path
@@ -254,7 +578,7 @@ class AwsDownload(Download):
                 **product.properties
             )
             logger.info("Fetching extra metadata from %s" % fetch_url)
-            resp = requests.get(fetch_url, timeout=HTTP_REQ_TIMEOUT)
+            resp = self.http_session.get(fetch_url, timeout=self.http_session.timeout)
             update_metadata = mtd_cfg_as_jsonpath(update_metadata)
             if fetch_format == "json":
                 json_resp = resp.json()
@@ -267,19 +591,38 @@ class AwsDownload(Download):
                 logger.warning(
                     "SAFE metadata fetch format %s not implemented" % fetch_format
                 )
+        # expected checksums, by object key
+        checksums = {}
+        # only the selected assets or objects are downloaded if a filter is set
+        asset_filter = record.asset_filter
+        partial = False
         # if assets are defined, use them instead of scanning product.location
-        if hasattr(product, "assets") and not getattr(
+        use_assets = hasattr(product, "assets") and not getattr(
             self.config, "ignore_assets", False
-        ):
+        )
+        if use_assets:
+            assets = getattr(product, "assets", {})
+            if asset_filter is not None:
+                selected_keys = asset_filter.filter_keys(assets)
+                if assets and not selected_keys:
+                    raise DownloadError(f"No asset of {product} matches {asset_filter}")
+                partial = len(selected_keys) < len(assets)
+                assets = {key: assets[key] for key in selected_keys}
             bucket_names_and_prefixes = []
-            for complementary_url in getattr(product, "assets", {}).values():
+            for complementary_url in assets.values():
                 bucket_names_and_prefixes.append(
                     self.get_bucket_name_and_prefix(
                         product, complementary_url.get("href", "")
                     )
                 )
+                checksums[bucket_names_and_prefixes[-1][1]] = complementary_url.get(
+                    "file:checksum", None
+                )
         else:
             bucket_names_and_prefixes = [self.get_bucket_name_and_prefix(product)]
+            checksums[bucket_names_and_prefixes[-1][1]] = product.properties.get(
+                "checksum", None
+            )
 
         # add complementary urls
         try:
@@ -303,25 +646,9 @@ class AwsDownload(Download):
                 bucket_name, prefix = pack
                 if bucket_name not in authenticated_objects:
                     # get Prefixes longest common base path
-                    common_prefix = ""
-                    prefix_split = prefix.split("/")
-                    prefixes_in_bucket = len(
+                    common_prefix = self._get_common_prefix(
                         [p for b, p in bucket_names_and_prefixes if b == bucket_name]
                     )
-                    for i in range(1, len(prefix_split)):
-                        common_prefix = "/".join(prefix_split[0:i])
-                        if (
-                            len(
-                                [
-                                    p
-                                    for b, p in bucket_names_and_prefixes
-                                    if b == bucket_name and common_prefix in p
-                                ]
-                            )
-                            < prefixes_in_bucket
-                        ):
-                            common_prefix = "/".join(prefix_split[0 : i - 1])
-                            break
                     # connect to aws s3 and get bucket auhenticated objects
                     s3_objects = self.get_authenticated_objects(
                         bucket_name, common_prefix, auth
@@ -358,82 +685,342 @@ class AwsDownload(Download):
         if not authenticated_objects:
             raise AuthenticationError(", ".join(auth_error_messages))
 
-        # downloadable files
-        product_chunks = []
+        # downloadable files: each prefix of a bucket not included in another one is
+        # listed once, and the objects of each asset are matched in memory
+        listings = {}
+        for bucket_name in authenticated_objects:
+            prefixes = [p for b, p in bucket_names_and_prefixes if b == bucket_name]
+            for listing_prefix in self._get_listing_prefixes(prefixes):
+                try:
+                    listing = self.list_objects(
+                        authenticated_objects[bucket_name], bucket_name, listing_prefix
+                    )
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code") not in AUTH_ERROR_CODES:
+                        raise
+                    # cached credentials may have expired, authenticate again
+                    self.clear_authenticated_objects(bucket_name)
+                    authenticated_objects[bucket_name] = self.get_authenticated_objects(
+                        bucket_name, listing_prefix, auth
+                    )
+                    listing = self.list_objects(
+                        authenticated_objects[bucket_name], bucket_name, listing_prefix
+                    )
+                listings[(bucket_name, listing_prefix)] = listing
+
+        unique_product_chunks = {}
         for bucket_name, prefix in bucket_names_and_prefixes:
             # unauthenticated items filtered out
-            if bucket_name in authenticated_objects.keys():
-                product_chunks.extend(
-                    authenticated_objects[bucket_name].filter(Prefix=prefix)
-                )
-
-        unique_product_chunks = set(product_chunks)
+            if bucket_name not in authenticated_objects:
+                continue
+            listing = next(
+                objects
+                for (b, listing_prefix), objects in listings.items()
+                if b == bucket_name and prefix.startswith(listing_prefix)
+            )
+            for product_chunk in self._filter_objects(listing, prefix):
+                unique_product_chunks[product_chunk.key] = product_chunk
+        unique_product_chunks = list(unique_product_chunks.values())
+
+        # without assets, the filter is applied to the objects (before sizing)
+        if asset_filter is not None and not use_assets:
+            selected_chunks = [
+                product_chunk
+                for product_chunk in unique_product_chunks
+                if asset_filter.match_path(product_chunk.key)
+            ]
+            if not selected_chunks:
+                raise DownloadError(f"No object of {product} matches {asset_filter}")
+            partial = len(selected_chunks) < len(unique_product_chunks)
+            unique_product_chunks = selected_chunks
 
         total_size = sum([p.size for p in unique_product_chunks])
 
         # download
         progress_callback.reset(total=total_size)
-        try:
-            for product_chunk in unique_product_chunks:
-                chunk_rel_path = self.get_chunk_dest_path(
-                    product,
-                    product_chunk,
-                    build_safe=build_safe,
-                    dir_prefix=prefix,
-                )
-                chunk_abs_path = os.path.join(product_local_path, chunk_rel_path)
-                chunk_abs_path_dir = os.path.dirname(chunk_abs_path)
-                if not os.path.isdir(chunk_abs_path_dir):
-                    os.makedirs(chunk_abs_path_dir)
-
-                if not os.path.isfile(chunk_abs_path):
-                    product_chunk.Bucket().download_file(
-                        product_chunk.key,
-                        chunk_abs_path,
-                        ExtraArgs=getattr(s3_objects, "_params", {}),
-                        Callback=progress_callback,
-                    )
+        # the aggregated progress callback is shared by all the transfer threads
+        thread_safe_progress_callback = get_thread_safe_callback(progress_callback)
+
+        def update_progress(increment):
+            thread_safe_progress_callback(increment)
+            # called by the transfer threads, which wait if the bandwidth is exceeded
+            self.rate_limiter.consume_bytes(increment)
+
+        transfer_config = self._get_transfer_config()
+        chunks_to_download = []
+        chunks_rel_paths = self.get_chunks_dest_paths(
+            product, unique_product_chunks, build_safe=build_safe, dir_prefix=prefix
+        )
+        for product_chunk, chunk_rel_path in zip(
+            unique_product_chunks, chunks_rel_paths
+        ):
+            chunk_abs_path = os.path.join(product_local_path, chunk_rel_path)
+            os.makedirs(os.path.dirname(chunk_abs_path), exist_ok=True)
+            if not os.path.isfile(chunk_abs_path):
+                chunks_to_download.append((product_chunk, chunk_abs_path))
 
-        except AuthenticationError as e:
-            logger.warning("Unexpected error: %s" % e)
-            logger.warning("Skipping %s/%s" % (bucket_name, prefix))
-        except ClientError as e:
-            err = e.response["Error"]
-            auth_messages = [
-                "AccessDenied",
-                "InvalidAccessKeyId",
-                "SignatureDoesNotMatch",
-            ]
-            if err["Code"] in auth_messages and "key" in err["Message"].lower():
-                raise AuthenticationError(
-                    "HTTP error {} returned\n{}: {}\nPlease check your credentials for {}".format(
-                        e.response["ResponseMetadata"]["HTTPStatusCode"],
-                        err["Code"],
-                        err["Message"],
-                        self.provider,
-                    )
+        max_workers = max(
+            1, min(self._get_objects_max_workers(), len(chunks_to_download))
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._download_chunk,
+                    product_chunk,
+                    chunk_abs_path,
+                    checksums.get(product_chunk.key, None),
+                    ExtraArgs=getattr(
+                        authenticated_objects.get(product_chunk.bucket_name, None),
+                        "_params",
+                        {},
+                    ),
+                    Callback=update_progress,
+                    Config=transfer_config,
+                ): product_chunk
+                for product_chunk, chunk_abs_path in chunks_to_download
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except (AuthenticationError, ClientError) as e:
+                for other_future in futures:
+                    other_future.cancel()
+                failed_chunk = futures[future]
+                self._handle_download_error(
+                    e, failed_chunk.bucket_name, failed_chunk.key
                 )
-            logger.warning("Unexpected error: %s" % e)
-            logger.warning("Skipping %s/%s" % (bucket_name, prefix))
+                # neither finalized nor recorded, the objects already downloaded are
+                # kept and the next download completes them
+                raise DownloadError(f"{product} could not be downloaded completely")
 
+        # the layout of partially downloaded products is changed once complete
+        if partial:
+            logger.info(
+                f"{product} partially downloaded (assets {asset_filter}), "
+                "SAFE format and directory flattening not applied"
+            )
         # finalize safe product
-        if build_safe and "S2_MSI" in product.product_type:
+        elif build_safe and "S2_MSI" in product.product_type:
             self.finalize_s2_safe_product(product_local_path)
         # flatten directory structure
         elif flatten_top_dirs:
             flatten_top_directories(product_local_path, common_prefix)
 
-        if build_safe:
+        if build_safe and not partial:
             self.check_manifest_file_list(product_local_path)
 
-        # save hash/record file
-        with open(record_filename, "w") as fh:
-            fh.write(product.remote_location)
-        logger.debug("Download recorded in %s", record_filename)
+        # save download record
+        record.save(product_local_path, partial=partial)
 
         product.location = path_to_uri(product_local_path)
         return product_local_path
 
+    @staticmethod
+    def _get_common_prefix(prefixes):
+        """Longest common base path of prefixes, the last part of the first prefix
+        excluded
+
+        >>> AwsDownload._get_common_prefix(["a/b/c", "a/b/d/e"])
+        'a/b'
+        >>> AwsDownload._get_common_prefix(["a/b/c"])
+        'a/b'
+
+        :param prefixes: The prefixes
+        :type prefixes: list
+        :returns: The common base path
+        :rtype: str
+        """
+        prefixes_split = [prefix.split("/") for prefix in prefixes]
+        common_parts = []
+        for parts in zip(*prefixes_split):
+            if len(set(parts)) > 1:
+                break
+            common_parts.append(parts[0])
+        return "/".join(common_parts[: len(prefixes_split[0]) - 1])
+
+    @staticmethod
+    def _get_listing_prefixes(prefixes):
+        """Prefixes to list so that all the objects of ``prefixes`` are listed once:
+        prefixes starting with another one are dropped
+
+        >>> AwsDownload._get_listing_prefixes(["a/b/c", "a/b", "d", "a/bc"])
+        ['a/b', 'd']
+
+        :param prefixes: The prefixes
+        :type prefixes: list
+        :returns: The prefixes to list
+        :rtype: list
+        """
+        listing_prefixes = []
+        # a prefix is sorted after the prefixes it starts with
+        for prefix in sorted(set(prefixes)):
+            if not listing_prefixes or not prefix.startswith(listing_prefixes[-1]):
+                listing_prefixes.append(prefix)
+        return listing_prefixes
+
+    def list_objects(self, s3_objects, bucket_name, prefix):
+        """List the objects of a bucket prefix, using ``list_objects_v2``
+
+        :param s3_objects: The bucket authenticated objects
+        :type s3_objects: :class:`~boto3.resources.collection.s3.Bucket.objectsCollection`
+        :param bucket_name: The bucket
+        :type bucket_name: str
+        :param prefix: The prefix of the listed objects
+        :type prefix: str
+        :returns: The objects, sorted by key
+        :rtype: list[:class:`~eodag.plugins.download.aws.S3Object`]
+        """
+        client = s3_objects._parent.meta.client
+        params = {
+            k: v for k, v in getattr(s3_objects, "_params", {}).items() if k != "Prefix"
+        }
+        objects = []
+        for page in client.get_paginator("list_objects_v2").paginate(
+            Bucket=bucket_name, Prefix=prefix, **params
+        ):
+            objects.extend(
+                S3Object(bucket_name, obj["Key"], obj["Size"], client)
+                for obj in page.get("Contents", [])
+            )
+        objects.sort(key=lambda obj: obj.key)
+        return objects
+
+    @staticmethod
+    def _filter_objects(objects, prefix):
+        """Objects of a listing sorted by key whose key starts with ``prefix``
+
+        :param objects: The objects, sorted by key
+        :type objects: list[:class:`~eodag.plugins.download.aws.S3Object`]
+        :param prefix: The prefix
+        :type prefix: str
+        :returns: The matching objects
+        :rtype: list[:class:`~eodag.plugins.download.aws.S3Object`]
+        """
+        keys = [obj.key for obj in objects]
+        start = bisect.bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return objects[start:end]
+
+    def _handle_download_error(self, error, bucket_name, key):
+        """Raise an authentication error if ``error`` is caused by credentials, else
+        log it and skip the remaining objects
+
+        :param error: The transfer error
+        :type error: Union[:class:`~eodag.utils.exceptions.AuthenticationError`,
+                     :class:`botocore.exceptions.ClientError`]
+        :param bucket_name: The bucket of the object which transfer failed
+        :type bucket_name: str
+        :param key: The key of the object which transfer failed
+        :type key: str
+        :raises: :class:`~eodag.utils.exceptions.AuthenticationError`
+        """
+        if isinstance(error, ClientError):
+            err = error.response["Error"]
+            if err["Code"] in AUTH_ERROR_CODES:
+                self.clear_authenticated_objects(bucket_name)
+            if err["Code"] in AUTH_ERROR_CODES and "key" in err["Message"].lower():
+                raise AuthenticationError(
+                    "HTTP error {} returned\n{}: {}\nPlease check your credentials for {}".format(
+                        error.response["ResponseMetadata"]["HTTPStatusCode"],
+                        err["Code"],
+                        err["Message"],
+                        self.provider,
+                    )
+                )
+        logger.warning("Unexpected error: %s" % error)
+        logger.warning("Skipping %s/%s" % (bucket_name, key))
+
+    def _get_objects_max_workers(self):
+        """Number of objects of a product that can be transferred concurrently"""
+        return int(getattr(self.config, "max_workers", DEFAULT_OBJECTS_MAX_WORKERS))
+
+    def _get_transfer_config(self):
+        """Get the boto3 transfer configuration from the ``transfer_config`` plugin
+        parameter, ``max_concurrency`` being the number of threads used for each
+        multipart object
+
+        :returns: The transfer configuration
+        :rtype: :class:`boto3.s3.transfer.TransferConfig`
+        """
+        return TransferConfig(**(getattr(self.config, "transfer_config", None) or {}))
+
+    def _get_client_config(self):
+        """Get the botocore client configuration, with a connection pool large enough
+        for concurrent transfers
+
+        :returns: The client configuration
+        :rtype: :class:`botocore.config.Config`
+        """
+        return Config(
+            max_pool_connections=max(
+                DEFAULT_MAX_POOL_CONNECTIONS,
+                self._get_objects_max_workers()
+                * self._get_transfer_config().max_request_concurrency,
+            )
+        )
+
+    def _download_chunk(self, product_chunk, chunk_abs_path, checksum=None, **kwargs):
+        """Download an object using the client shared by all the objects of its
+        bucket
+
+        :param product_chunk: The object to download
+        :type product_chunk: :class:`~eodag.plugins.download.aws.S3Object`
+        :param chunk_abs_path: The destination file
+        :type chunk_abs_path: str
+        :param checksum: (optional) The expected checksum metadata
+        :type checksum: Any
+        :param kwargs: ``ExtraArgs``, ``Callback`` and ``Config`` passed to boto3
+        :type kwargs: Union[dict, Callable, :class:`boto3.s3.transfer.TransferConfig`]
+        """
+        if checksum and self._get_checksum_verifier(checksum):
+            return self._download_verified_chunk(
+                product_chunk, chunk_abs_path, checksum, **kwargs
+            )
+        product_chunk.client.download_file(
+            product_chunk.bucket_name, product_chunk.key, chunk_abs_path, **kwargs
+        )
+
+    def _download_verified_chunk(
+        self, product_chunk, chunk_abs_path, checksum, **kwargs
+    ):
+        """Download an object, computing its checksum while it is written and
+        downloading it again if it does not match.
+
+        The object is written through a non-seekable file object, so that boto3
+        writes its parts in order.
+
+        :param product_chunk: The object to download
+        :type product_chunk: :class:`~eodag.plugins.download.aws.S3Object`
+        :param chunk_abs_path: The destination file
+        :type chunk_abs_path: str
+        :param checksum: The expected checksum metadata
+        :type checksum: Any
+        :param kwargs: ``ExtraArgs``, ``Callback`` and ``Config`` passed to boto3
+        :type kwargs: Union[dict, Callable, :class:`boto3.s3.transfer.TransferConfig`]
+        :raises: :class:`~eodag.utils.exceptions.ChecksumError`
+        """
+        attempts = DEFAULT_MAX_RETRIES
+        while "Loop until the object matches its checksum":
+            verifier = self._get_checksum_verifier(checksum)
+            with open(chunk_abs_path, "wb") as fhandle:
+                product_chunk.client.download_fileobj(
+                    product_chunk.bucket_name,
+                    product_chunk.key,
+                    ChecksumWriter(fhandle, verifier),
+                    **kwargs,
+                )
+            try:
+                verifier.verify(product_chunk.key)
+                return
+            except ChecksumError as e:
+                os.remove(chunk_abs_path)
+                if attempts <= 0:
+                    raise
+                attempts -= 1
+                logger.warning("%s, downloading it again", e)
+
     def get_rio_env(self, bucket_name, prefix, auth_dict):
         """Get rasterio environment variables needed for data access authentication.
 
@@ -446,26 +1033,89 @@ class AwsDownload(Download):
         :returns: The rasterio environement variables
         :rtype: dict
         """
-        if self.s3_session is not None:
-            if self.requester_pays:
-                return {"session": self.s3_session, "requester_pays": True}
-            else:
-                return {"session": self.s3_session}
-
+        # the session of the auth strategy of the bucket, cached by
+        # get_authenticated_objects
         _ = self.get_authenticated_objects(bucket_name, prefix, auth_dict)
-        if self.s3_session is not None:
+        cached = self._get_cached_authentication(bucket_name, auth_dict)
+        s3_session = cached[1] if cached else self.s3_session
+        if s3_session is not None:
             if self.requester_pays:
-                return {"session": self.s3_session, "requester_pays": True}
+                return {"session": s3_session, "requester_pays": True}
             else:
-                return {"session": self.s3_session}
+                return {"session": s3_session}
         else:
             return {"aws_unsigned": True}
 
+    def get_range_fetcher(self, product, url, auth=None):
+        """Get a fetcher of byte ranges of an object of a product, used to read it
+        without downloading it (see
+        :meth:`~eodag.api.product._product.EOProduct.open_asset`).
+
+        Ranges are fetched with ``GetObject`` range requests, using the client of the
+        auth strategy of the bucket, as cached for :meth:`get_rio_env`.
+
+        :param product: The EO product
+        :type product: :class:`~eodag.api.product._product.EOProduct`
+        :param url: The object URL
+        :type url: str
+        :param auth: (optional) Dictionnary containing authentication keys
+        :type auth: dict
+        :returns: The range fetcher
+        :rtype: :class:`~eodag.utils.ranges.S3RangeFetcher`
+        """
+        bucket_name, key = self.get_bucket_name_and_prefix(product, url)
+        s3_objects = self.get_authenticated_objects(
+            bucket_name, key, auth if isinstance(auth, dict) else {}
+        )
+        return S3RangeFetcher(
+            s3_objects._parent.meta.client,
+            bucket_name,
+            key,
+            requester_pays=self.requester_pays,
+        )
+
+    def _get_authenticated_objects_cache_key(self, bucket_name, auth_dict):
+        """Key of the authenticated objects of a bucket in the process-wide cache"""
+        return (
+            self.provider,
+            getattr(self.config, "base_uri", None),
+            bool(self.requester_pays),
+            bucket_name,
+            obj_md5sum(dict(auth_dict or {})),
+        )
+
+    def _get_cached_authentication(self, bucket_name, auth_dict):
+        """Cached authenticated objects, session and auth strategy name of a bucket
+
+        :returns: The cache entry, or ``None``
+        :rtype: tuple
+        """
+        cache_key = self._get_authenticated_objects_cache_key(bucket_name, auth_dict)
+        with _authenticated_objects_cache_lock:
+            return _authenticated_objects_cache.get(cache_key, None)
+
+    def clear_authenticated_objects(self, bucket_name=None):
+        """Forget the cached authenticated objects and auth strategy of a bucket of the
+        provider, or of all its buckets, so that the next access authenticates again
+
+        :param bucket_name: (optional) The bucket, all the buckets if not set
+        :type bucket_name: str
+        """
+        with _authenticated_objects_cache_lock:
+            for key in list(_authenticated_objects_cache):
+                if key[0] == self.provider and bucket_name in (None, key[3]):
+                    del _authenticated_objects_cache[key]
+
     def get_authenticated_objects(self, bucket_name, prefix, auth_dict):
         """Get boto3 authenticated objects for the given bucket using
         the most adapted auth strategy.
         Also expose ``s3_session`` as class variable if available.
 
+        The authenticated objects and the strategy are cached for the whole process,
+        by provider, bucket and credentials, so that strategies are only tried on
+        the first access to the bucket. The cache entry of a bucket is cleared when
+        a request on it is rejected because of its credentials.
+
         :param bucket_name: Bucket containg objects
         :type bucket_name: str
         :param prefix: Prefix used to filter objects on auth try
@@ -476,6 +1126,15 @@ class AwsDownload(Download):
         :returns: The boto3 authenticated objects
         :rtype: :class:`~boto3.resources.collection.s3.Bucket.objectsCollection`
         """
+        cached = self._get_cached_authentication(bucket_name, auth_dict)
+        if cached is not None:
+            s3_objects, s3_session, auth_method_name = cached
+            logger.debug("Auth using %s (cached)", auth_method_name)
+            if s3_session is not None:
+                self.s3_session = s3_session
+            self._register_rate_limiter(s3_objects)
+            return s3_objects
+
         auth_methods = [
             self._get_authenticated_objects_unsigned,
             self._get_authenticated_objects_from_auth_profile,
@@ -491,13 +1150,24 @@ class AwsDownload(Download):
                 s3_objects = try_auth_method(bucket_name, prefix, auth_dict)
                 if s3_objects:
                     logger.debug("Auth using %s succeeded", try_auth_method.__name__)
+                    s3_session = (
+                        None
+                        if try_auth_method == self._get_authenticated_objects_unsigned
+                        else self.s3_session
+                    )
+                    self._register_rate_limiter(s3_objects)
+                    cache_key = self._get_authenticated_objects_cache_key(
+                        bucket_name, auth_dict
+                    )
+                    with _authenticated_objects_cache_lock:
+                        _authenticated_objects_cache[cache_key] = (
+                            s3_objects,
+                            s3_session,
+                            try_auth_method.__name__,
+                        )
                     return s3_objects
             except ClientError as e:
-                if e.response.get("Error", {}).get("Code", {}) in [
-                    "AccessDenied",
-                    "InvalidAccessKeyId",
-                    "SignatureDoesNotMatch",
-                ]:
+                if e.response.get("Error", {}).get("Code", {}) in AUTH_ERROR_CODES:
                     pass
                 else:
                     raise e
@@ -510,11 +1180,36 @@ class AwsDownload(Download):
             % bucket_name
         )
 
+    def _register_rate_limiter(self, s3_objects):
+        """Throttle the requests sent by the client of authenticated objects, using
+        the rate limiter of the plugin
+
+        The authenticated objects are cached and shared by the plugins of the
+        provider: the hook registered by a previous plugin is replaced, so that
+        requests are throttled by the rate limiter of the plugin using them.
+
+        :param s3_objects: The boto3 authenticated objects
+        :type s3_objects: :class:`~boto3.resources.collection.s3.Bucket.objectsCollection`
+        """
+        rate_limiter = self.rate_limiter
+
+        def acquire_request(**kwargs):
+            # returning a value would be used as the response of the request
+            rate_limiter.acquire_request()
+
+        events = s3_objects._parent.meta.client.meta.events
+        events.unregister("before-send.s3", unique_id=RATE_LIMITER_HOOK_ID)
+        events.register(
+            "before-send.s3", acquire_request, unique_id=RATE_LIMITER_HOOK_ID
+        )
+
     def _get_authenticated_objects_unsigned(self, bucket_name, prefix, auth_dict):
         """Auth strategy using no-sign-request"""
 
         s3_resource = boto3.resource(
-            service_name="s3", endpoint_url=getattr(self.config, "base_uri", None)
+            service_name="s3",
+            endpoint_url=getattr(self.config, "base_uri", None),
+            config=self._get_client_config(),
         )
         s3_resource.meta.client.meta.events.register(
             "choose-signer.s3.*", disable_signing
@@ -533,6 +1228,7 @@ class AwsDownload(Download):
             s3_resource = s3_session.resource(
                 service_name="s3",
                 endpoint_url=getattr(self.config, "base_uri", None),
+                config=self._get_client_config(),
             )
             if self.requester_pays:
                 objects = s3_resource.Bucket(bucket_name).objects.filter(
@@ -558,6 +1254,7 @@ class AwsDownload(Download):
             s3_resource = s3_session.resource(
                 service_name="s3",
                 endpoint_url=getattr(self.config, "base_uri", None),
+                config=self._get_client_config(),
             )
             if self.requester_pays:
                 objects = s3_resource.Bucket(bucket_name).objects.filter(
@@ -576,7 +1273,9 @@ class AwsDownload(Download):
 
         s3_session = boto3.session.Session()
         s3_resource = s3_session.resource(
-            service_name="s3", endpoint_url=getattr(self.config, "base_uri", None)
+            service_name="s3",
+            endpoint_url=getattr(self.config, "base_uri", None),
+            config=self._get_client_config(),
         )
         if self.requester_pays:
             objects = s3_resource.Bucket(bucket_name).objects.filter(
@@ -599,7 +1298,12 @@ class AwsDownload(Download):
         :rtype: tuple
         """
         if not url:
-            url = product.location
+            # the location of a partially downloaded product is local
+            url = (
+                product.remote_location
+                if product.location.startswith("file:")
+                else product.location
+            )
 
         bucket_path_level = getattr(self.config, "bucket_path_level", None)
 
@@ -696,227 +1400,100 @@ class AwsDownload(Download):
 
     def get_chunk_dest_path(self, product, chunk, dir_prefix, build_safe=False):
         """Get chunk destination path"""
-        if build_safe:
-            # S2 common
-            if "S2_MSI" in product.product_type:
-                title_search = re.search(
-                    r"^\w+_\w+_(\w+)_(\w+)_(\w+)_(\w+)_(\w+)$",
-                    product.properties["title"],
-                )
-                title_date1 = title_search.group(1) if title_search else None
-                title_part3 = title_search.group(4) if title_search else None
-                ds_dir_search = re.search(
-                    r"^.+_(DS_\w+_+\w+_\w+)_\w+.\w+$",
-                    product.properties.get("originalSceneID", ""),
-                )
-                ds_dir = ds_dir_search.group(1) if ds_dir_search else 0
-                s2_processing_level = product.product_type.split("_")[-1]
-            # S1 common
-            elif product.product_type == "S1_SAR_GRD":
-                s1_title_suffix_search = re.search(
-                    r"^.+_([A-Z0-9_]+_[A-Z0-9_]+_[A-Z0-9_]+_[A-Z0-9_]+)_\w+$",
-                    product.properties["title"],
-                )
-                s1_title_suffix = (
-                    s1_title_suffix_search.group(1).lower().replace("_", "-")
-                    if s1_title_suffix_search
-                    else None
-                )
+        return self.get_chunks_dest_paths(
+            product, [chunk], dir_prefix, build_safe=build_safe
+        )[0]
 
-            # S2 L2A Tile files -----------------------------------------------
-            if S2L2A_TILE_IMG_REGEX.match(chunk.key):
-                found_dict = S2L2A_TILE_IMG_REGEX.match(chunk.key).groupdict()
-                product_path = (
-                    "%s.SAFE/GRANULE/%s/IMG_DATA/R%s/T%s%s%s_%s_%s_%s.jp2"
-                    % (
-                        product.properties["title"],
-                        found_dict["num"],
-                        found_dict["res"],
-                        found_dict["tile1"],
-                        found_dict["tile2"],
-                        found_dict["tile3"],
-                        title_date1,
-                        found_dict["file"],
-                        found_dict["res"],
-                    )
-                )
-            elif S2L2A_TILE_AUX_DIR_REGEX.match(chunk.key):
-                found_dict = S2L2A_TILE_AUX_DIR_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/AUX_DATA/%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file"],
-                )
-            # S2 L2A QI Masks
-            elif S2_TILE_QI_MSK_REGEX.match(chunk.key):
-                found_dict = S2_TILE_QI_MSK_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/QI_DATA/MSK_%sPRB_%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file_base"],
-                    found_dict["file_suffix"],
-                )
-            # S2 L2A QI PVI
-            elif S2_TILE_QI_PVI_REGEX.match(chunk.key):
-                found_dict = S2_TILE_QI_PVI_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/QI_DATA/%s_%s_PVI.jp2" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    title_part3,
-                    title_date1,
-                )
-            # S2 Tile files ---------------------------------------------------
-            elif S2_TILE_PREVIEW_DIR_REGEX.match(chunk.key):
-                found_dict = S2_TILE_PREVIEW_DIR_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/preview/%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file"],
-                )
-            elif S2_TILE_IMG_REGEX.match(chunk.key):
-                found_dict = S2_TILE_IMG_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/IMG_DATA/T%s%s%s_%s_%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["tile1"],
-                    found_dict["tile2"],
-                    found_dict["tile3"],
-                    title_date1,
-                    found_dict["file"],
-                )
-            elif S2_TILE_THUMBNAIL_REGEX.match(chunk.key):
-                found_dict = S2_TILE_THUMBNAIL_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file"],
-                )
-            elif S2_TILE_MTD_REGEX.match(chunk.key):
-                found_dict = S2_TILE_MTD_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/MTD_TL.xml" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                )
-            elif S2_TILE_AUX_DIR_REGEX.match(chunk.key):
-                found_dict = S2_TILE_AUX_DIR_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/AUX_DATA/AUX_%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file"],
-                )
-            elif S2_TILE_QI_DIR_REGEX.match(chunk.key):
-                found_dict = S2_TILE_QI_DIR_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/QI_DATA/%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file"],
-                )
-            # S2 Tiles generic
-            elif S2_TILE_REGEX.match(chunk.key):
-                found_dict = S2_TILE_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/GRANULE/%s/%s" % (
-                    product.properties["title"],
-                    found_dict["num"],
-                    found_dict["file"],
-                )
-            # S2 Product files
-            elif S2_PROD_DS_MTD_REGEX.match(chunk.key):
-                found_dict = S2_PROD_DS_MTD_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/DATASTRIP/%s/MTD_DS.xml" % (
-                    product.properties["title"],
-                    ds_dir,
-                )
-            elif S2_PROD_DS_QI_REPORT_REGEX.match(chunk.key):
-                found_dict = S2_PROD_DS_QI_REPORT_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/DATASTRIP/%s/QI_DATA/%s.xml" % (
-                    product.properties["title"],
-                    ds_dir,
-                    found_dict["filename"],
-                )
-            elif S2_PROD_DS_QI_REGEX.match(chunk.key):
-                found_dict = S2_PROD_DS_QI_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/DATASTRIP/%s/QI_DATA/%s" % (
-                    product.properties["title"],
-                    ds_dir,
-                    found_dict["file"],
-                )
-            elif S2_PROD_INSPIRE_REGEX.match(chunk.key):
-                found_dict = S2_PROD_INSPIRE_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/INSPIRE.xml" % (product.properties["title"],)
-            elif S2_PROD_MTD_REGEX.match(chunk.key):
-                found_dict = S2_PROD_MTD_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/MTD_MSI%s.xml" % (
-                    product.properties["title"],
-                    s2_processing_level,
-                )
-            # S2 Product generic
-            elif S2_PROD_REGEX.match(chunk.key):
-                found_dict = S2_PROD_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/%s" % (
-                    product.properties["title"],
-                    found_dict["file"],
-                )
-            # S1 --------------------------------------------------------------
-            elif S1_CALIB_REGEX.match(chunk.key):
-                found_dict = S1_CALIB_REGEX.match(chunk.key).groupdict()
-                product_path = (
-                    "%s.SAFE/annotation/calibration/%s-%s-%s-grd-%s-%s-%03d.xml"
-                    % (
-                        product.properties["title"],
-                        found_dict["file_prefix"],
-                        product.properties["platformSerialIdentifier"].lower(),
-                        found_dict["file_beam"],
-                        found_dict["file_pol"],
-                        s1_title_suffix,
-                        S1_IMG_NB_PER_POLAR.get(
-                            product.properties["polarizationMode"], {}
-                        ).get(found_dict["file_pol"].upper(), 1),
-                    )
-                )
-            elif S1_ANNOT_REGEX.match(chunk.key):
-                found_dict = S1_ANNOT_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/annotation/%s-%s-grd-%s-%s-%03d.xml" % (
-                    product.properties["title"],
-                    product.properties["platformSerialIdentifier"].lower(),
-                    found_dict["file_beam"],
-                    found_dict["file_pol"],
-                    s1_title_suffix,
-                    S1_IMG_NB_PER_POLAR.get(
-                        product.properties["polarizationMode"], {}
-                    ).get(found_dict["file_pol"].upper(), 1),
-                )
-            elif S1_MEAS_REGEX.match(chunk.key):
-                found_dict = S1_MEAS_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/measurement/%s-%s-grd-%s-%s-%03d.%s" % (
-                    product.properties["title"],
-                    product.properties["platformSerialIdentifier"].lower(),
-                    found_dict["file_beam"],
-                    found_dict["file_pol"],
-                    s1_title_suffix,
-                    S1_IMG_NB_PER_POLAR.get(
-                        product.properties["polarizationMode"], {}
-                    ).get(found_dict["file_pol"].upper(), 1),
-                    found_dict["file_ext"],
-                )
-            elif S1_REPORT_REGEX.match(chunk.key):
-                found_dict = S1_REPORT_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/%s.SAFE-%s" % (
-                    product.properties["title"],
-                    product.properties["title"],
-                    found_dict["file"],
-                )
-            # S1 generic
-            elif S1_REGEX.match(chunk.key):
-                found_dict = S1_REGEX.match(chunk.key).groupdict()
-                product_path = "%s.SAFE/%s" % (
-                    product.properties["title"],
-                    found_dict["file"],
-                )
-        # no SAFE format
+    def get_chunks_dest_paths(self, product, chunks, dir_prefix, build_safe=False):
+        """Get the destination paths of many chunks of a product at once, product
+        title fields used to build SAFE paths being parsed once
+
+        :param product: The EO product
+        :type product: :class:`~eodag.api.product._product.EOProduct`
+        :param chunks: The product chunks, objects having a ``key`` attribute
+        :type chunks: list
+        :param dir_prefix: The prefix removed from chunks keys if not building SAFE
+        :type dir_prefix: str
+        :param build_safe: (optional) Whether the paths are built in the SAFE format
+        :type build_safe: bool
+        :returns: The destination paths, relative to the product directory
+        :rtype: list
+        """
+        if not build_safe:
+            dir_prefix = dir_prefix.strip("/") + "/"
+            products_paths = [chunk.key.split(dir_prefix)[-1] for chunk in chunks]
         else:
-            product_path = chunk.key.split(dir_prefix.strip("/") + "/")[-1]
-        logger.debug("Downloading %s to %s" % (chunk.key, product_path))
-        return product_path
+            safe_fields = self._get_safe_fields(product)
+            safe_path_mapper = self._get_safe_path_mapper(product)
+            products_paths = safe_path_mapper.get_paths(
+                [chunk.key for chunk in chunks], safe_fields
+            )
+        for chunk, product_path in zip(chunks, products_paths):
+            logger.debug("Downloading %s to %s" % (chunk.key, product_path))
+        return products_paths
+
+    def _get_safe_fields(self, product):
+        """Fields of the product title and metadata used to build its SAFE paths
+
+        :returns: The SAFE fields
+        :rtype: dict
+        """
+        safe_fields = {
+            "title": product.properties["title"],
+            "platform": str(
+                product.properties.get("platformSerialIdentifier", "")
+            ).lower(),
+        }
+        # S2 common
+        if "S2_MSI" in product.product_type:
+            title_search = re.search(
+                r"^\w+_\w+_(\w+)_(\w+)_(\w+)_(\w+)_(\w+)$",
+                product.properties["title"],
+            )
+            safe_fields["title_date1"] = title_search.group(1) if title_search else None
+            safe_fields["title_part3"] = title_search.group(4) if title_search else None
+            ds_dir_search = re.search(
+                r"^.+_(DS_\w+_+\w+_\w+)_\w+.\w+$",
+                product.properties.get("originalSceneID", ""),
+            )
+            safe_fields["ds_dir"] = ds_dir_search.group(1) if ds_dir_search else 0
+            safe_fields["s2_processing_level"] = product.product_type.split("_")[-1]
+        # S1 common
+        elif product.product_type == "S1_SAR_GRD":
+            s1_title_suffix_search = re.search(
+                r"^.+_([A-Z0-9_]+_[A-Z0-9_]+_[A-Z0-9_]+_[A-Z0-9_]+)_\w+$",
+                product.properties["title"],
+            )
+            safe_fields["s1_title_suffix"] = (
+                s1_title_suffix_search.group(1).lower().replace("_", "-")
+                if s1_title_suffix_search
+                else None
+            )
+            img_nb_per_polar = S1_IMG_NB_PER_POLAR.get(
+                product.properties.get("polarizationMode", None), {}
+            )
+            safe_fields["s1_img_nb"] = lambda fields: img_nb_per_polar.get(
+                str(fields.get("file_pol", "")).upper(), 1
+            )
+        return safe_fields
+
+    def _get_safe_path_mapper(self, product):
+        """Get the compiled SAFE path rules of a product, from the ``safe_path_rules``
+        of its product type configuration, of the plugin configuration, or the
+        default ones
+
+        :param product: The EO product
+        :type product: :class:`~eodag.api.product._product.EOProduct`
+        :returns: The compiled rules
+        :rtype: :class:`~eodag.plugins.download.aws.SafePathMapper`
+        """
+        product_conf = getattr(self.config, "products", {}).get(
+            product.product_type, {}
+        )
+        rules = product_conf.get(
+            "safe_path_rules", getattr(self.config, "safe_path_rules", None)
+        )
+        return get_safe_path_mapper(rules or DEFAULT_SAFE_PATH_RULES)
 
     def download_all(
         self,
@@ -16,31 +16,51 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import hashlib
+import heapq
 import logging
 import os
 import shutil
+import sqlite3
 import tarfile
 import tempfile
 import zipfile
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from time import sleep
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from requests.auth import AuthBase
+
+from eodag.api.product.metadata_mapping import ONLINE_STATUS, STAGING_STATUS
 from eodag.plugins.base import PluginTopic
 from eodag.utils import ProgressCallback, sanitize, uri_to_path
+from eodag.utils.archive import extract_zip
+from eodag.utils.assets import AssetFilter
+from eodag.utils.cache import get_product_cache, get_product_cache_key
+from eodag.utils.checksum import ChecksumVerifier
 from eodag.utils.exceptions import (
     AuthenticationError,
     MisconfiguredError,
     NotAvailableError,
 )
+from eodag.utils.http import DEFAULT_STREAM_REQUESTS_TIMEOUT  # noqa
 from eodag.utils.notebook import NotebookWidgets
+from eodag.utils.ranges import HttpRangeFetcher
+from eodag.utils.records import RECORDS_DIRNAME, DownloadRecord, get_download_records
 
 logger = logging.getLogger("eodag.plugins.download.base")
 
+# default maximum number of archive members extracted concurrently
+DEFAULT_EXTRACT_MAX_WORKERS = 4
+
+# default download records backend
+DEFAULT_DOWNLOAD_RECORDS = "sqlite"
+
 # default wait times in minutes
 DEFAULT_DOWNLOAD_WAIT = 2  # in minutes
 DEFAULT_DOWNLOAD_TIMEOUT = 20  # in minutes
-DEFAULT_STREAM_REQUESTS_TIMEOUT = 60  # in seconds
 
 
 class Download(PluginTopic):
@@ -63,14 +83,27 @@ class Download(PluginTopic):
       eventually after it's extracted) to the product's location given as a file URI
       (e.g. 'file:///tmp/product_folder' on Linux or
       'file:///C:/Users/username/AppData/LOcal/Temp' on Windows)
-    - save a *record* file in the directory ``outputs_prefix/.downloaded`` whose name
-      is built on the MD5 hash of the product's ``remote_location`` attribute
-      (``hashlib.md5(remote_location.encode("utf-8")).hexdigest()``) and whose content is
-      the product's ``remote_location`` attribute itself.
+    - save a *record* of the download in the directory ``outputs_prefix/.downloaded``,
+      identified by the MD5 hash of the product's ``remote_location`` attribute
+      (``hashlib.md5(remote_location.encode("utf-8")).hexdigest()``), using the
+      :class:`~eodag.utils.records.DownloadRecord` returned by
+      ``_prepare_download``. Records are stored in a SQLite database, or in one file per
+      product if ``download_records`` is set to ``files`` in the plugin configuration.
+    - download only the assets selected by the ``asset_filter`` kwarg, if any (see
+      :class:`~eodag.utils.assets.AssetFilter`), available as the ``asset_filter``
+      of the record. Directory layout changes (``flatten_top_dirs``, SAFE
+      finalization) are skipped for these partial downloads, which are recorded as
+      such (``record.save(path, partial=True)``), so that a later request for more
+      assets completes them. Plugins not supporting it download whole products.
+    - verify downloaded data against the checksum found in the product or asset
+      metadata, if any, using the :class:`~eodag.utils.checksum.ChecksumVerifier`
+      returned by ``_get_checksum_verifier``, unless ``verify_checksum`` is set to
+      False in the plugin configuration. The verified checksum is saved in the
+      record (``record.save(path, checksum=...)``)
     - not try to download a product whose ``location`` attribute already points to an
       existing file/directory
-    - not try to download a product if its *record* file exists as long as the expected
-      product's file/directory. If the *record* file only is found, it must be deleted
+    - not try to download a product if its *record* exists as long as the expected
+      product's file/directory. If the *record* only is found, it must be deleted
       (it certainly indicates that the download didn't complete)
 
     :param provider: An eodag providers configuration dictionary
@@ -109,8 +142,10 @@ class Download(PluginTopic):
         :param kwargs: `outputs_prefix` (str), `extract` (bool), `delete_archive` (bool)
                         and `dl_url_params` (dict) can be provided as additional kwargs
                         and will override any other values defined in a configuration
-                        file or with environment variables.
-        :type kwargs: Union[str, bool, dict]
+                        file or with environment variables. `asset_filter` (str or list)
+                        selects the assets to download (see
+                        :class:`~eodag.utils.assets.AssetFilter`).
+        :type kwargs: Union[str, bool, dict, list]
         :returns: The absolute path to the downloaded product in the local filesystem
             (e.g. '/tmp/product.zip' on Linux or
             'C:\\Users\\username\\AppData\\Local\\Temp\\product.zip' on Windows)
@@ -120,6 +155,30 @@ class Download(PluginTopic):
             "A Download plugin must implement a method named download"
         )
 
+    def get_range_fetcher(self, product, url, auth=None):
+        """Get a fetcher of byte ranges of a remote file of a product, used to read
+        it without downloading it (see
+        :meth:`~eodag.api.product._product.EOProduct.open_asset`).
+
+        Ranges are fetched with HTTP range requests, using the session of the plugin.
+
+        :param product: The EO product
+        :type product: :class:`~eodag.api.product._product.EOProduct`
+        :param url: The file URL
+        :type url: str
+        :param auth: (optional) The authentication returned by the authentication
+                     plugin of the product
+        :type auth: :class:`requests.auth.AuthBase`
+        :returns: The range fetcher
+        :rtype: :class:`~eodag.utils.ranges.HttpRangeFetcher`
+        """
+        return HttpRangeFetcher(
+            url,
+            session=self.http_session,
+            auth=auth if isinstance(auth, AuthBase) else None,
+            params=getattr(self.config, "dl_url_params", None),
+        )
+
     def _prepare_download(self, product, progress_callback=None, **kwargs):
         """Check if file has already been downloaded, and prepare product download
 
@@ -127,18 +186,26 @@ class Download(PluginTopic):
         :type product: :class:`~eodag.api.product._product.EOProduct`
         :param progress_callback: (optional) A progress callback
         :type progress_callback: :class:`~eodag.utils.ProgressCallback` or None
-        :returns: fs_path, record_filename
+        :returns: fs_path, record to save once the product is downloaded
         :rtype: tuple
         """
+        asset_filter = AssetFilter.from_value(kwargs.get("asset_filter", None))
+        assets_keys = list(getattr(product, "assets", None) or {})
+
         if product.location != product.remote_location:
             fs_path = uri_to_path(product.location)
             # The fs path of a product is either a file (if 'extract' config is False) or a directory
             if os.path.isfile(fs_path) or os.path.isdir(fs_path):
-                logger.info(
-                    f"Product already present on this platform. Identifier: {fs_path}",
-                )
-                # Do not download data if we are on site. Instead give back the absolute path to the data
-                return fs_path, None
+                if AssetFilter.covers(
+                    self._get_partial_download_filter(product, fs_path),
+                    asset_filter,
+                    assets_keys,
+                ):
+                    logger.info(
+                        f"Product already present on this platform. Identifier: {fs_path}",
+                    )
+                    # Do not download data if we are on site. Instead give back the absolute path to the data
+                    return fs_path, None
 
         url = product.remote_location
         if not url:
@@ -170,21 +237,25 @@ class Download(PluginTopic):
             f"{sanitize(product.properties['title'])}{collision_avoidance_suffix}{outputs_extension}",
         )
         fs_dir_path = fs_path.replace(outputs_extension, "")
-        download_records_dir = os.path.join(prefix, ".downloaded")
-        try:
-            os.makedirs(download_records_dir)
-        except OSError as exc:
-            import errno
-
-            if exc.errno != errno.EEXIST:  # Skip error if dir exists
-                import traceback as tb
-
-                logger.warning(
-                    f"Unable to create records directory. Got:\n{tb.format_exc()}",
+        download_records = self._get_download_records(prefix)
+        record = download_records.get(url)
+        # assets already downloaded, if the product was partially downloaded
+        downloaded_asset_filter = None
+        if (
+            record
+            and record.get("asset_filter", None) is not None
+            and (os.path.isfile(fs_path) or os.path.isdir(fs_dir_path))
+        ):
+            downloaded_asset_filter = record["asset_filter"]
+            if not AssetFilter.covers(
+                downloaded_asset_filter, asset_filter, assets_keys
+            ):
+                logger.info(
+                    f"Completing the partial download of {url} "
+                    f"(assets {downloaded_asset_filter} downloaded)"
                 )
-        url_hash = hashlib.md5(url.encode("utf-8")).hexdigest()
-        record_filename = os.path.join(download_records_dir, url_hash)
-        if os.path.isfile(record_filename) and os.path.isfile(fs_path):
+                record = None
+        if record and os.path.isfile(fs_path):
             logger.info(
                 f"Product already downloaded: {fs_path}",
             )
@@ -192,7 +263,7 @@ class Download(PluginTopic):
                 self._finalize(fs_path, progress_callback=progress_callback, **kwargs),
                 None,
             )
-        elif os.path.isfile(record_filename) and os.path.isdir(fs_dir_path):
+        elif record and os.path.isdir(fs_dir_path):
             logger.info(
                 f"Product already downloaded: {fs_dir_path}",
             )
@@ -202,17 +273,143 @@ class Download(PluginTopic):
                 ),
                 None,
             )
-        # Remove the record file if fs_path is absent (e.g. it was deleted while record wasn't)
-        elif os.path.isfile(record_filename):
+        # Remove the record if fs_path is absent (e.g. it was deleted while record wasn't)
+        elif record:
             logger.debug(
-                f"Record file found ({record_filename}) but not the actual file",
+                f"Record found for {url} but not the actual file",
             )
-            logger.debug(
-                f"Removing record file : {record_filename}",
+            download_records.remove(url)
+
+        # assets downloaded by the previous partial download are kept
+        if asset_filter is not None and downloaded_asset_filter is not None:
+            asset_filter = AssetFilter(
+                asset_filter.patterns + downloaded_asset_filter.patterns
             )
-            os.remove(record_filename)
 
-        return fs_path, record_filename
+        # link the product from the products cache if it is there
+        product_cache = self._get_product_cache()
+        cache_key = get_product_cache_key(product) if product_cache else None
+        cached_path = product_cache.get(cache_key, prefix) if product_cache else None
+        if cached_path:
+            logger.info(
+                f"Product found in products cache: {cached_path}",
+            )
+            download_records.add(url, path=cached_path)
+            return (
+                self._finalize(
+                    cached_path,
+                    progress_callback=progress_callback,
+                    outputs_prefix=prefix,
+                    **kwargs,
+                ),
+                None,
+            )
+
+        return fs_path, DownloadRecord(
+            download_records,
+            url,
+            product_cache=product_cache,
+            cache_key=cache_key,
+            asset_filter=asset_filter,
+        )
+
+    def _get_partial_download_filter(self, product, fs_path):
+        """Get the assets downloaded in ``fs_path``, from the records of its
+        directory, if the product was partially downloaded there
+
+        :param product: The EO product
+        :type product: :class:`~eodag.api.product._product.EOProduct`
+        :param fs_path: The local path of the product
+        :type fs_path: str
+        :returns: The assets downloaded, or ``None`` if the product is complete
+        :rtype: :class:`~eodag.utils.assets.AssetFilter`
+        """
+        records_dir = os.path.join(os.path.dirname(fs_path), RECORDS_DIRNAME)
+        if not product.remote_location or not os.path.isdir(records_dir):
+            return None
+        record = get_download_records(
+            records_dir,
+            getattr(self.config, "download_records", DEFAULT_DOWNLOAD_RECORDS),
+        ).get(product.remote_location)
+        return record.get("asset_filter", None) if record else None
+
+    def _get_checksum_verifier(self, checksum):
+        """Get a verifier of the checksum found in product or asset metadata, if
+        checksums verification is enabled (``verify_checksum``, default: True)
+
+        :param checksum: The checksum metadata
+        :type checksum: Any
+        :returns: The checksum verifier, or ``None``
+        :rtype: :class:`~eodag.utils.checksum.ChecksumVerifier`
+        """
+        if not getattr(self.config, "verify_checksum", True):
+            return None
+        return ChecksumVerifier.from_metadata(checksum)
+
+    def _get_product_cache(self):
+        """Get the products cache from ``cache_dir`` and ``cache_quota`` (in bytes)
+        plugin configuration parameters, if set
+
+        :returns: The products cache or ``None``
+        :rtype: :class:`~eodag.utils.cache.ProductCache`
+        """
+        cache_dir = getattr(self.config, "cache_dir", None)
+        if not cache_dir:
+            return None
+        return get_product_cache(
+            cache_dir, quota=getattr(self.config, "cache_quota", None)
+        )
+
+    def _get_download_records(self, outputs_prefix):
+        """Get the records of the products downloaded in ``outputs_prefix``, using the
+        ``download_records`` backend of the plugin configuration (``sqlite`` or legacy
+        ``files``)
+
+        :param outputs_prefix: The downloads output directory
+        :type outputs_prefix: str
+        :returns: The download records
+        :rtype: :class:`~eodag.utils.records.DownloadRecords`
+        """
+        download_records_dir = os.path.join(
+            os.path.abspath(outputs_prefix), RECORDS_DIRNAME
+        )
+        try:
+            os.makedirs(download_records_dir)
+        except OSError as exc:
+            import errno
+
+            if exc.errno != errno.EEXIST:  # Skip error if dir exists
+                import traceback as tb
+
+                logger.warning(
+                    f"Unable to create records directory. Got:\n{tb.format_exc()}",
+                )
+        return get_download_records(
+            download_records_dir,
+            getattr(self.config, "download_records", DEFAULT_DOWNLOAD_RECORDS),
+        )
+
+    @contextmanager
+    def _prefetch_download_records(self, outputs_prefix, urls):
+        """Look up the download records of many products at once, forgetting on exit
+        the ones which were not used
+
+        :param outputs_prefix: The downloads output directory
+        :type outputs_prefix: str
+        :param urls: The products remote locations
+        :type urls: list
+        """
+        records = None
+        try:
+            records = self._get_download_records(outputs_prefix)
+            records.prefetch(urls)
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(f"Could not look up download records: {e}")
+        try:
+            yield
+        finally:
+            if records is not None:
+                records.clear_prefetched(urls)
 
     def _resolve_archive_depth(self, product_path):
         """Update product_path using archive_depth from provider configuration.
@@ -234,6 +431,20 @@ class Download(PluginTopic):
             count += 1
         return product_path
 
+    def _get_extract_workers(self):
+        """Number of archive members extracted concurrently, from ``extract_workers``
+        configuration parameter"""
+        return max(
+            1,
+            int(
+                getattr(
+                    self.config,
+                    "extract_workers",
+                    min(DEFAULT_EXTRACT_MAX_WORKERS, os.cpu_count() or 1),
+                )
+            ),
+        )
+
     def _finalize(self, fs_path, progress_callback=None, **kwargs):
         """Finalize the download process.
 
@@ -318,33 +529,33 @@ class Download(PluginTopic):
             progress_callback.refresh()
 
             outputs_dir = os.path.join(outputs_prefix, product_path)
-            tmp_dir = tempfile.TemporaryDirectory()
-            extraction_dir = os.path.join(tmp_dir.name, os.path.basename(outputs_dir))
-
-            if fs_path.endswith(".zip"):
-                with zipfile.ZipFile(fs_path, "r") as zfile:
-                    fileinfos = zfile.infolist()
-
-                    progress_callback.reset(total=len(fileinfos))
+            # extract next to the destination, on the same filesystem, to finish with
+            # an atomic rename
+            tmp_dir = tempfile.mkdtemp(prefix=".", dir=os.path.dirname(outputs_dir))
+            extraction_dir = os.path.join(tmp_dir, os.path.basename(outputs_dir))
+
+            try:
+                if fs_path.endswith(".zip"):
+                    with zipfile.ZipFile(fs_path, "r") as zfile:
+                        progress_callback.reset(total=len(zfile.infolist()))
+                    extract_zip(
+                        fs_path,
+                        extraction_dir,
+                        max_workers=self._get_extract_workers(),
+                        progress_callback=progress_callback,
+                    )
+                    os.rename(extraction_dir, outputs_dir)
 
-                    for fileinfo in fileinfos:
-                        zfile.extract(
-                            fileinfo,
-                            path=extraction_dir,
-                        )
+                elif fs_path.endswith(".tar.gz"):
+                    with tarfile.open(fs_path, "r:gz") as zfile:
+                        progress_callback.reset(total=1)
+                        zfile.extractall(path=extraction_dir)
                         progress_callback(1)
-                shutil.move(extraction_dir, outputs_dir)
-
-            elif fs_path.endswith(".tar.gz"):
-                with tarfile.open(fs_path, "r:gz") as zfile:
-                    progress_callback.reset(total=1)
-                    zfile.extractall(path=extraction_dir)
-                    progress_callback(1)
-                shutil.move(extraction_dir, outputs_dir)
-            else:
-                progress_callback(1, total=1)
-
-            tmp_dir.cleanup()
+                    os.rename(extraction_dir, outputs_dir)
+                else:
+                    progress_callback(1, total=1)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
 
             if delete_archive:
                 logger.info(f"Deleting archive {os.path.basename(fs_path)}")
@@ -378,7 +589,13 @@ class Download(PluginTopic):
         Base download_all method.
 
         This specific implementation uses the :meth:`eodag.plugins.download.base.Download.download` method
-        implemented by the plugin to **sequentially** attempt to download products.
+        implemented by the plugin to attempt to download products, using a pool of
+        ``max_workers`` threads (one by default, i.e. **sequentially**). Products are
+        tried in the order of their next download try date, so that available products
+        keep being downloaded while unavailable ones wait for their next try. The
+        storage status of ordered (``STAGING``) products is polled before trying them,
+        if their plugin supports it, their try being postponed while they are not
+        ``ONLINE``.
 
         :param products: Products to download
         :type products: :class:`~eodag.api.search_result.SearchResult`
@@ -401,16 +618,25 @@ class Download(PluginTopic):
         :param kwargs: `outputs_prefix` (str), `extract` (bool), `delete_archive` (bool)
                         and `dl_url_params` (dict) can be provided as additional kwargs
                         and will override any other values defined in a configuration
-                        file or with environment variables.
-        :type kwargs: Union[str, bool, dict]
+                        file or with environment variables. `max_workers` (int) sets
+                        the number of products downloaded concurrently and
+                        `max_workers_per_provider` (int) caps it for each provider.
+                        `asset_filter` (str or list) selects the assets to download
+                        (see :class:`~eodag.utils.assets.AssetFilter`).
+        :type kwargs: Union[str, bool, dict, int, list]
         :returns: List of absolute paths to the downloaded products in the local
             filesystem (e.g. ``['/tmp/product.zip']`` on Linux or
             ``['C:\\Users\\username\\AppData\\Local\\Temp\\product.zip']`` on Windows)
         :rtype: list
         """
-        # Products are going to be removed one by one from this sequence once
-        # downloaded.
         products = products[:]
+        max_workers = max(1, int(kwargs.pop("max_workers", None) or 1))
+        max_workers_per_provider = kwargs.pop("max_workers_per_provider", None)
+        max_workers_per_provider = (
+            max(1, int(max_workers_per_provider))
+            if max_workers_per_provider
+            else max_workers
+        )
         paths = []
         # initiate retry loop
         start_time = datetime.now()
@@ -420,8 +646,17 @@ class Download(PluginTopic):
         # another output for notbooks
         nb_info = NotebookWidgets()
 
-        for product in products:
+        outputs_prefix = (
+            kwargs.get("outputs_prefix", None)
+            or getattr(self.config, "outputs_prefix", tempfile.gettempdir())
+            or tempfile.gettempdir()
+        )
+
+        # products waiting for a download try, prioritized by next try date
+        queue = []
+        for idx, product in enumerate(products):
             product.next_try = start_time
+            heapq.heappush(queue, (product.next_try, idx, product))
 
         # progress bar init
         if progress_callback is None:
@@ -440,40 +675,109 @@ class Download(PluginTopic):
             progress_callback.unit_scale = False
         progress_callback.refresh()
 
-        with progress_callback as bar:
+        def download_product(product, product_progress_callback):
+            path = product.download(
+                progress_callback=product_progress_callback,
+                wait=wait,
+                timeout=-1,
+                **kwargs,
+            )
+            if downloaded_callback:
+                downloaded_callback(product)
+            return path
+
+        running = {}
+        running_per_provider = defaultdict(int)
+        # products already tried, only retried until the stop time
+        tried = set()
+        stopped = False
+
+        # look up the download records of all the products at once
+        with self._prefetch_download_records(
+            outputs_prefix, [product.remote_location for product in products]
+        ), progress_callback as bar, ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
             while "Loop until all products are download or timeout is reached":
-                # try downloading each product before retry
-                for idx, product in enumerate(products):
-                    if datetime.now() >= product.next_try:
-                        products[idx].next_try += timedelta(minutes=wait)
-                        try:
-                            paths.append(
-                                product.download(
-                                    progress_callback=product_progress_callback,
-                                    wait=wait,
-                                    timeout=-1,
-                                    **kwargs,
-                                )
-                            )
+                self._poll_ordered_products(queue, wait)
+                # submit ready products, within global and per-provider limits
+                postponed = []
+                while (
+                    queue
+                    and len(running) < max_workers
+                    and datetime.now() >= queue[0][0]
+                ):
+                    next_try, idx, product = heapq.heappop(queue)
+                    if idx in tried and datetime.now() >= stop_time:
+                        # timeout reached, or stopped after a fatal error
+                        continue
+                    if (
+                        running_per_provider[product.provider]
+                        >= max_workers_per_provider
+                    ):
+                        postponed.append((next_try, idx, product))
+                        continue
+                    product.next_try += timedelta(minutes=wait)
+                    tried.add(idx)
+                    # concurrent downloads cannot share the same product progress bar
+                    task_progress_callback = (
+                        product_progress_callback.copy()
+                        if product_progress_callback is not None and max_workers > 1
+                        else product_progress_callback
+                    )
+                    future = executor.submit(
+                        download_product, product, task_progress_callback
+                    )
+                    running[future] = (idx, product)
+                    running_per_provider[product.provider] += 1
+                for item in postponed:
+                    heapq.heappush(queue, item)
 
-                            if downloaded_callback:
-                                downloaded_callback(product)
+                if not running and not queue:
+                    break
+
+                if running:
+                    # wait for a download to finish or for the next product to retry
+                    next_tries = [
+                        next_try
+                        for next_try, _, product in queue
+                        if running_per_provider[product.provider]
+                        < max_workers_per_provider
+                    ]
+                    next_try_seconds = (
+                        max(0, (min(next_tries) - datetime.now()).total_seconds())
+                        if next_tries and len(running) < max_workers
+                        else None
+                    )
+                    done, _ = wait_futures(
+                        running,
+                        timeout=next_try_seconds,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        idx, product = running.pop(future)
+                        running_per_provider[product.provider] -= 1
+                        try:
+                            paths.append(future.result())
 
                             # product downloaded, to not retry it
                             products.remove(product)
                             bar(1)
 
-                            # reset stop time for next product
-                            stop_time = datetime.now() + timedelta(minutes=timeout)
+                            # reset stop time for next product, unless stopped
+                            if not stopped:
+                                stop_time = datetime.now() + timedelta(minutes=timeout)
 
                         except NotAvailableError as e:
                             logger.info(e)
-                            continue
+                            heapq.heappush(queue, (product.next_try, idx, product))
 
                         except (AuthenticationError, MisconfiguredError):
                             logger.exception(
                                 f"Stopped because of credentials problems with provider {self.provider}"
                             )
+                            for pending in running:
+                                pending.cancel()
                             raise
 
                         except RuntimeError:
@@ -484,6 +788,7 @@ class Download(PluginTopic):
                                 "Skipping it"
                             )
                             logger.debug(f"\n{tb.format_exc()}")
+                            stopped = True
                             stop_time = datetime.now()
 
                         except Exception:
@@ -494,13 +799,12 @@ class Download(PluginTopic):
                                 "Skipping it",
                             )
                             logger.debug(f"\n{tb.format_exc()}")
+                            heapq.heappush(queue, (product.next_try, idx, product))
+                    continue
 
-                if (
-                    len(products) > 0
-                    and datetime.now() < products[0].next_try
-                    and datetime.now() < stop_time
-                ):
-                    wait_seconds = (products[0].next_try - datetime.now()).seconds
+                # nothing running: all remaining products wait for their next try
+                if datetime.now() < queue[0][0] and datetime.now() < stop_time:
+                    wait_seconds = (queue[0][0] - datetime.now()).seconds
                     retry_count += 1
                     info_message = (
                         f"[Retry #{retry_count}, {nb_products - len(products)}/{nb_products} D/L] "
@@ -509,17 +813,69 @@ class Download(PluginTopic):
                     logger.info(info_message)
                     nb_info.display_html(info_message)
                     sleep(wait_seconds + 1)
-                elif len(products) > 0 and datetime.now() >= stop_time:
-                    logger.warning(
-                        f"{len(products)} products could not be downloaded:"
-                        f"{' ' + [prod.properties['title'] for prod in products]}",
-                    )
-                    break
-                elif len(products) == 0:
+                elif datetime.now() >= stop_time:
                     break
 
+        if products:
+            logger.warning(
+                f"{len(products)} products could not be downloaded: "
+                f"{', '.join(prod.properties['title'] for prod in products)}",
+            )
         return paths
 
+    def _get_storage_statuses(self, products):
+        """Poll the storage status of ordered products, without downloading them.
+
+        Plugins able to tell cheaply whether ordered products are online override this
+        method, preferably querying the status of all the products at once.
+
+        :param products: The ordered products
+        :type products: list[:class:`~eodag.api.product._product.EOProduct`]
+        :returns: The storage status of each product, ``None`` if unknown
+        :rtype: list
+        """
+        return [None] * len(products)
+
+    def _poll_ordered_products(self, queue, wait):
+        """Poll the storage status of the ``STAGING`` products ready for a download
+        try, postponing the try of those which are still not online
+
+        :param queue: The products waiting for a download try, as a heap of
+                      ``(next_try, index, product)`` tuples
+        :type queue: list
+        :param wait: Wait time in minutes between two download tries
+        :type wait: int
+        """
+        now = datetime.now()
+        ready = defaultdict(list)
+        for next_try, idx, product in queue:
+            if (
+                next_try <= now
+                and product.properties.get("storageStatus", None) == STAGING_STATUS
+            ):
+                ready[getattr(product, "downloader", None) or self].append(product)
+        postponed = set()
+        for downloader, products in ready.items():
+            if not hasattr(downloader, "_get_storage_statuses"):
+                continue
+            statuses = downloader._get_storage_statuses(products)
+            for product, status in zip(products, statuses):
+                if status is None:
+                    continue
+                product.properties["storageStatus"] = status
+                if status != ONLINE_STATUS:
+                    product.next_try = now + timedelta(minutes=wait)
+                    postponed.add(id(product))
+        if postponed:
+            logger.debug("%s ordered products are not online yet", len(postponed))
+            queue[:] = [
+                (product.next_try, idx, product)
+                if id(product) in postponed
+                else (next_try, idx, product)
+                for next_try, idx, product in queue
+            ]
+            heapq.heapify(queue)
+
     def _download_retry(self, product, wait, timeout):
         """
         Download retry decorator.
@@ -546,6 +902,7 @@ class Download(PluginTopic):
                 product.next_try = start_time
                 retry_count = 0
                 not_available_info = "The product could not be downloaded"
+                retry_server_info = None
                 # another output for notebooks
                 nb_info = NotebookWidgets()
 
@@ -565,7 +922,7 @@ class Download(PluginTopic):
                                     f" {self.provider}, {e}"
                                 )
                             not_available_info = e
-                            pass
+                            retry_server_info = e.retry_after
 
                     if datetime_now >= product.next_try and datetime_now < stop_time:
                         wait_seconds = (
@@ -578,14 +935,10 @@ class Download(PluginTopic):
                         )
                         logger.debug(not_available_info)
                         # Retry-After info from Response header
-                        if hasattr(self, "stream"):
-                            retry_server_info = self.stream.headers.get(
-                                "Retry-After", ""
+                        if retry_server_info:
+                            logger.debug(
+                                f"[{self.provider} response] Retry-After: {retry_server_info}"
                             )
-                            if retry_server_info:
-                                logger.debug(
-                                    f"[{self.provider} response] Retry-After: {retry_server_info}"
-                                )
                         logger.info(retry_info)
                         nb_info.display_html(retry_info)
                         product.next_try = datetime_now
@@ -598,14 +951,10 @@ class Download(PluginTopic):
                         )
                         logger.debug(not_available_info)
                         # Retry-After info from Response header
-                        if hasattr(self, "stream"):
-                            retry_server_info = self.stream.headers.get(
-                                "Retry-After", ""
+                        if retry_server_info:
+                            logger.debug(
+                                f"[{self.provider} response] Retry-After: {retry_server_info}"
                             )
-                            if retry_server_info:
-                                logger.debug(
-                                    f"[{self.provider} response] Retry-After: {retry_server_info}"
-                                )
                         logger.info(retry_info)
                         nb_info.display_html(retry_info)
                         sleep(wait_seconds)
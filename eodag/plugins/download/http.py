@@ -19,38 +19,92 @@
 import logging
 import os
 import shutil
+import tempfile
+import threading
 import zipfile
 from cgi import parse_header
 from urllib.parse import urlparse
 
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from requests import HTTPError, RequestException
+from requests.exceptions import ChunkedEncodingError
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
-from eodag.api.product.metadata_mapping import OFFLINE_STATUS, ONLINE_STATUS
+from eodag.api.product.metadata_mapping import (
+    OFFLINE_STATUS,
+    ONLINE_STATUS,
+    STAGING_STATUS,
+)
 from eodag.plugins.download.base import (
     DEFAULT_DOWNLOAD_TIMEOUT,
     DEFAULT_DOWNLOAD_WAIT,
-    DEFAULT_STREAM_REQUESTS_TIMEOUT,
     Download,
 )
 from eodag.utils import (
     ProgressCallback,
     flatten_top_directories,
+    get_thread_safe_callback,
     path_to_uri,
     uri_to_path,
 )
+from eodag.utils.archive import StreamReader, extract_stream, get_stream_archive_type
 from eodag.utils.exceptions import (
     AuthenticationError,
+    ChecksumError,
+    DownloadError,
     MisconfiguredError,
     NotAvailableError,
 )
-from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT
+from eodag.utils.http import DEFAULT_MAX_RETRIES
+from eodag.utils.orders import get_order_records
+from eodag.utils.streaming import write_stream
 
 logger = logging.getLogger("eodag.plugins.download.http")
 
+# default number of assets of a product downloaded concurrently
+DEFAULT_ASSETS_MAX_WORKERS = 4
+# default number of concurrent transfers per provider
+DEFAULT_MAX_CONNECTIONS = 10
+# suffix of the file storing the validator used to resume a partial download
+RESUME_VALIDATOR_SUFFIX = ".resume"
+# minimum size of a segment of a segmented download
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024
+# default number of orders submitted, or of storage statuses polled, concurrently
+DEFAULT_ORDER_MAX_WORKERS = 4
+
 
 class HTTPDownload(Download):
-    """HTTPDownload plugin. Handles product download over HTTP protocol"""
+    """HTTPDownload plugin. Handles product download over HTTP protocol
+
+    :param provider: provider name
+    :type provider: str
+    :param config: Download plugin configuration:
+
+                    * ``config.base_uri`` (str) - default endpoint url
+                    * ``config.max_workers`` (int) - number of assets of a product
+                      sized and downloaded concurrently (default: 4)
+                    * ``config.max_connections`` (int) - maximum number of concurrent
+                      transfers for the whole provider (default: HTTP pool size)
+                    * ``config.segments`` (int) - number of byte ranges of a product
+                      archive downloaded concurrently, if the server accepts ranges
+                      (default: 1, no segmented download)
+                    * ``config.segment_min_size`` (int) - minimum size in bytes of a
+                      segment (default: 8 MiB)
+                    * ``config.stream_extract`` (bool) - extract zip and tar.gz
+                      archives while they are downloaded, without writing them, when
+                      ``extract`` and ``delete_archive`` are enabled (default: False)
+                    * ``config.verify_checksum`` (bool) - verify downloaded products
+                      and assets against the checksum of their metadata (product
+                      ``checksum`` property, asset ``file:checksum``), downloading
+                      them again on mismatch (default: True)
+                    * ``config.order_max_workers`` (int) - number of offline products
+                      ordered, or whose storage status is polled, concurrently by
+                      ``download_all`` (default: 4)
+                    * ``config.staging_status_codes`` (list) - HTTP status codes
+                      returned while an ordered product is being staged, in addition
+                      to 202 (default: none)
+    :type config: :class:`~eodag.config.PluginConfig`
+    """
 
     def __init__(self, provider, config):
         super(HTTPDownload, self).__init__(provider, config)
@@ -72,7 +126,10 @@ class HTTPDownload(Download):
 
         The downloaded product is assumed to be a Zip file. If it is not,
         the user is warned, it is renamed to remove the zip extension and
-        no further treatment is done (no extraction)
+        no further treatment is done (no extraction).
+
+        If the server accepts byte ranges, an interrupted download is resumed from
+        the partially downloaded file instead of being started over.
         """
         if progress_callback is None:
             logger.info(
@@ -80,10 +137,10 @@ class HTTPDownload(Download):
             )
             progress_callback = ProgressCallback(disable=True)
 
-        fs_path, record_filename = self._prepare_download(
+        fs_path, record = self._prepare_download(
             product, progress_callback=progress_callback, **kwargs
         )
-        if not fs_path or not record_filename:
+        if not fs_path or not record:
             if fs_path:
                 product.location = path_to_uri(fs_path)
             return fs_path
@@ -93,7 +150,7 @@ class HTTPDownload(Download):
             fs_path = self._download_assets(
                 product,
                 fs_path.replace(".zip", ""),
-                record_filename,
+                record,
                 auth,
                 progress_callback,
                 **kwargs,
@@ -101,41 +158,32 @@ class HTTPDownload(Download):
             product.location = path_to_uri(fs_path)
             return fs_path
         except NotAvailableError:
-            pass
+            if record.asset_filter is not None:
+                logger.warning(
+                    f"{product} has no assets, asset filter {record.asset_filter} "
+                    "ignored and the whole product downloaded"
+                )
 
         url = product.remote_location
 
-        # order product if it is offline
+        # order product if it is offline, and was not ordered by a previous run
+        order_records = (
+            get_order_records(record.records.records_dir)
+            if "orderLink" in product.properties
+            else None
+        )
         ordered_message = ""
         if (
-            "orderLink" in product.properties
-            and "storageStatus" in product.properties
-            and product.properties["storageStatus"] == OFFLINE_STATUS
+            order_records is not None
+            and product.properties.get("storageStatus", None) == OFFLINE_STATUS
         ):
-            order_method = getattr(self.config, "order_method", "GET")
-            with requests.request(
-                method=order_method,
-                url=product.properties["orderLink"],
-                auth=auth,
-                headers=getattr(self.config, "order_headers", {}),
-            ) as response:
-                try:
-                    response.raise_for_status()
-                    ordered_message = response.text
-                    logger.debug(ordered_message)
-                    logger.info("%s was ordered", product.properties["title"])
-                except RequestException as e:
-                    logger.warning(
-                        "%s could not be ordered, request returned %s",
-                        product.properties["title"],
-                        e,
-                    )
+            ordered_message = self._order_once(product, auth, order_records)
 
         @self._download_retry(product, wait, timeout)
         def download_request(
             product,
             fs_path,
-            record_filename,
+            record,
             auth,
             progress_callback,
             ordered_message,
@@ -144,15 +192,33 @@ class HTTPDownload(Download):
             params = kwargs.pop("dl_url_params", None) or getattr(
                 self.config, "dl_url_params", {}
             )
-            with requests.get(
-                url,
-                stream=True,
-                auth=auth,
-                params=params,
-                timeout=DEFAULT_STREAM_REQUESTS_TIMEOUT,
-            ) as self.stream:
+            stream_extract = self._get_stream_extract(fs_path, **kwargs)
+            verifier = self._get_checksum_verifier(
+                product.properties.get("checksum", None)
+            )
+            if not stream_extract and self._download_segmented(
+                product, url, fs_path, auth, params, progress_callback
+            ):
+                checksum = None
+                if verifier:
+                    # segments are not received in order
+                    verifier.update_from_file(fs_path)
+                    checksum = self._verify_checksum(verifier, fs_path)
+                return self._finalize_download(
+                    product,
+                    fs_path,
+                    record,
+                    progress_callback,
+                    checksum=checksum,
+                    **kwargs,
+                )
+
+            stream, resume_from = self._open_resumable_stream(
+                url, fs_path, auth=auth, params=params
+            )
+            with stream:
                 try:
-                    self.stream.raise_for_status()
+                    stream.raise_for_status()
 
                 except RequestException as e:
                     # check if error is identified as auth_error in provider conf
@@ -184,7 +250,8 @@ class HTTPDownload(Download):
                                 product.properties["title"],
                                 product.properties["storageStatus"],
                                 msg,
-                            )
+                            ),
+                            retry_after=e.response.headers.get("Retry-After"),
                         )
                     else:
                         import traceback as tb
@@ -194,7 +261,7 @@ class HTTPDownload(Download):
                             tb.format_exc(),
                         )
                 else:
-                    stream_size = int(self.stream.headers.get("content-length", 0))
+                    stream_size = int(stream.headers.get("content-length", 0))
                     if (
                         stream_size == 0
                         and "storageStatus" in product.properties
@@ -205,65 +272,701 @@ class HTTPDownload(Download):
                             % (
                                 product.properties["title"],
                                 product.properties["storageStatus"],
-                                self.stream.reason,
-                            )
+                                stream.reason,
+                            ),
+                            retry_after=stream.headers.get("Retry-After"),
                         )
-                    progress_callback.reset(total=stream_size)
-                    with open(fs_path, "wb") as fhandle:
-                        for chunk in self.stream.iter_content(chunk_size=64 * 1024):
-                            if chunk:
-                                fhandle.write(chunk)
-                                progress_callback(len(chunk))
-
-                    with open(record_filename, "w") as fh:
-                        fh.write(url)
-                    logger.debug("Download recorded in %s", record_filename)
-
-                    # Check that the downloaded file is really a zip file
-                    if not zipfile.is_zipfile(fs_path):
-                        logger.warning(
-                            "Downloaded product is not a Zip File. Please check its file type before using it"
+                    progress_callback.reset(total=resume_from + stream_size)
+                    if stream_extract and not resume_from:
+                        return self._download_extract(
+                            product,
+                            fs_path,
+                            record,
+                            progress_callback,
+                            stream,
+                            verifier=verifier,
+                            **kwargs,
                         )
-                        new_fs_path = fs_path[: fs_path.index(".zip")]
-                        shutil.move(fs_path, new_fs_path)
-                        product.location = path_to_uri(new_fs_path)
-                        return new_fs_path
-                    product_path = self._finalize(
-                        fs_path, progress_callback=progress_callback, **kwargs
+                    if resume_from:
+                        progress_callback(resume_from)
+                        if verifier:
+                            verifier.update_from_file(fs_path)
+                    else:
+                        self._save_resume_validator(fs_path, stream.headers)
+                    with open(fs_path, "ab" if resume_from else "wb") as fhandle:
+                        write_stream(
+                            stream, fhandle, progress_callback, verifier=verifier
+                        )
+                    checksum = None
+                    if verifier:
+                        checksum = self._verify_checksum(verifier, fs_path)
+                    self._remove_resume_validator(fs_path)
+
+                    return self._finalize_download(
+                        product,
+                        fs_path,
+                        record,
+                        progress_callback,
+                        checksum=checksum,
+                        **kwargs,
                     )
-                    product.location = path_to_uri(product_path)
-                    return product_path
 
-        return download_request(
-            product,
-            fs_path,
-            record_filename,
-            auth,
-            progress_callback,
-            ordered_message,
-            **kwargs,
+        resume_attempts = getattr(self.http_session, "max_retries", DEFAULT_MAX_RETRIES)
+        checksum_attempts = resume_attempts
+        while "Loop until download succeeds or cannot be resumed":
+            try:
+                path = download_request(
+                    product,
+                    fs_path,
+                    record,
+                    auth,
+                    progress_callback,
+                    ordered_message,
+                    **kwargs,
+                )
+                if order_records is not None:
+                    order_records.remove(url)
+                return path
+            except (ChunkedEncodingError, RequestsConnectionError) as e:
+                # interrupted transfer: resume it from the partially downloaded file
+                if resume_attempts <= 0 or not os.path.isfile(
+                    fs_path + RESUME_VALIDATOR_SUFFIX
+                ):
+                    raise
+                resume_attempts -= 1
+                logger.warning(
+                    "Download of %s interrupted (%s), resuming it",
+                    product.properties["title"],
+                    e,
+                )
+            except ChecksumError as e:
+                # corrupted transfer: the downloaded file was removed, start over
+                if checksum_attempts <= 0:
+                    raise
+                checksum_attempts -= 1
+                logger.warning("%s, downloading it again", e)
+
+    def order(self, product, auth=None, order_records=None):
+        """Order an offline product, using its ``orderLink`` property. The product
+        becomes ``STAGING`` once ordered.
+
+        :param product: The product to order
+        :type product: :class:`~eodag.api.product._product.EOProduct`
+        :param auth: (optional) The authentication of the request
+        :type auth: :class:`requests.auth.AuthBase`
+        :param order_records: (optional) Orders where the order is recorded
+        :type order_records: :class:`~eodag.utils.orders.OrderRecords`
+        :returns: The message returned by the provider, empty if the order failed
+        :rtype: str
+        """
+        order_method = getattr(self.config, "order_method", "GET")
+        with self.http_session.request(
+            method=order_method,
+            url=product.properties["orderLink"],
+            auth=auth,
+            headers=getattr(self.config, "order_headers", {}),
+        ) as response:
+            try:
+                response.raise_for_status()
+            except RequestException as e:
+                logger.warning(
+                    "%s could not be ordered, request returned %s",
+                    product.properties["title"],
+                    e,
+                )
+                return ""
+            ordered_message = response.text
+        logger.debug(ordered_message)
+        logger.info("%s was ordered", product.properties["title"])
+        product.properties["storageStatus"] = STAGING_STATUS
+        if order_records is not None:
+            order_records.add(product.remote_location, STAGING_STATUS, ordered_message)
+        return ordered_message
+
+    def _order_once(self, product, auth, order_records):
+        """Order an offline product, unless its order was recorded by a previous run
+
+        :returns: The message returned by the provider
+        :rtype: str
+        """
+        order = order_records.get(product.remote_location) if order_records else None
+        if order is None:
+            return self.order(product, auth=auth, order_records=order_records)
+        logger.info(
+            "%s was already ordered on %s",
+            product.properties["title"],
+            order["timestamp"],
         )
+        product.properties["storageStatus"] = order["status"]
+        return order["message"] or ""
+
+    def _get_order_max_workers(self):
+        """Number of orders submitted, or storage statuses polled, concurrently"""
+        return max(
+            1, int(getattr(self.config, "order_max_workers", DEFAULT_ORDER_MAX_WORKERS))
+        )
+
+    def _order_products(self, products, outputs_prefix=None):
+        """Order up front all the offline products, ``order_max_workers`` at a time,
+        so that the provider stages them while online products are downloaded.
+        Products ordered by a previous run on the same output directory are not
+        ordered again.
+
+        :param products: The products to download
+        :type products: list[:class:`~eodag.api.product._product.EOProduct`]
+        :param outputs_prefix: (optional) The downloads output directory
+        :type outputs_prefix: str
+        """
+        to_order = [
+            product
+            for product in products
+            if product.properties.get("storageStatus", None) == OFFLINE_STATUS
+            and "orderLink" in product.properties
+            and (getattr(product, "downloader", None) or self) is self
+            and product.remote_location
+        ]
+        if not to_order:
+            return
+        outputs_prefix = (
+            outputs_prefix
+            or getattr(self.config, "outputs_prefix", tempfile.gettempdir())
+            or tempfile.gettempdir()
+        )
+        order_records = get_order_records(
+            self._get_download_records(outputs_prefix).records_dir
+        )
+        orders = order_records.get_many([p.remote_location for p in to_order])
+        auths = self._authenticate_products(to_order)
+
+        def order_product(product):
+            try:
+                if product.remote_location in orders:
+                    order = orders[product.remote_location]
+                    product.properties["storageStatus"] = order["status"]
+                else:
+                    self.order(
+                        product, auth=auths[id(product)], order_records=order_records
+                    )
+            except RequestException as e:
+                logger.warning(
+                    "%s could not be ordered: %s", product.properties["title"], e
+                )
+
+        logger.info(
+            "Ordering %s offline products (%s already ordered)",
+            len(to_order) - len(orders),
+            len(orders),
+        )
+        with ThreadPoolExecutor(
+            max_workers=min(self._get_order_max_workers(), len(to_order))
+        ) as executor:
+            list(executor.map(order_product, to_order))
+
+    def _authenticate_products(self, products):
+        """Authentication of the requests of each product, using its authentication
+        plugin, authenticated once for all the products sharing it
+
+        :returns: The authentications, by product ``id()``
+        :rtype: dict
+        """
+        auths = {}
+        plugins_auths = {}
+        for product in products:
+            auth_plugin = getattr(product, "downloader_auth", None)
+            if auth_plugin is None:
+                auths[id(product)] = None
+                continue
+            if id(auth_plugin) not in plugins_auths:
+                plugins_auths[id(auth_plugin)] = auth_plugin.authenticate()
+            auths[id(product)] = plugins_auths[id(auth_plugin)]
+        return auths
+
+    def _get_storage_statuses(self, products):
+        """Poll the storage status of ordered products with ``HEAD`` requests on their
+        download url, ``order_max_workers`` at a time: a product is online once a
+        non-empty file is returned, and staging while 202 or one of the
+        ``staging_status_codes`` is returned. Other errors, and servers not sending
+        the size of the file, leave the status unknown: the download will raise the
+        actual error.
+
+        :param products: The ordered products
+        :type products: list[:class:`~eodag.api.product._product.EOProduct`]
+        :returns: The storage status of each product, ``None`` if unknown
+        :rtype: list
+        """
+        auths = self._authenticate_products(products)
+        params = getattr(self.config, "dl_url_params", {})
+        staging_codes = getattr(self.config, "staging_status_codes", None) or []
+        if not isinstance(staging_codes, list):
+            staging_codes = [staging_codes]
+        staging_codes = {202, *(int(code) for code in staging_codes)}
+
+        def poll(product):
+            try:
+                with self.http_session.head(
+                    product.remote_location,
+                    auth=auths[id(product)],
+                    params=params,
+                    allow_redirects=True,
+                    timeout=self.http_session.timeout,
+                ) as response:
+                    status_code = response.status_code
+                    size = response.headers.get("Content-Length", None)
+            except RequestException as e:
+                logger.debug(
+                    "Storage status of %s not polled: %s",
+                    product.properties["title"],
+                    e,
+                )
+                return None
+            if status_code in staging_codes:
+                return STAGING_STATUS
+            if status_code >= 400:
+                return None
+            if size == "0":
+                return STAGING_STATUS
+            return ONLINE_STATUS if size else None
+
+        with ThreadPoolExecutor(
+            max_workers=min(self._get_order_max_workers(), len(products))
+        ) as executor:
+            return list(executor.map(poll, products))
+
+    def _verify_checksum(self, verifier, path, name=None):
+        """Verify the checksum of a downloaded file, removing the file if it does not
+        match so that it is downloaded again from scratch
+
+        :param verifier: The checksum computed during the download
+        :type verifier: :class:`~eodag.utils.checksum.ChecksumVerifier`
+        :param path: The downloaded file
+        :type path: str
+        :param name: (optional) Name of the downloaded data used in error messages,
+                     ``path`` by default
+        :type name: str
+        :returns: The verified checksum, as ``<algorithm>:<hex digest>``
+        :rtype: str
+        :raises: :class:`~eodag.utils.exceptions.ChecksumError`
+        """
+        try:
+            return verifier.verify(name or path)
+        except ChecksumError:
+            self._remove_resume_validator(path)
+            if os.path.isfile(path):
+                os.remove(path)
+            raise
+
+    def _finalize_download(
+        self, product, fs_path, record, progress_callback, checksum=None, **kwargs
+    ):
+        """Record the downloaded file and finalize it (extraction, ...)
+
+        :param checksum: (optional) The verified checksum of the downloaded file
+        :type checksum: str
+        :returns: The absolute path to the downloaded product
+        :rtype: str
+        """
+        record.save(fs_path, checksum=checksum)
+
+        # Check that the downloaded file is really a zip file
+        if not zipfile.is_zipfile(fs_path):
+            logger.warning(
+                "Downloaded product is not a Zip File. Please check its file type before using it"
+            )
+            new_fs_path = fs_path[: fs_path.index(".zip")]
+            shutil.move(fs_path, new_fs_path)
+            product.location = path_to_uri(new_fs_path)
+            return new_fs_path
+        product_path = self._finalize(
+            fs_path, progress_callback=progress_callback, **kwargs
+        )
+        product.location = path_to_uri(product_path)
+        return product_path
+
+    def _get_stream_extract(self, fs_path, **kwargs):
+        """Whether the archive should be extracted while it is downloaded: requires
+        ``stream_extract``, ``extract`` and ``delete_archive`` to be enabled, and no
+        partial download to resume"""
+        stream_extract = kwargs.get("stream_extract", None)
+        if stream_extract is None:
+            stream_extract = getattr(self.config, "stream_extract", False)
+        extract = kwargs.get("extract", None)
+        if extract is None:
+            extract = getattr(self.config, "extract", True)
+        delete_archive = kwargs.get("delete_archive", None)
+        if delete_archive is None:
+            delete_archive = getattr(self.config, "delete_archive", True)
+        return bool(
+            stream_extract
+            and extract
+            and delete_archive
+            and fs_path.endswith(kwargs.get("outputs_extension", ".zip"))
+            and not os.path.isfile(fs_path + RESUME_VALIDATOR_SUFFIX)
+        )
+
+    def _download_extract(
+        self,
+        product,
+        fs_path,
+        record,
+        progress_callback,
+        stream,
+        verifier=None,
+        **kwargs,
+    ):
+        """Extract the archive from a download stream, without writing it.
+
+        Members are extracted in a temporary directory next to the product
+        directory, which is renamed once the archive is complete and its checksum
+        verified. If the stream is not a supported archive, it is written to
+        ``fs_path`` as usual.
+
+        :param stream: The response of the download request, already checked
+        :type stream: :class:`requests.Response`
+        :returns: The absolute path to the downloaded product
+        :rtype: str
+        """
+
+        def chunks():
+            for chunk in stream.iter_content(chunk_size=64 * 1024):
+                if chunk:
+                    if verifier:
+                        verifier.update(chunk)
+                    progress_callback(len(chunk))
+                    yield chunk
+
+        reader = StreamReader(chunks())
+        if get_stream_archive_type(reader) is None:
+            logger.debug("Download of %s cannot be extracted on the fly", fs_path)
+            with open(fs_path, "wb") as fhandle:
+                for chunk in iter(lambda: reader.read(64 * 1024), b""):
+                    fhandle.write(chunk)
+            checksum = None
+            if verifier:
+                checksum = self._verify_checksum(verifier, fs_path)
+            return self._finalize_download(
+                product,
+                fs_path,
+                record,
+                progress_callback,
+                checksum=checksum,
+                **kwargs,
+            )
+
+        product_path = fs_path[: fs_path.index(kwargs.get("outputs_extension", ".zip"))]
+        if os.path.isfile(product_path):
+            os.remove(product_path)
+        elif os.path.isdir(product_path) and not os.listdir(product_path):
+            os.rmdir(product_path)
+        tmp_dir = tempfile.mkdtemp(prefix=".", dir=os.path.dirname(product_path))
+        checksum = None
+        try:
+            extraction_dir = os.path.join(tmp_dir, os.path.basename(product_path))
+            logger.info("Extracting files from %s while downloading", fs_path)
+            extract_stream(reader, extraction_dir)
+            if verifier:
+                # consume the archive padding, if any
+                for _ in iter(lambda: reader.read(64 * 1024), b""):
+                    pass
+                checksum = verifier.verify(fs_path)
+            if os.path.isdir(product_path):
+                logger.info(
+                    f"Destination directory already exists and is not empty, keeping it: {product_path}"
+                )
+            else:
+                os.rename(extraction_dir, product_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        record.save(product_path, checksum=checksum)
+
+        product_path = self._resolve_archive_depth(product_path)
+        product.location = path_to_uri(product_path)
+        return product_path
+
+    def _download_segmented(
+        self, product, url, fs_path, auth, params, progress_callback
+    ):
+        """Download the file in ``config.segments`` byte ranges fetched concurrently
+        into a preallocated file, if the server accepts ranges.
+
+        :returns: ``True`` if the file was downloaded, ``False`` if segmented
+                  download is not enabled or not supported for this file
+        :rtype: bool
+        """
+        segments = int(getattr(self.config, "segments", 1) or 1)
+        if (
+            segments < 2
+            or product.properties.get("storageStatus", ONLINE_STATUS) != ONLINE_STATUS
+            # a partial download is being resumed
+            or os.path.isfile(fs_path + RESUME_VALIDATOR_SUFFIX)
+        ):
+            return False
+
+        try:
+            with self.http_session.head(
+                url,
+                auth=auth,
+                params=params,
+                allow_redirects=True,
+                timeout=self.http_session.timeout,
+            ) as response:
+                response.raise_for_status()
+                headers = response.headers
+        except RequestException as e:
+            logger.debug("Segmented download not available for %s: %s", url, e)
+            return False
+
+        size = int(headers.get("Content-Length", 0) or 0)
+        min_size = int(getattr(self.config, "segment_min_size", SEGMENT_MIN_SIZE))
+        if (
+            headers.get("Accept-Ranges", "").lower() != "bytes"
+            or size < segments * min_size
+        ):
+            return False
+        validator = self._get_resume_validator(headers)
+        logger.debug("Downloading %s in %s segments", url, segments)
+
+        # preallocate the file, each segment is written at its offset
+        with open(fs_path, "wb") as fh:
+            fh.truncate(size)
+
+        progress_callback.reset(total=size)
+        update_progress = get_thread_safe_callback(progress_callback)
+
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [
+                executor.submit(
+                    self._download_segment,
+                    url,
+                    fs_path,
+                    i * size // segments,
+                    (i + 1) * size // segments - 1,
+                    auth,
+                    params,
+                    validator,
+                    update_progress,
+                )
+                for i in range(segments)
+            ]
+            written = 0
+            try:
+                for future in as_completed(futures):
+                    written += future.result()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        # the file was preallocated, its size does not tell whether it is complete
+        if written != size:
+            raise DownloadError(
+                f"{written} bytes of {fs_path} downloaded, {size} expected"
+            )
+        return True
+
+    def _download_segment(
+        self, url, fs_path, start, end, auth, params, validator, progress_callback
+    ):
+        """Download the ``start``-``end`` byte range of the file into ``fs_path``,
+        resuming the range if its transfer is interrupted
+
+        :returns: The number of bytes written
+        :rtype: int
+        """
+        offset = start
+        attempts = getattr(self.http_session, "max_retries", DEFAULT_MAX_RETRIES)
+        headers = {"If-Range": validator} if validator else {}
+        with self._get_transfer_slots(), open(fs_path, "r+b") as fh:
+            while offset <= end:
+                fh.seek(offset)
+                try:
+                    with self.http_session.get(
+                        url,
+                        stream=True,
+                        auth=auth,
+                        params=params,
+                        headers=dict(headers, Range=f"bytes={offset}-{end}"),
+                        timeout=self.http_session.stream_timeout,
+                    ) as stream:
+                        stream.raise_for_status()
+                        if stream.status_code != 206 or not stream.headers.get(
+                            "Content-Range", ""
+                        ).startswith(f"bytes {offset}-"):
+                            raise DownloadError(
+                                f"Unexpected response to range request of {url}: "
+                                f"{stream.status_code} {stream.headers.get('Content-Range', '')}"
+                            )
+                        offset += write_stream(
+                            stream, fh, progress_callback, limit=end + 1 - offset
+                        )
+                except (ChunkedEncodingError, RequestsConnectionError) as e:
+                    # resume from the data written before the interruption
+                    offset = fh.tell()
+                    if attempts <= 0:
+                        raise
+                    logger.debug(
+                        "Segment %s-%s of %s interrupted (%s), resuming it",
+                        offset,
+                        end,
+                        url,
+                        e,
+                    )
+                    attempts -= 1
+                    continue
+                if offset <= end:
+                    # incomplete range returned
+                    if attempts <= 0:
+                        raise DownloadError(
+                            f"Incomplete segment {start}-{end} downloaded from {url}"
+                        )
+                    attempts -= 1
+        return offset - start
+
+    def _open_resumable_stream(self, url, fs_path, auth=None, params=None):
+        """Send a streamed GET request, resuming the partial download of ``fs_path``
+        if any, using ``Range`` and ``If-Range`` headers. If the partial file cannot
+        be resumed (remote file changed, range not satisfiable), the whole file is
+        requested again.
+
+        :param url: The url of the file to download
+        :type url: str
+        :param fs_path: Local path of the (partially) downloaded file
+        :type fs_path: str
+        :param auth: (optional) Authentication to use for the request
+        :type auth: :class:`requests.auth.AuthBase`
+        :param params: (optional) Extra query parameters
+        :type params: dict
+        :returns: The response and the number of bytes already downloaded that
+                  it continues
+        :rtype: tuple
+        """
+        resume_from, headers = self._get_resume_headers(fs_path)
+        if not resume_from:
+            return (
+                self.http_session.get(
+                    url,
+                    stream=True,
+                    auth=auth,
+                    params=params,
+                    timeout=self.http_session.stream_timeout,
+                ),
+                0,
+            )
+
+        stream = self.http_session.get(
+            url,
+            stream=True,
+            auth=auth,
+            params=params,
+            headers=headers,
+            timeout=self.http_session.stream_timeout,
+        )
+
+        content_range = stream.headers.get("Content-Range", "")
+        if stream.status_code == 206 and content_range.startswith(
+            f"bytes {resume_from}-"
+        ):
+            logger.info("Resuming download of %s from byte %s", fs_path, resume_from)
+            return stream, resume_from
+        elif stream.status_code in (206, 416):
+            # unexpected range: download the whole file again
+            stream.close()
+            self._remove_resume_validator(fs_path)
+            os.remove(fs_path)
+            stream = self.http_session.get(
+                url,
+                stream=True,
+                auth=auth,
+                params=params,
+                timeout=self.http_session.stream_timeout,
+            )
+        else:
+            # the remote file changed or ranges are not supported, and the server
+            # returned the whole file
+            logger.debug("Download of %s cannot be resumed", fs_path)
+        return stream, 0
+
+    def _get_resume_headers(self, fs_path):
+        """Build the headers needed to resume the partial download of ``fs_path``
+
+        :returns: The number of bytes already downloaded and the request headers
+        :rtype: tuple
+        """
+        validator_path = fs_path + RESUME_VALIDATOR_SUFFIX
+        if not os.path.isfile(fs_path) or not os.path.isfile(validator_path):
+            return 0, {}
+        with open(validator_path) as fh:
+            validator = fh.read().strip()
+        resume_from = os.path.getsize(fs_path)
+        if not validator or not resume_from:
+            return 0, {}
+        return resume_from, {"Range": f"bytes={resume_from}-", "If-Range": validator}
+
+    def _save_resume_validator(self, fs_path, headers):
+        """Save next to ``fs_path`` the validator (strong ``ETag`` or ``Last-Modified``)
+        that will allow to resume its download, if the server accepts ranges"""
+        validator = None
+        if str(headers.get("Accept-Ranges", "")).lower() == "bytes":
+            validator = self._get_resume_validator(headers)
+        if validator:
+            with open(fs_path + RESUME_VALIDATOR_SUFFIX, "w") as fh:
+                fh.write(validator)
+        else:
+            self._remove_resume_validator(fs_path)
+
+    @staticmethod
+    def _get_resume_validator(headers):
+        """Get the validator of a response usable in ``If-Range`` headers: its strong
+        ``ETag`` or its ``Last-Modified`` date
+
+        :returns: The validator or ``None``
+        :rtype: str
+        """
+        etag = headers.get("ETag", None)
+        if isinstance(etag, str) and etag and not etag.startswith("W/"):
+            return etag
+        last_modified = headers.get("Last-Modified", None)
+        if isinstance(last_modified, str) and last_modified:
+            return last_modified
+        return None
+
+    def _remove_resume_validator(self, fs_path):
+        """Remove the resume validator of ``fs_path`` if it exists"""
+        validator_path = fs_path + RESUME_VALIDATOR_SUFFIX
+        if os.path.isfile(validator_path):
+            os.remove(validator_path)
 
     def _download_assets(
         self,
         product,
         fs_dir_path,
-        record_filename,
+        record,
         auth=None,
         progress_callback=None,
         **kwargs,
     ):
-        """Download product assets if they exist"""
-        assets_urls = [
-            a["href"] for a in getattr(product, "assets", {}).values() if "href" in a
-        ]
-        assets_values = [
-            a for a in getattr(product, "assets", {}).values() if "href" in a
-        ]
+        """Download product assets if they exist, only the assets selected by the
+        ``asset_filter`` of the record if it is set"""
+        assets = {
+            key: a for key, a in getattr(product, "assets", {}).items() if "href" in a
+        }
 
-        if not assets_urls:
+        if not assets:
             raise NotAvailableError("No assets available for %s" % product)
 
+        # filter assets before sizing and transfer
+        partial = False
+        if record.asset_filter is not None:
+            selected_keys = record.asset_filter.filter_keys(assets)
+            if not selected_keys:
+                raise DownloadError(
+                    f"No asset of {product} matches {record.asset_filter}"
+                )
+            partial = len(selected_keys) < len(assets)
+            assets = {key: assets[key] for key in selected_keys}
+        assets_urls = [a["href"] for a in assets.values()]
+        assets_values = list(assets.values())
+
         # remove existing incomplete file
         if os.path.isfile(fs_dir_path):
             os.remove(fs_dir_path)
@@ -284,128 +987,68 @@ class HTTPDownload(Download):
             self.config, "dl_url_params", {}
         )
 
-        total_size = 0
-        # loop for assets size & filename
-        for asset in assets_values:
-            if not asset["href"].startswith("file:"):
-                # HEAD request for size & filename
-                asset_headers = requests.head(
-                    asset["href"], auth=auth, timeout=HTTP_REQ_TIMEOUT
-                ).headers
-                header_content_disposition_dict = {}
-
-                if not asset.get("size", 0):
-                    # size from HEAD header / Content-length
-                    asset["size"] = int(asset_headers.get("Content-length", 0))
-
-                if not asset.get("size", 0) or not asset.get("filename", 0):
-                    # header content-disposition
-                    header_content_disposition_dict = parse_header(
-                        asset_headers.get("content-disposition", "")
-                    )[-1]
-                if not asset.get("size", 0):
-                    # size from HEAD header / content-disposition / size
-                    asset["size"] = int(header_content_disposition_dict.get("size", 0))
-                if not asset.get("filename", 0):
-                    # filename from HEAD header / content-disposition / size
-                    asset["filename"] = header_content_disposition_dict.get(
-                        "filename", None
-                    )
-
-                if not asset.get("size", 0):
-                    # GET request for size
-                    with requests.get(
-                        asset["href"],
-                        stream=True,
-                        auth=auth,
-                        params=params,
-                        timeout=DEFAULT_STREAM_REQUESTS_TIMEOUT,
-                    ) as stream:
-                        # size from GET header / Content-length
-                        asset["size"] = int(stream.headers.get("Content-length", 0))
-                        if not asset.get("size", 0):
-                            # size from GET header / content-disposition / size
-                            asset["size"] = int(
-                                parse_header(
-                                    stream.headers.get("content-disposition", "")
-                                )[-1].get("size", 0)
-                            )
-
-                total_size += asset["size"]
-
-        progress_callback.reset(total=total_size)
-        error_messages = set()
-
         local_assets_count = 0
-
-        # loop for assets download
+        remote_assets = []
         for asset in assets_values:
-
             if asset["href"].startswith("file:"):
                 logger.info(
                     f"Local asset detected. Download skipped for {asset['href']}"
                 )
                 local_assets_count += 1
-                continue
+            else:
+                remote_assets.append(asset)
 
-            with requests.get(
-                asset["href"],
-                stream=True,
-                auth=auth,
-                params=params,
-                timeout=DEFAULT_STREAM_REQUESTS_TIMEOUT,
-            ) as stream:
-                try:
-                    stream.raise_for_status()
-                except RequestException as e:
-                    # check if error is identified as auth_error in provider conf
-                    auth_errors = getattr(self.config, "auth_error_code", [None])
-                    if not isinstance(auth_errors, list):
-                        auth_errors = [auth_errors]
-                    if e.response.status_code in auth_errors:
-                        raise AuthenticationError(
-                            "HTTP Error %s returned, %s\nPlease check your credentials for %s"
-                            % (
-                                e.response.status_code,
-                                e.response.text.strip(),
-                                self.provider,
-                            )
-                        )
-                    else:
-                        logger.warning("Unexpected error: %s" % e)
-                        logger.warning("Skipping %s" % asset["href"])
-                    error_messages.add(str(e))
-                else:
-                    asset_rel_path = urlparse(asset["href"]).path.strip("/")
-                    asset_rel_dir = os.path.dirname(asset_rel_path)
+        max_workers = max(1, min(self._get_assets_max_workers(), len(remote_assets)))
+        transfer_slots = self._get_transfer_slots()
 
-                    if not asset.get("filename", None):
-                        # try getting filename in GET header if was not found in HEAD result
-                        asset_content_disposition_dict = stream.headers.get(
-                            "content-disposition", None
-                        )
-                        if asset_content_disposition_dict:
-                            asset["filename"] = parse_header(
-                                asset_content_disposition_dict
-                            )[-1].get("filename", None)
+        # assets sizes & filenames
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            assets_sizes = list(
+                executor.map(
+                    lambda asset: self._get_asset_size(
+                        asset, auth, params, transfer_slots
+                    ),
+                    remote_assets,
+                )
+            )
+        # assets already downloaded by a previous partial download are skipped
+        pending_assets = [
+            (asset, size)
+            for asset, size in zip(remote_assets, assets_sizes)
+            if not os.path.isfile(self._get_asset_path(asset, fs_dir_path))
+        ]
+        remote_assets = [asset for asset, _ in pending_assets]
+        total_size = sum(size for _, size in pending_assets)
 
-                    if not asset.get("filename", None):
-                        # default filename extracted from path
-                        asset["filename"] = os.path.basename(asset_rel_path)
+        progress_callback.reset(total=total_size)
+        # the aggregated progress callback is shared by all the transfer threads
+        update_progress = get_thread_safe_callback(progress_callback)
 
-                    asset_abs_path = os.path.join(
-                        fs_dir_path, asset_rel_dir, asset["filename"]
-                    )
-                    asset_abs_path_dir = os.path.dirname(asset_abs_path)
-                    if not os.path.isdir(asset_abs_path_dir):
-                        os.makedirs(asset_abs_path_dir)
+        error_messages = set()
 
-                    if not os.path.isfile(asset_abs_path):
-                        with open(asset_abs_path, "wb") as fhandle:
-                            for chunk in stream.iter_content(chunk_size=64 * 1024):
-                                if chunk:
-                                    fhandle.write(chunk)
-                                    progress_callback(len(chunk))
+        # assets download
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._download_asset,
+                    asset,
+                    fs_dir_path,
+                    auth,
+                    params,
+                    update_progress,
+                    transfer_slots,
+                )
+                for asset in remote_assets
+            ]
+            try:
+                for future in as_completed(futures):
+                    error_message = future.result()
+                    if error_message:
+                        error_messages.add(error_message)
+            except AuthenticationError:
+                for future in futures:
+                    future.cancel()
+                raise
 
         # only one local asset
         if local_assets_count == len(assets_urls) and local_assets_count == 1:
@@ -424,17 +1067,198 @@ class HTTPDownload(Download):
         elif len(os.listdir(fs_dir_path)) == 0:
             raise HTTPError(", ".join(error_messages))
 
-        # flatten directory structure
-        if flatten_top_dirs:
+        # flatten directory structure, once all the assets are downloaded
+        if flatten_top_dirs and not partial:
             flatten_top_directories(fs_dir_path)
 
-        # save hash/record file
-        with open(record_filename, "w") as fh:
-            fh.write(product.remote_location)
-        logger.debug("Download recorded in %s", record_filename)
+        # save download record
+        record.save(fs_dir_path, partial=partial)
 
         return fs_dir_path
 
+    def _get_assets_max_workers(self):
+        """Number of assets of a product that can be transferred concurrently"""
+        return int(getattr(self.config, "max_workers", DEFAULT_ASSETS_MAX_WORKERS))
+
+    def _get_transfer_slots(self):
+        """Semaphore bounding the number of concurrent transfers of the provider,
+        shared by all the products downloaded using this plugin"""
+        if getattr(self, "_transfer_slots", None) is None:
+            max_connections = int(
+                getattr(
+                    self.config,
+                    "max_connections",
+                    getattr(self.http_session, "pool_maxsize", DEFAULT_MAX_CONNECTIONS),
+                )
+            )
+            self._transfer_slots = threading.BoundedSemaphore(max(1, max_connections))
+        return self._transfer_slots
+
+    def _get_asset_path(self, asset, fs_dir_path):
+        """Local path of an asset, using the filename found while getting its size,
+        or the name of its url path
+
+        :param asset: The asset
+        :type asset: dict
+        :param fs_dir_path: The product directory
+        :type fs_dir_path: str
+        :returns: The asset path
+        :rtype: str
+        """
+        asset_rel_path = urlparse(asset["href"]).path.strip("/")
+        return os.path.join(
+            fs_dir_path,
+            os.path.dirname(asset_rel_path),
+            asset.get("filename", None) or os.path.basename(asset_rel_path),
+        )
+
+    def _get_asset_size(self, asset, auth, params, transfer_slots):
+        """Get asset size and filename, using HEAD request headers and then GET
+        request headers if needed. The asset dict is updated in place.
+
+        :returns: The asset size in bytes, 0 if unknown
+        :rtype: int
+        """
+        with transfer_slots:
+            # HEAD request for size & filename
+            asset_headers = self.http_session.head(
+                asset["href"], auth=auth, timeout=self.http_session.timeout
+            ).headers
+            header_content_disposition_dict = {}
+
+            if not asset.get("size", 0):
+                # size from HEAD header / Content-length
+                asset["size"] = int(asset_headers.get("Content-length", 0))
+
+            if not asset.get("size", 0) or not asset.get("filename", 0):
+                # header content-disposition
+                header_content_disposition_dict = parse_header(
+                    asset_headers.get("content-disposition", "")
+                )[-1]
+            if not asset.get("size", 0):
+                # size from HEAD header / content-disposition / size
+                asset["size"] = int(header_content_disposition_dict.get("size", 0))
+            if not asset.get("filename", 0):
+                # filename from HEAD header / content-disposition / size
+                asset["filename"] = header_content_disposition_dict.get(
+                    "filename", None
+                )
+
+            if not asset.get("size", 0):
+                # GET request for size
+                with self.http_session.get(
+                    asset["href"],
+                    stream=True,
+                    auth=auth,
+                    params=params,
+                    timeout=self.http_session.stream_timeout,
+                ) as stream:
+                    # size from GET header / Content-length
+                    asset["size"] = int(stream.headers.get("Content-length", 0))
+                    if not asset.get("size", 0):
+                        # size from GET header / content-disposition / size
+                        asset["size"] = int(
+                            parse_header(stream.headers.get("content-disposition", ""))[
+                                -1
+                            ].get("size", 0)
+                        )
+
+        return asset["size"]
+
+    def _download_asset(
+        self, asset, fs_dir_path, auth, params, progress_callback, transfer_slots
+    ):
+        """Download a single asset in the product directory, downloading it again if
+        it does not match its checksum (STAC ``file:checksum``)
+
+        :returns: An error message if the asset could not be downloaded, else None
+        :rtype: str
+        """
+        attempts = getattr(self.http_session, "max_retries", DEFAULT_MAX_RETRIES)
+        while "Loop until the asset matches its checksum":
+            try:
+                return self._transfer_asset(
+                    asset, fs_dir_path, auth, params, progress_callback, transfer_slots
+                )
+            except ChecksumError as e:
+                if attempts <= 0:
+                    raise
+                attempts -= 1
+                logger.warning("%s, downloading it again", e)
+
+    def _transfer_asset(
+        self, asset, fs_dir_path, auth, params, progress_callback, transfer_slots
+    ):
+        """Transfer a single asset in the product directory, verifying its checksum
+
+        :returns: An error message if the asset could not be downloaded, else None
+        :rtype: str
+        """
+        with transfer_slots, self.http_session.get(
+            asset["href"],
+            stream=True,
+            auth=auth,
+            params=params,
+            timeout=self.http_session.stream_timeout,
+        ) as stream:
+            try:
+                stream.raise_for_status()
+            except RequestException as e:
+                # check if error is identified as auth_error in provider conf
+                auth_errors = getattr(self.config, "auth_error_code", [None])
+                if not isinstance(auth_errors, list):
+                    auth_errors = [auth_errors]
+                if e.response.status_code in auth_errors:
+                    raise AuthenticationError(
+                        "HTTP Error %s returned, %s\nPlease check your credentials for %s"
+                        % (
+                            e.response.status_code,
+                            e.response.text.strip(),
+                            self.provider,
+                        )
+                    )
+                else:
+                    logger.warning("Unexpected error: %s" % e)
+                    logger.warning("Skipping %s" % asset["href"])
+                return str(e)
+            else:
+                asset_rel_path = urlparse(asset["href"]).path.strip("/")
+                asset_rel_dir = os.path.dirname(asset_rel_path)
+
+                if not asset.get("filename", None):
+                    # try getting filename in GET header if was not found in HEAD result
+                    asset_content_disposition_dict = stream.headers.get(
+                        "content-disposition", None
+                    )
+                    if asset_content_disposition_dict:
+                        asset["filename"] = parse_header(
+                            asset_content_disposition_dict
+                        )[-1].get("filename", None)
+
+                if not asset.get("filename", None):
+                    # default filename extracted from path
+                    asset["filename"] = os.path.basename(asset_rel_path)
+
+                asset_abs_path = os.path.join(
+                    fs_dir_path, asset_rel_dir, asset["filename"]
+                )
+                asset_abs_path_dir = os.path.dirname(asset_abs_path)
+                os.makedirs(asset_abs_path_dir, exist_ok=True)
+
+                if not os.path.isfile(asset_abs_path):
+                    verifier = self._get_checksum_verifier(
+                        asset.get("file:checksum", asset.get("checksum", None))
+                    )
+                    with open(asset_abs_path, "wb") as fhandle:
+                        write_stream(
+                            stream, fhandle, progress_callback, verifier=verifier
+                        )
+                    if verifier:
+                        self._verify_checksum(
+                            verifier, asset_abs_path, name=asset["href"]
+                        )
+        return None
+
     def download_all(
         self,
         products,
@@ -446,8 +1270,11 @@ class HTTPDownload(Download):
         **kwargs,
     ):
         """
-        Download all using parent (base plugin) method
+        Download all using parent (base plugin) method, after having ordered all the
+        offline products up front. Ordered products are then downloaded as soon as
+        their polled storage status is ``ONLINE``.
         """
+        self._order_products(products, kwargs.get("outputs_prefix", None))
         return super(HTTPDownload, self).download_all(
             products,
             auth=auth,
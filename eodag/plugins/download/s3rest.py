@@ -16,7 +16,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import hashlib
 import logging
 import os
 import os.path
@@ -27,7 +26,7 @@ import requests
 from requests import RequestException
 
 from eodag.api.product.metadata_mapping import OFFLINE_STATUS
-from eodag.plugins.download.base import DEFAULT_STREAM_REQUESTS_TIMEOUT, Download
+from eodag.plugins.download.base import Download
 from eodag.plugins.download.http import HTTPDownload
 from eodag.utils import (
     ProgressCallback,
@@ -42,7 +41,7 @@ from eodag.utils.exceptions import (
     NotAvailableError,
     RequestError,
 )
-from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT
+from eodag.utils.streaming import write_stream
 
 logger = logging.getLogger("eodag.plugins.download.s3rest")
 
@@ -108,8 +107,8 @@ class S3RestDownload(Download):
 
         # get nodes/files list contained in the bucket
         logger.debug("Retrieving product content from %s", nodes_list_url)
-        bucket_contents = requests.get(
-            nodes_list_url, auth=auth, timeout=HTTP_REQ_TIMEOUT
+        bucket_contents = self.http_session.get(
+            nodes_list_url, auth=auth, timeout=self.http_session.timeout
         )
         try:
             bucket_contents.raise_for_status()
@@ -163,32 +162,18 @@ class S3RestDownload(Download):
         abs_outputs_prefix = os.path.abspath(outputs_prefix)
         product_local_path = os.path.join(abs_outputs_prefix, prefix.split("/")[-1])
 
-        # .downloaded cache record directory
-        download_records_dir = os.path.join(abs_outputs_prefix, ".downloaded")
-        try:
-            os.makedirs(download_records_dir)
-        except OSError as exc:
-            import errno
-
-            if exc.errno != errno.EEXIST:  # Skip error if dir exists
-                import traceback as tb
-
-                logger.warning(
-                    "Unable to create records directory. Got:\n%s", tb.format_exc()
-                )
         # check if product has already been downloaded
-        url_hash = hashlib.md5(product.remote_location.encode("utf-8")).hexdigest()
-        record_filename = os.path.join(download_records_dir, url_hash)
-        if os.path.isfile(record_filename) and os.path.exists(product_local_path):
+        download_records = self._get_download_records(abs_outputs_prefix)
+        record = download_records.get(product.remote_location)
+        if record and os.path.exists(product_local_path):
             product.location = path_to_uri(product_local_path)
             return product_local_path
-        # Remove the record file if product_local_path is absent (e.g. it was deleted while record wasn't)
-        elif os.path.isfile(record_filename):
+        # Remove the record if product_local_path is absent (e.g. it was deleted while record wasn't)
+        elif record:
             logger.debug(
-                "Record file found (%s) but not the actual file", record_filename
+                "Record found for %s but not the actual file", product.remote_location
             )
-            logger.debug("Removing record file : %s", record_filename)
-            os.remove(record_filename)
+            download_records.remove(product.remote_location)
 
         # total size for progress_callback
         total_size = sum(
@@ -214,11 +199,11 @@ class S3RestDownload(Download):
             if not os.path.isdir(local_filename_dir):
                 os.makedirs(local_filename_dir)
 
-            with requests.get(
+            with self.http_session.get(
                 node_url,
                 stream=True,
                 auth=auth,
-                timeout=DEFAULT_STREAM_REQUESTS_TIMEOUT,
+                timeout=self.http_session.stream_timeout,
             ) as stream:
                 try:
                     stream.raise_for_status()
@@ -228,16 +213,11 @@ class S3RestDownload(Download):
                     logger.error("Error while getting resource :\n%s", tb.format_exc())
                 else:
                     with open(local_filename, "wb") as fhandle:
-                        for chunk in stream.iter_content(chunk_size=64 * 1024):
-                            if chunk:
-                                fhandle.write(chunk)
-                                progress_callback(len(chunk))
+                        write_stream(stream, fhandle, progress_callback)
 
             # TODO: check md5 hash ?
 
-        with open(record_filename, "w") as fh:
-            fh.write(product.remote_location)
-        logger.debug("Download recorded in %s", record_filename)
+        download_records.add(product.remote_location, path=product_local_path)
 
         product.location = path_to_uri(product_local_path)
         return product_local_path
@@ -30,6 +30,8 @@ from eodag.plugins.download.base import Download
 from eodag.plugins.search.base import Search
 from eodag.utils import GENERIC_PRODUCT_TYPE
 from eodag.utils.exceptions import UnsupportedProvider
+from eodag.utils.http import HttpSession
+from eodag.utils.throttling import RateLimiter, get_global_rate_limiter
 
 logger = logging.getLogger("eodag.plugins.manager")
 
@@ -97,6 +99,8 @@ class PluginManager(object):
 
         self.build_product_type_to_provider_config_map()
         self._built_plugins_cache = {}
+        self._http_sessions = {}
+        self._rate_limiters = {}
 
     def build_product_type_to_provider_config_map(self):
         """Build mapping conf between product types and providers"""
@@ -234,6 +238,48 @@ class PluginManager(object):
         Klass = Crunch.get_plugin_by_class_name(name)
         return Klass(options)
 
+    def get_http_session(self, provider):
+        """Get the pooled HTTP session shared by all the plugins of the given provider.
+
+        The session is built on first use from the ``http`` section of the provider
+        configuration (see :class:`~eodag.utils.http.HttpSession`).
+
+        :param provider: The provider for which to get the session
+        :type provider: str
+        :returns: The provider HTTP session
+        :rtype: :class:`~eodag.utils.http.HttpSession`
+        """
+        session = self._http_sessions.get(provider, None)
+        if session is None:
+            http_conf = getattr(self.providers_config.get(provider, None), "http", None)
+            session = HttpSession.from_config(http_conf)
+            self._http_sessions[provider] = session
+            session.rate_limiter = self.get_rate_limiter(provider)
+        return session
+
+    def get_rate_limiter(self, provider):
+        """Get the bandwidth and requests rate limiter shared by all the plugins of
+        the given provider.
+
+        The limiter is built on first use from the ``rate_limit`` section of the
+        provider configuration (see :class:`~eodag.utils.throttling.RateLimiter`), the
+        global limiter being its parent.
+
+        :param provider: The provider for which to get the limiter
+        :type provider: str
+        :returns: The provider rate limiter
+        :rtype: :class:`~eodag.utils.throttling.RateLimiter`
+        """
+        rate_limiter = self._rate_limiters.get(provider, None)
+        if rate_limiter is None:
+            rate_limit_conf = getattr(
+                self.providers_config.get(provider, None), "rate_limit", None
+            )
+            rate_limiter = self._rate_limiters[provider] = RateLimiter.from_config(
+                rate_limit_conf, parent=get_global_rate_limiter()
+            )
+        return rate_limiter
+
     def sort_providers(self):
         """Sort providers taking into account current priority order"""
         for provider_configs in self.product_type_to_provider_config_map.values():
@@ -288,5 +334,7 @@ class PluginManager(object):
             topic_class, getattr(plugin_conf, "type")
         )
         plugin = plugin_class(provider, plugin_conf)
+        plugin.http_session = self.get_http_session(provider)
+        plugin.rate_limiter = self.get_rate_limiter(provider)
         self._built_plugins_cache[(provider, topic_class.__name__)] = plugin
         return plugin
@@ -15,6 +15,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from eodag.api.product.metadata_mapping import (
     DEFAULT_METADATA_MAPPING,
@@ -23,9 +25,49 @@ from eodag.api.product.metadata_mapping import (
 from eodag.plugins.base import PluginTopic
 
 
+class SearchContext:
+    """State of a search request.
+
+    It is kept out of the search plugin, which is shared by all the searches of a
+    provider, so that concurrent searches running in other threads or asyncio tasks
+    do not overwrite it.
+
+    :param product_type_config: (optional) Metadata of the searched product type, used
+                                as default properties of the found products
+    :type product_type_config: dict
+    """
+
+    def __init__(self, product_type_config=None):
+        self.product_type_config = product_type_config or {}
+        # query parameters, query string and urls of the current page
+        self.query_params = {}
+        self.query_string = ""
+        self.search_urls = []
+        # provider product type definition parameters
+        self.product_type_def_params = {}
+        # plugin metadata mapping updated with the product type one, if any
+        self.metadata_mapping = None
+        # entries overriding the pagination configuration of the plugin
+        self.pagination = {}
+        # next page information collected from the last response
+        self.next_page_url = None
+        self.next_page_query_obj = None
+        self.next_page_merge = None
+        # count requests of the collections of the current page, in the order of the
+        # search urls
+        self.count_requests = []
+
+    def __repr__(self):
+        return f"SearchContext(query_params={self.query_params})"
+
+
 class Search(PluginTopic):
     """Base Search Plugin.
 
+    The state of a search request is stored in a
+    :class:`~eodag.plugins.search.base.SearchContext`, local to the current thread or
+    asyncio task (see :attr:`context`), so that a plugin can serve concurrent searches.
+
     :param provider: An eodag providers configuration dictionary
     :type provider: dict
     :param config: Path to the user configuration file
@@ -34,6 +76,7 @@ class Search(PluginTopic):
 
     def __init__(self, provider, config):
         super(Search, self).__init__(provider, config)
+        self._context_var = ContextVar(f"search_context_{id(self)}", default=None)
         # Prepare the metadata mapping
         # Do a shallow copy, the structure is flat enough for this to be sufficient
         metas = DEFAULT_METADATA_MAPPING.copy()
@@ -44,9 +87,35 @@ class Search(PluginTopic):
             metas, self.config.metadata_mapping
         )
 
+    @property
+    def context(self):
+        """Context of the search running in the current thread or asyncio task,
+        created if there is none"""
+        context = self._context_var.get()
+        if context is None:
+            context = SearchContext()
+            self._context_var.set(context)
+        return context
+
+    @contextmanager
+    def use_context(self, context=None):
+        """Run searches using the given context, restoring the previous one on exit
+
+        :param context: (optional) The search context, a new one if not set
+        :type context: :class:`~eodag.plugins.search.base.SearchContext`
+        :returns: The search context
+        :rtype: :class:`~eodag.plugins.search.base.SearchContext`
+        """
+        context = SearchContext() if context is None else context
+        token = self._context_var.set(context)
+        try:
+            yield context
+        finally:
+            self._context_var.reset(token)
+
     def clear(self):
         """Method used to clear a search context between two searches."""
-        pass
+        self._context_var.set(SearchContext())
 
     def query(self, *args, count=True, **kwargs):
         """Implementation of how the products must be searched goes here.
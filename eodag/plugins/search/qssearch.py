@@ -19,10 +19,17 @@
 import json
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import copy_context
+from copy import copy as copy_copy
+from copy import deepcopy
 from urllib.error import HTTPError as urllib_HTTPError
 from urllib.request import urlopen
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from lxml import etree
 
 from eodag.api.product import EOProduct
@@ -37,7 +44,7 @@ from eodag.api.product.metadata_mapping import (
     properties_from_json,
     properties_from_xml,
 )
-from eodag.plugins.search.base import Search
+from eodag.plugins.search.base import Search, SearchContext
 from eodag.utils import (
     GENERIC_PRODUCT_TYPE,
     cached_parse,
@@ -47,11 +54,31 @@ from eodag.utils import (
     update_nested_dict,
     urlencode,
 )
+from eodag.utils.concurrency import iter_ordered
 from eodag.utils.exceptions import AuthenticationError, MisconfiguredError, RequestError
-from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT
 
 logger = logging.getLogger("eodag.plugins.search.qssearch")
 
+# default number of search and count requests sent concurrently, for providers
+# searched over several collections
+DEFAULT_SEARCH_MAX_WORKERS = 4
+# duration during which the counts of identical queries are reused when searching
+# with count="estimate", and maximum number of counts cached by a plugin
+DEFAULT_COUNT_CACHE_TTL = 300  # in seconds
+COUNT_CACHE_SIZE = 128
+
+
+def _context_property(name):
+    """Plugin attribute stored in the search context of the current thread or task"""
+
+    def getter(self):
+        return getattr(self.context, name)
+
+    def setter(self, value):
+        setattr(self.context, name, value)
+
+    return property(getter, setter, doc=f"``{name}`` of the current search context")
+
 
 class QueryStringSearch(Search):
     """A plugin that helps implementing any kind of search protocol that relies on
@@ -89,14 +116,24 @@ class QueryStringSearch(Search):
             which provides the total results metadata along with the result of the
             query and don't have an endpoint for querying the number of items
             satisfying a request, or for providers for which the count endpoint returns
-            a json or xml document
+            a json or xml document. Without count endpoint, the total is read from the
+            search response, a count request being sent only if it is missing
 
           - *count_endpoint*: (optional) The endpoint for counting the number of items
-            satisfying a request
+            satisfying a request. The count request is sent concurrently with the
+            search request
 
           - *next_page_url_key_path*: (optional) A JSONPATH expression used to retrieve
             the URL of the next page in the response of the current page.
 
+        - **max_workers**: (optional) The number of requests sent concurrently when
+          several collections are searched, 4 by default. The results are merged in
+          the order of the collections.
+
+        - **count_cache_ttl**: (optional) The duration in seconds during which the
+          counts of identical queries are reused when searching with
+          ``count="estimate"``, 300 by default.
+
         - **free_text_search_operations**: (optional) A tree structure of the form::
 
             <search-param>:     # e.g: $search
@@ -154,28 +191,41 @@ class QueryStringSearch(Search):
     DEFAULT_ITEMS_PER_PAGE = 10
     extract_properties = {"xml": properties_from_xml, "json": properties_from_json}
 
+    # per request state, stored in the search context
+    search_urls = _context_property("search_urls")
+    query_params = _context_property("query_params")
+    query_string = _context_property("query_string")
+    product_type_def_params = _context_property("product_type_def_params")
+    next_page_url = _context_property("next_page_url")
+    next_page_query_obj = _context_property("next_page_query_obj")
+    next_page_merge = _context_property("next_page_merge")
+    count_requests = _context_property("count_requests")
+
     def __init__(self, provider, config):
         super(QueryStringSearch, self).__init__(provider, config)
         self.config.__dict__.setdefault("result_type", "json")
         self.config.__dict__.setdefault("results_entry", "features")
         self.config.__dict__.setdefault("pagination", {})
         self.config.__dict__.setdefault("free_text_search_operations", {})
-        self.search_urls = []
-        self.query_params = dict()
-        self.query_string = ""
-        self.next_page_url = None
-        self.next_page_query_obj = None
-        self.next_page_merge = None
-
-    def clear(self):
-        """Clear search context"""
-        super().clear()
-        self.search_urls.clear()
-        self.query_params.clear()
-        self.query_string = ""
-        self.next_page_url = None
-        self.next_page_query_obj = None
-        self.next_page_merge = None
+        # counts of the last queries, by count url and query parameters
+        self._count_cache = OrderedDict()
+        self._count_cache_lock = threading.Lock()
+
+    @property
+    def metadata_mapping(self):
+        """Metadata mapping of the current search: the plugin one, updated with the
+        one of the searched product type"""
+        metadata_mapping = self.context.metadata_mapping
+        if metadata_mapping is None:
+            return self.config.metadata_mapping
+        return metadata_mapping
+
+    @property
+    def pagination(self):
+        """Pagination configuration of the current search"""
+        if not self.context.pagination:
+            return self.config.pagination
+        return dict(self.config.pagination, **self.context.pagination)
 
     def discover_product_types(self):
         """Fetch product types list from provider using `discover_product_types` conf
@@ -317,8 +367,10 @@ class QueryStringSearch(Search):
         :type items_per_page: int
         :param page: (optional) The page number to return
         :type page: int
-        :param count: (optional) To trigger a count request
-        :type count: bool
+        :param count: (optional) To count the results: ``True`` to trigger count
+                      requests, ``"estimate"`` to reuse the counts of identical
+                      queries if they are cached
+        :type count: Union[bool, str]
         """
         product_type = kwargs.get("productType", None)
         if product_type == GENERIC_PRODUCT_TYPE:
@@ -341,6 +393,7 @@ class QueryStringSearch(Search):
         self.product_type_def_params = self.get_product_type_def_params(
             product_type, **kwargs
         )
+        self.context.metadata_mapping = None
 
         # update config using provider product type definition metadata_mapping
         # from another product
@@ -371,8 +424,8 @@ class QueryStringSearch(Search):
                 k: v
                 for k, v in self.product_type_def_params.items()
                 if k not in keywords.keys()
-                and k in self.config.metadata_mapping.keys()
-                and isinstance(self.config.metadata_mapping[k], list)
+                and k in self.metadata_mapping.keys()
+                and isinstance(self.metadata_mapping[k], list)
             }
         )
 
@@ -383,30 +436,37 @@ class QueryStringSearch(Search):
         self.search_urls, total_items = self.collect_search_urls(
             page=page, items_per_page=items_per_page, count=count, **kwargs
         )
-        provider_results = self.do_search(items_per_page=items_per_page, **kwargs)
+        provider_results, total_items = self.search_and_count(
+            total_items, items_per_page=items_per_page, **kwargs
+        )
         eo_products = self.normalize_results(provider_results, **kwargs)
         total_items = len(eo_products) if total_items == 0 else total_items
         return eo_products, total_items
 
     def update_metadata_mapping(self, metadata_mapping):
-        """Update plugin metadata_mapping with input metadata_mapping configuration"""
-        self.config.metadata_mapping.update(metadata_mapping)
+        """Update the metadata_mapping of the current search with input
+        metadata_mapping configuration, leaving the plugin one untouched"""
+        if self.context.metadata_mapping is None:
+            self.context.metadata_mapping = dict(self.config.metadata_mapping)
+        current_mapping = self.context.metadata_mapping
+        current_mapping.update(metadata_mapping)
         for metadata in metadata_mapping:
-            path = get_metadata_path_value(self.config.metadata_mapping[metadata])
+            path = get_metadata_path_value(current_mapping[metadata])
             # check if path has already been parsed
             if isinstance(path, str):
-                conversion, path = get_metadata_path(
-                    self.config.metadata_mapping[metadata]
-                )
+                conversion, path = get_metadata_path(current_mapping[metadata])
+                # queryable mappings are lists shared with the configuration
+                if isinstance(current_mapping[metadata], list):
+                    current_mapping[metadata] = list(current_mapping[metadata])
                 try:
                     # If the metadata is queryable (i.e a list of 2 elements), replace the value of the last item
-                    if len(self.config.metadata_mapping[metadata]) == 2:
-                        self.config.metadata_mapping[metadata][1] = (
+                    if len(current_mapping[metadata]) == 2:
+                        current_mapping[metadata][1] = (
                             conversion,
                             cached_parse(path),
                         )
                     else:
-                        self.config.metadata_mapping[metadata] = (
+                        current_mapping[metadata] = (
                             conversion,
                             cached_parse(path),
                         )
@@ -414,16 +474,14 @@ class QueryStringSearch(Search):
                     # Assume the mapping is to be passed as is.
                     # Ignore any transformation specified. If a value is to be passed as is, we don't want to transform
                     # it further
-                    _, text = get_metadata_path(self.config.metadata_mapping[metadata])
-                    if len(self.config.metadata_mapping[metadata]) == 2:
-                        self.config.metadata_mapping[metadata][1] = (None, text)
+                    _, text = get_metadata_path(current_mapping[metadata])
+                    if len(current_mapping[metadata]) == 2:
+                        current_mapping[metadata][1] = (None, text)
                     else:
-                        self.config.metadata_mapping[metadata] = (None, text)
+                        current_mapping[metadata] = (None, text)
 
                 # Put the updated mapping at the end
-                self.config.metadata_mapping[
-                    metadata
-                ] = self.config.metadata_mapping.pop(metadata)
+                current_mapping[metadata] = current_mapping.pop(metadata)
 
     def build_query_string(self, product_type, **kwargs):
         """Build The query string using the search parameters"""
@@ -469,6 +527,8 @@ class QueryStringSearch(Search):
         literal_search_params = getattr(self.config, "literal_search_params", {})
         if not isinstance(literal_search_params, dict):
             literal_search_params = {}
+        else:
+            literal_search_params = dict(literal_search_params)
 
         # Now add formatted free text search parameters (this is for cases where a
         # complex query through a free text search parameter is available for the
@@ -529,7 +589,7 @@ class QueryStringSearch(Search):
         queryables = {}
         for eodag_search_key, user_input in search_params.items():
             if user_input is not None:
-                md_mapping = self.config.metadata_mapping.get(
+                md_mapping = self.metadata_mapping.get(
                     eodag_search_key, (None, NOT_MAPPED)
                 )
                 _, md_value = md_mapping
@@ -574,9 +634,21 @@ class QueryStringSearch(Search):
                                 )
         return queryables
 
+    def _get_max_workers(self, requests_nb):
+        """Number of requests sent concurrently, out of ``requests_nb`` requests"""
+        return max(
+            1,
+            min(
+                int(getattr(self.config, "max_workers", DEFAULT_SEARCH_MAX_WORKERS)),
+                requests_nb,
+            ),
+        )
+
     def collect_search_urls(self, page=None, items_per_page=None, count=True, **kwargs):
-        """Build paginated urls"""
+        """Build paginated urls, and the requests counting the results of each
+        collection, sent by :meth:`search_and_count`"""
         urls = []
+        self.count_requests = []
         total_results = 0 if count else None
         for collection in self.get_collections(**kwargs):
             # skip empty collection if one is required in api_endpoint
@@ -592,13 +664,11 @@ class QueryStringSearch(Search):
                     ).format(collection=collection)
                     if count_endpoint:
                         count_url = "{}?{}".format(count_endpoint, self.query_string)
-                        _total_results = self.count_hits(
-                            count_url, result_type=self.config.result_type
-                        )
                     else:
-                        # First do one request querying only one element (lightweight
-                        # request to schedule the pagination)
-                        next_url_tpl = self.config.pagination["next_page_url_tpl"]
+                        # One request querying only one element (lightweight request
+                        # to schedule the pagination), if the search response does
+                        # not give the total
+                        next_url_tpl = self.pagination["next_page_url_tpl"]
                         count_url = next_url_tpl.format(
                             url=search_endpoint,
                             search=self.query_string,
@@ -607,11 +677,13 @@ class QueryStringSearch(Search):
                             skip=0,
                             skip_base_1=1,
                         )
-                        _total_results = self.count_hits(
-                            count_url, result_type=self.config.result_type
-                        )
-                    total_results += _total_results or 0
-                next_url = self.config.pagination["next_page_url_tpl"].format(
+                    self.add_count_request(
+                        count_url,
+                        count=count,
+                        in_response=not count_endpoint
+                        and "total_items_nb_key_path" in self.config.pagination,
+                    )
+                next_url = self.pagination["next_page_url_tpl"].format(
                     url=search_endpoint,
                     search=self.query_string,
                     items_per_page=items_per_page,
@@ -624,27 +696,202 @@ class QueryStringSearch(Search):
             urls.append(next_url)
         return urls, total_results
 
+    def add_count_request(
+        self, count_url, count=True, query_params=None, in_response=False
+    ):
+        """Add the request counting the results of the collection of the last
+        collected search url. With ``count="estimate"``, the count of an identical
+        request is reused if it is cached.
+
+        :param count_url: The url of the count request
+        :type count_url: str
+        :param count: (optional) The count mode, ``True`` or ``"estimate"``
+        :type count: Union[bool, str]
+        :param query_params: (optional) The query parameters of the count request,
+                             for POST requests
+        :type query_params: dict
+        :param in_response: (optional) Whether the total is given by the search
+                            response, the count request being only sent if it is not
+        :type in_response: bool
+        """
+        cache_key = (
+            count_url,
+            json.dumps(query_params, sort_keys=True, default=str)
+            if query_params is not None
+            else None,
+        )
+        self.count_requests.append(
+            {
+                "count_url": count_url,
+                "query_params": query_params,
+                "in_response": in_response,
+                "cache_key": cache_key,
+                "total": self._get_cached_count(cache_key)
+                if count == "estimate"
+                else None,
+            }
+        )
+
+    def _get_cached_count(self, cache_key):
+        """Count of an identical request, if it is cached and not expired"""
+        ttl = float(getattr(self.config, "count_cache_ttl", DEFAULT_COUNT_CACHE_TTL))
+        with self._count_cache_lock:
+            cached = self._count_cache.get(cache_key, None)
+            if cached is None:
+                return None
+            total, cached_at = cached
+            if time.monotonic() - cached_at > ttl:
+                del self._count_cache[cache_key]
+                return None
+            self._count_cache.move_to_end(cache_key)
+        logger.debug("Using cached count: %s", total)
+        return total
+
+    def _set_count(self, count_request, total):
+        """Set the total of a count request, and cache it"""
+        count_request["total"] = total
+        if total is None:
+            return
+        with self._count_cache_lock:
+            self._count_cache[count_request["cache_key"]] = (total, time.monotonic())
+            self._count_cache.move_to_end(count_request["cache_key"])
+            while len(self._count_cache) > COUNT_CACHE_SIZE:
+                self._count_cache.popitem(last=False)
+
+    def _send_count_request(self, count_request):
+        """Send a count request, using its own query parameters if it has some"""
+        context = copy_copy(self.context)
+        if count_request["query_params"] is not None:
+            context.query_params = count_request["query_params"]
+        with self.use_context(context):
+            return self.count_hits(
+                count_request["count_url"], result_type=self.config.result_type
+            )
+
+    def _send_count_requests(self, count_requests):
+        """Send count requests concurrently, setting their totals"""
+        for count_request, total in zip(
+            count_requests,
+            iter_ordered(
+                self._send_count_request,
+                count_requests,
+                max_workers=self._get_max_workers(len(count_requests)),
+            ),
+        ):
+            self._set_count(count_request, total)
+
+    def search_and_count(self, total_items=0, items_per_page=None, **kwargs):
+        """Perform the search requests, and the count requests added by
+        :meth:`collect_search_urls`.
+
+        The count requests are sent while the search is running. Those of the
+        collections for which the search response gives the total are only sent if it
+        does not, and those which are cached, when counting with ``"estimate"``, are
+        not sent.
+
+        :param total_items: (optional) The total number of results returned by
+                            :meth:`collect_search_urls`, ``None`` if they are not
+                            counted
+        :type total_items: int
+        :param items_per_page: (optional) The number of items to return for one page
+        :type items_per_page: int
+        :returns: The provider results and their total number
+        :rtype: tuple(list, int)
+        """
+        count_requests = self.count_requests if total_items is not None else []
+        pending = [
+            r for r in count_requests if r["total"] is None and not r["in_response"]
+        ]
+        counts_future = None
+        if pending:
+            executor = ThreadPoolExecutor(max_workers=1)
+            counts_future = executor.submit(
+                copy_context().run, self._send_count_requests, pending
+            )
+            executor.shutdown(wait=False)
+
+        provider_results = self.do_search(items_per_page=items_per_page, **kwargs)
+
+        if counts_future is not None:
+            counts_future.result()
+        # totals missing from the search responses, or from responses not read
+        missing = [r for r in count_requests if r["total"] is None and r["in_response"]]
+        if missing:
+            self._send_count_requests(missing)
+
+        for count_request in count_requests:
+            if getattr(self.config, "merge_responses", False):
+                total_items = count_request["total"] or 0
+            else:
+                total_items += count_request["total"] or 0
+        return provider_results, total_items
+
+    def _set_count_from_response(self, index, content):
+        """Set the total of the count request of a collection from its search
+        response, if it gives it
+
+        :param index: The index of the search url of the collection
+        :type index: int
+        :param content: The parsed search response
+        :type content: Union[dict, :class:`lxml.etree._Element`]
+        """
+        count_requests = self.count_requests
+        if index >= len(count_requests):
+            return
+        count_request = count_requests[index]
+        if not count_request["in_response"] or count_request["total"] is not None:
+            return
+        total_items_nb_key_path = self.config.pagination["total_items_nb_key_path"]
+        try:
+            if self.config.result_type == "xml":
+                total = int(
+                    content.xpath(
+                        total_items_nb_key_path,
+                        namespaces={k or "ns": v for k, v in content.nsmap.items()},
+                    )[0]
+                )
+            else:
+                total = cached_parse(total_items_nb_key_path).find(content)[0].value
+        except (IndexError, TypeError, ValueError):
+            logger.debug("Total number of results not found in the search response")
+            return
+        self._set_count(count_request, total)
+
+    def _iter_search_responses(self, search_urls):
+        """Responses to the search requests, in the order of the urls. The requests are
+        sent concurrently, and those not sent yet are cancelled when the iteration
+        stops.
+
+        :param search_urls: The search urls
+        :type search_urls: list[str]
+        :returns: The responses
+        :rtype: Iterator[:class:`requests.Response`]
+        """
+        return iter_ordered(
+            lambda search_url: self._request(
+                search_url,
+                info_message="Sending search request: {}".format(search_url),
+                exception_message="Skipping error while searching for {} {} "
+                "instance:".format(self.provider, self.__class__.__name__),
+            ),
+            search_urls,
+            max_workers=self._get_max_workers(len(search_urls)),
+        )
+
     def do_search(self, items_per_page=None, **kwargs):
         """Perform the actual search request.
 
         If there is a specified number of items per page, return the results as soon
-        as this number is reached
+        as this number is reached. The urls of several collections are requested
+        concurrently, their results being merged in the order of the urls.
 
         :param items_per_page: (optional) The number of items to return for one page
         :type items_per_page: int
         """
         results = []
-        for search_url in self.search_urls:
-            try:
-                response = self._request(
-                    search_url,
-                    info_message="Sending search request: {}".format(search_url),
-                    exception_message="Skipping error while searching for {} {} "
-                    "instance:".format(self.provider, self.__class__.__name__),
-                )
-            except RequestError:
-                return []
-            else:
+        responses = self._iter_search_responses(self.search_urls)
+        try:
+            for index, response in enumerate(responses):
                 next_page_url_key_path = self.config.pagination.get(
                     "next_page_url_key_path", None
                 )
@@ -656,6 +903,7 @@ class QueryStringSearch(Search):
                 )
                 if self.config.result_type == "xml":
                     root_node = etree.fromstring(response.content)
+                    self._set_count_from_response(index, root_node)
                     namespaces = {k or "ns": v for k, v in root_node.nsmap.items()}
                     result = [
                         etree.tostring(entry)
@@ -670,6 +918,7 @@ class QueryStringSearch(Search):
                         )
                 else:
                     resp_as_json = response.json()
+                    self._set_count_from_response(index, resp_as_json)
                     if next_page_url_key_path:
                         path_parsed = cached_parse(next_page_url_key_path)
                         try:
@@ -713,8 +962,13 @@ class QueryStringSearch(Search):
                     )
                 else:
                     results.extend(result)
-            if items_per_page is not None and len(results) == items_per_page:
-                return results
+                if items_per_page is not None and len(results) == items_per_page:
+                    return results
+        except RequestError:
+            return []
+        finally:
+            # cancel the requests not sent yet
+            responses.close()
         return results
 
     def normalize_results(self, results, **kwargs):
@@ -730,7 +984,7 @@ class QueryStringSearch(Search):
                 self.provider,
                 QueryStringSearch.extract_properties[self.config.result_type](
                     result,
-                    self.config.metadata_mapping,
+                    self.metadata_mapping,
                     discovery_pattern=getattr(self.config, "discover_metadata", {}).get(
                         "metadata_pattern", None
                     ),
@@ -742,7 +996,7 @@ class QueryStringSearch(Search):
             )
             # use product_type_config as default properties
             product.properties = dict(
-                getattr(self.config, "product_type_config", {}), **product.properties
+                self.context.product_type_config, **product.properties
             )
             products.append(product)
         return products
@@ -799,7 +1053,8 @@ class QueryStringSearch(Search):
                     collections.add("")
             else:
                 collections.add(collection)
-            return tuple(collections)
+            # sorted for the results to be merged in a deterministic order
+            return tuple(sorted(collections, key=str))
         if self.provider == "peps":
             if product_type == "S2_MSI_L1C":
                 date = kwargs.get("startTimeFromAscendingNode")
@@ -906,7 +1161,9 @@ class QueryStringSearch(Search):
             else:
                 if info_message:
                     logger.info(info_message)
-                response = requests.get(url, timeout=HTTP_REQ_TIMEOUT, **kwargs)
+                response = self.http_session.get(
+                    url, timeout=self.http_session.timeout, **kwargs
+                )
                 response.raise_for_status()
         except (requests.RequestException, urllib_HTTPError) as err:
             err_msg = err.readlines() if hasattr(err, "readlines") else ""
@@ -939,7 +1196,7 @@ class AwsSearch(QueryStringSearch):
             day = str(int(result["properties"]["completionDate"][8:10]))
 
             properties = QueryStringSearch.extract_properties[self.config.result_type](
-                result, self.config.metadata_mapping
+                result, self.metadata_mapping
             )
 
             properties["downloadLink"] = (
@@ -964,7 +1221,9 @@ class ODataV4Search(QueryStringSearch):
             metadata_url = self.get_metadata_search_url(entity)
             try:
                 logger.debug("Sending metadata request: %s", metadata_url)
-                response = requests.get(metadata_url, timeout=HTTP_REQ_TIMEOUT)
+                response = self.http_session.get(
+                    metadata_url, timeout=self.http_session.timeout
+                )
                 response.raise_for_status()
             except requests.RequestException:
                 logger.exception(
@@ -1010,6 +1269,7 @@ class PostJsonSearch(QueryStringSearch):
         self.product_type_def_params = self.get_product_type_def_params(
             product_type, **kwargs
         )
+        self.context.metadata_mapping = None
 
         # update config using provider product type definition metadata_mapping
         # from another product
@@ -1034,8 +1294,8 @@ class PostJsonSearch(QueryStringSearch):
                 k: v
                 for k, v in self.product_type_def_params.items()
                 if k not in keywords.keys()
-                and k in self.config.metadata_mapping.keys()
-                and isinstance(self.config.metadata_mapping[k], list)
+                and k in self.metadata_mapping.keys()
+                and isinstance(self.metadata_mapping[k], list)
             }
         )
 
@@ -1048,27 +1308,13 @@ class PostJsonSearch(QueryStringSearch):
                     "specific_qssearch", {"parameters": []}
                 )["parameters"]
             ):
-                self.config.api_endpoint = query_value
-                self.config.metadata_mapping = self.config.products[product_type][
-                    "specific_qssearch"
-                ]["metadata_mapping"]
-                self.config.results_entry = self.config.products[product_type][
-                    "specific_qssearch"
-                ]["results_entry"]
-                self.config.collection = self.config.products[product_type][
-                    "specific_qssearch"
-                ].get("collection", None)
-                self.config.merge_responses = self.config.products[product_type][
-                    "specific_qssearch"
-                ].get("merge_responses", None)
-                super(PostJsonSearch, self).__init__(
-                    provider=self.provider, config=self.config
-                )
-                self.count_hits = lambda *x, **y: 1
-                self._request = super(PostJsonSearch, self)._request
-                return super(PostJsonSearch, self).query(
-                    items_per_page=items_per_page, page=page, **kwargs
-                )
+                specific_search = self.get_specific_qssearch(product_type, query_value)
+                with specific_search.use_context(
+                    SearchContext(self.context.product_type_config)
+                ):
+                    return super(PostJsonSearch, specific_search).query(
+                        items_per_page=items_per_page, page=page, **kwargs
+                    )
 
         # If we were not able to build query params but have search criteria, this means
         # the provider does not support the search criteria given. If so, stop searching
@@ -1079,14 +1325,49 @@ class PostJsonSearch(QueryStringSearch):
         self.search_urls, total_items = self.collect_search_urls(
             page=page, items_per_page=items_per_page, count=count, **kwargs
         )
-        provider_results = self.do_search(items_per_page=items_per_page, **kwargs)
+        provider_results, total_items = self.search_and_count(
+            total_items, items_per_page=items_per_page, **kwargs
+        )
         eo_products = self.normalize_results(provider_results, **kwargs)
         total_items = len(eo_products) if total_items == 0 else total_items
         return eo_products, total_items
 
+    def get_specific_qssearch(self, product_type, api_endpoint):
+        """Build the plugin replacing this one for the search of a product by one of
+        the parameters listed in the ``specific_qssearch`` configuration of its product
+        type. It sends its requests using GET, as
+        :class:`~eodag.plugins.search.qssearch.QueryStringSearch`.
+
+        The plugin is built for the current search, from a copy of the configuration,
+        which is left untouched.
+
+        :param product_type: The searched product type
+        :type product_type: str
+        :param api_endpoint: The endpoint of the search
+        :type api_endpoint: str
+        :returns: The search plugin
+        :rtype: :class:`~eodag.plugins.search.qssearch.QueryStringSearch`
+        """
+        specific_qssearch = self.config.products[product_type]["specific_qssearch"]
+        config = copy_copy(self.config)
+        config.api_endpoint = api_endpoint
+        config.metadata_mapping = deepcopy(specific_qssearch["metadata_mapping"])
+        config.collection = specific_qssearch.get("collection", None)
+        config.merge_responses = specific_qssearch.get("merge_responses", None)
+        specific_search = PostJsonSearch(self.provider, config)
+        # overwritten by init
+        config.results_entry = specific_qssearch["results_entry"]
+        specific_search.http_session = self.http_session
+        if hasattr(self, "auth"):
+            specific_search.auth = self.auth
+        specific_search.count_hits = lambda *x, **y: 1
+        specific_search._request = super(PostJsonSearch, specific_search)._request
+        return specific_search
+
     def collect_search_urls(self, page=None, items_per_page=None, count=True, **kwargs):
         """Adds pagination to query parameters, and auth to url"""
         urls = []
+        self.count_requests = []
         total_results = 0 if count else None
         if hasattr(kwargs["auth"], "config"):
             auth_conf_dict = getattr(kwargs["auth"].config, "credentials", {})
@@ -1108,33 +1389,35 @@ class PostJsonSearch(QueryStringSearch):
                         "count_endpoint", ""
                     ).format(**dict(collection=collection, **auth_conf_dict))
                     if count_endpoint:
-                        _total_results = self.count_hits(
-                            count_endpoint, result_type=self.config.result_type
+                        self.add_count_request(
+                            count_endpoint,
+                            count=count,
+                            query_params=deepcopy(self.query_params),
                         )
                     else:
-                        # Update the query params with a pagination requesting 1 product only
-                        # which is enough to obtain the count hits.
+                        # Query params with a pagination requesting 1 product only,
+                        # which is enough to obtain the count hits if the search
+                        # response does not give them
                         count_pagination_params = dict(
                             items_per_page=1, page=1, skip=0, skip_base_1=1
                         )
                         count_params = json.loads(
-                            self.config.pagination["next_page_query_obj"].format(
+                            self.pagination["next_page_query_obj"].format(
                                 **count_pagination_params
                             )
                         )
-                        update_nested_dict(self.query_params, count_params)
-                        _total_results = self.count_hits(
-                            search_endpoint, result_type=self.config.result_type
+                        count_query_params = deepcopy(self.query_params)
+                        update_nested_dict(count_query_params, count_params)
+                        self.add_count_request(
+                            search_endpoint,
+                            count=count,
+                            query_params=count_query_params,
+                            in_response="total_items_nb_key_path"
+                            in self.config.pagination,
                         )
-                    if getattr(self.config, "merge_responses", False):
-                        total_results = _total_results or 0
-                    else:
-                        total_results += _total_results or 0
-                if isinstance(self.config.pagination["next_page_query_obj"], str):
+                if isinstance(self.pagination["next_page_query_obj"], str):
                     # next_page_query_obj needs to be parsed
-                    next_page_query_obj = self.config.pagination[
-                        "next_page_query_obj"
-                    ].format(
+                    next_page_query_obj = self.pagination["next_page_query_obj"].format(
                         items_per_page=items_per_page,
                         page=page,
                         skip=(page - 1) * items_per_page,
@@ -1159,13 +1442,16 @@ class PostJsonSearch(QueryStringSearch):
                 kwargs["auth"] = self.auth
 
             # perform the request using the next page arguments if they are defined
-            if getattr(self, "next_page_query_obj", None):
+            if self.next_page_query_obj:
                 self.query_params = self.next_page_query_obj
             if info_message:
                 logger.info(info_message)
             logger.debug("Query parameters: %s" % self.query_params)
-            response = requests.post(
-                url, json=self.query_params, timeout=HTTP_REQ_TIMEOUT, **kwargs
+            response = self.http_session.post(
+                url,
+                json=self.query_params,
+                timeout=self.http_session.timeout,
+                **kwargs,
             )
             response.raise_for_status()
         except (requests.RequestException, urllib_HTTPError) as err:
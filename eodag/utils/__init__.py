@@ -33,6 +33,8 @@ import os
 import re
 import shutil
 import string
+import threading
+import time
 import types
 import unicodedata
 import warnings
@@ -69,6 +71,7 @@ from shapely.geometry.base import BaseGeometry
 from tqdm.auto import tqdm
 
 from eodag.utils import logging as eodag_logging
+from eodag.utils.progress import get_progress_metrics
 
 DEFAULT_PROJ = "EPSG:4326"
 
@@ -76,6 +79,10 @@ logger = py_logging.getLogger("eodag.utils")
 
 GENERIC_PRODUCT_TYPE = "GENERIC_PRODUCT_TYPE"
 
+# minimum delay and amount between two updates of a progress bar
+DEFAULT_PROGRESS_FLUSH_INTERVAL = 0.1  # in seconds
+DEFAULT_PROGRESS_FLUSH_SIZE = 8 * 1024 * 1024
+
 
 def _deprecated(reason="", version=None):
     """Simple decorator to mark functions/methods/classes as deprecated.
@@ -437,10 +444,33 @@ class ProgressCallback(tqdm):
     It can be globally disabled using `eodag.utils.logging.setup_logging(0)` or
     `eodag.utils.logging.setup_logging(level, no_progress_bar=True)`, and
     individually disabled using `disable=True`.
+
+    Calls are cheap and thread-safe: increments are accumulated and only applied to
+    the progress bar once `flush_interval` seconds elapsed or `flush_size` units
+    were accumulated since the last update, or when the total is reached. Applied
+    updates are also counted by the process-wide
+    :class:`~eodag.utils.progress.ProgressMetrics`, also when the bar is disabled,
+    which makes them available to headless runs.
+
+    >>> with ProgressCallback(total=3, disable=True, flush_interval=60) as bar:
+    ...     bar(1)
+    ...     bar.n
+    ...     bar(2)
+    ...     bar.n
+    0
+    3
     """
 
     def __init__(self, *args, **kwargs):
         self.kwargs = kwargs.copy()
+        self.flush_interval = float(
+            kwargs.pop("flush_interval", DEFAULT_PROGRESS_FLUSH_INTERVAL)
+        )
+        self.flush_size = kwargs.pop("flush_size", DEFAULT_PROGRESS_FLUSH_SIZE)
+        self.metrics = get_progress_metrics()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        self._pending_lock = threading.Lock()
         if "unit" not in kwargs:
             kwargs["unit"] = "B"
         if "unit_scale" not in kwargs:
@@ -455,6 +485,11 @@ class ProgressCallback(tqdm):
             kwargs["dynamic_ncols"] = True
 
         super(ProgressCallback, self).__init__(*args, **kwargs)
+        if self.disable:
+            # not set by disabled tqdm instances
+            self.unit = kwargs["unit"]
+            self.unit_scale = kwargs["unit_scale"]
+            self.desc = kwargs["desc"]
 
     def __call__(self, increment, total=None):
         """Update the progress bar.
@@ -467,8 +502,48 @@ class ProgressCallback(tqdm):
         if total is not None and total != self.total:
             self.reset(total=total)
 
-        self.update(increment)
-        self.refresh()
+        with self._pending_lock:
+            self._pending += increment
+            now = time.monotonic()
+            if (
+                self._pending < self.flush_size
+                and now - self._flushed_at < self.flush_interval
+                and (not self.total or self.n + self._pending < self.total)
+            ):
+                return
+            self._flush(now)
+
+    def _flush(self, now=None):
+        """Apply the accumulated increments, the pending lock being held"""
+        increment, self._pending = self._pending, 0
+        self._flushed_at = now or time.monotonic()
+        if not increment:
+            return
+        self.metrics.add(self.unit, increment)
+        if self.disable:
+            self.n += increment
+        else:
+            self.update(increment)
+
+    def flush(self):
+        """Apply the accumulated increments to the progress bar"""
+        with self._pending_lock:
+            self._flush()
+
+    def reset(self, total=None):
+        """Reset the progress bar, once the accumulated increments are applied
+
+        :param total: (optional) Maximum amount of data to be processed
+        :type total: int
+        """
+        self.flush()
+        super(ProgressCallback, self).reset(total=total)
+
+    def close(self):
+        """Close the progress bar, once the accumulated increments are applied"""
+        if getattr(self, "_pending_lock", None) is not None:
+            self.flush()
+        super(ProgressCallback, self).close()
 
     def copy(self, *args, **kwargs):
         """Returns another progress callback using the same initial
@@ -482,6 +557,26 @@ class ProgressCallback(tqdm):
         return ProgressCallback(*args, **dict(self.kwargs, **kwargs))
 
 
+def get_thread_safe_callback(progress_callback):
+    """Get a progress callback that can be called from several threads
+
+    :param progress_callback: A progress callback
+    :type progress_callback: Callable
+    :returns: The callback itself if it is a :class:`~eodag.utils.ProgressCallback`,
+              or the callback called under a lock
+    :rtype: Callable
+    """
+    if isinstance(progress_callback, ProgressCallback):
+        return progress_callback
+    lock = threading.Lock()
+
+    def locked_progress_callback(*args, **kwargs):
+        with lock:
+            return progress_callback(*args, **kwargs)
+
+    return locked_progress_callback
+
+
 @_deprecated(reason="Use ProgressCallback class instead", version="2.2.1")
 class NotebookProgressCallback(tqdm):
     """A custom progress bar to be used inside Jupyter notebooks"""
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Archives utilities: extraction of zip and tar archives"""
+import logging
+import os
+import struct
+import tarfile
+import threading
+import zipfile
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("eodag.utils.archive")
+
+ZIP_LOCAL_FILE_HEADER = b"PK\x03\x04"
+ZIP_DATA_DESCRIPTOR = b"PK\x07\x08"
+# signatures of the records following the zip entries (central directory, end records)
+ZIP_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06", b"PK\x06\x07")
+GZIP_MAGIC = b"\x1f\x8b"
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_FLAG_ENCRYPTED = 0x1
+ZIP_FLAG_DATA_DESCRIPTOR = 0x8
+ZIP_FLAG_UTF8 = 0x800
+ZIP64_EXTRA_ID = 0x0001
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class StreamReader:
+    """Read-only file-like object over an iterator of bytes chunks, such as
+    :meth:`requests.Response.iter_content`
+
+    :param chunks: The bytes chunks
+    :type chunks: Iterable[bytes]
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def _fill(self, size):
+        """Buffer chunks until ``size`` bytes are available or the stream ends"""
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+    def read(self, size=-1):
+        """Read at most ``size`` bytes, everything that is left if ``size`` is negative
+
+        :param size: (optional) Maximum number of bytes to read
+        :type size: int
+        :returns: The bytes read, empty at the end of the stream
+        :rtype: bytes
+        """
+        if size is None or size < 0:
+            data = bytes(self._buffer) + b"".join(self._chunks)
+            self._buffer.clear()
+            return data
+        if not self._buffer:
+            self._fill(1)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read_exact(self, size):
+        """Read exactly ``size`` bytes
+
+        :param size: Number of bytes to read
+        :type size: int
+        :returns: The bytes read
+        :rtype: bytes
+        :raises: :class:`EOFError`
+        """
+        self._fill(size)
+        if len(self._buffer) < size:
+            raise EOFError(f"Unexpected end of stream, {size} bytes expected")
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def peek(self, size):
+        """Get the next ``size`` bytes without consuming them
+
+        :param size: Number of bytes to get
+        :type size: int
+        :returns: At most ``size`` bytes
+        :rtype: bytes
+        """
+        self._fill(size)
+        return bytes(self._buffer[:size])
+
+    def unread(self, data):
+        """Push back ``data`` at the beginning of the stream
+
+        :param data: Bytes to push back
+        :type data: bytes
+        """
+        self._buffer[:0] = data
+
+
+def get_stream_archive_type(reader):
+    """Detect the archive type of a stream from its first bytes
+
+    :param reader: The stream
+    :type reader: :class:`~eodag.utils.archive.StreamReader`
+    :returns: ``zip``, ``tar.gz`` or ``None`` if the stream is not a supported archive
+    :rtype: str
+    """
+    magic = reader.peek(4)
+    if magic == ZIP_LOCAL_FILE_HEADER:
+        return "zip"
+    elif magic[:2] == GZIP_MAGIC:
+        return "tar.gz"
+    return None
+
+
+def extract_stream(reader, path):
+    """Extract a zip or tar.gz archive while it is read from a stream
+
+    :param reader: The archive stream
+    :type reader: :class:`~eodag.utils.archive.StreamReader`
+    :param path: The directory where the archive members are extracted
+    :type path: str
+    :raises: :class:`ValueError` if the stream is not a supported archive
+    """
+    archive_type = get_stream_archive_type(reader)
+    if archive_type == "zip":
+        extract_zip_stream(reader, path)
+    elif archive_type == "tar.gz":
+        with tarfile.open(fileobj=reader, mode="r|gz") as tfile:
+            tfile.extractall(path=path)
+    else:
+        raise ValueError("Unsupported archive stream")
+
+
+def _sanitize_member_path(name):
+    """Relative path of an archive member, without absolute or parent parts"""
+    parts = [
+        part
+        for part in name.replace("\\", "/").split("/")
+        if part not in ("", ".", "..")
+    ]
+    return os.path.join(*parts) if parts else ""
+
+
+def _parse_zip64_extra(extra):
+    """Uncompressed and compressed sizes from a zip64 extra field, if any"""
+    while len(extra) >= 4:
+        header_id, data_size = struct.unpack("<HH", extra[:4])
+        if header_id == ZIP64_EXTRA_ID and data_size >= 16:
+            return struct.unpack("<QQ", extra[4:20])
+        extra = extra[4 + data_size :]
+    return None
+
+
+def extract_zip_stream(reader, path):
+    """Extract a zip archive sequentially, using its local file headers.
+
+    Entries are read as they come, the central directory at the end of the archive
+    is not needed. Stored and deflated entries are supported, deflated entries may
+    have their sizes in a trailing data descriptor.
+
+    :param reader: The zip archive stream
+    :type reader: :class:`~eodag.utils.archive.StreamReader`
+    :param path: The directory where the archive members are extracted
+    :type path: str
+    :raises: :class:`zipfile.BadZipFile`
+    """
+    os.makedirs(path, exist_ok=True)
+    try:
+        while True:
+            signature = reader.read_exact(4)
+            if signature in ZIP_END_SIGNATURES:
+                # consume the central directory
+                reader.read()
+                break
+            elif signature != ZIP_LOCAL_FILE_HEADER:
+                raise zipfile.BadZipFile(f"Bad zip entry signature {signature!r}")
+
+            (
+                _,
+                flags,
+                method,
+                _,
+                _,
+                crc,
+                compressed_size,
+                size,
+                name_length,
+                extra_length,
+            ) = struct.unpack("<HHHHHIIIHH", reader.read_exact(26))
+            raw_name = reader.read_exact(name_length)
+            name = raw_name.decode("utf-8" if flags & ZIP_FLAG_UTF8 else "cp437")
+            zip64_sizes = _parse_zip64_extra(reader.read_exact(extra_length))
+            if zip64_sizes:
+                size, compressed_size = zip64_sizes
+            has_data_descriptor = flags & ZIP_FLAG_DATA_DESCRIPTOR
+
+            if flags & ZIP_FLAG_ENCRYPTED:
+                raise zipfile.BadZipFile(f"Encrypted zip entry {name} not supported")
+            if method == ZIP_STORED and has_data_descriptor and name.endswith("/"):
+                # directory entry, no data
+                compressed_size = 0
+            elif method not in (ZIP_STORED, ZIP_DEFLATED) or (
+                method == ZIP_STORED and has_data_descriptor
+            ):
+                raise zipfile.BadZipFile(
+                    f"Zip entry {name} cannot be extracted from a stream"
+                )
+
+            member_path = os.path.join(path, _sanitize_member_path(name))
+            if name.endswith("/"):
+                os.makedirs(member_path, exist_ok=True)
+                fhandle = None
+            else:
+                os.makedirs(os.path.dirname(member_path), exist_ok=True)
+                fhandle = open(member_path, "wb")
+
+            computed_crc = 0
+            try:
+                if method == ZIP_STORED:
+                    left = compressed_size
+                    while left > 0:
+                        data = reader.read_exact(min(left, COPY_BUFFER_SIZE))
+                        left -= len(data)
+                        computed_crc = zlib.crc32(data, computed_crc)
+                        if fhandle:
+                            fhandle.write(data)
+                else:
+                    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    left = None if has_data_descriptor else compressed_size
+                    while not decompressor.eof and left != 0:
+                        data = reader.read(
+                            COPY_BUFFER_SIZE
+                            if left is None
+                            else min(left, COPY_BUFFER_SIZE)
+                        )
+                        if not data:
+                            raise EOFError(f"Unexpected end of stream in {name}")
+                        if left is not None:
+                            left -= len(data)
+                        data = decompressor.decompress(data)
+                        computed_crc = zlib.crc32(data, computed_crc)
+                        if fhandle:
+                            fhandle.write(data)
+                    # data read beyond the end of the deflated stream
+                    reader.unread(decompressor.unused_data)
+            finally:
+                if fhandle:
+                    fhandle.close()
+
+            if has_data_descriptor:
+                descriptor = reader.read_exact(4)
+                if descriptor == ZIP_DATA_DESCRIPTOR:
+                    descriptor = reader.read_exact(4)
+                crc = struct.unpack("<I", descriptor)[0]
+                reader.read_exact(16 if zip64_sizes else 8)
+            if computed_crc != crc:
+                raise zipfile.BadZipFile(f"Bad CRC-32 for zip entry {name}")
+    except EOFError as e:
+        raise zipfile.BadZipFile(str(e))
+
+
+def extract_zip(archive_path, path, max_workers=1, progress_callback=None):
+    """Extract a zip archive, distributing its members over a pool of threads.
+
+    Larger members are extracted first so that they are decompressed concurrently.
+    Each thread reads the archive through its own file handle.
+
+    :param archive_path: The zip archive to extract
+    :type archive_path: str
+    :param path: The directory where the archive members are extracted
+    :type path: str
+    :param max_workers: (optional) Number of members extracted concurrently
+    :type max_workers: int
+    :param progress_callback: (optional) A callable called with ``1`` each time a
+                              member is extracted
+    :type progress_callback: Callable[[int], None]
+    """
+    with zipfile.ZipFile(archive_path, "r") as zfile:
+        fileinfos = sorted(zfile.infolist(), key=lambda i: i.file_size, reverse=True)
+        # create the directories tree first, to avoid concurrent creations
+        for fileinfo in fileinfos:
+            member_dir = os.path.dirname(
+                os.path.join(path, _sanitize_member_path(fileinfo.filename))
+            )
+            os.makedirs(member_dir, exist_ok=True)
+
+        if max_workers <= 1 or len(fileinfos) <= 1:
+            for fileinfo in fileinfos:
+                zfile.extract(fileinfo, path=path)
+                if progress_callback:
+                    progress_callback(1)
+            return
+
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+    progress_lock = threading.Lock()
+
+    def extract_member(fileinfo):
+        if not hasattr(local, "zfile"):
+            local.zfile = zipfile.ZipFile(archive_path, "r")
+            with handles_lock:
+                handles.append(local.zfile)
+        local.zfile.extract(fileinfo, path=path)
+        if progress_callback:
+            with progress_lock:
+                progress_callback(1)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # consume results to raise extraction errors
+            list(executor.map(extract_member, fileinfos))
+    finally:
+        for handle in handles:
+            handle.close()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Selection of the assets of a product to download"""
+import fnmatch
+import json
+import os
+import re
+
+# prefix of the patterns that are regular expressions instead of glob patterns
+REGEX_PATTERN_PREFIX = "re:"
+
+
+class AssetFilter:
+    """Assets of a product to download, selected by their key.
+
+    A filter is made of glob patterns, or regular expressions prefixed with ``re:``,
+    an asset being selected if its key fully matches one of them.
+
+    >>> asset_filter = AssetFilter.from_value(["B0[48]", "re:SCL(_20m)?"])
+    >>> asset_filter.match("B04"), asset_filter.match("SCL_20m"), asset_filter.match("B02")
+    (True, True, False)
+    >>> asset_filter.filter_keys(["B02", "B04", "B08", "SCL"])
+    ['B04', 'B08', 'SCL']
+    >>> str(AssetFilter.from_value("B04"))
+    '["B04"]'
+
+    :param patterns: The glob patterns and regular expressions
+    :type patterns: list[str]
+    """
+
+    def __init__(self, patterns):
+        self.patterns = sorted(set(patterns))
+        self._regex = re.compile(
+            "|".join(
+                f"(?:{pattern[len(REGEX_PATTERN_PREFIX):]})"
+                if pattern.startswith(REGEX_PATTERN_PREFIX)
+                else fnmatch.translate(pattern)
+                for pattern in self.patterns
+            )
+        )
+
+    @classmethod
+    def from_value(cls, value):
+        """Create a filter from the value given to the download methods
+
+        :param value: A glob pattern, a regular expression (compiled, or a string
+                      prefixed with ``re:``), a list of them, or an
+                      :class:`~eodag.utils.assets.AssetFilter`
+        :type value: Union[str, list, :class:`re.Pattern`,
+                     :class:`~eodag.utils.assets.AssetFilter`]
+        :returns: The filter, or ``None`` if all the assets are selected
+        :rtype: :class:`~eodag.utils.assets.AssetFilter`
+        :raises: :class:`ValueError`
+        """
+        if value is None or isinstance(value, cls):
+            return value
+        if isinstance(value, (str, re.Pattern)):
+            value = [value]
+        patterns = []
+        for pattern in value:
+            if isinstance(pattern, re.Pattern):
+                pattern = REGEX_PATTERN_PREFIX + pattern.pattern
+            elif not isinstance(pattern, str):
+                raise ValueError(f"Invalid asset filter pattern: {pattern!r}")
+            patterns.append(pattern)
+        return cls(patterns) if patterns else None
+
+    @classmethod
+    def from_json(cls, value):
+        """Create a filter from its JSON representation, as saved in download records
+
+        :param value: The JSON representation, or ``None`` for all the assets
+        :type value: str
+        :returns: The filter
+        :rtype: :class:`~eodag.utils.assets.AssetFilter`
+        """
+        return cls(json.loads(value)) if value else None
+
+    def __str__(self):
+        return json.dumps(self.patterns)
+
+    def __repr__(self):
+        return f"AssetFilter({self.patterns!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, AssetFilter) and self.patterns == other.patterns
+
+    def __hash__(self):
+        return hash(tuple(self.patterns))
+
+    def match(self, key):
+        """Whether an asset is selected
+
+        :param key: The asset key
+        :type key: str
+        :rtype: bool
+        """
+        return self._regex.fullmatch(key) is not None
+
+    def match_path(self, path):
+        """Whether a file of a product is selected, using its path, its name or its
+        name without extension
+
+        >>> AssetFilter.from_value("B04").match_path("GRANULE/0/R10m/B04.jp2")
+        True
+
+        :param path: The file path relative to the product
+        :type path: str
+        :rtype: bool
+        """
+        filename = os.path.basename(path)
+        return (
+            self.match(path)
+            or self.match(filename)
+            or self.match(os.path.splitext(filename)[0])
+        )
+
+    def filter_keys(self, keys):
+        """Selected assets keys
+
+        :param keys: The assets keys
+        :type keys: Iterable[str]
+        :returns: The selected keys, in the same order
+        :rtype: list[str]
+        """
+        return [key for key in keys if self.match(key)]
+
+    @staticmethod
+    def covers(downloaded, requested, keys=None):
+        """Whether the assets downloaded with a filter include the requested ones
+
+        >>> AssetFilter.covers(AssetFilter(["B0*"]), AssetFilter(["B04"]), ["B04", "B8A"])
+        True
+        >>> AssetFilter.covers(AssetFilter(["B04"]), None, ["B04", "B8A"])
+        False
+
+        :param downloaded: The filter of the download, ``None`` if complete
+        :type downloaded: :class:`~eodag.utils.assets.AssetFilter`
+        :param requested: The requested filter, ``None`` for the whole product
+        :type requested: :class:`~eodag.utils.assets.AssetFilter`
+        :param keys: (optional) The assets keys of the product, if known
+        :type keys: Iterable[str]
+        :rtype: bool
+        """
+        if downloaded is None or downloaded == requested:
+            return True
+        if requested is None or not keys:
+            return False
+        return set(requested.filter_keys(keys)) <= set(downloaded.filter_keys(keys))
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local products cache, shared by several downloads output directories"""
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from eodag.utils.checksum import parse_checksum
+
+logger = logging.getLogger("eodag.utils.cache")
+
+CACHE_INDEX_FILENAME = "index.sqlite"
+# ioctl request cloning a file on copy-on-write filesystems (btrfs, xfs)
+FICLONE = 0x40049409
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_product_cache_key(product):
+    """Cache key of a product: its remote checksum if known, else its provider and id
+
+    :param product: The product
+    :type product: :class:`~eodag.api.product._product.EOProduct`
+    :returns: The cache key
+    :rtype: str
+    """
+    checksum = parse_checksum(product.properties.get("checksum", None))
+    if checksum:
+        return hashlib.sha256(
+            "checksum:{}:{}".format(*checksum).encode("utf-8")
+        ).hexdigest()
+    return hashlib.sha256(
+        f"{product.provider}:{product.properties['id']}".encode("utf-8")
+    ).hexdigest()
+
+
+def _reflink(src, dst):
+    """Clone ``src`` to ``dst`` sharing their data blocks, where supported"""
+    import fcntl
+
+    with open(src, "rb") as src_fh, open(dst, "wb") as dst_fh:
+        try:
+            fcntl.ioctl(dst_fh.fileno(), FICLONE, src_fh.fileno())
+        except OSError:
+            dst_fh.close()
+            os.remove(dst)
+            raise
+
+
+def link_or_copy(src, dst):
+    """Make ``dst`` file have the content of ``src``, without copying data if
+    possible: reflink on copy-on-write filesystems, else hard link, else copy
+
+    :param src: Source file
+    :type src: str
+    :param dst: Destination file
+    :type dst: str
+    """
+    try:
+        _reflink(src, dst)
+        return
+    except (OSError, ImportError):
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def link_or_copy_tree(src, dst):
+    """Make ``dst`` file or directory tree have the content of ``src``, linking
+    files when possible (see :func:`~eodag.utils.cache.link_or_copy`)
+
+    :param src: Source file or directory
+    :type src: str
+    :param dst: Destination file or directory
+    :type dst: str
+    """
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, copy_function=link_or_copy)
+    else:
+        link_or_copy(src, dst)
+
+
+def get_path_size(path):
+    """Size in bytes of a file or directory tree
+
+    :param path: The file or directory
+    :type path: str
+    :rtype: int
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+class ProductCache:
+    """Products cache, shared by several downloads output directories.
+
+    Products are stored by key (see :func:`~eodag.utils.cache.get_product_cache_key`)
+    and are linked into the requested output directories. Least recently used
+    products are evicted when the cache size exceeds its quota.
+
+    Products are linked using reflinks where supported, else hard links: with hard
+    links, modifying a product file in place modifies the cached file too.
+
+    :param cache_dir: The cache directory
+    :type cache_dir: str
+    :param quota: (optional) Maximum size of the cache in bytes, unlimited if not set
+    :type quota: int
+    """
+
+    def __init__(self, cache_dir, quota=None):
+        self.cache_dir = cache_dir
+        self.quota = int(quota) if quota else None
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            os.path.join(cache_dir, CACHE_INDEX_FILENAME),
+            timeout=30,
+            check_same_thread=False,
+        )
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "key TEXT PRIMARY KEY, name TEXT, size INTEGER, last_access REAL)"
+            )
+
+    def _entry_path(self, key, name):
+        return os.path.join(self.cache_dir, key[:2], key, name)
+
+    def get(self, key, outputs_prefix):
+        """Link a cached product into ``outputs_prefix``
+
+        :param key: The product cache key
+        :type key: str
+        :param outputs_prefix: The directory where the product is requested
+        :type outputs_prefix: str
+        :returns: The path to the product in ``outputs_prefix``, or ``None`` if it is
+                  not cached or cannot be linked
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT name FROM products WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry_path = self._entry_path(key, row[0])
+            if not os.path.exists(entry_path):
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM products WHERE key = ?", (key,)
+                    )
+                return None
+            dest_path = os.path.join(outputs_prefix, row[0])
+            if os.path.isdir(dest_path):
+                return None
+            elif os.path.isfile(dest_path):
+                # partially downloaded file
+                os.remove(dest_path)
+            link_or_copy_tree(entry_path, dest_path)
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE products SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+        return dest_path
+
+    def put(self, key, path):
+        """Add a downloaded product to the cache, and evict least recently used
+        products if the quota is exceeded
+
+        :param key: The product cache key
+        :type key: str
+        :param path: The product file or directory
+        :type path: str
+        """
+        size = get_path_size(path)
+        if self.quota is not None and size > self.quota:
+            logger.debug(f"{path} is larger than the cache quota, not cached")
+            return
+        name = os.path.basename(path.rstrip(os.sep))
+        entry_dir = os.path.dirname(self._entry_path(key, name))
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        # link into a temporary directory first, so that entries are complete
+        tmp_dir = tempfile.mkdtemp(prefix=".", dir=os.path.dirname(entry_dir))
+        try:
+            link_or_copy_tree(path, os.path.join(tmp_dir, name))
+            with self._lock:
+                if os.path.exists(entry_dir):
+                    shutil.rmtree(entry_dir)
+                try:
+                    os.rename(tmp_dir, entry_dir)
+                except OSError as e:
+                    if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                        raise
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO products (key, name, size, last_access) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, name, size, time.time()),
+                    )
+                logger.debug(f"{path} added to products cache {self.cache_dir}")
+                self._evict()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _evict(self):
+        """Remove least recently used products until the cache fits its quota"""
+        if self.quota is None:
+            return
+        total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM products"
+        ).fetchone()[0]
+        if total_size <= self.quota:
+            return
+        for key, name, size in self._connection.execute(
+            "SELECT key, name, size FROM products ORDER BY last_access"
+        ).fetchall():
+            if total_size <= self.quota:
+                break
+            shutil.rmtree(os.path.dirname(self._entry_path(key, name)), True)
+            with self._connection:
+                self._connection.execute("DELETE FROM products WHERE key = ?", (key,))
+            total_size -= size
+            logger.debug(f"{name} evicted from products cache {self.cache_dir}")
+
+
+def get_product_cache(cache_dir, quota=None):
+    """Get the products cache of a directory, shared by all the plugins
+
+    :param cache_dir: The cache directory
+    :type cache_dir: str
+    :param quota: (optional) Maximum size of the cache in bytes
+    :type quota: int
+    :returns: The products cache
+    :rtype: :class:`~eodag.utils.cache.ProductCache`
+    """
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = ProductCache(cache_dir, quota=quota)
+        cache = _caches[cache_dir]
+        cache.quota = int(quota) if quota else None
+        return cache
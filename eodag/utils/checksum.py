@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Checksums of downloaded data, computed while it is transferred"""
+import hashlib
+import logging
+import re
+
+from eodag.api.product.metadata_mapping import NOT_AVAILABLE
+from eodag.utils.exceptions import ChecksumError
+
+logger = logging.getLogger("eodag.utils.checksum")
+
+# supported algorithms, by preference order when several checksums are available
+CHECKSUM_ALGORITHMS = ("sha512", "sha256", "sha1", "md5")
+# algorithms names used by providers
+CHECKSUM_ALGORITHMS_ALIASES = {
+    "sha2256": "sha256",
+    "sha2512": "sha512",
+}
+# multihash codes (hex) of the supported algorithms, used by STAC file:checksum
+MULTIHASH_CODES = {
+    "d501": "md5",
+    "11": "sha1",
+    "12": "sha256",
+    "13": "sha512",
+}
+# hex digest length of the supported algorithms
+CHECKSUM_HEX_LENGTHS = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+HEX_REGEX = re.compile(r"^[0-9a-fA-F]+$")
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+def _normalize_algorithm(algorithm):
+    """hashlib name of an algorithm, or ``None`` if it is not supported"""
+    algorithm = re.sub(r"[-_ ]", "", str(algorithm).lower())
+    algorithm = CHECKSUM_ALGORITHMS_ALIASES.get(algorithm, algorithm)
+    return algorithm if algorithm in CHECKSUM_ALGORITHMS else None
+
+
+def _parse_multihash(value):
+    """Algorithm and hex digest of a multihash hex string, or ``None``"""
+    for code, algorithm in MULTIHASH_CODES.items():
+        digest_length = hashlib.new(algorithm).digest_size
+        prefix = f"{code}{digest_length:02x}"
+        if value.startswith(prefix) and len(value) == len(prefix) + 2 * digest_length:
+            return algorithm, value[len(prefix) :]
+    return None
+
+
+def parse_checksum(value):
+    """Parse a checksum found in products metadata.
+
+    Supported formats are:
+
+    * OData ``Checksum`` entries, like ``[{"Algorithm": "MD5", "Value": "..."}]``,
+      the strongest supported algorithm being used
+    * STAC ``file:checksum`` multihash hex strings
+    * ``<algorithm>:<hex digest>`` strings
+    * hex digests, the algorithm being guessed from their length
+
+    >>> parse_checksum("md5:d41d8cd98f00b204e9800998ecf8427e")
+    ('md5', 'd41d8cd98f00b204e9800998ecf8427e')
+    >>> parse_checksum([{"Algorithm": "MD5", "Value": "D41D8CD98F00B204E9800998ECF8427E"}])
+    ('md5', 'd41d8cd98f00b204e9800998ecf8427e')
+    >>> parse_checksum("d50110d41d8cd98f00b204e9800998ecf8427e")
+    ('md5', 'd41d8cd98f00b204e9800998ecf8427e')
+    >>> parse_checksum(None) is None
+    True
+
+    :param value: The checksum metadata
+    :type value: Any
+    :returns: The hashlib algorithm name and the expected hex digest, or ``None`` if
+              the checksum is not available or not supported
+    :rtype: tuple
+    """
+    if isinstance(value, dict):
+        value = [value]
+    if isinstance(value, list):
+        checksums = {}
+        for entry in value:
+            if not isinstance(entry, dict):
+                continue
+            entry = {k.lower(): v for k, v in entry.items()}
+            algorithm = _normalize_algorithm(entry.get("algorithm", ""))
+            digest = entry.get("value", None)
+            if algorithm and isinstance(digest, str) and HEX_REGEX.match(digest):
+                checksums[algorithm] = digest.lower()
+        for algorithm in CHECKSUM_ALGORITHMS:
+            if algorithm in checksums:
+                return algorithm, checksums[algorithm]
+        return None
+    if not isinstance(value, str) or not value or value == NOT_AVAILABLE:
+        return None
+
+    if ":" in value:
+        algorithm, digest = value.split(":", 1)
+        algorithm = _normalize_algorithm(algorithm)
+        if algorithm and HEX_REGEX.match(digest):
+            return algorithm, digest.lower()
+        return None
+    if not HEX_REGEX.match(value):
+        return None
+    value = value.lower()
+    multihash = _parse_multihash(value)
+    if multihash:
+        return multihash
+    if len(value) in CHECKSUM_HEX_LENGTHS:
+        return CHECKSUM_HEX_LENGTHS[len(value)], value
+    return None
+
+
+class ChecksumVerifier:
+    """Incremental checksum of data being transferred, verified once the transfer
+    is complete
+
+    :param algorithm: The hashlib algorithm name
+    :type algorithm: str
+    :param expected: The expected hex digest
+    :type expected: str
+    """
+
+    def __init__(self, algorithm, expected):
+        self.algorithm = algorithm
+        self.expected = expected.lower()
+        self._hash = hashlib.new(algorithm)
+
+    @classmethod
+    def from_metadata(cls, value):
+        """Create a verifier for a checksum found in products metadata
+
+        :param value: The checksum metadata (see
+                      :func:`~eodag.utils.checksum.parse_checksum`)
+        :type value: Any
+        :returns: The verifier, or ``None`` if there is no supported checksum
+        :rtype: :class:`~eodag.utils.checksum.ChecksumVerifier`
+        """
+        checksum = parse_checksum(value)
+        return cls(*checksum) if checksum else None
+
+    def update(self, data):
+        """Add transferred data to the checksum
+
+        :param data: The transferred data
+        :type data: bytes
+        """
+        self._hash.update(data)
+
+    def update_from_file(self, path):
+        """Add the content of an already transferred file, like a partial download
+        being resumed
+
+        :param path: The file path
+        :type path: str
+        """
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(COPY_BUFFER_SIZE), b""):
+                self._hash.update(chunk)
+
+    def hexdigest(self):
+        """The checksum of the data added so far
+
+        :rtype: str
+        """
+        return self._hash.hexdigest()
+
+    def verify(self, name):
+        """Check that the transferred data matches the expected checksum
+
+        :param name: Name of the transferred data, used in the error message
+        :type name: str
+        :returns: The verified checksum, as ``<algorithm>:<hex digest>``
+        :rtype: str
+        :raises: :class:`~eodag.utils.exceptions.ChecksumError`
+        """
+        digest = self.hexdigest()
+        if digest != self.expected:
+            raise ChecksumError(
+                f"{self.algorithm} checksum mismatch for {name}: "
+                f"{digest} computed, {self.expected} expected"
+            )
+        logger.debug("%s checksum of %s verified", self.algorithm, name)
+        return f"{self.algorithm}:{digest}"
+
+
+class ChecksumWriter:
+    """Write-only file-like object writing to a file handle and updating a checksum.
+
+    It is not seekable, so that the data is written in order.
+
+    :param fhandle: The file handle
+    :type fhandle: file object
+    :param verifier: The checksum to update
+    :type verifier: :class:`~eodag.utils.checksum.ChecksumVerifier`
+    """
+
+    def __init__(self, fhandle, verifier):
+        self._fhandle = fhandle
+        self._verifier = verifier
+
+    def write(self, data):
+        """Write data and add it to the checksum
+
+        :param data: The data to write
+        :type data: bytes
+        :returns: Number of bytes written
+        :rtype: int
+        """
+        self._verifier.update(data)
+        return self._fhandle.write(data)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Concurrent execution of requests whose results are consumed in order"""
+from collections import deque
+from contextvars import copy_context
+from itertools import islice
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_ordered(func, items, max_workers=1, prefetch=None):
+    """Call a function on each item using a pool of threads, yielding the results in
+    the order of the items.
+
+    The items are consumed lazily: at most ``prefetch`` calls are submitted ahead of
+    the result being yielded, so that ``items`` may be infinite (e.g. page numbers).
+    The calls which are not started yet when the iteration stops, on an error or when
+    the consumer closes it, are cancelled. Each call runs in a copy of the context of
+    the caller, so that it sees its context variables (e.g. the search context of a
+    plugin, see :class:`~eodag.plugins.search.base.SearchContext`).
+
+    >>> list(iter_ordered(lambda x: x * 2, range(5), max_workers=3))
+    [0, 2, 4, 6, 8]
+
+    :param func: The function, called with one item
+    :type func: Callable
+    :param items: The items
+    :type items: Iterable
+    :param max_workers: (optional) Maximum number of concurrent calls, the calls being
+                        done in the current thread if lower than 2
+    :type max_workers: int
+    :param prefetch: (optional) Maximum number of calls submitted ahead of the
+                     consumer, ``max_workers`` if not set
+    :type prefetch: int
+    :returns: The results of the calls
+    :rtype: Iterator
+    """
+    items = iter(items)
+    if max_workers is None or max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    prefetch = max(1, prefetch or max_workers)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit(count):
+            for item in islice(items, count):
+                pending.append(executor.submit(copy_context().run, func, item))
+
+        try:
+            submit(prefetch)
+            while pending:
+                result = pending.popleft().result()
+                submit(1)
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
@@ -65,8 +65,20 @@ class DownloadError(Exception):
     """An error indicating something wrong with the download process"""
 
 
+class ChecksumError(DownloadError):
+    """An error indicating that downloaded data does not match its expected checksum"""
+
+
 class NotAvailableError(Exception):
-    """An error indicating that the product is not available for download"""
+    """An error indicating that the product is not available for download
+
+    :param retry_after: (optional) ``Retry-After`` header of the provider response
+    :type retry_after: str
+    """
+
+    def __init__(self, *args, retry_after=None):
+        super().__init__(*args)
+        self.retry_after = retry_after
 
 
 class RequestError(Exception):
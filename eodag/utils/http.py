@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""HTTP transport utilities: pooled, provider-scoped sessions"""
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from eodag.utils.stac_reader import HTTP_REQ_TIMEOUT
+
+logger = logging.getLogger("eodag.utils.http")
+
+DEFAULT_STREAM_REQUESTS_TIMEOUT = 60  # in seconds
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# gateway errors only: 429/503 are handled by the download retry / order mechanism
+DEFAULT_RETRY_STATUS_CODES = (502, 504)
+# idempotent methods that can safely be retried
+RETRY_METHODS = frozenset(["HEAD", "GET", "OPTIONS"])
+
+_default_session = None
+
+
+class _ThrottledRaw:
+    """Raw response whose read bytes are counted by a rate limiter"""
+
+    def __init__(self, raw, rate_limiter):
+        self._raw = raw
+        self._rate_limiter = rate_limiter
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        self._rate_limiter.consume_bytes(len(data))
+        return data
+
+    def readinto(self, buffer):
+        size = self._raw.readinto(buffer)
+        self._rate_limiter.consume_bytes(size)
+        return size
+
+    def stream(self, *args, **kwargs):
+        for chunk in self._raw.stream(*args, **kwargs):
+            self._rate_limiter.consume_bytes(len(chunk))
+            yield chunk
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter counting the bytes of the responses bodies with the rate
+    limiter of its session, as they are read"""
+
+    rate_limiter = None
+
+    def build_response(self, req, resp):
+        """Build the response, its body being counted by the rate limiter"""
+        response = super(RateLimitedAdapter, self).build_response(req, resp)
+        if self.rate_limiter is not None and self.rate_limiter.limits_bytes:
+            response.raw = _ThrottledRaw(response.raw, self.rate_limiter)
+        return response
+
+
+class HttpSession(requests.Session):
+    """A :class:`requests.Session` keeping connections alive in a bounded pool, and
+    retrying idempotent requests on connection errors and gateway errors.
+
+    A session is meant to be shared by all the plugins of a provider (see
+    :meth:`~eodag.plugins.manager.PluginManager.get_http_session`), so that successive
+    search pages, counts, HEAD and download requests reuse the same TCP/TLS connections.
+
+    Requests and received bytes are throttled by the ``rate_limiter`` of the session,
+    if set (see :class:`~eodag.utils.throttling.RateLimiter`).
+
+    It can be configured in the ``http`` section of a provider configuration::
+
+        http:
+          pool_maxsize: 10
+          max_retries: 3
+          backoff_factor: 0.5
+          timeout: 5
+          stream_timeout: 60
+
+    :param pool_connections: (optional) Number of connection pools (one per host) to cache
+    :type pool_connections: int
+    :param pool_maxsize: (optional) Maximum number of connections kept alive per host
+    :type pool_maxsize: int
+    :param max_retries: (optional) Maximum number of retries of an idempotent request
+    :type max_retries: int
+    :param backoff_factor: (optional) Backoff factor applied between retries, in seconds
+    :type backoff_factor: float
+    :param retry_status_codes: (optional) HTTP status codes triggering a retry
+    :type retry_status_codes: list
+    :param timeout: (optional) Timeout in seconds of simple (not streamed) requests
+    :type timeout: float
+    :param stream_timeout: (optional) Timeout in seconds of streamed (download) requests
+    :type stream_timeout: float
+    :param keep_alive: (optional) Whether connections should be kept alive or not
+    :type keep_alive: bool
+    """
+
+    def __init__(
+        self,
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        max_retries=DEFAULT_MAX_RETRIES,
+        backoff_factor=DEFAULT_BACKOFF_FACTOR,
+        retry_status_codes=DEFAULT_RETRY_STATUS_CODES,
+        timeout=HTTP_REQ_TIMEOUT,
+        stream_timeout=DEFAULT_STREAM_REQUESTS_TIMEOUT,
+        keep_alive=True,
+    ):
+        super(HttpSession, self).__init__()
+        self.timeout = float(timeout)
+        self.stream_timeout = float(stream_timeout)
+        self.pool_maxsize = int(pool_maxsize)
+        self.max_retries = int(max_retries)
+
+        retries = Retry(
+            total=self.max_retries,
+            backoff_factor=float(backoff_factor),
+            status_forcelist=[int(code) for code in retry_status_codes],
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,
+        )
+        self._rate_limiter = None
+        adapter = RateLimitedAdapter(
+            pool_connections=int(pool_connections),
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retries,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        if not keep_alive or str(keep_alive).lower() == "false":
+            self.headers["Connection"] = "close"
+
+    @property
+    def rate_limiter(self):
+        """Rate limiter of the requests of the session, ``None`` if unlimited"""
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter):
+        self._rate_limiter = rate_limiter
+        for adapter in self.adapters.values():
+            adapter.rate_limiter = rate_limiter
+
+    def send(self, request, **kwargs):
+        """Send the request once the rate limiter allows it"""
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire_request()
+        return super(HttpSession, self).send(request, **kwargs)
+
+    @classmethod
+    def from_config(cls, http_conf=None):
+        """Build a session from an ``http`` configuration mapping
+
+        :param http_conf: (optional) The ``http`` configuration section
+        :type http_conf: dict
+        :returns: The configured session
+        :rtype: :class:`~eodag.utils.http.HttpSession`
+        """
+        http_conf = http_conf or {}
+        unknown_keys = set(http_conf) - set(HTTP_CONF_KEYS)
+        if unknown_keys:
+            logger.warning(
+                "Unknown http configuration parameters ignored: %s",
+                ", ".join(sorted(unknown_keys)),
+            )
+        return cls(**{k: v for k, v in http_conf.items() if k in HTTP_CONF_KEYS})
+
+
+HTTP_CONF_KEYS = (
+    "pool_connections",
+    "pool_maxsize",
+    "max_retries",
+    "backoff_factor",
+    "retry_status_codes",
+    "timeout",
+    "stream_timeout",
+    "keep_alive",
+)
+
+
+def get_default_http_session():
+    """Get the process-wide session used for requests that are not bound to a
+    provider (external configuration files, quicklooks, ...)
+
+    :returns: The default session
+    :rtype: :class:`~eodag.utils.http.HttpSession`
+    """
+    global _default_session
+    if _default_session is None:
+        _default_session = HttpSession()
+    return _default_session
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Orders of offline products, persisted so that they are not submitted twice"""
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from eodag.utils.records import SQLITE_MAX_VARIABLES, get_record_filename
+
+logger = logging.getLogger("eodag.utils.orders")
+
+SQLITE_ORDERS_FILENAME = "orders.sqlite"
+
+_orders_instances = {}
+_orders_instances_lock = threading.Lock()
+
+
+class OrderRecords:
+    """Orders of offline products submitted to their provider, stored in a SQLite
+    database of the download records directory.
+
+    A job restarted on the same output directory finds the products it already
+    ordered, and waits for them to be online instead of ordering them again. Orders
+    are identified by the md5 hash of the product url, like download records.
+
+    :param records_dir: The directory where orders are stored
+    :type records_dir: str
+    """
+
+    def __init__(self, records_dir):
+        self.records_dir = records_dir
+        self.db_path = os.path.join(records_dir, SQLITE_ORDERS_FILENAME)
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self):
+        """Connection to the database, created on first use"""
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS orders ("
+                    "key TEXT PRIMARY KEY, url TEXT, status TEXT, timestamp TEXT, "
+                    "message TEXT)"
+                )
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """Close the connection to the database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _exists(self):
+        """Whether orders were recorded, without creating the database"""
+        return self._connection is not None or os.path.isfile(self.db_path)
+
+    def is_available(self):
+        """Whether the orders database still exists
+
+        :rtype: bool
+        """
+        return self._connection is None or os.path.isfile(self.db_path)
+
+    def get(self, url):
+        """Get the order of a product
+
+        :param url: The product remote location
+        :type url: str
+        :returns: The order (``url``, ``status``, ``timestamp`` and ``message``), or
+                  ``None`` if the product was not ordered
+        :rtype: dict
+        """
+        return self.get_many([url]).get(url, None)
+
+    def get_many(self, urls):
+        """Get the orders of many products at once
+
+        :param urls: The products remote locations
+        :type urls: list
+        :returns: The orders found, by product remote location
+        :rtype: dict
+        """
+        orders = {}
+        if not self._exists():
+            return orders
+        keys = {get_record_filename(url): url for url in urls}
+        keys_list = list(keys)
+        with self._lock:
+            for i in range(0, len(keys_list), SQLITE_MAX_VARIABLES):
+                keys_chunk = keys_list[i : i + SQLITE_MAX_VARIABLES]
+                cursor = self.connection.execute(
+                    "SELECT key, status, timestamp, message FROM orders "
+                    f"WHERE key IN ({', '.join('?' * len(keys_chunk))})",
+                    keys_chunk,
+                )
+                for key, status, timestamp, message in cursor:
+                    orders[keys[key]] = dict(
+                        url=keys[key],
+                        status=status,
+                        timestamp=timestamp,
+                        message=message,
+                    )
+        return orders
+
+    def add(self, url, status, message=None):
+        """Record the order of a product, or update its status
+
+        :param url: The product remote location
+        :type url: str
+        :param status: The storage status of the product
+        :type status: str
+        :param message: (optional) The message returned by the provider
+        :type message: str
+        """
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO orders (key, url, status, timestamp, message) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "status = excluded.status, "
+                "message = COALESCE(excluded.message, orders.message)",
+                (
+                    get_record_filename(url),
+                    url,
+                    status,
+                    datetime.now(timezone.utc).isoformat(),
+                    message,
+                ),
+            )
+        logger.debug("Order of %s recorded as %s", url, status)
+
+    def remove(self, url):
+        """Remove the order of a product, typically once it is downloaded
+
+        :param url: The product remote location
+        :type url: str
+        """
+        if not self._exists():
+            return
+        with self._lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM orders WHERE key = ?", (get_record_filename(url),)
+            )
+
+
+def get_order_records(records_dir):
+    """Get the orders of a download records directory, shared by all the plugins
+
+    :param records_dir: The directory where orders are stored
+    :type records_dir: str
+    :returns: The orders
+    :rtype: :class:`~eodag.utils.orders.OrderRecords`
+    """
+    key = os.path.abspath(records_dir)
+    with _orders_instances_lock:
+        orders = _orders_instances.get(key, None)
+        if orders is None or not orders.is_available():
+            if orders is not None:
+                orders.close()
+            _orders_instances[key] = OrderRecords(records_dir)
+        return _orders_instances[key]
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Progress counters of long running processes, for headless runs"""
+import threading
+import time
+from collections import defaultdict
+
+_progress_metrics = None
+_progress_metrics_lock = threading.Lock()
+
+
+class ProgressMetrics:
+    """Counters of the progress of all the long running processes, by unit.
+
+    The progress callbacks (see :class:`~eodag.utils.ProgressCallback`) report their
+    batched updates to these counters, whether their progress bar is displayed or
+    not, so that headless runs (servers, batch jobs) can monitor transfers without
+    rendering anything.
+
+    >>> metrics = ProgressMetrics()
+    >>> metrics.add("B", 1024)
+    >>> metrics.add("B", 1024)
+    >>> metrics.add("file", 1)
+    >>> metrics.snapshot()["counters"]
+    {'B': 2048, 'file': 1}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._updates = 0
+        self._started = time.monotonic()
+
+    def __repr__(self):
+        return f"ProgressMetrics({dict(self._counters)})"
+
+    def add(self, unit, amount):
+        """Count processed data
+
+        :param unit: The unit of the amount (e.g. ``B``, ``file``, ``product``)
+        :type unit: str
+        :param amount: The processed amount
+        :type amount: int
+        """
+        with self._lock:
+            self._counters[unit] += amount
+            self._updates += 1
+
+    def snapshot(self):
+        """Current counters, with the number of updates they received and the
+        duration since they were reset
+
+        :returns: The counters
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "updates": self._updates,
+                "duration": time.monotonic() - self._started,
+            }
+
+    def reset(self):
+        """Reset the counters"""
+        with self._lock:
+            self._counters.clear()
+            self._updates = 0
+            self._started = time.monotonic()
+
+
+def get_progress_metrics():
+    """Get the process-wide progress counters
+
+    :returns: The progress counters
+    :rtype: :class:`~eodag.utils.progress.ProgressMetrics`
+    """
+    global _progress_metrics
+    with _progress_metrics_lock:
+        if _progress_metrics is None:
+            _progress_metrics = ProgressMetrics()
+        return _progress_metrics
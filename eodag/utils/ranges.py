@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Random access to remote files using range requests"""
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from concurrent.futures import ThreadPoolExecutor
+from requests import RequestException
+
+from eodag.utils.exceptions import RequestError
+from eodag.utils.http import get_default_http_session
+
+logger = logging.getLogger("eodag.utils.ranges")
+
+# size of the blocks fetched and cached, aligned on multiples of this size
+DEFAULT_BLOCK_SIZE = 512 * 1024
+# maximum size of the cached blocks of a file
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+# default number of ranges of a file fetched concurrently
+DEFAULT_RANGES_MAX_WORKERS = 8
+
+
+class HttpRangeFetcher:
+    """Fetch byte ranges of a file served over HTTP(S). If the server does not
+    support range requests, the whole file is fetched once and kept in memory.
+
+    :param url: The file URL
+    :type url: str
+    :param session: (optional) The session used for the requests, the default one
+                    if not set
+    :type session: :class:`~eodag.utils.http.HttpSession`
+    :param auth: (optional) The authentication of the requests
+    :type auth: :class:`requests.auth.AuthBase`
+    :param params: (optional) Extra query parameters of the requests
+    :type params: dict
+    """
+
+    def __init__(self, url, session=None, auth=None, params=None):
+        self.url = url
+        self.session = session or get_default_http_session()
+        self.auth = auth
+        self.params = params or {}
+        # whole file, if the server does not support range requests
+        self._content = None
+        self._ranges_checked = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"HttpRangeFetcher({self.url!r})"
+
+    def _request(self, method, **kwargs):
+        try:
+            response = self.session.request(
+                method,
+                self.url,
+                auth=self.auth,
+                params=self.params,
+                timeout=getattr(self.session, "timeout", None),
+                **kwargs,
+            )
+            response.raise_for_status()
+        except RequestException as e:
+            raise RequestError(f"Could not read {self.url}: {e}")
+        return response
+
+    def get_size(self):
+        """Size of the file, from the headers of a ``HEAD`` request, or of a one byte
+        range request if the server does not send it
+
+        :returns: The file size in bytes
+        :rtype: int
+        """
+        response = self._request("HEAD", allow_redirects=True)
+        size = int(response.headers.get("Content-Length", 0) or 0)
+        if size:
+            return size
+        response = self._request("GET", headers={"Range": "bytes=0-0"})
+        content_range = response.headers.get("Content-Range", "")
+        if "/" in content_range and not content_range.endswith("*"):
+            return int(content_range.rsplit("/", 1)[1])
+        return len(response.content)
+
+    def fetch(self, start, end):
+        """Fetch a byte range
+
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset following the last byte
+        :type end: int
+        :returns: The bytes
+        :rtype: bytes
+        """
+        if not self._ranges_checked:
+            # the first request tells whether the server supports ranges
+            with self._lock:
+                if not self._ranges_checked:
+                    data = self._fetch(start, end)
+                    self._ranges_checked = True
+                    return data
+        return self._fetch(start, end)
+
+    def _fetch(self, start, end):
+        if self._content is not None:
+            return self._content[start:end]
+        response = self._request("GET", headers={"Range": f"bytes={start}-{end - 1}"})
+        if response.status_code != 206:
+            # the server ignored the range and sent the whole file
+            logger.debug("%s does not support range requests", self.url)
+            self._content = response.content
+            return self._content[start:end]
+        return response.content
+
+
+class S3RangeFetcher:
+    """Fetch byte ranges of an object stored on S3
+
+    :param client: The S3 client
+    :type client: :class:`botocore.client.S3`
+    :param bucket_name: The bucket of the object
+    :type bucket_name: str
+    :param key: The object key
+    :type key: str
+    :param requester_pays: (optional) Whether the requests are paid by the requester
+    :type requester_pays: bool
+    """
+
+    def __init__(self, client, bucket_name, key, requester_pays=False):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.extra_args = {"RequestPayer": "requester"} if requester_pays else {}
+
+    def __repr__(self):
+        return f"S3RangeFetcher('s3://{self.bucket_name}/{self.key}')"
+
+    def get_size(self):
+        """Size of the object, from its metadata
+
+        :returns: The object size in bytes
+        :rtype: int
+        """
+        return self.client.head_object(
+            Bucket=self.bucket_name, Key=self.key, **self.extra_args
+        )["ContentLength"]
+
+    def fetch(self, start, end):
+        """Fetch a byte range
+
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset following the last byte
+        :type end: int
+        :returns: The bytes
+        :rtype: bytes
+        """
+        return self.client.get_object(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            Range=f"bytes={start}-{end - 1}",
+            **self.extra_args,
+        )["Body"].read()
+
+
+class RangeReader(io.RawIOBase):
+    """Seekable read-only file object on a remote file, reading it with range
+    requests.
+
+    The file is read by blocks aligned on multiples of ``block_size``, kept in a
+    least recently used cache of at most ``cache_size`` bytes. The missing blocks
+    of a read are fetched using one request per run of consecutive blocks, the runs
+    being fetched concurrently. The blocks needed by future reads can be fetched
+    concurrently beforehand using :meth:`prefetch`.
+
+    >>> class Fetcher:
+    ...     def get_size(self):
+    ...         return 10
+    ...     def fetch(self, start, end):
+    ...         return b"0123456789"[start:end]
+    >>> reader = RangeReader(Fetcher(), block_size=4)
+    >>> _ = reader.seek(3)
+    >>> reader.read(4), reader.read()
+    (b'3456', b'789')
+    >>> reader.requests_count, reader.bytes_fetched
+    (2, 10)
+
+    :param fetcher: Fetcher of the ranges of the file, with ``get_size()`` and
+                    ``fetch(start, end)`` methods
+    :type fetcher: Union[:class:`~eodag.utils.ranges.HttpRangeFetcher`,
+                   :class:`~eodag.utils.ranges.S3RangeFetcher`]
+    :param size: (optional) The file size, fetched when needed if not set
+    :type size: int
+    :param block_size: (optional) Size of the fetched and cached blocks
+    :type block_size: int
+    :param cache_size: (optional) Maximum size of the cached blocks
+    :type cache_size: int
+    :param max_workers: (optional) Maximum number of ranges fetched concurrently
+    :type max_workers: int
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        size=None,
+        block_size=DEFAULT_BLOCK_SIZE,
+        cache_size=DEFAULT_CACHE_SIZE,
+        max_workers=DEFAULT_RANGES_MAX_WORKERS,
+    ):
+        super(RangeReader, self).__init__()
+        self.fetcher = fetcher
+        self._size = size
+        self.block_size = int(block_size)
+        self.max_cached_blocks = max(1, int(cache_size) // self.block_size)
+        self.max_workers = max(1, int(max_workers))
+        self.requests_count = 0
+        self.bytes_fetched = 0
+        self._position = 0
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"RangeReader({self.fetcher!r})"
+
+    @property
+    def size(self):
+        """Size of the file in bytes"""
+        if self._size is None:
+            self._size = int(self.fetcher.get_size())
+        return self._size
+
+    def readable(self):
+        """The file is readable"""
+        return True
+
+    def seekable(self):
+        """The file supports random access"""
+        return True
+
+    def tell(self):
+        """Current position in the file"""
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Move to a new position, relative to ``whence``, without fetching data"""
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        """Read bytes from the current position into a buffer"""
+        end = min(self._position + len(buffer), self.size)
+        if end <= self._position:
+            return 0
+        data = self.read_range(self._position, end)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def read_range(self, start, end):
+        """Read a byte range, without moving the position of the file object
+
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset following the last byte
+        :type end: int
+        :returns: The bytes
+        :rtype: bytes
+        """
+        end = min(end, self.size)
+        if end <= start:
+            return b""
+        first_block = start // self.block_size
+        blocks = self._get_blocks(range(first_block, (end - 1) // self.block_size + 1))
+        data = b"".join(blocks)
+        offset = start - first_block * self.block_size
+        return data[offset : offset + end - start]
+
+    def prefetch(self, ranges):
+        """Fetch concurrently the blocks of byte ranges which are not cached yet
+
+        :param ranges: The ``(start, end)`` byte ranges
+        :type ranges: Iterable[tuple]
+        """
+        indexes = set()
+        for start, end in ranges:
+            end = min(end, self.size)
+            if end > start:
+                indexes.update(
+                    range(start // self.block_size, (end - 1) // self.block_size + 1)
+                )
+        self._get_blocks(sorted(indexes))
+
+    def _get_blocks(self, indexes):
+        """Cached or fetched blocks
+
+        :param indexes: The sorted indexes of the blocks
+        :type indexes: Iterable[int]
+        :returns: The blocks, in the same order
+        :rtype: list[bytes]
+        """
+        blocks = {}
+        with self._lock:
+            for index in indexes:
+                if index in self._blocks:
+                    self._blocks.move_to_end(index)
+                    blocks[index] = self._blocks[index]
+                else:
+                    blocks[index] = None
+        missing = [index for index, block in blocks.items() if block is None]
+
+        # one request per run of consecutive missing blocks
+        runs = []
+        for index in missing:
+            if runs and runs[-1][-1] == index - 1:
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+        if len(runs) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(runs))
+            ) as executor:
+                fetched = list(executor.map(self._fetch_run, runs))
+        else:
+            fetched = [self._fetch_run(run) for run in runs]
+
+        with self._lock:
+            for run_blocks in fetched:
+                for index, block in run_blocks:
+                    blocks[index] = block
+                    self._blocks[index] = block
+                    self._blocks.move_to_end(index)
+            while len(self._blocks) > self.max_cached_blocks:
+                self._blocks.popitem(last=False)
+        return list(blocks.values())
+
+    def _fetch_run(self, run):
+        """Fetch consecutive blocks with a single request
+
+        :param run: The indexes of the consecutive blocks
+        :type run: list[int]
+        :returns: The indexes and their blocks
+        :rtype: list[tuple]
+        """
+        start = run[0] * self.block_size
+        end = min((run[-1] + 1) * self.block_size, self.size)
+        data = self.fetcher.fetch(start, end)
+        with self._lock:
+            self.requests_count += 1
+            self.bytes_fetched += len(data)
+        return [
+            (index, data[i * self.block_size : (i + 1) * self.block_size])
+            for i, index in enumerate(run)
+        ]
+
+    def clear_cache(self):
+        """Forget the cached blocks"""
+        with self._lock:
+            self._blocks.clear()
@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Download records: products already downloaded in an output directory"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from eodag.utils.assets import AssetFilter
+
+logger = logging.getLogger("eodag.utils.records")
+
+# records directory, relative to the downloads output directory
+RECORDS_DIRNAME = ".downloaded"
+SQLITE_RECORDS_FILENAME = "records.sqlite"
+# legacy record files are named after the md5 hash of the product url
+LEGACY_RECORD_FILENAME_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+# maximum number of parameters of a SQLite query
+SQLITE_MAX_VARIABLES = 500
+
+_records_instances = {}
+_records_instances_lock = threading.Lock()
+
+
+def get_record_filename(url):
+    """Name of the legacy record file of a product url
+
+    :param url: The product remote location
+    :type url: str
+    :returns: The md5 hash of the url
+    :rtype: str
+    """
+    return hashlib.md5(url.encode("utf-8")).hexdigest()
+
+
+class DownloadRecords:
+    """Records of the products downloaded in a directory.
+
+    Many products can be looked up at once using
+    :meth:`~eodag.utils.records.DownloadRecords.prefetch`, the result of each lookup
+    being used by the next :meth:`~eodag.utils.records.DownloadRecords.get` call.
+
+    :param records_dir: The directory where records are stored
+    :type records_dir: str
+    """
+
+    def __init__(self, records_dir):
+        self.records_dir = records_dir
+        self._prefetched = {}
+
+    def get(self, url):
+        """Get the record of a product
+
+        :param url: The product remote location
+        :type url: str
+        :returns: The record (``url``, ``path``, ``size``, ``checksum``,
+                  ``timestamp`` and ``asset_filter``, the
+                  :class:`~eodag.utils.assets.AssetFilter` of a partial download),
+                  or ``None`` if the product was not downloaded
+        :rtype: dict
+        """
+        try:
+            return self._prefetched.pop(url)
+        except KeyError:
+            return self._get_many([url]).get(url, None)
+
+    def prefetch(self, urls):
+        """Look up the records of many products at once, for their next
+        :meth:`~eodag.utils.records.DownloadRecords.get` call
+
+        :param urls: The products remote locations
+        :type urls: list
+        """
+        urls = list(set(urls))
+        records = self._get_many(urls)
+        for url in urls:
+            self._prefetched[url] = records.get(url, None)
+
+    def clear_prefetched(self, urls=None):
+        """Forget the prefetched records which were not used, so that they are looked
+        up again by the next :meth:`~eodag.utils.records.DownloadRecords.get` call
+
+        :param urls: (optional) The products remote locations, all of them if not set
+        :type urls: list
+        """
+        if urls is None:
+            self._prefetched.clear()
+            return
+        for url in urls:
+            self._prefetched.pop(url, None)
+
+    def is_available(self):
+        """Whether the records storage still exists
+
+        :rtype: bool
+        """
+        return os.path.isdir(self.records_dir)
+
+    def add(self, url, path=None, size=None, checksum=None, asset_filter=None):
+        """Record a downloaded product
+
+        :param url: The product remote location
+        :type url: str
+        :param path: (optional) The local path of the product
+        :type path: str
+        :param size: (optional) The size in bytes of the product
+        :type size: int
+        :param checksum: (optional) The checksum of the product
+        :type checksum: str
+        :param asset_filter: (optional) The assets downloaded, if the product was
+                             partially downloaded
+        :type asset_filter: :class:`~eodag.utils.assets.AssetFilter`
+        """
+        record = dict(
+            url=url,
+            path=path,
+            size=size,
+            checksum=checksum,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            asset_filter=asset_filter,
+        )
+        self._prefetched.pop(url, None)
+        self._add(record)
+
+    def remove(self, url):
+        """Remove the record of a product
+
+        :param url: The product remote location
+        :type url: str
+        """
+        self._prefetched.pop(url, None)
+        self._remove(url)
+
+    def _get_many(self, urls):
+        raise NotImplementedError
+
+    def _add(self, record):
+        raise NotImplementedError
+
+    def _remove(self, url):
+        raise NotImplementedError
+
+
+class FileDownloadRecords(DownloadRecords):
+    """Legacy records: one file per product, named after the md5 hash of its url and
+    containing the url. Partial downloads are not recorded."""
+
+    def _get_many(self, urls):
+        records = {}
+        for url in urls:
+            if os.path.isfile(os.path.join(self.records_dir, get_record_filename(url))):
+                records[url] = dict(
+                    url=url,
+                    path=None,
+                    size=None,
+                    checksum=None,
+                    timestamp=None,
+                    asset_filter=None,
+                )
+        return records
+
+    def _add(self, record):
+        if record["asset_filter"] is not None:
+            # would be taken for a complete download
+            self._remove(record["url"])
+            logger.debug("Partial download of %s not recorded", record["url"])
+            return
+        record_filename = os.path.join(
+            self.records_dir, get_record_filename(record["url"])
+        )
+        with open(record_filename, "w") as fh:
+            fh.write(record["url"])
+        logger.debug("Download recorded in %s", record_filename)
+
+    def _remove(self, url):
+        record_filename = os.path.join(self.records_dir, get_record_filename(url))
+        if os.path.isfile(record_filename):
+            logger.debug(f"Removing record file : {record_filename}")
+            os.remove(record_filename)
+
+
+class SQLiteDownloadRecords(DownloadRecords):
+    """Records stored in a single SQLite database, in a transactional way.
+
+    Records are identified by the md5 hash of the product url, like legacy record
+    files. Legacy record files found in the records directory are imported into the
+    database, and kept for the ``files`` backend and older eodag versions.
+    """
+
+    def __init__(self, records_dir):
+        super(SQLiteDownloadRecords, self).__init__(records_dir)
+        self.db_path = os.path.join(records_dir, SQLITE_RECORDS_FILENAME)
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self):
+        """Connection to the database, created and migrated on first use"""
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS records ("
+                    "key TEXT PRIMARY KEY, url TEXT, path TEXT, size INTEGER, "
+                    "checksum TEXT, timestamp TEXT, asset_filter TEXT)"
+                )
+                columns = [
+                    row[1] for row in connection.execute("PRAGMA table_info(records)")
+                ]
+                if "asset_filter" not in columns:
+                    connection.execute(
+                        "ALTER TABLE records ADD COLUMN asset_filter TEXT"
+                    )
+            self._connection = connection
+            self._migrate_legacy_records()
+        return self._connection
+
+    def close(self):
+        """Close the connection to the database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _migrate_legacy_records(self):
+        """Import legacy record files into the database"""
+        legacy_records = []
+        with os.scandir(self.records_dir) as entries:
+            for entry in entries:
+                if LEGACY_RECORD_FILENAME_PATTERN.match(entry.name) and entry.is_file():
+                    with open(entry.path) as fh:
+                        url = fh.read().strip()
+                    timestamp = datetime.fromtimestamp(
+                        entry.stat().st_mtime, timezone.utc
+                    ).isoformat()
+                    legacy_records.append((entry.name, url, timestamp))
+        if not legacy_records:
+            return
+        with self._connection:
+            imported = self._connection.executemany(
+                "INSERT OR IGNORE INTO records (key, url, timestamp) VALUES (?, ?, ?)",
+                legacy_records,
+            ).rowcount
+        if imported > 0:
+            logger.info(
+                "%s legacy download records imported in %s", imported, self.db_path
+            )
+
+    def is_available(self):
+        """Whether the records database still exists
+
+        :rtype: bool
+        """
+        return self._connection is None or os.path.isfile(self.db_path)
+
+    def _get_many(self, urls):
+        keys = {get_record_filename(url): url for url in urls}
+        keys_list = list(keys)
+        records = {}
+        with self._lock:
+            for i in range(0, len(keys_list), SQLITE_MAX_VARIABLES):
+                keys_chunk = keys_list[i : i + SQLITE_MAX_VARIABLES]
+                cursor = self.connection.execute(
+                    "SELECT key, path, size, checksum, timestamp, asset_filter "
+                    "FROM records "
+                    f"WHERE key IN ({', '.join('?' * len(keys_chunk))})",
+                    keys_chunk,
+                )
+                for key, path, size, checksum, timestamp, asset_filter in cursor:
+                    records[keys[key]] = dict(
+                        url=keys[key],
+                        path=path,
+                        size=size,
+                        checksum=checksum,
+                        timestamp=timestamp,
+                        asset_filter=AssetFilter.from_json(asset_filter),
+                    )
+        return records
+
+    def _add(self, record):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO records "
+                "(key, url, path, size, checksum, timestamp, asset_filter) "
+                "VALUES (:key, :url, :path, :size, :checksum, :timestamp, "
+                ":asset_filter)",
+                dict(
+                    record,
+                    key=get_record_filename(record["url"]),
+                    asset_filter=(
+                        str(record["asset_filter"])
+                        if record["asset_filter"] is not None
+                        else None
+                    ),
+                ),
+            )
+        logger.debug("Download of %s recorded in %s", record["url"], self.db_path)
+
+    def _remove(self, url):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM records WHERE key = ?", (get_record_filename(url),)
+            )
+        logger.debug("Removing record of %s from %s", url, self.db_path)
+        # the legacy record would be imported again
+        legacy_record = os.path.join(self.records_dir, get_record_filename(url))
+        if os.path.isfile(legacy_record):
+            os.remove(legacy_record)
+
+
+DOWNLOAD_RECORDS_BACKENDS = {
+    "sqlite": SQLiteDownloadRecords,
+    "files": FileDownloadRecords,
+}
+
+
+def get_download_records(records_dir, backend="sqlite"):
+    """Get the download records of a directory, shared by all the plugins
+
+    :param records_dir: The directory where records are stored
+    :type records_dir: str
+    :param backend: (optional) Records backend, ``sqlite`` or legacy ``files``
+    :type backend: str
+    :returns: The download records
+    :rtype: :class:`~eodag.utils.records.DownloadRecords`
+    """
+    if backend not in DOWNLOAD_RECORDS_BACKENDS:
+        raise ValueError(
+            f"Unknown download records backend {backend}, "
+            f"available: {', '.join(DOWNLOAD_RECORDS_BACKENDS)}"
+        )
+    key = (backend, os.path.abspath(records_dir))
+    with _records_instances_lock:
+        records = _records_instances.get(key, None)
+        if records is None or not records.is_available():
+            if hasattr(records, "close"):
+                records.close()
+            _records_instances[key] = DOWNLOAD_RECORDS_BACKENDS[backend](records_dir)
+        return _records_instances[key]
+
+
+class DownloadRecord:
+    """Record of a product being downloaded, to be saved once it is downloaded
+
+    :param records: The records where the download will be saved
+    :type records: :class:`~eodag.utils.records.DownloadRecords`
+    :param url: The product remote location
+    :type url: str
+    :param product_cache: (optional) Products cache where the downloaded product
+                          will be added
+    :type product_cache: :class:`~eodag.utils.cache.ProductCache`
+    :param cache_key: (optional) The product key in ``product_cache``
+    :type cache_key: str
+    :param asset_filter: (optional) The assets to download, if only some of them
+                         are requested
+    :type asset_filter: :class:`~eodag.utils.assets.AssetFilter`
+    """
+
+    def __init__(
+        self, records, url, product_cache=None, cache_key=None, asset_filter=None
+    ):
+        self.records = records
+        self.url = url
+        self.product_cache = product_cache
+        self.cache_key = cache_key
+        self.asset_filter = asset_filter
+
+    def save(self, path=None, size=None, checksum=None, partial=False):
+        """Save the record of the downloaded product, and add it to the products cache
+        if it was completely downloaded
+
+        :param path: (optional) The local path of the product
+        :type path: str
+        :param size: (optional) The size in bytes of the product, computed from
+                     ``path`` if it is a file
+        :type size: int
+        :param checksum: (optional) The checksum of the product
+        :type checksum: str
+        :param partial: (optional) Whether only the assets of ``asset_filter`` were
+                        downloaded
+        :type partial: bool
+        """
+        asset_filter = self.asset_filter if partial else None
+        if size is None and path and os.path.isfile(path):
+            size = os.path.getsize(path)
+        self.records.add(
+            self.url,
+            path=path,
+            size=size,
+            checksum=checksum,
+            asset_filter=asset_filter,
+        )
+        if (
+            self.product_cache is not None
+            and asset_filter is None
+            and path
+            and os.path.exists(path)
+        ):
+            try:
+                self.product_cache.put(self.cache_key, path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Could not add {path} to products cache: {e}")
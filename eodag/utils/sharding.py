@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Splitting of searches into shards covering shorter time ranges or smaller areas"""
+import datetime
+
+from dateutil.parser import isoparse
+from dateutil.tz import UTC
+from shapely.geometry import box
+
+# area searched when no geometry is given
+WORLD_BOUNDS = (-180.0, -90.0, 180.0, 90.0)
+# shards are not split into time ranges shorter than this duration
+DEFAULT_SHARD_MIN_DURATION = datetime.timedelta(days=1)
+# shards matching more products are split, many providers limiting the number of
+# results which can be paginated through
+DEFAULT_SHARD_MAX_RESULTS = 10000
+# maximum number of splits of a shard, and number of shards searched concurrently
+DEFAULT_SHARD_MAX_DEPTH = 10
+DEFAULT_SHARDS_MAX_WORKERS = 4
+
+
+def _parse_datetime(date_time):
+    """Aware datetime of an ISO 8601 string, assumed to be in UTC without offset"""
+    dt = isoparse(date_time)
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+def _format_datetime(dt):
+    """ISO 8601 string of a datetime in UTC"""
+    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class SearchShard:
+    """Part of a search, covering a time range and an area. Shards are split in two
+    halves, over time or over space, until they match few enough products.
+
+    >>> shard = SearchShard("2021-01-01", "2021-01-03")
+    >>> [(s.start, s.end) for s in shard.split_time()]  # doctest: +NORMALIZE_WHITESPACE
+    [('2021-01-01', '2021-01-02T00:00:00.000Z'),
+     ('2021-01-02T00:00:00.000Z', '2021-01-03')]
+    >>> [s.geometry.bounds for s in shard.split_space()]
+    [(-180.0, -90.0, 0.0, 90.0), (0.0, -90.0, 180.0, 90.0)]
+
+    :param start: (optional) Start of the time range, in ISO 8601 format
+    :type start: str
+    :param end: (optional) End of the time range, in ISO 8601 format
+    :type end: str
+    :param geometry: (optional) The area, the whole world if not set
+    :type geometry: :class:`shapely.geometry.base.BaseGeometry`
+    :param depth: (optional) The number of splits which led to this shard
+    :type depth: int
+    """
+
+    def __init__(self, start=None, end=None, geometry=None, depth=0):
+        self.start = start
+        self.end = end
+        self.geometry = geometry
+        self.depth = depth
+
+    def __repr__(self):
+        return (
+            f"SearchShard(start={self.start!r}, end={self.end!r}, "
+            f"bounds={self.bounds}, depth={self.depth})"
+        )
+
+    @property
+    def bounds(self):
+        """Bounds of the area of the shard"""
+        return self.geometry.bounds if self.geometry is not None else WORLD_BOUNDS
+
+    @property
+    def duration(self):
+        """Duration of the time range, ``None`` if it is not bounded"""
+        if self.start is None or self.end is None:
+            return None
+        return _parse_datetime(self.end) - _parse_datetime(self.start)
+
+    @property
+    def search_kwargs(self):
+        """Time range and geometry arguments of the search of the shard"""
+        search_kwargs = {}
+        if self.start is not None:
+            search_kwargs["start"] = self.start
+        if self.end is not None:
+            search_kwargs["end"] = self.end
+        if self.geometry is not None:
+            search_kwargs["geom"] = self.geometry
+        return search_kwargs
+
+    def split_time(self):
+        """Split the time range in two halves, sharing their bound
+
+        :returns: The two shards, or none if the time range is not bounded
+        :rtype: list[:class:`~eodag.utils.sharding.SearchShard`]
+        """
+        if self.duration is None:
+            return []
+        middle = _format_datetime(_parse_datetime(self.start) + self.duration / 2)
+        return [
+            SearchShard(self.start, middle, self.geometry, self.depth + 1),
+            SearchShard(middle, self.end, self.geometry, self.depth + 1),
+        ]
+
+    def split_space(self):
+        """Split the area in two halves, across the longest side of its bounds
+
+        :returns: The shards which are not empty
+        :rtype: list[:class:`~eodag.utils.sharding.SearchShard`]
+        """
+        minx, miny, maxx, maxy = self.bounds
+        if maxx - minx >= maxy - miny:
+            middle = (minx + maxx) / 2
+            halves = [box(minx, miny, middle, maxy), box(middle, miny, maxx, maxy)]
+        else:
+            middle = (miny + maxy) / 2
+            halves = [box(minx, miny, maxx, middle), box(minx, middle, maxx, maxy)]
+        shards = []
+        for half in halves:
+            geometry = (
+                half if self.geometry is None else self.geometry.intersection(half)
+            )
+            if geometry.is_empty:
+                continue
+            shards.append(SearchShard(self.start, self.end, geometry, self.depth + 1))
+        return shards
+
+    def split(self, split="time", min_duration=DEFAULT_SHARD_MIN_DURATION):
+        """Split the shard over time while its time range is longer than
+        ``min_duration``, then over space
+
+        :param split: (optional) How the shard is split: ``"time"``, ``"space"`` or
+                      ``"both"``
+        :type split: str
+        :param min_duration: (optional) Minimum duration of a time range split
+        :type min_duration: :class:`datetime.timedelta`
+        :returns: The shards, or none if the shard cannot be split
+        :rtype: list[:class:`~eodag.utils.sharding.SearchShard`]
+        """
+        if split not in ("time", "space", "both"):
+            raise ValueError(
+                f"Unknown split '{split}', must be one of time, space or both"
+            )
+        duration = self.duration
+        if split in ("time", "both") and duration is not None:
+            if duration / 2 >= min_duration:
+                return self.split_time()
+        if split in ("space", "both"):
+            shards = self.split_space()
+            # a point or a line may not be split
+            if len(shards) > 1:
+                return shards
+        return []
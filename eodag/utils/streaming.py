@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Writing of streamed responses to files"""
+import logging
+import os
+import threading
+import time
+
+from requests.exceptions import ChunkedEncodingError
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ContentDecodingError
+from requests.exceptions import SSLError as RequestsSSLError
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+
+logger = logging.getLogger("eodag.utils.streaming")
+
+# bounds of the size of the chunks read from a stream
+MIN_STREAM_CHUNK_SIZE = 64 * 1024
+MAX_STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+# the chunk size is doubled when a full chunk is read faster than this duration, and
+# halved when it takes more than 4 times this duration
+TARGET_CHUNK_DURATION = 0.05  # in seconds
+# files from which the page cache is advised to be used sequentially, and freed
+# once written, if supported
+FADVISE_MIN_SIZE = 256 * 1024 * 1024
+
+_buffers = threading.local()
+
+
+def _get_buffer(size):
+    """Preallocated buffer of the current thread, reused by all its streams"""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        buffer = _buffers.buffer = memoryview(bytearray(size))
+    return buffer
+
+
+def _readinto(raw, buffer):
+    """Read the raw stream into the buffer, raising the errors of
+    :meth:`requests.Response.iter_content` instead of the ones of urllib3"""
+    try:
+        return raw.readinto(buffer)
+    except ProtocolError as e:
+        raise ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise ContentDecodingError(e)
+    except ReadTimeoutError as e:
+        raise RequestsConnectionError(e)
+    except SSLError as e:
+        raise RequestsSSLError(e)
+
+
+class StreamWriter:
+    """Writes the body of a streamed response to a file.
+
+    The body is read into a preallocated buffer, reused by all the streams of a
+    thread, instead of allocating a new ``bytes`` object per chunk. The size of the
+    chunks adapts to the throughput: it grows while full chunks are read faster than
+    ``target_duration``, and shrinks when they are slower, so that progress is
+    reported regularly on slow connections and overhead stays low on fast ones.
+
+    Responses whose body is encoded (``gzip``, ...), or which do not provide a raw
+    stream supporting ``readinto``, are written from
+    :meth:`requests.Response.iter_content`.
+
+    Files larger than ``fadvise_min_size`` are advised to be read sequentially and
+    their written pages to be dropped from the page cache, on platforms supporting
+    :func:`os.posix_fadvise`.
+
+    :param min_chunk_size: (optional) Minimum size of the read chunks
+    :type min_chunk_size: int
+    :param max_chunk_size: (optional) Maximum size of the read chunks, and of the
+                           buffer
+    :type max_chunk_size: int
+    :param target_duration: (optional) Targeted duration of the read of a chunk
+    :type target_duration: float
+    :param fadvise_min_size: (optional) Minimum size of the files for which page cache
+                             hints are given, ``None`` to disable them
+    :type fadvise_min_size: int
+    """
+
+    def __init__(
+        self,
+        min_chunk_size=MIN_STREAM_CHUNK_SIZE,
+        max_chunk_size=MAX_STREAM_CHUNK_SIZE,
+        target_duration=TARGET_CHUNK_DURATION,
+        fadvise_min_size=FADVISE_MIN_SIZE,
+    ):
+        self.min_chunk_size = int(min_chunk_size)
+        self.max_chunk_size = max(self.min_chunk_size, int(max_chunk_size))
+        self.target_duration = float(target_duration)
+        self.fadvise_min_size = fadvise_min_size
+
+    def _next_chunk_size(self, chunk_size, read_size, duration):
+        """Chunk size adapted to the duration of the last read"""
+        if read_size == chunk_size and duration < self.target_duration:
+            return min(chunk_size * 2, self.max_chunk_size)
+        if duration > self.target_duration * 4:
+            return max(chunk_size // 2, self.min_chunk_size)
+        return chunk_size
+
+    def write(
+        self, response, fhandle, progress_callback=None, verifier=None, limit=None
+    ):
+        """Write the body of a response to a file
+
+        :param response: The streamed response
+        :type response: :class:`requests.Response`
+        :param fhandle: The file, opened in binary writing mode
+        :type fhandle: :class:`io.BufferedWriter`
+        :param progress_callback: (optional) Called with the number of written bytes
+        :type progress_callback: Callable
+        :param verifier: (optional) Checksum verifier updated with the written data
+        :type verifier: :class:`~eodag.utils.checksum.ChecksumVerifier`
+        :param limit: (optional) Maximum number of bytes to write
+        :type limit: int
+        :returns: The number of written bytes
+        :rtype: int
+        """
+        size = int(response.headers.get("content-length", 0) or 0)
+        fadvise = self._get_fadvise(fhandle, size)
+        raw = getattr(response, "raw", None)
+        # urllib3 responses, mocks being written through iter_content
+        if (
+            hasattr(type(raw), "readinto")
+            and not response.headers.get("content-encoding", None)
+            and not getattr(raw, "closed", True)
+        ):
+            chunks = self._iter_readinto(raw, limit)
+        else:
+            chunks = self._iter_content(response, limit)
+
+        written = 0
+        start = fhandle.tell()
+        for chunk in chunks:
+            fhandle.write(chunk)
+            if verifier:
+                verifier.update(chunk)
+            written += len(chunk)
+            if progress_callback:
+                progress_callback(len(chunk))
+            if fadvise and written >= fadvise[1] + self.max_chunk_size * 16:
+                fadvise = self._drop_written_pages(fhandle, start, fadvise, written)
+        return written
+
+    def _iter_readinto(self, raw, limit=None):
+        """Chunks of the body, as views of the buffer of the thread"""
+        buffer = _get_buffer(self.max_chunk_size)
+        chunk_size = self.min_chunk_size
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            started = time.monotonic()
+            read_size = _readinto(raw, buffer[:size])
+            if not read_size:
+                return
+            chunk_size = self._next_chunk_size(
+                chunk_size, read_size, time.monotonic() - started
+            )
+            if remaining is not None:
+                remaining -= read_size
+            yield buffer[:read_size]
+
+    def _iter_content(self, response, limit=None):
+        """Chunks of the body, read from :meth:`requests.Response.iter_content`"""
+        remaining = limit
+        for chunk in response.iter_content(chunk_size=self.min_chunk_size):
+            if not chunk:
+                continue
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining is not None and remaining <= 0:
+                return
+
+    def _get_fadvise(self, fhandle, size):
+        """File descriptor and written size when page cache hints were last given,
+        if they are enabled for this file"""
+        if (
+            self.fadvise_min_size is None
+            or size < self.fadvise_min_size
+            or not hasattr(os, "posix_fadvise")
+        ):
+            return None
+        try:
+            fd = fhandle.fileno()
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (AttributeError, OSError, ValueError) as e:
+            logger.debug("Page cache hints not given: %s", e)
+            return None
+        return fd, 0
+
+    def _drop_written_pages(self, fhandle, start, fadvise, written):
+        """Advise to drop the pages written since the last hint from the page cache"""
+        fd, advised = fadvise
+        fhandle.flush()
+        try:
+            os.posix_fadvise(
+                fd, start + advised, written - advised, os.POSIX_FADV_DONTNEED
+            )
+        except OSError as e:
+            logger.debug("Page cache hints not given: %s", e)
+            return None
+        return fd, written
+
+
+_default_stream_writer = StreamWriter()
+
+
+def write_stream(response, fhandle, progress_callback=None, verifier=None, limit=None):
+    """Write the body of a streamed response to a file, using the default
+    :class:`~eodag.utils.streaming.StreamWriter`
+
+    :param response: The streamed response
+    :type response: :class:`requests.Response`
+    :param fhandle: The file, opened in binary writing mode
+    :type fhandle: :class:`io.BufferedWriter`
+    :param progress_callback: (optional) Called with the number of written bytes
+    :type progress_callback: Callable
+    :param verifier: (optional) Checksum verifier updated with the written data
+    :type verifier: :class:`~eodag.utils.checksum.ChecksumVerifier`
+    :param limit: (optional) Maximum number of bytes to write
+    :type limit: int
+    :returns: The number of written bytes
+    :rtype: int
+    """
+    return _default_stream_writer.write(
+        response,
+        fhandle,
+        progress_callback=progress_callback,
+        verifier=verifier,
+        limit=limit,
+    )
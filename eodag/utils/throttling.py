@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bandwidth and requests rate limiting"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("eodag.utils.throttling")
+
+# duration of the traffic allowed in a burst, in seconds
+DEFAULT_BURST = 1.0
+
+RATE_LIMIT_CONF_KEYS = ("bytes_per_second", "requests_per_second", "burst")
+
+# environment variables setting the global limits
+BYTES_PER_SECOND_ENV_VAR = "EODAG_MAX_BYTES_PER_SECOND"
+REQUESTS_PER_SECOND_ENV_VAR = "EODAG_MAX_REQUESTS_PER_SECOND"
+
+_global_rate_limiter = None
+_global_rate_limiter_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Token bucket filled at a constant rate, up to its capacity.
+
+    Consuming more tokens than available does not fail: the bucket goes into debt
+    and the consumer waits for the time needed to pay it back, so that concurrent
+    consumers are served in turn without holding any lock while waiting.
+
+    >>> bucket = TokenBucket(rate=100, capacity=100)
+    >>> bucket.consume(50, wait=False), bucket.consume(100, wait=False) > 0.4
+    (0.0, True)
+
+    :param rate: Tokens added per second
+    :type rate: float
+    :param capacity: Maximum number of tokens, allowing bursts
+    :type capacity: float
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"TokenBucket(rate={self.rate}, capacity={self.capacity})"
+
+    def consume(self, amount=1, wait=True):
+        """Consume tokens, waiting until they are available
+
+        :param amount: (optional) Number of tokens to consume
+        :type amount: float
+        :param wait: (optional) Whether to wait or only return the waiting time
+        :type wait: bool
+        :returns: The waiting time in seconds
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay and wait:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    """Limits of the bandwidth and of the requests rate of a provider, or of all of
+    them for the global limiter.
+
+    The limiter of a provider is shared by all its plugins (see
+    :meth:`~eodag.plugins.manager.PluginManager.get_rate_limiter`), through the HTTP
+    session of the provider and the S3 clients of
+    :class:`~eodag.plugins.download.aws.AwsDownload`. Consumed bytes and requests are
+    also counted by its ``parent``, the global limiter, so that providers share the
+    global bandwidth. Limits are set in the ``rate_limit`` section of a provider
+    configuration::
+
+        rate_limit:
+          bytes_per_second: 10000000
+          requests_per_second: 5
+          burst: 1.0
+
+    ``burst`` being the duration, in seconds, of the traffic allowed at once.
+
+    :param bytes_per_second: (optional) Maximum bandwidth, unlimited if not set
+    :type bytes_per_second: float
+    :param requests_per_second: (optional) Maximum requests rate, unlimited if not set
+    :type requests_per_second: float
+    :param burst: (optional) Duration of the traffic allowed in a burst, in seconds
+    :type burst: float
+    :param parent: (optional) Limiter also consumed, typically the global one
+    :type parent: :class:`~eodag.utils.throttling.RateLimiter`
+    """
+
+    def __init__(
+        self,
+        bytes_per_second=None,
+        requests_per_second=None,
+        burst=DEFAULT_BURST,
+        parent=None,
+    ):
+        self.parent = parent
+        self.bytes_bucket = None
+        self.requests_bucket = None
+        self.set_limits(bytes_per_second, requests_per_second, burst)
+
+    def __repr__(self):
+        return (
+            f"RateLimiter(bytes_per_second={self.bytes_per_second}, "
+            f"requests_per_second={self.requests_per_second})"
+        )
+
+    @classmethod
+    def from_config(cls, rate_limit_conf=None, parent=None):
+        """Build a limiter from a ``rate_limit`` configuration mapping
+
+        :param rate_limit_conf: (optional) The ``rate_limit`` configuration section
+        :type rate_limit_conf: dict
+        :param parent: (optional) Limiter also consumed, typically the global one
+        :type parent: :class:`~eodag.utils.throttling.RateLimiter`
+        :returns: The configured limiter
+        :rtype: :class:`~eodag.utils.throttling.RateLimiter`
+        """
+        rate_limit_conf = rate_limit_conf or {}
+        unknown_keys = set(rate_limit_conf) - set(RATE_LIMIT_CONF_KEYS)
+        if unknown_keys:
+            logger.warning(
+                "Unknown rate_limit configuration parameters ignored: %s",
+                ", ".join(sorted(unknown_keys)),
+            )
+        return cls(
+            parent=parent,
+            **{k: v for k, v in rate_limit_conf.items() if k in RATE_LIMIT_CONF_KEYS},
+        )
+
+    @property
+    def bytes_per_second(self):
+        """Maximum bandwidth, ``None`` if unlimited"""
+        return self.bytes_bucket.rate if self.bytes_bucket else None
+
+    @property
+    def requests_per_second(self):
+        """Maximum requests rate, ``None`` if unlimited"""
+        return self.requests_bucket.rate if self.requests_bucket else None
+
+    @property
+    def limits_bytes(self):
+        """Whether the bandwidth is limited, by this limiter or by its parent"""
+        return self.bytes_bucket is not None or bool(
+            self.parent and self.parent.limits_bytes
+        )
+
+    def set_limits(
+        self, bytes_per_second=None, requests_per_second=None, burst=DEFAULT_BURST
+    ):
+        """Change the limits, a limit not set being removed
+
+        :param bytes_per_second: (optional) Maximum bandwidth
+        :type bytes_per_second: float
+        :param requests_per_second: (optional) Maximum requests rate
+        :type requests_per_second: float
+        :param burst: (optional) Duration of the traffic allowed in a burst, in seconds
+        :type burst: float
+        """
+        burst = float(burst)
+        self.bytes_bucket = (
+            TokenBucket(float(bytes_per_second), float(bytes_per_second) * burst)
+            if bytes_per_second
+            else None
+        )
+        # at least one request is allowed at once
+        self.requests_bucket = (
+            TokenBucket(
+                float(requests_per_second),
+                max(1.0, float(requests_per_second) * burst),
+            )
+            if requests_per_second
+            else None
+        )
+
+    def acquire_request(self):
+        """Wait until a request can be sent"""
+        if self.requests_bucket is not None:
+            self.requests_bucket.consume(1)
+        if self.parent is not None:
+            self.parent.acquire_request()
+
+    def consume_bytes(self, amount):
+        """Count received or sent bytes, waiting if the bandwidth is exceeded
+
+        :param amount: Number of bytes
+        :type amount: int
+        """
+        if self.bytes_bucket is not None:
+            self.bytes_bucket.consume(amount)
+        if self.parent is not None:
+            self.parent.consume_bytes(amount)
+
+
+def get_global_rate_limiter():
+    """Get the process-wide limiter, parent of the limiters of all the providers.
+
+    It is unlimited unless limits are set with :func:`set_global_rate_limit`, or
+    with the ``EODAG_MAX_BYTES_PER_SECOND`` and ``EODAG_MAX_REQUESTS_PER_SECOND``
+    environment variables.
+
+    :returns: The global limiter
+    :rtype: :class:`~eodag.utils.throttling.RateLimiter`
+    """
+    global _global_rate_limiter
+    with _global_rate_limiter_lock:
+        if _global_rate_limiter is None:
+            _global_rate_limiter = RateLimiter(
+                bytes_per_second=os.getenv(BYTES_PER_SECOND_ENV_VAR, None),
+                requests_per_second=os.getenv(REQUESTS_PER_SECOND_ENV_VAR, None),
+            )
+        return _global_rate_limiter
+
+
+def set_global_rate_limit(
+    bytes_per_second=None, requests_per_second=None, burst=DEFAULT_BURST
+):
+    """Set the limits shared by all the providers, a limit not set being removed
+
+    :param bytes_per_second: (optional) Maximum bandwidth
+    :type bytes_per_second: float
+    :param requests_per_second: (optional) Maximum requests rate
+    :type requests_per_second: float
+    :param burst: (optional) Duration of the traffic allowed in a burst, in seconds
+    :type burst: float
+    """
+    get_global_rate_limiter().set_limits(bytes_per_second, requests_per_second, burst)
@@ -122,8 +122,10 @@ class EODagTestCase(unittest.TestCase):
             }
         )
 
-        self.requests_http_get_patcher = mock.patch("requests.get", autospec=True)
-        self.requests_http_post_patcher = mock.patch("requests.post", autospec=True)
+        self.requests_http_get_patcher = mock.patch("eodag.utils.http.HttpSession.get")
+        self.requests_http_post_patcher = mock.patch(
+            "eodag.utils.http.HttpSession.post"
+        )
         self.requests_http_get = self.requests_http_get_patcher.start()
         self.requests_http_post = self.requests_http_post_patcher.start()
 
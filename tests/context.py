@@ -27,6 +27,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 from eodag import EODataAccessGateway, api, config, setup_logging
 from eodag.api.core import DEFAULT_ITEMS_PER_PAGE, DEFAULT_MAX_ITEMS_PER_PAGE
 from eodag.api.product import EOProduct
+from eodag.api.product._reader import AssetReader
 from eodag.api.product.drivers import DRIVERS
 from eodag.api.product.drivers.base import NoDriver
 from eodag.api.product.metadata_mapping import (
@@ -63,6 +64,7 @@ from eodag.plugins.search.base import Search
 from eodag.utils import (
     get_bucket_name_and_prefix,
     get_geometry_from_various,
+    get_thread_safe_callback,
     get_timestamp,
     makedirs,
     merge_mappings,
@@ -78,6 +80,7 @@ from eodag.utils import (
 from eodag.utils.exceptions import (
     AddressNotFound,
     AuthenticationError,
+    ChecksumError,
     DownloadError,
     MisconfiguredError,
     NoMatchingProductType,
@@ -89,6 +92,24 @@ from eodag.utils.exceptions import (
     ValidationError,
     STACOpenerError,
 )
+from eodag.utils.archive import StreamReader, extract_stream, extract_zip
+from eodag.utils.assets import AssetFilter
+from eodag.utils.cache import ProductCache
+from eodag.utils.checksum import ChecksumVerifier, parse_checksum
+from eodag.utils.concurrency import iter_ordered
+from eodag.utils.http import HttpSession
+from eodag.utils.orders import get_order_records
+from eodag.utils.progress import get_progress_metrics
+from eodag.utils.ranges import HttpRangeFetcher, RangeReader, S3RangeFetcher
+from eodag.utils.sharding import SearchShard
+from eodag.utils.streaming import StreamWriter
+from eodag.utils.throttling import RateLimiter, get_global_rate_limiter
+from eodag.utils.records import (
+    FileDownloadRecords,
+    SQLiteDownloadRecords,
+    get_download_records,
+    get_record_filename,
+)
 from eodag.utils.stac_reader import fetch_stac_items, HTTP_REQ_TIMEOUT, _TextOpener
 from tests import TESTS_DOWNLOAD_PATH, TEST_RESOURCES_PATH
 from usgs.api import USGSAuthExpiredError, USGSError
@@ -49,23 +49,18 @@ class TestCoreProvidersConfig(TestCase):
     def test_core_providers_config_update(self, mock__request):
         """Providers config must be updatable"""
         mock__request.return_value = mock.Mock()
-        mock__request_side_effect = [
-            {
-                "context": {
-                    "matched": 1,
-                }
-            },
-            {
-                "features": [
-                    {
-                        "id": "foo",
-                        "bar": "baz",
-                        "geometry": "POLYGON((180 -90, 180 90, -180 90, -180 -90, 180 -90))",
-                    }
-                ]
+        mock__request.return_value.json.return_value = {
+            "context": {
+                "matched": 1,
             },
-        ]
-        mock__request.return_value.json.side_effect = mock__request_side_effect
+            "features": [
+                {
+                    "id": "foo",
+                    "bar": "baz",
+                    "geometry": "POLYGON((180 -90, 180 90, -180 90, -180 -90, 180 -90))",
+                }
+            ],
+        }
 
         # add new provider and search on it
         self.dag.update_providers_config(
@@ -96,7 +91,6 @@ class TestCoreProvidersConfig(TestCase):
                         title: '$.bar'
             """
         )
-        mock__request.return_value.json.side_effect = mock__request_side_effect
         prods, _ = self.dag.search(raise_errors=True)
         self.assertEqual(prods[0].properties["title"], "baz")
 
@@ -133,7 +127,7 @@ class TestCoreProductTypesConfig(TestCase):
         self.expanduser_mock.stop()
         self.tmp_home_dir.cleanup()
 
-    @mock.patch("eodag.plugins.search.qssearch.requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get")
     def test_core_discover_product_types_auth(self, mock_requests_get):
         # without auth plugin
         self.dag.update_providers_config(
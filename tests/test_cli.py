@@ -777,6 +777,33 @@ class TestEodagCli(unittest.TestCase):
             "A file may have been downloaded but we cannot locate it\n", result.output
         )
 
+    @mock.patch("eodag.cli.EODataAccessGateway", autospec=True)
+    def test_eodag_download_asset(self, dag):
+        """Calling eodag download with asset patterns downloads only these assets"""
+        search_results_path = os.path.join(
+            TEST_RESOURCES_PATH, "eodag_search_result.geojson"
+        )
+        config_path = os.path.join(TEST_RESOURCES_PATH, "file_config_override.yml")
+        dag.return_value.download_all.return_value = ["/fake_path"]
+        self.runner.invoke(
+            eodag,
+            [
+                "download",
+                "--search-results",
+                search_results_path,
+                "-f",
+                config_path,
+                "--asset",
+                "B0[48]",
+                "--asset",
+                "re:SCL.*",
+            ],
+        )
+        self.assertEqual(
+            dag.return_value.download_all.call_args[1]["asset_filter"],
+            ["B0[48]", "re:SCL.*"],
+        )
+
     @mock.patch("eodag.cli.EODataAccessGateway", autospec=True)
     def test_eodag_download_ko(self, dag):
         """Calling eodag download with all args well formed fails"""
@@ -459,7 +459,7 @@ class TestConfigFunctions(unittest.TestCase):
         peps_conf = default_config["peps"]
         self.assertEqual(peps_conf.download.outputs_prefix, "/data")
 
-    @mock.patch("requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get")
     def test_get_ext_product_types_conf(self, mock_get):
         """External product types configuration must be loadable from remote or local file"""
         ext_product_types_path = os.path.join(
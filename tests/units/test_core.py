@@ -21,6 +21,8 @@ import json
 import os
 import re
 import shutil
+import threading
+import time
 import unittest
 import uuid
 from copy import deepcopy
@@ -1226,6 +1228,11 @@ class TestCoreSearch(TestCoreBase):
             # Just check that the title has been set correctly. There are more (e.g.
             # abstract, platform, etc.) but this is sufficient to check that the
             # product_type_config dict has been created and populated.
+            self.assertEqual(
+                prepared_search["search_plugin"].context.product_type_config["title"],
+                "SENTINEL2 Level-1C",
+            )
+            # still set in the plugin configuration for plugins without search context
             self.assertEqual(
                 prepared_search["search_plugin"].config.product_type_config["title"],
                 "SENTINEL2 Level-1C",
@@ -1243,7 +1250,7 @@ class TestCoreSearch(TestCoreBase):
             # product_type_config is still created if the product is not known to eodag
             # however it contains no data.
             self.assertIsNone(
-                prepared_search["search_plugin"].config.product_type_config["title"],
+                prepared_search["search_plugin"].context.product_type_config["title"],
             )
         finally:
             self.dag.set_preferred_provider(prev_fav_provider)
@@ -1743,6 +1750,176 @@ class TestCoreSearch(TestCoreBase):
         dag.search_all(productType="S2_MSI_L1C", items_per_page=7)
         self.assertEqual(mocked_search_iter_page.call_args[1]["items_per_page"], 7)
 
+    @mock.patch("eodag.plugins.search.qssearch.QueryStringSearch.query", autospec=True)
+    def test_search_all_prefetch(self, mock_query):
+        """search_all must search the next pages concurrently when prefetching them"""
+        dag = EODataAccessGateway()
+        dummy_provider_config = """
+        dummy_provider:
+            search:
+                type: QueryStringSearch
+                api_endpoint: https://api.my_new_provider/search
+                pagination:
+                    next_page_url_tpl: '{url}?{search}&page={page}'
+                metadata_mapping:
+                    dummy: 'dummy'
+            products:
+                S2_MSI_L1C:
+                    productType: '{productType}'
+        """
+        dag.update_providers_config(dummy_provider_config)
+        dag.set_preferred_provider("dummy_provider")
+        # pages 2 and 3 must be searched before any of them returns
+        barrier = threading.Barrier(2, timeout=10)
+
+        def query(plugin, count=True, page=1, items_per_page=2, **kwargs):
+            if page > 1:
+                barrier.wait()
+            if page == 2:
+                # the first prefetched page is the slowest
+                time.sleep(0.1)
+            nb_products = 1 if page == 3 else items_per_page
+            products = []
+            for i in range(nb_products):
+                product = EOProduct(
+                    "dummy_provider", dict(geometry="POINT (0 0)", id=f"{page}-{i}")
+                )
+                product.search_intersection = None
+                products.append(product)
+            return products, 5 if count else None
+
+        mock_query.side_effect = query
+        all_results = dag.search_all(
+            productType="S2_MSI_L1C", items_per_page=2, prefetch=2
+        )
+        # pages are kept in order, and no page is searched after the last one
+        self.assertListEqual(
+            [p.properties["id"] for p in all_results],
+            ["1-0", "1-1", "2-0", "2-1", "3-0"],
+        )
+        self.assertEqual(mock_query.call_count, 3)
+        self.assertTrue(mock_query.call_args_list[0][1]["count"])
+
+        # a provider not implementing pagination returns the same first product
+        mock_query.reset_mock()
+        barrier = threading.Barrier(1)
+        mock_query.side_effect = lambda *args, **kwargs: query(
+            *args, **dict(kwargs, page=1)
+        )
+        pages = list(
+            dag.search_iter_page(productType="S2_MSI_L1C", items_per_page=2, prefetch=2)
+        )
+        self.assertEqual(len(pages), 1)
+
+        # without total, pages are searched one after another up to the last one
+        searching = threading.Lock()
+
+        def do_search_without_total(plugin, count=False, page=1, **kwargs):
+            self.assertTrue(searching.acquire(blocking=False))
+            try:
+                products, _ = query(plugin, page=page, **kwargs)
+                return SearchResult(products), None
+            finally:
+                searching.release()
+
+        with mock.patch.object(
+            dag, "_do_search", side_effect=do_search_without_total
+        ) as mock_do_search:
+            all_results = dag.search_all(
+                productType="S2_MSI_L1C", items_per_page=2, prefetch=2
+            )
+        self.assertEqual(len(all_results), 5)
+        self.assertEqual(mock_do_search.call_count, 3)
+
+    @mock.patch("eodag.api.core.EODataAccessGateway.search_all", autospec=True)
+    @mock.patch("eodag.api.core.EODataAccessGateway.search", autospec=True)
+    def test_search_iter_shards(self, mock_search, mock_search_all):
+        """search_iter_shards must split the search until shards match few enough
+        products, and yield their products without duplicates"""
+        days = ["2021-01-0%s" % day for day in range(1, 6)]
+
+        def products_between(start, end):
+            # one product per day, at midnight
+            products = []
+            for day in days:
+                if start[:10] <= day <= end[:10]:
+                    product = EOProduct(
+                        "peps", dict(geometry="POINT (0 0)", id="product-" + day)
+                    )
+                    products.append(product)
+            return products
+
+        # 10 products per day are counted
+        mock_search.side_effect = lambda dag, start, end, **kwargs: (
+            SearchResult([]),
+            10 * len(products_between(start, end)),
+        )
+        mock_search_all.side_effect = lambda dag, start, end, **kwargs: SearchResult(
+            products_between(start, end)
+        )
+
+        pages = list(
+            self.dag.search_iter_shards(
+                start=days[0],
+                end=days[-1],
+                productType="S2_MSI_L1C",
+                max_results=20,
+            )
+        )
+        # 5 days > 3 days > 2 days
+        self.assertEqual(mock_search.call_count, 1 + 2 + 4)
+        self.assertEqual(mock_search_all.call_count, 4)
+        self.assertEqual(mock_search.call_args[1]["count"], "estimate")
+        self.assertEqual(mock_search_all.call_args[1]["productType"], "S2_MSI_L1C")
+        # products at the boundary of two shards are only yielded once, in order
+        self.assertEqual(
+            [p.properties["id"] for page in pages for p in page],
+            ["product-" + day for day in days],
+        )
+        self.assertTrue(all(isinstance(page, SearchResult) for page in pages))
+
+        # shards without product are not searched
+        mock_search.reset_mock()
+        mock_search_all.reset_mock()
+        pages = list(
+            self.dag.search_iter_shards(
+                start="2021-02-01", end="2021-02-05", productType="S2_MSI_L1C"
+            )
+        )
+        self.assertEqual(pages, [])
+        self.assertEqual(mock_search.call_count, 1)
+        mock_search_all.assert_not_called()
+
+    @mock.patch("eodag.plugins.search.qssearch.QueryStringSearch.query", autospec=True)
+    def test_search_iter_page_prefetch_cursor_pagination(self, mock_query):
+        """search_iter_page must not prefetch pages obtained from the previous one"""
+        dag = EODataAccessGateway()
+        dummy_provider_config = """
+        dummy_provider:
+            search:
+                type: QueryStringSearch
+                api_endpoint: https://api.my_new_provider/search
+                pagination:
+                    next_page_url_tpl: 'dummy_next_page_url_tpl'
+                    next_page_url_key_path: '$.links[?(@.rel="next")].href'
+                metadata_mapping:
+                    dummy: 'dummy'
+            products:
+                S2_MSI_L1C:
+                    productType: '{productType}'
+        """
+        dag.update_providers_config(dummy_provider_config)
+        dag.set_preferred_provider("dummy_provider")
+        p1 = EOProduct("dummy_provider", dict(geometry="POINT (0 0)", id="1"))
+        p1.search_intersection = None
+        mock_query.side_effect = [([p1], None)]
+        pages = list(
+            dag.search_iter_page(productType="S2_MSI_L1C", items_per_page=2, prefetch=2)
+        )
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(mock_query.call_count, 1)
+        self.assertFalse(mock_query.call_args[1]["count"])
+
     @mock.patch(
         "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
     )
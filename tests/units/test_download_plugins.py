@@ -15,21 +15,37 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import io
 import os
+import re
 import shutil
 import stat
+import threading
+import time
 import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory, gettempdir, mkdtemp
 from unittest import mock
 
+import boto3
 import responses
+from botocore.exceptions import ClientError
 
 from tests.context import (
     OFFLINE_STATUS,
+    AwsDownload,
+    ChecksumError,
+    Download,
+    DownloadError,
     EOProduct,
+    HTTPDownload,
     NotAvailableError,
+    PluginConfig,
     PluginManager,
+    get_global_rate_limiter,
+    get_order_records,
     load_default_config,
     path_to_uri,
     uri_to_path,
@@ -144,9 +160,133 @@ class TestDownloadPluginBase(BaseDownloadPluginTest):
             )
             self.assertIn("Unable to create records directory", str(cm.output))
 
+    @mock.patch("eodag.api.product._product.EOProduct.download", autospec=True)
+    def test_plugins_download_base_download_all_offline_not_blocking(
+        self, mock_download
+    ):
+        """Download.download_all must keep downloading online products while others wait"""
+        products = [
+            EOProduct("peps", dict(geometry="POINT (0 0)", id=f"p{i}", title=f"p{i}"))
+            for i in range(3)
+        ]
+        tries = []
+
+        def download_side_effect(product, **kwargs):
+            tries.append(product.properties["id"])
+            if product.properties["id"] == "p0" and tries.count("p0") == 1:
+                raise NotAvailableError("p0 is offline")
+            return product.properties["id"]
+
+        mock_download.side_effect = download_side_effect
+        downloaded = []
+
+        plugin = Download("peps", PluginConfig())
+        paths = plugin.download_all(
+            products,
+            downloaded_callback=lambda product: downloaded.append(
+                product.properties["id"]
+            ),
+            wait=0.001,
+            timeout=0.1,
+        )
+
+        self.assertEqual(tries, ["p0", "p1", "p2", "p0"])
+        self.assertEqual(downloaded, ["p1", "p2", "p0"])
+        self.assertEqual(paths, ["p1", "p2", "p0"])
+
+    @mock.patch("eodag.api.product._product.EOProduct.download", autospec=True)
+    def test_plugins_download_base_download_all_stop(self, mock_download):
+        """Download.download_all must not retry products once stopped"""
+        products = [
+            EOProduct("peps", dict(geometry="POINT (0 0)", id=f"p{i}", title=f"p{i}"))
+            for i in range(3)
+        ]
+        tries = []
+
+        def download_side_effect(product, **kwargs):
+            tries.append(product.properties["id"])
+            if product.properties["id"] == "p0":
+                raise RuntimeError("fatal error")
+            if product.properties["id"] == "p1":
+                raise NotAvailableError("p1 is offline")
+            return product.properties["id"]
+
+        mock_download.side_effect = download_side_effect
+
+        plugin = Download("peps", PluginConfig())
+        with self.assertLogs("eodag.plugins.download.base", level="WARNING") as cm:
+            paths = plugin.download_all(
+                products, wait=0.001, timeout=1, outputs_prefix=self.output_dir
+            )
+
+        # products not tried yet are still downloaded, but none is retried
+        self.assertEqual(tries, ["p0", "p1", "p2"])
+        self.assertEqual(paths, ["p2"])
+        self.assertIn("2 products could not be downloaded: p0, p1", str(cm.output))
+        # the records prefetched for products not downloaded are forgotten
+        self.assertEqual(plugin._get_download_records(self.output_dir)._prefetched, {})
+
+    @mock.patch("eodag.api.product._product.EOProduct.download", autospec=True)
+    def test_plugins_download_base_download_all_concurrent(self, mock_download):
+        """Download.download_all must download products concurrently within provider limits"""
+        products = [
+            EOProduct(
+                provider, dict(geometry="POINT (0 0)", id=f"{provider}{i}", title="t")
+            )
+            for provider in ("peps", "creodias")
+            for i in range(3)
+        ]
+        lock = threading.Lock()
+        running = {"peps": 0, "creodias": 0}
+        max_running = {"peps": 0, "creodias": 0}
+        max_total = []
+
+        def download_side_effect(product, **kwargs):
+            with lock:
+                running[product.provider] += 1
+                max_running[product.provider] = max(
+                    max_running[product.provider], running[product.provider]
+                )
+                max_total.append(sum(running.values()))
+            time.sleep(0.1)
+            with lock:
+                running[product.provider] -= 1
+            return product.properties["id"]
+
+        mock_download.side_effect = download_side_effect
+
+        plugin = Download("peps", PluginConfig())
+        paths = plugin.download_all(products, max_workers=4, max_workers_per_provider=2)
+
+        self.assertEqual(mock_download.call_count, 6)
+        self.assertCountEqual(paths, [p.properties["id"] for p in products])
+        self.assertEqual(max_running, {"peps": 2, "creodias": 2})
+        self.assertEqual(max(max_total), 4)
+
 
 class TestDownloadPluginHttp(BaseDownloadPluginTest):
-    @mock.patch("eodag.plugins.download.http.requests.get", autospec=True)
+    def test_plugins_download_http_shared_session(self):
+        """HTTPDownload must use the HTTP session shared by the provider plugins"""
+        plugin = self.get_download_plugin(self.product)
+        auth_plugin = self.plugins_manager.get_auth_plugin(self.product.provider)
+        search_plugin = next(
+            self.plugins_manager.get_search_plugins(provider=self.product.provider)
+        )
+        self.assertIs(plugin.http_session, auth_plugin.http_session)
+        self.assertIs(plugin.http_session, search_plugin.http_session)
+        self.assertIs(
+            plugin.http_session,
+            self.plugins_manager.get_http_session(self.product.provider),
+        )
+        self.assertIsNot(
+            plugin.http_session, self.plugins_manager.get_http_session("creodias")
+        )
+        # and its rate limiter, counted by the global one
+        self.assertIs(plugin.rate_limiter, search_plugin.rate_limiter)
+        self.assertIs(plugin.http_session.rate_limiter, plugin.rate_limiter)
+        self.assertIs(plugin.rate_limiter.parent, get_global_rate_limiter())
+
+    @mock.patch("eodag.utils.http.HttpSession.get", autospec=True)
     def test_plugins_download_http_ok(self, mock_requests_get):
         """HTTPDownload.download() must create an outputfile"""
 
@@ -159,8 +299,8 @@ class TestDownloadPluginHttp(BaseDownloadPluginTest):
         self.assertEqual(path, os.path.join(self.output_dir, "dummy_product"))
         self.assertTrue(os.path.isfile(path))
 
-    @mock.patch("eodag.plugins.download.http.requests.head", autospec=True)
-    @mock.patch("eodag.plugins.download.http.requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.head", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get", autospec=True)
     def test_plugins_download_http_assets_filename_from_href(
         self, mock_requests_get, mock_requests_head
     ):
@@ -185,8 +325,8 @@ class TestDownloadPluginHttp(BaseDownloadPluginTest):
             os.path.isfile(os.path.join(self.output_dir, "dummy_product", "something"))
         )
 
-    @mock.patch("eodag.plugins.download.http.requests.head", autospec=True)
-    @mock.patch("eodag.plugins.download.http.requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.head", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get", autospec=True)
     def test_plugins_download_http_assets_filename_from_get(
         self, mock_requests_get, mock_requests_head
     ):
@@ -211,8 +351,8 @@ class TestDownloadPluginHttp(BaseDownloadPluginTest):
             )
         )
 
-    @mock.patch("eodag.plugins.download.http.requests.head", autospec=True)
-    @mock.patch("eodag.plugins.download.http.requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.head", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get", autospec=True)
     def test_plugins_download_http_assets_filename_from_head(
         self, mock_requests_get, mock_requests_head
     ):
@@ -240,8 +380,8 @@ class TestDownloadPluginHttp(BaseDownloadPluginTest):
         )
 
     @mock.patch("eodag.utils.ProgressCallback.reset", autospec=True)
-    @mock.patch("eodag.plugins.download.http.requests.head", autospec=True)
-    @mock.patch("eodag.plugins.download.http.requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.head", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get", autospec=True)
     def test_plugins_download_http_assets_size(
         self, mock_requests_get, mock_requests_head, mock_progress_callback_reset
     ):
@@ -306,6 +446,161 @@ class TestDownloadPluginHttp(BaseDownloadPluginTest):
             plugin.download(self.product, outputs_prefix=temp_dir)
         mock_progress_callback_reset.assert_called_once_with(mock.ANY, total=4 + 4)
 
+    def test_plugins_download_http_assets_concurrent(self):
+        """HTTPDownload.download() must download assets concurrently within provider limits"""
+        plugin = HTTPDownload(
+            "foo",
+            PluginConfig.from_mapping(
+                {"base_uri": "http://somewhere", "max_workers": 4, "max_connections": 2}
+            ),
+        )
+        self.product.location = self.product.remote_location = "http://somewhere"
+        self.product.assets = {
+            f"asset{i}": {"href": f"http://somewhere/asset{i}"} for i in range(6)
+        }
+        lock = threading.Lock()
+        transfers = {"active": 0, "max_active": 0}
+
+        def get_callback(request):
+            with lock:
+                transfers["active"] += 1
+                transfers["max_active"] = max(
+                    transfers["max_active"], transfers["active"]
+                )
+            time.sleep(0.1)
+            with lock:
+                transfers["active"] -= 1
+            return (200, {}, b"a" * 10)
+
+        progress_callback = mock.MagicMock()
+        with responses.RequestsMock() as rsps:
+            for i in range(6):
+                url = f"http://somewhere/asset{i}"
+                rsps.add(responses.HEAD, url, headers={"Content-length": "10"})
+                rsps.add_callback(responses.GET, url, callback=get_callback)
+
+            path = plugin.download(
+                self.product,
+                outputs_prefix=self.output_dir,
+                progress_callback=progress_callback,
+            )
+
+        self.assertEqual(len(os.listdir(path)), 6)
+        progress_callback.reset.assert_called_once_with(total=60)
+        self.assertEqual(
+            sum(call.args[0] for call in progress_callback.call_args_list), 60
+        )
+        self.assertLessEqual(transfers["max_active"], 2)
+        self.assertGreater(transfers["max_active"], 1)
+
+    def test_plugins_download_http_concurrent_products(self):
+        """HTTPDownload.download() must not mix products downloaded concurrently"""
+        plugin = HTTPDownload(
+            "foo", PluginConfig.from_mapping({"base_uri": "http://somewhere"})
+        )
+        products = []
+        for name in ("first", "second"):
+            product = EOProduct(
+                "foo", dict(geometry="POINT (0 0)", title=name, id=name)
+            )
+            product.location = product.remote_location = f"http://somewhere/{name}"
+            products.append(product)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_callback(request):
+            return (200, {}, request.url.rsplit("/", 1)[-1].encode() * 1000)
+
+        def progress_callback():
+            callback = mock.MagicMock()
+
+            def reset(**kwargs):
+                # both responses are received before any of them is read
+                if callback.reset.call_count == 1:
+                    barrier.wait()
+
+            callback.reset.side_effect = reset
+            return callback
+
+        paths = {}
+
+        def download(product):
+            paths[product.properties["id"]] = plugin.download(
+                product,
+                outputs_prefix=self.output_dir,
+                progress_callback=progress_callback(),
+            )
+
+        with responses.RequestsMock() as rsps:
+            for product in products:
+                rsps.add_callback(
+                    responses.GET, product.remote_location, callback=get_callback
+                )
+            threads = [
+                threading.Thread(target=download, args=(product,))
+                for product in products
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        for name in ("first", "second"):
+            with open(paths[name], "rb") as fh:
+                self.assertEqual(fh.read(), name.encode() * 1000)
+
+    def test_plugins_download_http_assets_filter(self):
+        """HTTPDownload.download() must download the selected assets only, and complete them later"""
+        plugin = HTTPDownload(
+            "foo", PluginConfig.from_mapping({"base_uri": "http://somewhere"})
+        )
+        self.product.location = self.product.remote_location = "http://somewhere"
+        self.product.assets = {
+            key: {"href": f"http://somewhere/{key}.jp2"}
+            for key in ("B02", "B04", "B08", "SCL")
+        }
+        progress_callback = mock.MagicMock()
+
+        def download(**kwargs):
+            with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+                for asset in self.product.assets.values():
+                    rsps.add(
+                        responses.HEAD, asset["href"], headers={"Content-length": "10"}
+                    )
+                    rsps.add(responses.GET, asset["href"], body=b"a" * 10)
+                path = plugin.download(
+                    self.product,
+                    outputs_prefix=self.output_dir,
+                    progress_callback=progress_callback,
+                    **kwargs,
+                )
+                return path, sorted(
+                    call.request.url
+                    for call in rsps.calls
+                    if call.request.method == "GET"
+                )
+
+        path, urls = download(asset_filter="B0[48]")
+        self.assertEqual(sorted(os.listdir(path)), ["B04.jp2", "B08.jp2"])
+        self.assertEqual(urls, ["http://somewhere/B04.jp2", "http://somewhere/B08.jp2"])
+        progress_callback.reset.assert_called_once_with(total=20)
+        record = plugin._get_download_records(self.output_dir).get(
+            self.product.remote_location
+        )
+        self.assertEqual(record["asset_filter"].patterns, ["B0[48]"])
+
+        # selected assets already downloaded
+        path, urls = download(asset_filter=["B04"])
+        self.assertEqual(urls, [])
+
+        # the whole product completes the partial download
+        path, urls = download()
+        self.assertEqual(len(os.listdir(path)), 4)
+        self.assertEqual(urls, ["http://somewhere/B02.jp2", "http://somewhere/SCL.jp2"])
+        record = plugin._get_download_records(self.output_dir).get(
+            self.product.remote_location
+        )
+        self.assertIsNone(record["asset_filter"])
+
     def test_plugins_download_http_one_local_asset(
         self,
     ):
@@ -328,6 +623,311 @@ class TestDownloadPluginHttp(BaseDownloadPluginTest):
         # empty product download directory should have been removed
         self.assertFalse(Path(os.path.join(self.output_dir, "dummy_product")).exists())
 
+    def test_plugins_download_http_resume(self):
+        """HTTPDownload.download() must resume a partial download using ranges"""
+        plugin = self.get_download_plugin(self.product)
+        self.product.location = self.product.remote_location = "http://somewhere"
+        partial_path = os.path.join(self.output_dir, "dummy_product.zip")
+        with open(partial_path, "wb") as fh:
+            fh.write(b"some")
+        with open(partial_path + ".resume", "w") as fh:
+            fh.write('"etag1"')
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                "http://somewhere/?issuerId=peps",
+                status=206,
+                headers={"Content-Range": "bytes 4-8/9", "ETag": '"etag1"'},
+                body=b"thing",
+                match=[
+                    responses.matchers.header_matcher(
+                        {"Range": "bytes=4-", "If-Range": '"etag1"'}
+                    )
+                ],
+            )
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        # not a zip file, renamed without extension
+        self.assertEqual(path, os.path.join(self.output_dir, "dummy_product"))
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), b"something")
+        self.assertFalse(os.path.isfile(partial_path + ".resume"))
+
+    def test_plugins_download_http_resume_interrupted(self):
+        """HTTPDownload.download() must resume a transfer interrupted by the server"""
+        content = os.urandom(100000)
+        ranges = []
+
+        class InterruptingHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                range_header = self.headers.get("Range")
+                ranges.append(range_header)
+                if range_header is None:
+                    # the connection is closed in the middle of the body
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(content)))
+                    self.send_header("Accept-Ranges", "bytes")
+                    self.send_header("ETag", '"etag1"')
+                    self.end_headers()
+                    self.wfile.write(content[: len(content) // 2])
+                    self.close_connection = True
+                    return
+                start = int(range_header[len("bytes=") : -1])
+                self.send_response(206)
+                self.send_header("Content-Length", str(len(content) - start))
+                self.send_header(
+                    "Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}"
+                )
+                self.send_header("ETag", '"etag1"')
+                self.end_headers()
+                self.wfile.write(content[start:])
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), InterruptingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        plugin = HTTPDownload(
+            "foo", PluginConfig.from_mapping({"base_uri": "http://somewhere"})
+        )
+        url = f"http://127.0.0.1:{server.server_port}/file"
+        self.product.location = self.product.remote_location = url
+        try:
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(ranges, [None, f"bytes={len(content) // 2}-"])
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+
+    def test_plugins_download_http_resume_not_supported(self):
+        """HTTPDownload.download() must download again a file that cannot be resumed"""
+        plugin = self.get_download_plugin(self.product)
+        self.product.location = self.product.remote_location = "http://somewhere"
+        partial_path = os.path.join(self.output_dir, "dummy_product.zip")
+        with open(partial_path, "wb") as fh:
+            fh.write(b"other")
+        with open(partial_path + ".resume", "w") as fh:
+            fh.write('"etag1"')
+
+        with responses.RequestsMock() as rsps:
+            # remote file changed, whole content returned
+            rsps.add(
+                responses.GET,
+                "http://somewhere/?issuerId=peps",
+                status=200,
+                headers={"ETag": '"etag2"'},
+                body=b"something",
+            )
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), b"something")
+        self.assertFalse(os.path.isfile(partial_path + ".resume"))
+
+    def test_plugins_download_http_segmented(self):
+        """HTTPDownload.download() must download large files in concurrent segments"""
+        plugin = HTTPDownload(
+            "foo",
+            PluginConfig.from_mapping(
+                {"base_uri": "http://somewhere", "segments": 3, "segment_min_size": 1}
+            ),
+        )
+        self.product.location = self.product.remote_location = "http://somewhere"
+        content = bytes(range(30))
+        ranges = []
+
+        def get_callback(request):
+            start, end = request.headers["Range"][len("bytes=") :].split("-")
+            ranges.append((int(start), int(end)))
+            return (
+                206,
+                {"Content-Range": f"bytes {start}-{end}/{len(content)}"},
+                content[int(start) : int(end) + 1],
+            )
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.HEAD,
+                "http://somewhere/",
+                headers={"Accept-Ranges": "bytes", "Content-Length": "30"},
+            )
+            rsps.add_callback(responses.GET, "http://somewhere/", callback=get_callback)
+
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        self.assertCountEqual(ranges, [(0, 9), (10, 19), (20, 29)])
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+
+        # the preallocated file is not complete until all its bytes are written
+        self.product.properties["title"] = "other"
+        self.product.location = self.product.remote_location
+        with responses.RequestsMock() as rsps, mock.patch.object(
+            HTTPDownload, "_download_segment", autospec=True, return_value=9
+        ):
+            rsps.add(
+                responses.HEAD,
+                "http://somewhere/",
+                headers={"Accept-Ranges": "bytes", "Content-Length": "30"},
+            )
+            with self.assertRaisesRegex(DownloadError, "27 bytes"):
+                plugin.download(self.product, outputs_prefix=self.output_dir)
+
+    def test_plugins_download_http_stream_extract(self):
+        """HTTPDownload.download() must extract archives while downloading them"""
+        plugin = HTTPDownload(
+            "foo",
+            PluginConfig.from_mapping(
+                {"base_uri": "http://somewhere", "stream_extract": True}
+            ),
+        )
+        self.product.location = self.product.remote_location = "http://somewhere"
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zfile:
+            zfile.writestr("dummy_product/a.txt", b"a" * 1000)
+            zfile.writestr("dummy_product/b/c.txt", b"c" * 1000)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, "http://somewhere/", body=archive.getvalue())
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        self.assertEqual(path, os.path.join(self.output_dir, "dummy_product"))
+        self.assertEqual(
+            Path(path, "dummy_product", "b", "c.txt").read_bytes(), b"c" * 1000
+        )
+        # the archive has not been written, no temporary files are left
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)), [".downloaded", "dummy_product"]
+        )
+
+    def test_plugins_download_http_checksum(self):
+        """HTTPDownload.download() must download again a product not matching its checksum"""
+        plugin = self.get_download_plugin(self.product)
+        self.product.location = self.product.remote_location = "http://somewhere"
+        self.product.properties["checksum"] = [
+            {"Algorithm": "MD5", "Value": "437b930db84b8079c2dd804a71936b5f"}
+        ]
+
+        with responses.RequestsMock() as rsps:
+            # corrupted transfer, then good one
+            rsps.add(
+                responses.GET, "http://somewhere/?issuerId=peps", body=b"somethinG"
+            )
+            rsps.add(
+                responses.GET, "http://somewhere/?issuerId=peps", body=b"something"
+            )
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+            self.assertEqual(len(rsps.calls), 2)
+
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), b"something")
+        # the verified checksum is recorded
+        record = plugin._get_download_records(self.output_dir).get(
+            self.product.remote_location
+        )
+        self.assertEqual(record["checksum"], "md5:437b930db84b8079c2dd804a71936b5f")
+
+        # checksum never matching
+        self.product.properties["checksum"] = "md5:" + "0" * 32
+        self.product.properties["id"] = self.product.properties["title"] = "other"
+        self.product.location = self.product.remote_location
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET, "http://somewhere/?issuerId=peps", body=b"something"
+            )
+            with self.assertRaises(ChecksumError):
+                plugin.download(self.product, outputs_prefix=self.output_dir)
+            self.assertEqual(len(rsps.calls), 1 + plugin.http_session.max_retries)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "other.zip")))
+
+    def test_plugins_download_http_searched_checksum(self):
+        """HTTPDownload.download() must verify the checksum mapped from search results"""
+        search_plugin = next(
+            self.plugins_manager.get_search_plugins(
+                product_type="S2_MSI_L1C", provider="peps"
+            )
+        )
+        feature = {
+            "type": "Feature",
+            "id": "some-uid",
+            "geometry": {"type": "Point", "coordinates": [0, 0]},
+            "properties": {
+                "title": "searched_product",
+                "productIdentifier": "searched_product",
+                "storage": {"mode": "disk"},
+                "services": {
+                    "download": {
+                        "url": "http://somewhere/download",
+                        "checksum": "437B930DB84B8079C2DD804A71936B5F",
+                    }
+                },
+            },
+        }
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                re.compile(r"https://peps\.cnes\.fr/resto/api/collections/.*"),
+                json={"properties": {"totalResults": 1}, "features": [feature]},
+            )
+            products, _ = search_plugin.query(
+                productType="S2_MSI_L1C", page=1, items_per_page=1
+            )
+        product = products[0]
+        self.assertEqual(
+            product.properties["checksum"], "437B930DB84B8079C2DD804A71936B5F"
+        )
+        plugin = self.get_download_plugin(product)
+        product.register_downloader(plugin, None)
+
+        with responses.RequestsMock() as rsps:
+            # corrupted transfer, then good one
+            url = "http://somewhere/download?issuerId=peps"
+            rsps.add(responses.GET, url, body=b"somethinG")
+            rsps.add(responses.GET, url, body=b"something")
+            path = product.download(outputs_prefix=self.output_dir)
+            self.assertEqual(len(rsps.calls), 2)
+
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), b"something")
+
+    def test_plugins_download_http_product_cache(self):
+        """HTTPDownload.download() must link products already in the products cache"""
+        cache_dir = TemporaryDirectory()
+        other_output_dir = TemporaryDirectory()
+        plugin = HTTPDownload(
+            "foo",
+            PluginConfig.from_mapping(
+                {"base_uri": "http://somewhere", "cache_dir": cache_dir.name}
+            ),
+        )
+        self.product.location = self.product.remote_location = "http://somewhere"
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zfile:
+            zfile.writestr("dummy_product/a.txt", b"a" * 1000)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, "http://somewhere/", body=archive.getvalue())
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+            self.product.location = self.product.remote_location
+            other_path = plugin.download(
+                self.product, outputs_prefix=other_output_dir.name
+            )
+            self.assertEqual(len(rsps.calls), 1)
+
+        self.assertEqual(path, os.path.join(self.output_dir, "dummy_product"))
+        self.assertEqual(
+            other_path, os.path.join(other_output_dir.name, "dummy_product")
+        )
+        self.assertEqual(
+            Path(other_path, "dummy_product", "a.txt").read_bytes(), b"a" * 1000
+        )
+        cache_dir.cleanup()
+        other_output_dir.cleanup()
+
     def test_plugins_download_http_several_local_assets(
         self,
     ):
@@ -522,6 +1122,115 @@ class TestDownloadPluginHttpRetry(BaseDownloadPluginTest):
 
         run()
 
+    def test_plugins_download_http_storage_statuses(self):
+        """HTTPDownload must poll products as staging only for staging status codes"""
+        plugin = HTTPDownload(
+            "foo",
+            PluginConfig.from_mapping(
+                {"base_uri": "http://somewhere", "staging_status_codes": [503]}
+            ),
+        )
+        responses_by_id = {
+            "accepted": (202, {}),
+            "unavailable": (503, {}),
+            "empty": (200, {"Content-Length": "0"}),
+            "online": (200, {"Content-Length": "9"}),
+            "unsized": (200, {}),
+            "missing": (404, {}),
+            "error": (500, {}),
+            "nohead": (405, {}),
+        }
+        products = []
+        for product_id in responses_by_id:
+            product = EOProduct(
+                "foo", dict(geometry="POINT (0 0)", id=product_id, title=product_id)
+            )
+            product.remote_location = f"http://somewhere/{product_id}"
+            products.append(product)
+
+        def head_callback(request):
+            status, headers = responses_by_id[request.url.rsplit("/", 1)[-1]]
+            return (status, headers, "")
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.HEAD, re.compile(r"http://somewhere/\w+"), head_callback
+            )
+            statuses = plugin._get_storage_statuses(products)
+
+        self.assertEqual(
+            statuses,
+            ["STAGING", "STAGING", "STAGING", "ONLINE", None, None, None, None],
+        )
+
+    def test_plugins_download_http_order_all(self):
+        """HTTPDownload.download_all() must order offline products up front, and
+        download them once they are polled online"""
+        products = [
+            EOProduct(
+                "peps",
+                dict(
+                    geometry="POINT (0 0)",
+                    id=f"p{i}",
+                    title=f"p{i}",
+                    storageStatus=OFFLINE_STATUS,
+                    orderLink=f"http://somewhere/order/p{i}",
+                ),
+            )
+            for i in range(3)
+        ]
+        for product in products:
+            product.remote_location = f"http://somewhere/{product.properties['id']}"
+            product.location = product.remote_location
+            product.register_downloader(self.plugin, None)
+        # p2 was ordered by a previous run
+        records_dir = os.path.join(self.output_dir, ".downloaded")
+        os.makedirs(records_dir)
+        order_records = get_order_records(records_dir)
+        order_records.add(products[2].remote_location, "STAGING", "ordered")
+        polls = []
+
+        def head_callback(request):
+            product_id = request.url.split("?")[0].rsplit("/", 1)[-1]
+            polls.append(product_id)
+            # p0 is staged after a first poll
+            if product_id == "p0" and polls.count("p0") == 1:
+                return (202, {}, "")
+            return (200, {"Content-Length": "9"}, "")
+
+        with responses.RequestsMock() as rsps:
+            for i in range(2):
+                rsps.add(responses.GET, f"http://somewhere/order/p{i}", body="ordered")
+            rsps.add_callback(
+                responses.HEAD, re.compile(r"http://somewhere/p\d"), head_callback
+            )
+            rsps.add(
+                responses.GET,
+                re.compile(r"http://somewhere/p\d"),
+                body=b"something",
+                auto_calculate_content_length=True,
+            )
+            paths = self.plugin.download_all(
+                products,
+                outputs_prefix=self.output_dir,
+                wait=0.01 / 60,
+                timeout=0.2 / 60,
+            )
+            orders = [
+                call.request.url for call in rsps.calls if "/order/" in call.request.url
+            ]
+
+        self.assertEqual(len(paths), 3)
+        # ordered products are not ordered again, the others are ordered concurrently
+        self.assertEqual(
+            sorted(orders), ["http://somewhere/order/p0", "http://somewhere/order/p1"]
+        )
+        self.assertEqual(sorted(polls), ["p0", "p0", "p1", "p2"])
+        # orders are forgotten once downloaded
+        self.assertEqual(
+            order_records.get_many([p.remote_location for p in products]), {}
+        )
+
 
 class TestDownloadPluginAws(BaseDownloadPluginTest):
     def setUp(self):
@@ -558,3 +1267,338 @@ class TestDownloadPluginAws(BaseDownloadPluginTest):
             self.product, url="/somewhere/else"
         )
         self.assertEqual((bucket, prefix), ("default_bucket", "somewhere/else"))
+
+    @mock.patch.dict("eodag.plugins.download.aws._authenticated_objects_cache")
+    def test_plugins_download_aws_auth_cache(self):
+        """AwsDownload must reuse the auth strategy that succeeded on a bucket"""
+        plugin = self.get_download_plugin(self.product)
+        other_plugin = self.get_download_plugin(self.product)
+        plugin.clear_authenticated_objects()
+        session = mock.MagicMock()
+        objects = mock.MagicMock()
+
+        def from_auth_keys(bucket_name, prefix, auth_dict):
+            plugin.s3_session = session
+            return objects
+
+        denied = ClientError({"Error": {"Code": "AccessDenied"}}, "ListObjectsV2")
+        with mock.patch.object(
+            plugin, "_get_authenticated_objects_unsigned", side_effect=denied
+        ) as mock_unsigned, mock.patch.object(
+            plugin, "_get_authenticated_objects_from_auth_profile", return_value=None
+        ) as mock_profile, mock.patch.object(
+            plugin,
+            "_get_authenticated_objects_from_auth_keys",
+            side_effect=from_auth_keys,
+        ) as mock_keys:
+            for auth_mock in (mock_unsigned, mock_profile, mock_keys):
+                auth_mock.__name__ = "auth_method"
+            auth = {"aws_access_key_id": "foo", "aws_secret_access_key": "bar"}
+            for _ in range(3):
+                self.assertEqual(
+                    plugin.get_authenticated_objects("bucket", "prefix", auth),
+                    objects,
+                )
+            self.assertEqual(mock_unsigned.call_count, 1)
+            self.assertEqual(mock_keys.call_count, 1)
+
+            # shared by the plugins of the provider, and by get_rio_env
+            self.assertEqual(
+                other_plugin.get_authenticated_objects("bucket", "prefix", auth),
+                objects,
+            )
+            self.assertEqual(
+                other_plugin.get_rio_env("bucket", "prefix", auth),
+                {"session": session, "requester_pays": True},
+            )
+            self.assertEqual(mock_keys.call_count, 1)
+
+            # other credentials
+            plugin.get_authenticated_objects("bucket", "prefix", dict(auth, foo=1))
+            self.assertEqual(mock_keys.call_count, 2)
+
+            # cleared after an auth error
+            plugin.clear_authenticated_objects("bucket")
+            plugin.get_authenticated_objects("bucket", "prefix", auth)
+            self.assertEqual(mock_keys.call_count, 3)
+
+    @mock.patch.dict("eodag.plugins.download.aws._authenticated_objects_cache")
+    def test_plugins_download_aws_auth_cache_rate_limiter(self):
+        """AwsDownload must throttle the requests of cached authenticated objects
+        with the rate limiter of the plugin using them"""
+        plugin = self.get_download_plugin(self.product)
+        # a plugin of the provider created by another gateway
+        other_plugin = AwsDownload(plugin.provider, plugin.config)
+        plugin.rate_limiter = mock.MagicMock()
+        other_plugin.rate_limiter = mock.MagicMock()
+        objects = mock.MagicMock()
+        client = objects._parent.meta.client = boto3.client(
+            "s3", region_name="us-east-1"
+        )
+
+        with mock.patch.object(
+            plugin, "_get_authenticated_objects_unsigned", return_value=objects
+        ) as mock_unsigned:
+            mock_unsigned.__name__ = "auth_method"
+            plugin.get_authenticated_objects("bucket", "prefix", {})
+        client.meta.events.emit("before-send.s3.GetObject", request=None)
+        self.assertEqual(plugin.rate_limiter.acquire_request.call_count, 1)
+
+        self.assertEqual(
+            other_plugin.get_authenticated_objects("bucket", "prefix", {}), objects
+        )
+        client.meta.events.emit("before-send.s3.GetObject", request=None)
+        self.assertEqual(plugin.rate_limiter.acquire_request.call_count, 1)
+        self.assertEqual(other_plugin.rate_limiter.acquire_request.call_count, 1)
+
+    def test_plugins_download_aws_concurrent(self):
+        """AwsDownload.download() must download the objects of a product concurrently"""
+        plugin = self.get_download_plugin(self.product)
+        plugin.config.max_workers = 3
+        plugin.config.transfer_config = {"max_concurrency": 2}
+        self.product.product_type = "FOO"
+        self.product.location = self.product.remote_location = "s3://bucket/prefix"
+
+        running = {"current": 0, "max": 0}
+        lock = threading.Lock()
+
+        def download_file(bucket, key, filename, ExtraArgs, Callback, Config):
+            self.assertEqual(bucket, "bucket")
+            self.assertEqual(Config.max_request_concurrency, 2)
+            with lock:
+                running["current"] += 1
+                running["max"] = max(running["max"], running["current"])
+            time.sleep(0.1)
+            with open(filename, "wb") as fh:
+                fh.write(b"x" * 10)
+            Callback(10)
+            with lock:
+                running["current"] -= 1
+
+        progress_callback = mock.MagicMock()
+        with mock.patch.object(plugin, "get_authenticated_objects") as mock_objects:
+            mock_client = mock_objects.return_value._parent.meta.client
+            mock_client.get_paginator.return_value.paginate.return_value = [
+                {"Contents": [{"Key": f"prefix/file{i}", "Size": 10} for i in range(6)]}
+            ]
+            mock_client.download_file.side_effect = download_file
+            path = plugin.download(
+                self.product,
+                outputs_prefix=self.output_dir,
+                progress_callback=progress_callback,
+            )
+
+        self.assertEqual(sorted(os.listdir(path)), [f"file{i}" for i in range(6)])
+        self.assertEqual(running["max"], 3)
+        progress_callback.reset.assert_called_once_with(total=60)
+        self.assertEqual(progress_callback.call_count, 6)
+
+    def test_plugins_download_aws_chunk_error(self):
+        """AwsDownload.download() must not record a product which objects failed,
+        and complete it later"""
+        plugin = self.get_download_plugin(self.product)
+        plugin.config.max_workers = 1
+        self.product.product_type = "FOO"
+        self.product.location = self.product.remote_location = "s3://bucket/prefix"
+        product_path = os.path.join(self.output_dir, "dummy_product")
+        error = ClientError({"Error": {"Code": "InternalError"}}, "GetObject")
+
+        def download_file(bucket, key, filename, **kwargs):
+            if key == "prefix/file1":
+                raise error
+            Path(filename).touch()
+
+        with mock.patch.object(plugin, "get_authenticated_objects") as mock_objects:
+            mock_client = mock_objects.return_value._parent.meta.client
+            mock_client.get_paginator.return_value.paginate.return_value = [
+                {"Contents": [{"Key": f"prefix/file{i}", "Size": 10} for i in range(3)]}
+            ]
+            mock_client.download_file.side_effect = download_file
+            with self.assertLogs(
+                "eodag.plugins.download.aws", level="WARNING"
+            ) as cm, self.assertRaises(DownloadError):
+                plugin.download(self.product, outputs_prefix=self.output_dir)
+            # the failing object is skipped, not the product prefix
+            self.assertIn("Skipping bucket/prefix/file1", cm.output[-1])
+            self.assertIsNone(
+                plugin._get_download_records(self.output_dir).get(
+                    self.product.remote_location
+                )
+            )
+            self.assertIn("file0", os.listdir(product_path))
+            self.assertNotIn("file1", os.listdir(product_path))
+
+            mock_client.download_file.reset_mock(side_effect=True)
+            mock_client.download_file.side_effect = (
+                lambda bucket, key, filename, **kwargs: Path(filename).touch()
+            )
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        self.assertEqual(sorted(os.listdir(path)), ["file0", "file1", "file2"])
+        downloaded_keys = [
+            call.args[1] for call in mock_client.download_file.call_args_list
+        ]
+        self.assertIn("prefix/file1", downloaded_keys)
+        self.assertNotIn("prefix/file0", downloaded_keys)
+        self.assertIsNotNone(
+            plugin._get_download_records(self.output_dir).get(
+                self.product.remote_location
+            )
+        )
+
+    def test_plugins_download_aws_objects_filter(self):
+        """AwsDownload.download() must download the selected objects only, and complete them later"""
+        plugin = self.get_download_plugin(self.product)
+        self.product.product_type = "FOO"
+        self.product.location = self.product.remote_location = "s3://bucket/prefix"
+        progress_callback = mock.MagicMock()
+
+        with mock.patch.object(plugin, "get_authenticated_objects") as mock_objects:
+            mock_client = mock_objects.return_value._parent.meta.client
+            mock_client.get_paginator.return_value.paginate.return_value = [
+                {
+                    "Contents": [
+                        {"Key": f"prefix/B0{i}.jp2", "Size": 10} for i in range(6)
+                    ]
+                }
+            ]
+            mock_client.download_file.side_effect = (
+                lambda bucket, key, filename, **kwargs: Path(filename).touch()
+            )
+            path = plugin.download(
+                self.product,
+                outputs_prefix=self.output_dir,
+                progress_callback=progress_callback,
+                asset_filter=["B0[12]", "re:B05"],
+            )
+            self.assertEqual(
+                sorted(os.listdir(path)), ["B01.jp2", "B02.jp2", "B05.jp2"]
+            )
+            progress_callback.reset.assert_called_once_with(total=30)
+            record = plugin._get_download_records(self.output_dir).get(
+                self.product.remote_location
+            )
+            self.assertEqual(record["asset_filter"].patterns, ["B0[12]", "re:B05"])
+
+            # the whole product completes the partial download
+            mock_client.download_file.reset_mock()
+            plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        self.assertEqual(len(os.listdir(path)), 6)
+        self.assertEqual(
+            sorted(call.args[1] for call in mock_client.download_file.call_args_list),
+            ["prefix/B00.jp2", "prefix/B03.jp2", "prefix/B04.jp2"],
+        )
+        record = plugin._get_download_records(self.output_dir).get(
+            self.product.remote_location
+        )
+        self.assertIsNone(record["asset_filter"])
+
+    def test_plugins_download_aws_single_listing(self):
+        """AwsDownload.download() must list each bucket prefix once for all the assets"""
+        plugin = self.get_download_plugin(self.product)
+        self.product.product_type = "FOO"
+        plugin.config.flatten_top_dirs = False
+        self.product.location = self.product.remote_location = "s3://bucket/prefix"
+        self.product.assets = {
+            "B01": {"href": "s3://bucket/prefix/B01.jp2"},
+            "B02": {"href": "s3://bucket/prefix/B02.jp2"},
+            "metadata": {"href": "s3://bucket/prefix"},
+        }
+
+        with mock.patch.object(plugin, "get_authenticated_objects") as mock_objects:
+            mock_client = mock_objects.return_value._parent.meta.client
+            mock_client.get_paginator.return_value.paginate.return_value = [
+                {"Contents": [{"Key": "prefix/B01.jp2", "Size": 1}]},
+                {"Contents": [{"Key": "prefix/B02.jp2", "Size": 1}]},
+            ]
+            mock_client.download_file.side_effect = (
+                lambda bucket, key, filename, **kwargs: Path(filename).touch()
+            )
+            path = plugin.download(self.product, outputs_prefix=self.output_dir)
+
+        mock_client.get_paginator.assert_called_once_with("list_objects_v2")
+        mock_client.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket="bucket", Prefix="prefix"
+        )
+        self.assertEqual(mock_client.download_file.call_count, 2)
+        self.assertEqual(sorted(os.listdir(path)), ["B01.jp2", "B02.jp2"])
+
+    def test_plugins_download_aws_verified_chunk(self):
+        """AwsDownload must download again an object not matching its checksum"""
+        plugin = self.get_download_plugin(self.product)
+        product_chunk = mock.MagicMock(key="path/to/B01.jp2", bucket_name="bucket")
+        bodies = iter([b"somethinG", b"something"])
+        product_chunk.client.download_fileobj.side_effect = (
+            lambda bucket, key, fileobj, **kwargs: fileobj.write(next(bodies))
+        )
+        chunk_path = os.path.join(self.output_dir, "B01.jp2")
+        # STAC file:checksum multihash
+        plugin._download_verified_chunk(
+            product_chunk,
+            chunk_path,
+            "d50110437b930db84b8079c2dd804a71936b5f",
+            Callback=None,
+        )
+
+        self.assertEqual(product_chunk.client.download_fileobj.call_count, 2)
+        with open(chunk_path, "rb") as fh:
+            self.assertEqual(fh.read(), b"something")
+
+    def test_plugins_download_aws_safe_path_rules(self):
+        """AwsDownload must build SAFE paths using the configured rules"""
+        plugin = self.get_download_plugin(self.product)
+        self.product.properties[
+            "title"
+        ] = "S2A_MSIL2A_20210319T023551_N0214_R089_T51RVQ_20210319T043941"
+        chunks = [
+            mock.MagicMock(key="tiles/51/R/VQ/2021/3/19/0/R10m/B02.jp2"),
+            mock.MagicMock(key="products/2021/3/19/S2A_FOO/metadata.xml"),
+        ]
+        self.assertEqual(
+            plugin.get_chunks_dest_paths(self.product, chunks, "", build_safe=True),
+            [
+                f"{self.product.properties['title']}.SAFE/GRANULE/0/IMG_DATA/R10m/"
+                "T51RVQ_20210319T023551_B02_10m.jp2",
+                f"{self.product.properties['title']}.SAFE/MTD_MSIL2A.xml",
+            ],
+        )
+
+        plugin.config.products["S2_MSI_L2A"]["safe_path_rules"] = [
+            {
+                "pattern": r"^tiles/.+/R(?P<res>[0-9]+m)/(?P<file>\w+)\.jp2$",
+                "path": "{title}.SAFE/{res}/{file}_{title_date1}.jp2",
+            }
+        ]
+        self.assertEqual(
+            plugin.get_chunks_dest_paths(self.product, chunks, "", build_safe=True),
+            [
+                f"{self.product.properties['title']}.SAFE/10m/B02_20210319T023551.jp2",
+                None,
+            ],
+        )
+
+    def test_plugins_download_aws_range_fetcher(self):
+        """AwsDownload.get_range_fetcher() must read objects with the client of the bucket"""
+        plugin = self.get_download_plugin(self.product)
+        client = mock.MagicMock()
+        client.get_object.return_value["Body"].read.return_value = b"data"
+        s3_objects = mock.MagicMock()
+        s3_objects._parent.meta.client = client
+
+        with mock.patch.object(
+            plugin, "get_authenticated_objects", return_value=s3_objects
+        ) as mock_auth:
+            fetcher = plugin.get_range_fetcher(
+                self.product, "s3://bucket/path/to/B04.tif", auth={"foo": "bar"}
+            )
+            mock_auth.assert_called_once_with(
+                "bucket", "path/to/B04.tif", {"foo": "bar"}
+            )
+        self.assertEqual(fetcher.fetch(10, 14), b"data")
+        client.get_object.assert_called_once_with(
+            Bucket="bucket",
+            Key="path/to/B04.tif",
+            Range="bytes=10-13",
+            RequestPayer="requester",
+        )
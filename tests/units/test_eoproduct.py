@@ -25,17 +25,21 @@ import zipfile
 
 import geojson
 import requests
+import responses
 from shapely import geometry
 
 from tests import EODagTestCase
 from tests.context import (
     DEFAULT_STREAM_REQUESTS_TIMEOUT,
+    AddressNotFound,
+    AssetReader,
     Download,
     EOProduct,
     HTTPDownload,
     NoDriver,
     ProgressCallback,
     config,
+    get_download_records,
 )
 from tests.utils import mock
 
@@ -296,14 +300,16 @@ class TestEOProduct(EODagTestCase):
                 timeout=DEFAULT_STREAM_REQUESTS_TIMEOUT,
             )
             download_records_dir = pathlib.Path(product_dir_path).parent / ".downloaded"
-            # A .downloaded folder should be created, including a text file that
-            # lists the downloaded product by their url
+            # A .downloaded folder should be created, including a records database
+            # where the downloaded product is recorded by its url
             self.assertTrue(download_records_dir.is_dir())
             files_in_records_dir = list(download_records_dir.iterdir())
-            self.assertEqual(len(files_in_records_dir), 1)
-            records_file = files_in_records_dir[0]
-            actual_download_url = records_file.read_text()
-            self.assertEqual(actual_download_url, self.download_url)
+            self.assertEqual([f.name for f in files_in_records_dir], ["records.sqlite"])
+            record = get_download_records(str(download_records_dir)).get(
+                self.download_url
+            )
+            self.assertEqual(record["url"], self.download_url)
+            self.assertEqual(record["path"], str(product_dir_path) + ".zip")
             # Since extraction is True by default, check that the returned path is the
             # product's directory.
             self.assertTrue(os.path.isdir(product_dir_path))
@@ -534,3 +540,58 @@ class TestEOProduct(EODagTestCase):
             ]
             for needed_log in needed_logs:
                 self.assertTrue(any(needed_log in log for log in cm.output))
+
+    def test_eoproduct_open_asset(self):
+        """eoproduct.open_asset must lazily read assets with range requests"""
+        product = self._dummy_downloadable_product(
+            product=self._dummy_product(productType=self.NOT_ASSOCIATED_PRODUCT_TYPE)
+        )
+        url = "http://somewhere/B04.tif"
+        product.assets = {"B04": {"href": url}}
+        data = b"0123456789" * 10
+
+        with responses.RequestsMock() as rsps:
+            asset = product.open_asset("B04", block_size=16)
+            self.assertIsInstance(asset, AssetReader)
+            # nothing is requested until data is read
+            self.assertEqual(len(rsps.calls), 0)
+
+            rsps.add(responses.HEAD, url, headers={"Content-Length": str(len(data))})
+            rsps.add(responses.GET, url, status=206, body=data[16:32])
+            self.assertEqual(asset.read_bytes(20, 30), data[20:30])
+            self.assertEqual(rsps.calls[-1].request.headers["Range"], "bytes=16-31")
+            # the range is requested using the session of the download plugin
+            self.assertIs(asset.file.fetcher.session, product.downloader.http_session)
+
+        # bands are resolved using the driver of the product
+        with self.assertRaises(AddressNotFound):
+            product.open_asset("B08")
+
+        # downloaded assets are read from the local file
+        local_path = os.path.join(self.output_dir, "B04.tif")
+        with open(local_path, "wb") as fh:
+            fh.write(data)
+        product.assets["B04"]["href"] = pathlib.Path(local_path).as_uri()
+        with product.open_asset("B04") as asset:
+            self.assertEqual(asset.read_bytes(20, 30), data[20:30])
+
+    def test_eoproduct_open_asset_tiles_ranges(self):
+        """AssetReader must get the byte ranges of the tiles intersecting a window"""
+        dataset = mock.MagicMock(
+            indexes=[1, 2], height=1000, width=1000, block_shapes=[(256, 256)]
+        )
+        dataset.get_tag_item.side_effect = lambda key, ns, bidx: (
+            None
+            if key.endswith("_3_3")
+            else 1000 * bidx + 10 * int(key[-3]) + int(key[-1])
+            if key.startswith("BLOCK_OFFSET")
+            else 5
+        )
+        asset = AssetReader(self._dummy_product(), "http://somewhere/B04.tif")
+        asset._dataset = dataset
+        window = mock.MagicMock(row_off=500, col_off=700, height=300.5, width=100)
+        self.assertEqual(
+            asset.get_tiles_ranges(window, indexes=1),
+            # tiles (col, row) in cols 2-3 and rows 1-3, (3, 3) being empty
+            [(1021, 1026), (1022, 1027), (1023, 1028), (1031, 1036), (1032, 1037)],
+        )
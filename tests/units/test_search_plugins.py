@@ -17,6 +17,8 @@
 # limitations under the License.
 
 import json
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -79,10 +81,7 @@ class TestSearchPluginQueryStringSearch(BaseSearchPluginTest):
         with open(self.provider_resp_dir / "sobloo_search.json") as f:
             sobloo_resp_search = json.load(f)
         mock__request.return_value = mock.Mock()
-        mock__request.return_value.json.side_effect = [
-            self.sobloo_resp_count,
-            sobloo_resp_search,
-        ]
+        mock__request.return_value.json.return_value = sobloo_resp_search
         products, estimate = self.sobloo_search_plugin.query(
             page=1,
             items_per_page=2,
@@ -94,21 +93,54 @@ class TestSearchPluginQueryStringSearch(BaseSearchPluginTest):
         sobloo_url_search = "https://sobloo.eu/api/v1/services/search?f=acquisition.beginViewingDate:gte:1596844800000&f=acquisition.endViewingDate:lte:1597536000000&f=identification.type:eq:S2MSI1C&gintersect=POLYGON ((137.7729 13.1342, 137.7729 23.8860, 153.7491 23.8860, 153.7491 13.1342, 137.7729 13.1342))&size=2&from=0"  # noqa
         number_of_products = 2
 
-        mock__request.assert_any_call(
+        # the total is given by the search response, no count request is sent
+        mock__request.assert_called_once_with(
             mock.ANY,
-            self.sobloo_url_count,
+            sobloo_url_search,
             info_message=mock.ANY,
             exception_message=mock.ANY,
         )
+        self.assertEqual(estimate, self.sobloo_products_count)
+        self.assertEqual(len(products), number_of_products)
+        self.assertIsInstance(products[0], EOProduct)
+
+    @mock.patch(
+        "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
+    )
+    def test_plugins_search_querystringseach_count_missing_from_response_sobloo(
+        self, mock__request
+    ):
+        """A count request must be sent if the search response does not give the total"""  # noqa
+        with open(self.provider_resp_dir / "sobloo_search.json") as f:
+            sobloo_resp_search = json.load(f)
+        sobloo_resp_search.pop("totalnb")
+
+        def _request(plugin, url, **kwargs):
+            response = mock.Mock()
+            response.json.return_value = (
+                self.sobloo_resp_count
+                if url == self.sobloo_url_count
+                else sobloo_resp_search
+            )
+            return response
+
+        mock__request.side_effect = _request
+        products, estimate = self.sobloo_search_plugin.query(
+            page=1,
+            items_per_page=2,
+            auth=self.sobloo_auth_plugin,
+            **self.search_criteria_s2_msi_l1c
+        )
+
+        self.assertEqual(mock__request.call_count, 2)
         mock__request.assert_called_with(
             mock.ANY,
-            sobloo_url_search,
+            self.sobloo_url_count,
             info_message=mock.ANY,
             exception_message=mock.ANY,
         )
         self.assertEqual(estimate, self.sobloo_products_count)
-        self.assertEqual(len(products), number_of_products)
-        self.assertIsInstance(products[0], EOProduct)
+        self.assertEqual(len(products), 2)
 
     @mock.patch(
         "eodag.plugins.search.qssearch.QueryStringSearch.count_hits", autospec=True
@@ -147,6 +179,107 @@ class TestSearchPluginQueryStringSearch(BaseSearchPluginTest):
         self.assertEqual(len(products), number_of_products)
         self.assertIsInstance(products[0], EOProduct)
 
+    @mock.patch(
+        "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
+    )
+    def test_plugins_search_querystringseach_concurrent_queries(self, mock__request):
+        """Concurrent queries with a QueryStringSearch must not share their state"""
+        with open(self.provider_resp_dir / "sobloo_search.json") as f:
+            sobloo_resp_search = json.load(f)
+        # both queries have built their urls before one of them gets its response
+        barrier = threading.Barrier(2, timeout=10)
+
+        def _request(plugin, url, **kwargs):
+            barrier.wait()
+            response = mock.Mock()
+            response.json.return_value = sobloo_resp_search
+            return response
+
+        mock__request.side_effect = _request
+        search_urls = {}
+
+        def query(start):
+            self.sobloo_search_plugin.query(
+                count=False,
+                page=1,
+                items_per_page=2,
+                auth=self.sobloo_auth_plugin,
+                **dict(
+                    self.search_criteria_s2_msi_l1c, startTimeFromAscendingNode=start
+                )
+            )
+            search_urls[start] = list(self.sobloo_search_plugin.search_urls)
+
+        threads = [
+            threading.Thread(target=query, args=(start,))
+            for start in ("2020-08-08", "2020-08-10")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock__request.call_count, 2)
+        self.assertEqual(len(search_urls["2020-08-08"]), 1)
+        self.assertIn("gte:1596844800000", search_urls["2020-08-08"][0])
+        self.assertEqual(len(search_urls["2020-08-10"]), 1)
+        self.assertIn("gte:1597017600000", search_urls["2020-08-10"][0])
+
+    @mock.patch(
+        "eodag.plugins.search.qssearch.QueryStringSearch.normalize_results",
+        autospec=True,
+    )
+    @mock.patch(
+        "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
+    )
+    def test_plugins_search_querystringseach_concurrent_collections(
+        self, mock__request, mock_normalize_results
+    ):
+        """The collections searched by a QueryStringSearch must be requested concurrently"""  # noqa
+        # peps L1C products without date are searched in the S2 and S2ST collections
+        search_plugin = self.get_search_plugin(self.product_type, "peps")
+        counts = {"/S2/": 3, "/S2ST/": 4}
+        # both requests of a kind must be sent before any of them gets its response
+        barrier = threading.Barrier(2, timeout=10)
+
+        def _request(plugin, url, **kwargs):
+            collection = "/S2/" if "/S2/" in url else "/S2ST/"
+            if barrier is not None:
+                barrier.wait()
+            if collection == "/S2/":
+                # the first collection is the slowest
+                time.sleep(0.1)
+            response = mock.Mock()
+            response.json.return_value = {
+                "properties": {"totalResults": counts[collection]},
+                "features": [{"collection": collection}],
+            }
+            return response
+
+        mock__request.side_effect = _request
+        mock_normalize_results.side_effect = lambda plugin, results, **kw: results
+
+        products, estimate = search_plugin.query(
+            page=1,
+            items_per_page=2,
+            productType=self.product_type,
+        )
+        self.assertEqual(estimate, 7)
+        # results are merged in the order of the collections
+        self.assertListEqual(
+            products, [{"collection": "/S2/"}, {"collection": "/S2ST/"}]
+        )
+
+        # the search stops as soon as a page is full
+        barrier = None
+        products, estimate = search_plugin.query(
+            page=1,
+            items_per_page=1,
+            count=False,
+            productType=self.product_type,
+        )
+        self.assertListEqual(products, [{"collection": "/S2/"}])
+
     @mock.patch(
         "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
     )
@@ -254,10 +387,7 @@ class TestSearchPluginPostJsonSearch(BaseSearchPluginTest):
         with open(self.provider_resp_dir / "awseos_search.json") as f:
             awseos_resp_search = json.load(f)
         mock__request.return_value = mock.Mock()
-        mock__request.return_value.json.side_effect = [
-            self.awseos_resp_count,
-            awseos_resp_search,
-        ]
+        mock__request.return_value.json.return_value = awseos_resp_search
         products, estimate = self.awseos_search_plugin.query(
             page=1,
             items_per_page=2,
@@ -268,13 +398,8 @@ class TestSearchPluginPostJsonSearch(BaseSearchPluginTest):
         # Specific expected results
         number_of_products = 2
 
-        mock__request.assert_any_call(
-            mock.ANY,
-            self.awseos_url,
-            info_message=mock.ANY,
-            exception_message=mock.ANY,
-        )
-        mock__request.assert_called_with(
+        # the total is given by the search response, no count request is sent
+        mock__request.assert_called_once_with(
             mock.ANY,
             self.awseos_url,
             info_message=mock.ANY,
@@ -320,6 +445,56 @@ class TestSearchPluginPostJsonSearch(BaseSearchPluginTest):
         self.assertEqual(len(products), number_of_products)
         self.assertIsInstance(products[0], EOProduct)
 
+    @mock.patch("eodag.plugins.search.qssearch.PostJsonSearch._request", autospec=True)
+    @mock.patch(
+        "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
+    )
+    def test_plugins_search_postjsonsearch_specific_qssearch(
+        self, mock_qs__request, mock_pj__request
+    ):
+        """A PostJsonSearch query using specific_qssearch must not alter the plugin"""
+        search_plugin = self.get_search_plugin("S2_MSI_L2A", "aws_eos")
+        api_endpoint = search_plugin.config.api_endpoint
+        metadata_mapping = search_plugin.config.metadata_mapping
+        mock_qs__request.return_value.json.side_effect = [
+            {
+                "": [
+                    {
+                        "path": "tiles/31/T/CJ/2020/12/1/0",
+                        "tileDataGeometry": {"type": "Point", "coordinates": [0, 0]},
+                    }
+                ]
+            },
+            {
+                "": [
+                    {
+                        "name": "S2A_MSIL2A_20201201T105421_N0214_R051_T31TCJ_20201201T121312"
+                    }
+                ]
+            },
+        ]
+
+        products, _ = search_plugin.query(
+            productType="S2_MSI_L2A",
+            id="S2A_MSIL2A_20201201T105421_N0214_R051_T31TCJ_20201201T121312",
+            auth=self.awseos_auth_plugin,
+        )
+
+        mock_pj__request.assert_not_called()
+        self.assertEqual(mock_qs__request.call_count, 2)
+        mock_qs__request.assert_called_with(
+            mock.ANY,
+            "https://roda.sentinel-hub.com/sentinel-s2-l2a/tiles/31/T/CJ/2020/12/1/0/productInfo.json",
+            info_message=mock.ANY,
+            exception_message=mock.ANY,
+        )
+        self.assertEqual(len(products), 1)
+        # the configuration of the plugin is untouched
+        self.assertEqual(search_plugin.config.api_endpoint, api_endpoint)
+        self.assertIs(search_plugin.config.metadata_mapping, metadata_mapping)
+        self.assertEqual(search_plugin.config.results_entry, "results")
+        self.assertNotIn("_request", search_plugin.__dict__)
+
 
 class TestSearchPluginODataV4Search(BaseSearchPluginTest):
     def setUp(self):
@@ -333,7 +508,7 @@ class TestSearchPluginODataV4Search(BaseSearchPluginTest):
         self.onda_url_count = 'https://catalogue.onda-dias.eu/dias-catalogue/Products/$count?productType=S2MSI1C&$search="footprint:"Intersects(POLYGON ((137.7729 13.1342, 137.7729 23.8860, 153.7491 23.8860, 153.7491 13.1342, 137.7729 13.1342)))" AND productType:S2MSI1C AND beginPosition:[2020-08-08T00:00:00.000Z TO *] AND endPosition:[* TO 2020-08-16T00:00:00.000Z]"'  # noqa
         self.onda_products_count = 47
 
-    @mock.patch("eodag.plugins.search.qssearch.requests.get", autospec=True)
+    @mock.patch("eodag.utils.http.HttpSession.get", autospec=True)
     @mock.patch(
         "eodag.plugins.search.qssearch.QueryStringSearch._request", autospec=True
     )
@@ -343,11 +518,16 @@ class TestSearchPluginODataV4Search(BaseSearchPluginTest):
         """A query with a ODataV4Search (here onda) must return tuple with a list of EOProduct and a number of available products"""  # noqa
         with open(self.provider_resp_dir / "onda_search.json") as f:
             onda_resp_search = json.load(f)
-        mock__request.return_value = mock.Mock()
-        mock__request.return_value.json.side_effect = [
-            self.onda_resp_count,
-            onda_resp_search,
-        ]
+
+        def _request(plugin, url, **kwargs):
+            response = mock.Mock()
+            response.json.return_value = (
+                self.onda_resp_count if url == self.onda_url_count else onda_resp_search
+            )
+            return response
+
+        # the count and search requests are sent concurrently
+        mock__request.side_effect = _request
         mock_requests_get.return_value = mock.Mock()
         # Mock requests.get in ODataV4Search.do_search that sends a request per product
         # obtained by QueryStringSearch.do_search to retrieve its metadata.
@@ -372,17 +552,56 @@ class TestSearchPluginODataV4Search(BaseSearchPluginTest):
             info_message=mock.ANY,
             exception_message=mock.ANY,
         )
-        mock__request.assert_called_with(
+        mock__request.assert_any_call(
             mock.ANY,
             onda_url_search,
             info_message=mock.ANY,
             exception_message=mock.ANY,
         )
+        self.assertEqual(mock__request.call_count, 2)
 
         self.assertEqual(estimate, self.onda_products_count)
         self.assertEqual(len(products), number_of_products)
         self.assertIsInstance(products[0], EOProduct)
 
+        # the count of an identical query is reused when estimating it
+        mock__request.reset_mock()
+        products, estimate = self.onda_search_plugin.query(
+            page=2,
+            items_per_page=2,
+            count="estimate",
+            auth=self.onda_auth_plugin,
+            **self.search_criteria_s2_msi_l1c
+        )
+        self.assertEqual(mock__request.call_count, 1)
+        self.assertNotEqual(mock__request.call_args[0][1], self.onda_url_count)
+        self.assertEqual(estimate, self.onda_products_count)
+
+        # but not when counting it
+        mock__request.reset_mock()
+        products, estimate = self.onda_search_plugin.query(
+            page=1,
+            items_per_page=2,
+            auth=self.onda_auth_plugin,
+            **self.search_criteria_s2_msi_l1c
+        )
+        self.assertEqual(mock__request.call_count, 2)
+
+        # nor once expired
+        mock__request.reset_mock()
+        self.onda_search_plugin.config.count_cache_ttl = 0
+        try:
+            products, estimate = self.onda_search_plugin.query(
+                page=1,
+                items_per_page=2,
+                count="estimate",
+                auth=self.onda_auth_plugin,
+                **self.search_criteria_s2_msi_l1c
+            )
+        finally:
+            del self.onda_search_plugin.config.count_cache_ttl
+        self.assertEqual(mock__request.call_count, 2)
+
 
 class TestSearchPluginStacSearch(BaseSearchPluginTest):
     @mock.patch("eodag.plugins.search.qssearch.StacSearch._request", autospec=True)
@@ -392,36 +611,32 @@ class TestSearchPluginStacSearch(BaseSearchPluginTest):
         geojson_geometry = self.search_criteria_s2_msi_l1c["geometry"].__geo_interface__
 
         mock__request.return_value = mock.Mock()
-        mock__request.return_value.json.side_effect = [
-            {
-                "context": {"page": 1, "limit": 2, "matched": 1, "returned": 2},
-            },
-            {
-                "features": [
-                    {
-                        "id": "foo",
-                        "geometry": geojson_geometry,
-                        "properties": {
-                            "sentinel:product_id": "S2B_MSIL1C_20201009T012345_N0209_R008_T31TCJ_20201009T123456",
-                        },
+        mock__request.return_value.json.return_value = {
+            "context": {"page": 1, "limit": 2, "matched": 1, "returned": 2},
+            "features": [
+                {
+                    "id": "foo",
+                    "geometry": geojson_geometry,
+                    "properties": {
+                        "sentinel:product_id": "S2B_MSIL1C_20201009T012345_N0209_R008_T31TCJ_20201009T123456",
                     },
-                    {
-                        "id": "bar",
-                        "geometry": geojson_geometry,
-                        "properties": {
-                            "sentinel:product_id": "S2B_MSIL1C_20200910T012345_N0209_R008_T31TCJ_20200910T123456",
-                        },
+                },
+                {
+                    "id": "bar",
+                    "geometry": geojson_geometry,
+                    "properties": {
+                        "sentinel:product_id": "S2B_MSIL1C_20200910T012345_N0209_R008_T31TCJ_20200910T123456",
                     },
-                    {
-                        "id": "bar",
-                        "geometry": geojson_geometry,
-                        "properties": {
-                            "sentinel:product_id": "S2B_MSIL1C_20201010T012345_N0209_R008_T31TCJ_20201010T123456",
-                        },
+                },
+                {
+                    "id": "bar",
+                    "geometry": geojson_geometry,
+                    "properties": {
+                        "sentinel:product_id": "S2B_MSIL1C_20201010T012345_N0209_R008_T31TCJ_20201010T123456",
                     },
-                ]
-            },
-        ]
+                },
+            ],
+        }
 
         search_plugin = self.get_search_plugin(self.product_type, "earth_search")
 
@@ -448,23 +663,19 @@ class TestSearchPluginStacSearch(BaseSearchPluginTest):
         geojson_geometry = self.search_criteria_s2_msi_l1c["geometry"].__geo_interface__
 
         mock__request.return_value = mock.Mock()
-        mock__request.return_value.json.side_effect = [
-            {
-                "context": {"matched": 3},
-            },
-            {
-                "features": [
-                    {
-                        "id": "foo",
-                        "geometry": geojson_geometry,
-                    },
-                    {
-                        "id": "bar",
-                        "geometry": None,
-                    },
-                ]
-            },
-        ]
+        mock__request.return_value.json.return_value = {
+            "context": {"matched": 3},
+            "features": [
+                {
+                    "id": "foo",
+                    "geometry": geojson_geometry,
+                },
+                {
+                    "id": "bar",
+                    "geometry": None,
+                },
+            ],
+        }
 
         search_plugin = self.get_search_plugin(self.product_type, "earth_search")
 
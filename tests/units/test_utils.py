@@ -16,22 +16,60 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gzip
+import hashlib
+import io
 import os
+import re
+import sqlite3
 import sys
+import tarfile
+import threading
+import time
 import unittest
+import zipfile
 from contextlib import closing
-from datetime import datetime
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
+
+import responses
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import ChunkedEncodingError
+from shapely.geometry import box
 
 from tests.context import (
+    AssetFilter,
+    ChecksumError,
+    ChecksumVerifier,
     DownloadedCallback,
+    FileDownloadRecords,
+    HttpRangeFetcher,
+    HttpSession,
+    ProductCache,
     ProgressCallback,
+    RangeReader,
+    RateLimiter,
+    S3RangeFetcher,
+    SearchShard,
+    SQLiteDownloadRecords,
+    StreamReader,
+    StreamWriter,
+    extract_stream,
+    extract_zip,
     flatten_top_directories,
     get_bucket_name_and_prefix,
+    get_download_records,
+    get_progress_metrics,
+    get_record_filename,
+    get_thread_safe_callback,
     get_timestamp,
+    iter_ordered,
     merge_mappings,
+    parse_checksum,
     path_to_uri,
     setup_logging,
     uri_to_path,
@@ -139,6 +177,39 @@ class TestUtils(unittest.TestCase):
                 bar(1)
             self.assertEqual(tqdm_out.getvalue(), "")
 
+    def test_progresscallback_batched(self):
+        """ProgressCallback must batch updates from several threads, and count them"""
+        metrics = get_progress_metrics()
+        metrics.reset()
+        with ProgressCallback(total=8000, flush_interval=60, flush_size=1000) as bar:
+            with mock.patch.object(bar, "update", wraps=bar.update) as mock_update:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    list(executor.map(lambda _: bar(10), range(799)))
+                # updates are applied by batches of flush_size
+                self.assertEqual(bar.n, 7000)
+                self.assertEqual(mock_update.call_count, 7)
+                # and once the total is reached
+                bar(10)
+                self.assertEqual(bar.n, 8000)
+                self.assertEqual(mock_update.call_count, 8)
+            # pending updates are applied on reset
+            bar(10)
+            bar.reset(total=10)
+            self.assertEqual(metrics.snapshot()["counters"], {"B": 8010})
+
+        # disabled progress bars are counted too
+        with ProgressCallback(disable=True, unit="file", flush_interval=60) as bar:
+            bar(1)
+            self.assertEqual(bar.n, 0)
+        self.assertEqual(bar.n, 1)
+        self.assertEqual(metrics.snapshot()["counters"], {"B": 8010, "file": 1})
+
+        # other callables are called under a lock
+        self.assertIs(get_thread_safe_callback(bar), bar)
+        callback = mock.MagicMock()
+        get_thread_safe_callback(callback)(5)
+        callback.assert_called_once_with(5)
+
     def test_merge_mappings(self):
         """Configuration mappings must be merged properly."""
 
@@ -262,3 +333,490 @@ class TestUtils(unittest.TestCase):
             self.assertIn(Path(nested_dir_root) / "b" / "c2", dir_content)
             self.assertIn(Path(nested_dir_root) / "b" / "c2" / "bar", dir_content)
             self.assertIn(Path(nested_dir_root) / "b" / "c2" / "baz", dir_content)
+
+    def test_http_session_from_config(self):
+        """HttpSession must be configurable using an http configuration mapping"""
+        session = HttpSession.from_config(
+            {
+                "pool_maxsize": "4",
+                "max_retries": 2,
+                "timeout": 7,
+                "stream_timeout": 30,
+                "keep_alive": False,
+            }
+        )
+        self.assertEqual(session.timeout, 7)
+        self.assertEqual(session.stream_timeout, 30)
+        self.assertEqual(session.headers["Connection"], "close")
+        adapter = session.get_adapter("https://foo.bar")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(502, adapter.max_retries.status_forcelist)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+
+        # defaults
+        session = HttpSession.from_config(None)
+        self.assertEqual(session.timeout, 5)
+        self.assertNotEqual(session.headers.get("Connection"), "close")
+
+    @mock.patch("eodag.utils.throttling.time.sleep", autospec=True)
+    def test_rate_limiter(self, mock_sleep):
+        """RateLimiter must throttle bytes and requests, also counted by its parent"""
+        global_limiter = RateLimiter(bytes_per_second=1000)
+        limiter = RateLimiter.from_config(
+            {"bytes_per_second": 100, "requests_per_second": 2, "burst": 2},
+            parent=global_limiter,
+        )
+        self.assertTrue(limiter.limits_bytes)
+        # bursts are allowed, then consumers wait for the bucket to be refilled
+        limiter.consume_bytes(200)
+        mock_sleep.assert_not_called()
+        limiter.consume_bytes(50)
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.5, places=1)
+        self.assertAlmostEqual(global_limiter.bytes_bucket._tokens, 750, places=-1)
+        mock_sleep.reset_mock()
+        for _ in range(5):
+            limiter.acquire_request()
+        self.assertEqual(mock_sleep.call_count, 1)
+
+        limiter.set_limits(requests_per_second=1)
+        self.assertIsNone(limiter.bytes_per_second)
+        self.assertEqual(limiter.requests_per_second, 1)
+        self.assertFalse(RateLimiter(parent=RateLimiter()).limits_bytes)
+
+    def test_http_session_rate_limiter(self):
+        """HttpSession must count its requests and received bytes with its limiter"""
+        session = HttpSession()
+        session.rate_limiter = mock.MagicMock(limits_bytes=True)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, "http://somewhere/", body=b"a" * 1000)
+            with session.get("http://somewhere/", stream=True) as response:
+                self.assertEqual(
+                    sum(len(c) for c in response.iter_content(chunk_size=100)), 1000
+                )
+            self.assertEqual(session.get("http://somewhere/").content, b"a" * 1000)
+        self.assertEqual(session.rate_limiter.acquire_request.call_count, 2)
+        self.assertEqual(
+            sum(c.args[0] for c in session.rate_limiter.consume_bytes.call_args_list),
+            2000,
+        )
+
+    def test_extract_stream(self):
+        """extract_stream must extract zip and tar.gz archives from chunks of bytes"""
+
+        def chunks(data, size=100):
+            return (data[i : i + size] for i in range(0, len(data), size))
+
+        members = {"a/b.txt": os.urandom(1000), "c.txt": b"c" * 1000, "../d": b"d"}
+        for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, "w", compression=compression) as zfile:
+                for name, content in members.items():
+                    zfile.writestr(name, content)
+            with TemporaryDirectory() as tmp_dir:
+                extract_stream(StreamReader(chunks(archive.getvalue())), tmp_dir)
+                for name, content in members.items():
+                    # parent directory parts are ignored
+                    member_path = Path(tmp_dir) / name.replace("../", "")
+                    self.assertEqual(member_path.read_bytes(), content)
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w:gz") as tfile:
+            tarinfo = tarfile.TarInfo("a/b.txt")
+            tarinfo.size = 3
+            tfile.addfile(tarinfo, io.BytesIO(b"abc"))
+        with TemporaryDirectory() as tmp_dir:
+            extract_stream(StreamReader(chunks(archive.getvalue())), tmp_dir)
+            self.assertEqual((Path(tmp_dir) / "a" / "b.txt").read_bytes(), b"abc")
+
+        # not an archive
+        with self.assertRaises(ValueError), TemporaryDirectory() as tmp_dir:
+            extract_stream(StreamReader(chunks(b"foo")), tmp_dir)
+
+    def test_extract_zip_concurrent(self):
+        """extract_zip must extract zip archive members concurrently"""
+        members = {f"dir{i % 3}/file{i}": os.urandom(100 * i) for i in range(10)}
+        with TemporaryDirectory() as tmp_dir:
+            archive_path = os.path.join(tmp_dir, "archive.zip")
+            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zfile:
+                for name, content in members.items():
+                    zfile.writestr(name, content)
+
+            progress_callback = mock.MagicMock()
+            extract_zip(
+                archive_path,
+                os.path.join(tmp_dir, "out"),
+                max_workers=3,
+                progress_callback=progress_callback,
+            )
+
+            self.assertEqual(progress_callback.call_count, len(members))
+            for name, content in members.items():
+                self.assertEqual(
+                    Path(tmp_dir, "out", name).read_bytes(), content, msg=name
+                )
+
+    def test_download_records(self):
+        """Download records must be stored in a SQLite database or in legacy files"""
+        with TemporaryDirectory() as records_dir:
+            # legacy records
+            records = get_download_records(records_dir, backend="files")
+            self.assertIsInstance(records, FileDownloadRecords)
+            records.add("http://foo")
+            records.add("http://bar")
+            records.remove("http://bar")
+            self.assertEqual(
+                os.listdir(records_dir), [get_record_filename("http://foo")]
+            )
+            self.assertIsNotNone(records.get("http://foo"))
+            self.assertIsNone(records.get("http://bar"))
+
+            # legacy records are imported in the database, and kept
+            records = get_download_records(records_dir)
+            self.assertIsInstance(records, SQLiteDownloadRecords)
+            self.assertEqual(records.get("http://foo")["url"], "http://foo")
+            self.assertCountEqual(
+                os.listdir(records_dir),
+                ["records.sqlite", get_record_filename("http://foo")],
+            )
+
+            records.add("http://bar", path="/some/path", size=3, checksum="abc")
+            records.prefetch(["http://foo", "http://bar", "http://baz"])
+            self.assertDictContainsSubset(
+                {"path": "/some/path", "size": 3, "checksum": "abc"},
+                records.get("http://bar"),
+            )
+            self.assertIsNone(records.get("http://baz"))
+            records.remove("http://foo")
+            self.assertIsNone(records.get("http://foo"))
+            # and removed with the record
+            self.assertEqual(os.listdir(records_dir), ["records.sqlite"])
+            # unused prefetched records are forgotten, e.g. when another process
+            # records the product
+            records.prefetch(["http://foo"])
+            other_records = SQLiteDownloadRecords(records_dir)
+            other_records.add("http://foo")
+            other_records.close()
+            records.clear_prefetched(["http://foo"])
+            self.assertIsNotNone(records.get("http://foo"))
+            records.remove("http://foo")
+            # partial downloads
+            records.add("http://baz", asset_filter=AssetFilter.from_value("B0*"))
+            self.assertEqual(
+                records.get("http://baz")["asset_filter"], AssetFilter(["B0*"])
+            )
+            self.assertIsNone(records.get("http://bar")["asset_filter"])
+            # records are shared
+            self.assertIs(records, get_download_records(records_dir))
+            records.close()
+
+        # partial downloads are not recorded in legacy records
+        with TemporaryDirectory() as records_dir:
+            records = get_download_records(records_dir, backend="files")
+            records.add("http://foo", asset_filter=AssetFilter.from_value("B0*"))
+            self.assertIsNone(records.get("http://foo"))
+
+    def test_download_records_migration(self):
+        """Download records databases without asset filters must be migrated"""
+        with TemporaryDirectory() as records_dir:
+            connection = sqlite3.connect(os.path.join(records_dir, "records.sqlite"))
+            with connection:
+                connection.execute(
+                    "CREATE TABLE records (key TEXT PRIMARY KEY, url TEXT, "
+                    "path TEXT, size INTEGER, checksum TEXT, timestamp TEXT)"
+                )
+                connection.execute(
+                    "INSERT INTO records (key, url) VALUES (?, ?)",
+                    (get_record_filename("http://foo"), "http://foo"),
+                )
+            connection.close()
+
+            records = SQLiteDownloadRecords(records_dir)
+            self.assertIsNone(records.get("http://foo")["asset_filter"])
+            records.add("http://bar", asset_filter=AssetFilter(["B04"]))
+            self.assertEqual(
+                records.get("http://bar")["asset_filter"], AssetFilter(["B04"])
+            )
+            records.close()
+
+    def test_asset_filter(self):
+        """AssetFilter must select assets using glob patterns and regular expressions"""
+        asset_filter = AssetFilter.from_value(["B0?", re.compile(r"SCL(_\d+m)?")])
+        self.assertEqual(
+            asset_filter.filter_keys(["B01", "B8A", "B10", "SCL", "SCL_20m", "TCI"]),
+            ["B01", "SCL", "SCL_20m"],
+        )
+        self.assertEqual(asset_filter, AssetFilter.from_json(str(asset_filter)))
+        self.assertTrue(asset_filter.match_path("tiles/R20m/SCL.jp2"))
+        self.assertFalse(asset_filter.match_path("tiles/R20m/AOT.jp2"))
+        self.assertIsNone(AssetFilter.from_value(None))
+        self.assertIsNone(AssetFilter.from_value([]))
+        with self.assertRaises(ValueError):
+            AssetFilter.from_value([1])
+
+        # assets downloaded with a filter cover the requests of a subset of them
+        keys = ["B01", "B02", "SCL"]
+        self.assertTrue(AssetFilter.covers(None, asset_filter, keys))
+        self.assertTrue(AssetFilter.covers(asset_filter, AssetFilter(["B02"]), keys))
+        self.assertFalse(AssetFilter.covers(AssetFilter(["B02"]), asset_filter, keys))
+        self.assertFalse(AssetFilter.covers(asset_filter, None, keys))
+
+    def test_stream_writer(self):
+        """StreamWriter must write streams by growing chunks, using a reused buffer"""
+        data = os.urandom(100 * 1024)
+        url = "http://somewhere/file.tif"
+        writer = StreamWriter(
+            min_chunk_size=1024, max_chunk_size=16 * 1024, target_duration=60
+        )
+        with responses.RequestsMock() as rsps, TemporaryDirectory() as tmp_dir:
+            rsps.add(responses.GET, url, body=data)
+            rsps.add(
+                responses.GET,
+                url + ".gz",
+                body=gzip.compress(data),
+                headers={"Content-Encoding": "gzip"},
+            )
+            path = os.path.join(tmp_dir, "file.tif")
+            session = HttpSession()
+
+            chunks = []
+            verifier = hashlib.md5()
+            with open(path, "wb") as fh, session.get(url, stream=True) as stream:
+                written = writer.write(
+                    stream, fh, progress_callback=chunks.append, verifier=verifier
+                )
+            self.assertEqual(written, len(data))
+            self.assertEqual(Path(path).read_bytes(), data)
+            self.assertEqual(verifier.hexdigest(), hashlib.md5(data).hexdigest())
+            # chunks grow while they are read faster than the target duration
+            self.assertEqual(chunks[:6], [1024, 2048, 4096, 8192, 16384, 16384])
+
+            # writes can be limited, e.g. to a byte range
+            with open(path, "wb") as fh, session.get(url, stream=True) as stream:
+                self.assertEqual(writer.write(stream, fh, limit=5000), 5000)
+            self.assertEqual(Path(path).read_bytes(), data[:5000])
+
+            # encoded streams are decoded by iter_content
+            with open(path, "wb") as fh, session.get(
+                url + ".gz", stream=True
+            ) as stream:
+                self.assertEqual(writer.write(stream, fh, limit=5000), 5000)
+            self.assertEqual(Path(path).read_bytes(), data[:5000])
+
+    def test_stream_writer_truncated(self):
+        """StreamWriter must raise the errors of requests when a stream is truncated"""
+
+        class TruncatedHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "100000")
+                self.end_headers()
+                # the connection is closed before the end of the body
+                self.wfile.write(b"a" * 50000)
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), TruncatedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/file.tif"
+        writer = StreamWriter(min_chunk_size=1024, max_chunk_size=16 * 1024)
+        try:
+            with TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "file.tif")
+                chunks = []
+                with open(path, "wb") as fh, HttpSession().get(
+                    url, stream=True
+                ) as stream:
+                    with self.assertRaises(ChunkedEncodingError):
+                        writer.write(stream, fh, progress_callback=chunks.append)
+                # the data received before the interruption is written
+                self.assertEqual(sum(chunks), 50000)
+                self.assertEqual(Path(path).read_bytes(), b"a" * 50000)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_iter_ordered(self):
+        """iter_ordered must yield results in order, and cancel the pending calls"""
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        calls = []
+
+        def func(item):
+            with lock:
+                calls.append(item)
+                running.append(item)
+                max_running.append(len(running))
+            # the first calls are the slowest
+            time.sleep(0.05 * (4 - item) if item < 4 else 0)
+            with lock:
+                running.remove(item)
+            return item * 2
+
+        self.assertEqual(
+            list(iter_ordered(func, range(8), max_workers=3)),
+            [0, 2, 4, 6, 8, 10, 12, 14],
+        )
+        self.assertEqual(max(max_running), 3)
+
+        # items are consumed lazily, and the calls not started when the consumer
+        # stops are cancelled
+        calls.clear()
+        results = iter_ordered(func, range(1000), max_workers=2, prefetch=4)
+        self.assertEqual(next(results), 0)
+        results.close()
+        self.assertLessEqual(len(calls), 5)
+
+        # errors are raised in order
+        def fail(item):
+            if item == 1:
+                raise ValueError(item)
+            return item
+
+        results = iter_ordered(fail, range(3), max_workers=2)
+        self.assertEqual(next(results), 0)
+        self.assertRaises(ValueError, next, results)
+
+    def test_search_shard_split(self):
+        """SearchShard must be split over time, then over space"""
+        shard = SearchShard("2021-01-01", "2021-01-03", box(0, 0, 10, 4))
+        halves = shard.split("both", min_duration=timedelta(days=1))
+        self.assertEqual(
+            [(s.start, s.end) for s in halves],
+            [
+                ("2021-01-01", "2021-01-02T00:00:00.000Z"),
+                ("2021-01-02T00:00:00.000Z", "2021-01-03"),
+            ],
+        )
+        self.assertEqual([s.depth for s in halves], [1, 1])
+
+        # time ranges are not split below min_duration
+        quarters = halves[0].split("both", min_duration=timedelta(days=1))
+        self.assertEqual([s.start for s in quarters], ["2021-01-01"] * 2)
+        self.assertEqual(
+            [s.geometry.bounds for s in quarters],
+            [(0.0, 0.0, 5.0, 4.0), (5.0, 0.0, 10.0, 4.0)],
+        )
+        self.assertEqual(quarters[0].split("time"), [])
+
+        # only the parts of the area intersecting the geometry are kept
+        shard = SearchShard(geometry=box(0, 0, 10, 4).union(box(20, 0, 22, 1)))
+        self.assertEqual(len(shard.split("time")), 0)
+        halves = shard.split("space")
+        self.assertEqual(halves[0].geometry.bounds, (0.0, 0.0, 10.0, 4.0))
+        self.assertEqual(halves[1].geometry.bounds, (20.0, 0.0, 22.0, 1.0))
+        self.assertEqual(halves[1].search_kwargs, {"geom": halves[1].geometry})
+
+        self.assertRaises(ValueError, shard.split, "foo")
+
+    def test_range_reader(self):
+        """RangeReader must read remote files by cached blocks, with range requests"""
+        data = bytes(range(256)) * 4
+        url = "http://somewhere/file.tif"
+        ranges = []
+
+        def get_callback(request):
+            start, end = request.headers["Range"][len("bytes=") :].split("-")
+            ranges.append((int(start), int(end) + 1))
+            return (206, {}, data[int(start) : int(end) + 1])
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.HEAD, url, headers={"Content-Length": str(len(data))})
+            rsps.add_callback(responses.GET, url, callback=get_callback)
+            reader = RangeReader(
+                HttpRangeFetcher(url), block_size=100, cache_size=300, max_workers=4
+            )
+            reader.seek(150)
+            self.assertEqual(reader.read(100), data[150:250])
+            # blocks are aligned and consecutive ones fetched at once
+            self.assertEqual(ranges, [(100, 300)])
+            # cached blocks are not fetched again
+            self.assertEqual(reader.read_range(120, 180), data[120:180])
+            self.assertEqual(reader.requests_count, 1)
+
+            # runs of missing blocks are fetched concurrently
+            ranges.clear()
+            reader.prefetch([(0, 10), (500, 650), (1000, 1100)])
+            self.assertEqual(sorted(ranges), [(0, 100), (500, 700), (1000, 1024)])
+            # least recently used blocks are evicted
+            ranges.clear()
+            self.assertEqual(reader.read_range(150, 160), data[150:160])
+            self.assertEqual(ranges, [(100, 200)])
+
+            reader.seek(-4, os.SEEK_END)
+            self.assertEqual(reader.read(), data[-4:])
+
+        # servers not supporting ranges send the whole file, fetched only once
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, url, body=data)
+            fetcher = HttpRangeFetcher(url)
+            self.assertEqual(fetcher.fetch(0, 100), data[:100])
+            self.assertEqual(fetcher.fetch(500, 700), data[500:700])
+            self.assertEqual(len(rsps.calls), 1)
+
+        # S3 objects
+        client = mock.MagicMock()
+        client.head_object.return_value = {"ContentLength": len(data)}
+        client.get_object.return_value["Body"].read.return_value = data[:100]
+        reader = RangeReader(
+            S3RangeFetcher(client, "bucket", "key", requester_pays=True),
+            block_size=100,
+        )
+        self.assertEqual(reader.read(10), data[:10])
+        client.get_object.assert_called_once_with(
+            Bucket="bucket", Key="key", Range="bytes=0-99", RequestPayer="requester"
+        )
+
+    def test_product_cache(self):
+        """ProductCache must link cached products and evict least recently used ones"""
+        with TemporaryDirectory() as cache_dir, TemporaryDirectory() as tmp_dir:
+            cache = ProductCache(cache_dir, quota=25)
+            for name in ("foo", "bar"):
+                os.makedirs(os.path.join(tmp_dir, "src", name))
+                Path(tmp_dir, "src", name, "data").write_bytes(b"x" * 10)
+                cache.put(name, os.path.join(tmp_dir, "src", name))
+
+            # foo is used, bar becomes the least recently used product
+            path = cache.get("foo", os.path.join(tmp_dir, "dst"))
+            self.assertEqual(path, os.path.join(tmp_dir, "dst", "foo"))
+            self.assertEqual(Path(path, "data").read_bytes(), b"x" * 10)
+            self.assertIsNone(cache.get("baz", os.path.join(tmp_dir, "dst")))
+
+            # quota exceeded
+            Path(tmp_dir, "src", "baz").write_bytes(b"x" * 10)
+            cache.put("baz", os.path.join(tmp_dir, "src", "baz"))
+            self.assertIsNone(cache.get("bar", os.path.join(tmp_dir, "dst")))
+            self.assertIsNotNone(cache.get("baz", os.path.join(tmp_dir, "dst")))
+
+    def test_checksum(self):
+        """parse_checksum must parse checksums metadata and ChecksumVerifier verify them"""
+        md5 = hashlib.md5(b"some data").hexdigest()
+        sha256 = hashlib.sha256(b"some data").hexdigest()
+        self.assertEqual(parse_checksum(md5), ("md5", md5))
+        self.assertEqual(parse_checksum(sha256.upper()), ("sha256", sha256))
+        self.assertEqual(parse_checksum(f"SHA-256:{sha256}"), ("sha256", sha256))
+        # STAC file:checksum multihash
+        self.assertEqual(parse_checksum(f"1220{sha256}"), ("sha256", sha256))
+        # OData Checksum, the strongest algorithm is used
+        self.assertEqual(
+            parse_checksum(
+                [
+                    {"Value": md5, "Algorithm": "MD5"},
+                    {"Value": sha256, "Algorithm": "SHA256"},
+                ]
+            ),
+            ("sha256", sha256),
+        )
+        for value in (None, "Not Available", "foo:bar", "abc", [{"Value": "abc"}]):
+            self.assertIsNone(parse_checksum(value))
+
+        verifier = ChecksumVerifier.from_metadata(f"1220{sha256}")
+        verifier.update(b"some ")
+        verifier.update(b"data")
+        verifier.verify("foo")
+        verifier.update(b"more data")
+        with self.assertRaisesRegex(ChecksumError, "sha256 checksum mismatch for foo"):
+            verifier.verify("foo")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import re
+import timeit
+
+import yaml
+
+from eodag.api.product import EOProduct
+from eodag.plugins.download.aws import DEFAULT_SAFE_PATH_RULES, AwsDownload
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+DEFAULT_CHUNKS_FILE_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "../tests/resources/safe_build/aws_sentinel_chunks.yml",
+)
+
+
+class _Chunk:
+    def __init__(self, key):
+        self.key = key
+
+
+def _get_path_rule_by_rule(compiled_rules, key, safe_fields):
+    """SAFE path of a chunk, matching the rules one after the other"""
+    for regex, path in compiled_rules:
+        match = regex.match(key)
+        if match:
+            fields = match.groupdict()
+            for name, value in safe_fields.items():
+                fields[name] = value(fields) if callable(value) else value
+            return path.format(**fields)
+    return None
+
+
+def benchmark_safe_paths(
+    product_type="S2_MSI_L2A", chunks_file_path=DEFAULT_CHUNKS_FILE_PATH, number=100
+):
+    """Compare the time needed to build the SAFE paths of a real product listing,
+    using the compiled rules or matching the rules one after the other
+
+    :param product_type: (optional) Product type of the listing
+    :type product_type: str
+    :param chunks_file_path: (optional) Path to the chunks listings file
+    :type chunks_file_path: str
+    :param number: (optional) Number of runs
+    :type number: int
+    """
+    with open(chunks_file_path) as fh:
+        listing = yaml.load(fh, Loader=yaml.SafeLoader)[product_type]
+    product = EOProduct(
+        provider="aws_eos", properties=listing["properties"], productType=product_type
+    )
+    chunks = [_Chunk(key) for key in listing["chunks"]]
+    plugin = AwsDownload("aws_eos", {})
+    compiled_rules = [
+        (re.compile(rule["pattern"]), rule["path"]) for rule in DEFAULT_SAFE_PATH_RULES
+    ]
+
+    def rule_by_rule():
+        safe_fields = plugin._get_safe_fields(product)
+        return [
+            _get_path_rule_by_rule(compiled_rules, chunk.key, safe_fields)
+            for chunk in chunks
+        ]
+
+    def compiled():
+        return plugin.get_chunks_dest_paths(product, chunks, "", build_safe=True)
+
+    if rule_by_rule() != compiled():
+        raise ValueError("SAFE paths differ")
+
+    logger.info(f"{len(chunks)} {product_type} chunks, {number} runs")
+    for name, func in (("rule by rule", rule_by_rule), ("compiled", compiled)):
+        duration = min(timeit.repeat(func, number=number, repeat=5))
+        logger.info(f"{name}: {duration / number * 1000:.3f} ms per listing")
+
+
+if __name__ == "__main__":
+    benchmark_safe_paths()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023, CS GROUP - France, https://www.csgroup.eu/
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import TemporaryDirectory
+
+from eodag.utils.http import HttpSession
+from eodag.utils.streaming import write_stream
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+
+def _get_handler(data):
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            view = memoryview(data)
+            for i in range(0, len(data), 1024 * 1024):
+                self.wfile.write(view[i : i + 1024 * 1024])
+
+        def log_message(self, *args):
+            pass
+
+    return _Handler
+
+
+def _iter_content_write(response, fhandle, progress_callback):
+    """Write loop used before :func:`~eodag.utils.streaming.write_stream`"""
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        if chunk:
+            fhandle.write(chunk)
+            progress_callback(len(chunk))
+
+
+def benchmark_stream_writer(size=512 * 1024 * 1024, repeat=3):
+    """Compare the throughput of the download of a file served by a local HTTP
+    server, using 64 KiB ``iter_content`` chunks or the stream writer
+
+    :param size: (optional) Size of the served file in bytes
+    :type size: int
+    :param repeat: (optional) Number of runs
+    :type repeat: int
+    """
+    data = os.urandom(size)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _get_handler(data))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/file"
+    session = HttpSession()
+
+    def run(write):
+        calls = []
+        with TemporaryDirectory() as tmp_dir:
+            started = time.monotonic()
+            with open(os.path.join(tmp_dir, "file"), "wb") as fhandle:
+                with session.get(url, stream=True) as response:
+                    write(response, fhandle, calls.append)
+            duration = time.monotonic() - started
+        if sum(calls) != size:
+            raise ValueError(f"{sum(calls)} bytes written, {size} expected")
+        return duration, len(calls)
+
+    logger.info(f"{size / 1024 ** 2:.0f} MiB file, {repeat} runs")
+    try:
+        for name, write in (
+            ("iter_content", _iter_content_write),
+            ("write_stream", write_stream),
+        ):
+            duration, calls = min(run(write) for _ in range(repeat))
+            logger.info(
+                f"{name}: {size / 1024 ** 2 / duration:.0f} MiB/s, "
+                f"{calls} progress updates"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    benchmark_stream_writer()